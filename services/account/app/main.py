@@ -30,6 +30,7 @@ from kugel_common.schemas.health import HealthCheckResponse
 from kugel_common.utils.health_check import HealthChecker
 from kugel_common.exceptions import register_exception_handlers
 from kugel_common.middleware.log_requests import log_requests
+from kugel_common.utils.request_log_writer import request_log_writer
 from app.config.settings import settings
 from app.api.v1.account import router as v1_account_router
 
@@ -144,6 +145,9 @@ async def close_event():
     """
     logger.info("closing the application")
 
+    # Write the queued request logs before the database connection is closed
+    await request_log_writer.close_async()
+
     logger.info("Closing the database connection")
     await db_helper.close_client_async()
 
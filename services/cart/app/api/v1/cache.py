@@ -2,7 +2,7 @@
 Cache management endpoints for cart service.
 """
 
-from fastapi import APIRouter, status, Depends
+from fastapi import APIRouter, status, Depends, Request
 from logging import getLogger
 
 from kugel_common.schemas.api_response import ApiResponse
@@ -12,6 +12,9 @@ from app.dependencies.terminal_cache_dependency import (
     get_terminal_cache_size,
     get_tenant_terminal_ids_in_cache,
 )
+from app.utils.item_master_cache import item_master_cache
+from app.utils.promotion_cache import promotion_cache
+from app.utils.settings_snapshot import settings_snapshot_cache
 
 # Create a router instance
 router = APIRouter()
@@ -85,3 +88,234 @@ async def clear_cache(current_user: dict = Depends(get_current_user)) -> ApiResp
             "items_cleared": items_before,
         }
     )
+
+
+@router.get(
+    "/cache/item/status",
+    response_model=ApiResponse[dict],
+    status_code=status.HTTP_200_OK,
+    summary="Get item cache status",
+    description="Get current status and hit/miss statistics of the shared item master cache",
+)
+async def get_item_cache_status(current_user: dict = Depends(get_current_user)) -> ApiResponse[dict]:
+    """
+    Get the current status of the shared item master cache for the authenticated user's tenant.
+
+    Returns:
+        Cache status including size and hit/miss counters
+    """
+    tenant_id = current_user.get("tenant_id")
+
+    return ApiResponse(
+        success=True,
+        code=status.HTTP_200_OK,
+        message="Success to get item cache status",
+        data={
+            "cache_type": "item_master",
+            "tenant_id": tenant_id,
+            "tenant_cache_size": item_master_cache.size(tenant_id),
+            "total_cache_size": item_master_cache.size(),
+            "statistics": item_master_cache.stats(),
+            "status": "active",
+        }
+    )
+
+
+@router.delete(
+    "/cache/item",
+    response_model=ApiResponse[dict],
+    status_code=status.HTTP_200_OK,
+    summary="Clear item cache",
+    description="Clear all entries from the shared item master cache for the tenant",
+)
+async def clear_item_cache(current_user: dict = Depends(get_current_user)) -> ApiResponse[dict]:
+    """
+    Clear item master cache entries for the authenticated user's tenant.
+
+    Returns:
+        Confirmation of cache clearing with details
+    """
+    tenant_id = current_user.get("tenant_id")
+    username = current_user.get("username")
+
+    # Get count before clearing
+    items_before = item_master_cache.size(tenant_id)
+
+    # Clear cache for this tenant only
+    item_master_cache.clear(tenant_id)
+    logger.info(f"Item cache cleared for tenant {tenant_id} by user: {username}")
+
+    return ApiResponse(
+        success=True,
+        code=status.HTTP_200_OK,
+        message="Success to clear item cache",
+        data={
+            "message": f"Item cache cleared successfully for tenant {tenant_id}",
+            "cache_type": "item_master",
+            "tenant_id": tenant_id,
+            "items_cleared": items_before,
+        }
+    )
+
+
+@router.get(
+    "/cache/promotion/status",
+    response_model=ApiResponse[dict],
+    status_code=status.HTTP_200_OK,
+    summary="Get promotion cache status",
+    description="Get current status and hit/miss statistics of the shared active promotion cache",
+)
+async def get_promotion_cache_status(current_user: dict = Depends(get_current_user)) -> ApiResponse[dict]:
+    """
+    Get the current status of the shared active promotion cache.
+
+    Returns:
+        Cache status including hit/miss and invalidation counters
+    """
+    tenant_id = current_user.get("tenant_id")
+
+    return ApiResponse(
+        success=True,
+        code=status.HTTP_200_OK,
+        message="Success to get promotion cache status",
+        data={
+            "cache_type": "promotion",
+            "tenant_id": tenant_id,
+            "statistics": promotion_cache.stats(),
+            "status": "active",
+        }
+    )
+
+
+@router.delete(
+    "/cache/promotion",
+    response_model=ApiResponse[dict],
+    status_code=status.HTTP_200_OK,
+    summary="Clear promotion cache",
+    description="Clear all entries from the shared active promotion cache for the tenant",
+)
+async def clear_promotion_cache(current_user: dict = Depends(get_current_user)) -> ApiResponse[dict]:
+    """
+    Clear active promotion cache entries for the authenticated user's tenant.
+
+    Returns:
+        Confirmation of cache clearing with details
+    """
+    tenant_id = current_user.get("tenant_id")
+    username = current_user.get("username")
+
+    promotion_cache.invalidate(tenant_id)
+    logger.info(f"Promotion cache cleared for tenant {tenant_id} by user: {username}")
+
+    return ApiResponse(
+        success=True,
+        code=status.HTTP_200_OK,
+        message="Success to clear promotion cache",
+        data={
+            "message": f"Promotion cache cleared successfully for tenant {tenant_id}",
+            "cache_type": "promotion",
+            "tenant_id": tenant_id,
+        }
+    )
+
+
+@router.get(
+    "/cache/settings/status",
+    response_model=ApiResponse[dict],
+    status_code=status.HTTP_200_OK,
+    summary="Get settings snapshot cache status",
+    description="Get current status and hit/miss statistics of the shared settings master snapshot cache",
+)
+async def get_settings_cache_status(current_user: dict = Depends(get_current_user)) -> ApiResponse[dict]:
+    """
+    Get the current status of the shared settings master snapshot cache.
+
+    Returns:
+        Cache status including hit/miss counters and the latest snapshot version
+    """
+    tenant_id = current_user.get("tenant_id")
+
+    return ApiResponse(
+        success=True,
+        code=status.HTTP_200_OK,
+        message="Success to get settings cache status",
+        data={
+            "cache_type": "settings_master",
+            "tenant_id": tenant_id,
+            "statistics": settings_snapshot_cache.stats(),
+            "status": "active",
+        }
+    )
+
+
+@router.delete(
+    "/cache/settings",
+    response_model=ApiResponse[dict],
+    status_code=status.HTTP_200_OK,
+    summary="Clear settings snapshot cache",
+    description="Drop the settings master snapshots of the tenant so that they are reloaded on the next request",
+)
+async def clear_settings_cache(current_user: dict = Depends(get_current_user)) -> ApiResponse[dict]:
+    """
+    Clear settings master snapshots for the authenticated user's tenant.
+
+    Returns:
+        Confirmation of cache clearing with details
+    """
+    tenant_id = current_user.get("tenant_id")
+    username = current_user.get("username")
+
+    settings_snapshot_cache.invalidate(tenant_id)
+    logger.info(f"Settings snapshot cache cleared for tenant {tenant_id} by user: {username}")
+
+    return ApiResponse(
+        success=True,
+        code=status.HTTP_200_OK,
+        message="Success to clear settings cache",
+        data={
+            "message": f"Settings snapshot cache cleared successfully for tenant {tenant_id}",
+            "cache_type": "settings_master",
+            "tenant_id": tenant_id,
+        }
+    )
+
+
+@router.post("/cache/master-data/events")
+async def handle_master_data_event(request: Request) -> dict:
+    """
+    Handle master data change events received via Dapr pub/sub.
+
+    This endpoint is called by Dapr when master-data publishes a message to the
+    'topic-master-data' topic after a promotion or a setting has been created, updated
+    or deleted. All cached promotions or settings snapshots of the tenant are dropped,
+    since the change may also affect stores and terminals other than the targeted ones.
+
+    Args:
+        request: The FastAPI request containing the pub/sub message
+
+    Returns:
+        dict: A status response for Dapr
+    """
+    message = await request.json()
+    data = message.get("data") or {}
+    tenant_id = data.get("tenant_id")
+    if not tenant_id:
+        logger.warning(f"Master data event without tenant_id dropped: {message}")
+        return {"status": "DROP"}
+
+    master_type = data.get("master_type", "promotion")
+    if master_type == "promotion":
+        promotion_cache.invalidate(tenant_id)
+        logger.info(
+            f"Promotion cache invalidated by event: tenant_id={tenant_id}, "
+            f"promotion_code={data.get('promotion_code')}, operation={data.get('operation')}"
+        )
+    elif master_type == "settings":
+        settings_snapshot_cache.invalidate(tenant_id)
+        logger.info(
+            f"Settings snapshot cache invalidated by event: tenant_id={tenant_id}, "
+            f"name={data.get('name')}, operation={data.get('operation')}"
+        )
+    else:
+        logger.debug(f"Master data event ignored: master_type={master_type}")
+    return {"status": "SUCCESS"}
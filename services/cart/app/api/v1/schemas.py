@@ -221,3 +221,22 @@ class DeliveryStatusUpdateResponse(BaseModel):
     service: str
     status: str
     success: bool
+
+
+class BulkDeliveryStatusUpdateRequest(BaseModel):
+    """
+    API model for bulk delivery status update requests.
+    Contains the delivery statuses of many events of one tenant, applied in the given order.
+    """
+
+    statuses: list[DeliveryStatusUpdateRequest]
+
+
+class BulkDeliveryStatusUpdateResponse(BaseModel):
+    """
+    API model for bulk delivery status update responses.
+    Returns the number of statuses requested and of delivery statuses found.
+    """
+
+    requested: int
+    matched: int
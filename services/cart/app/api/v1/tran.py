@@ -3,7 +3,6 @@ from fastapi import APIRouter, status, Depends, Query, Path, HTTPException
 from logging import getLogger
 import inspect
 
-from kugel_common.database import database as db_helper
 from kugel_common.schemas.api_response import ApiResponse
 from kugel_common.security import verify_pubsub_notification_auth
 from app.dependencies.terminal_cache_dependency import get_terminal_info_with_jwt_or_cache
@@ -11,14 +10,7 @@ from kugel_common.status_codes import StatusCodes
 from kugel_common.models.documents.terminal_info_document import TerminalInfoDocument
 
 from app.services.tran_service import TranService
-from app.models.repositories.terminal_counter_repository import (
-    TerminalCounterRepository,
-)
-from app.models.repositories.tranlog_repository import TranlogRepository
-from app.models.repositories.tranlog_delivery_status_repository import TranlogDeliveryStatusRepository
-from app.models.repositories.settings_master_web_repository import SettingsMasterWebRepository
-from app.models.repositories.payment_master_web_repository import PaymentMasterWebRepository
-from app.models.repositories.transaction_status_repository import TransactionStatusRepository
+from app.dependencies.cart_service_container import CartServiceContainer, get_service_container
 from app.api.v1.schemas import (
     Cart,
     TranLineItem,
@@ -30,9 +22,10 @@ from app.api.v1.schemas import (
     Tran,
     DeliveryStatusUpdateRequest,
     DeliveryStatusUpdateResponse,
+    BulkDeliveryStatusUpdateRequest,
+    BulkDeliveryStatusUpdateResponse,
 )
 from app.api.v1.schemas_transformer import SchemasTransformerV1
-from app.config.settings import settings
 from app.exceptions import InvalidRequestDataException, InternalErrorException
 
 # create a router instance
@@ -50,6 +43,7 @@ async def get_tran_service_for_pubsub_notification(
     store_code: str = Path(...),
     terminal_no: int = Path(...),
     auth_info: dict = Depends(verify_pubsub_notification_auth),
+    container: CartServiceContainer = Depends(get_service_container),
 ):
     """
     Dependency injection helper for transaction service for pub/sub notifications.
@@ -60,6 +54,7 @@ async def get_tran_service_for_pubsub_notification(
         store_code: The store code from the path
         terminal_no: The terminal number from the path
         auth_info: Authentication information from JWT or API key
+        container: Service container building the repositories and services
 
     Returns:
         Configured TranService instance
@@ -115,40 +110,12 @@ async def get_tran_service_for_pubsub_notification(
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Terminal not found: {terminal_id}")
 
     # Create TranService
-    db = await db_helper.get_db_async(f"{settings.DB_NAME_PREFIX}_{tenant_id}")
-    db_common = await db_helper.get_db_async(f"{settings.DB_NAME_PREFIX}_commons")
-
-    terminal_counter_repo = TerminalCounterRepository(db=db, terminal_info=terminal_info)
-    await terminal_counter_repo.initialize()
-    tranlog_repo = TranlogRepository(db=db, terminal_info=terminal_info)
-    await tranlog_repo.initialize()
-    tranlog_delivery_status_repo = TranlogDeliveryStatusRepository(db=db_common, terminal_info=terminal_info)
-    await tranlog_delivery_status_repo.initialize()
-    settings_master_repo = SettingsMasterWebRepository(
-        tenant_id=tenant_id,
-        store_code=terminal_info.store_code,
-        terminal_no=terminal_info.terminal_no,
-        terminal_info=terminal_info,
-    )
-    payment_master_repo = PaymentMasterWebRepository(tenant_id=tenant_id, terminal_info=terminal_info)
-    transaction_status_repo = TransactionStatusRepository(db=db, terminal_info=terminal_info)
-    await transaction_status_repo.initialize()
-
-    tran_service = TranService(
-        terminal_info=terminal_info,
-        terminal_counter_repo=terminal_counter_repo,
-        tranlog_repo=tranlog_repo,
-        tranlog_delivery_status_repo=tranlog_delivery_status_repo,
-        settings_master_repo=settings_master_repo,
-        payment_master_repo=payment_master_repo,
-        transaction_status_repo=transaction_status_repo,
-    )
-
-    return tran_service
+    return await container.create_tran_service_async(terminal_info)
 
 
 async def get_tran_service(
     terminal_info: TerminalInfoDocument = Depends(get_terminal_info_with_jwt_or_cache),
+    container: CartServiceContainer = Depends(get_service_container),
 ):
     """
     Dependency injection helper for transaction service.
@@ -156,43 +123,12 @@ async def get_tran_service(
 
     Args:
         terminal_info: Terminal information obtained from API key authentication
+        container: Service container building the repositories and services
 
     Returns:
         Configured TranService instance
     """
-    # db for tenant
-    tenant_id = terminal_info.tenant_id
-    db = await db_helper.get_db_async(f"{settings.DB_NAME_PREFIX}_{tenant_id}")
-    # db for all tenants
-    db_common = await db_helper.get_db_async(f"{settings.DB_NAME_PREFIX}_commons")  # ← 修正
-
-    terminal_counter_repo = TerminalCounterRepository(db=db, terminal_info=terminal_info)
-    await terminal_counter_repo.initialize()
-    tranlog_repo = TranlogRepository(db=db, terminal_info=terminal_info)
-    await tranlog_repo.initialize()
-    tranlog_delivery_status_repo = TranlogDeliveryStatusRepository(
-        db=db_common, terminal_info=terminal_info  # use common db
-    )
-    await tranlog_delivery_status_repo.initialize()
-    settings_master_repo = SettingsMasterWebRepository(
-        tenant_id=tenant_id,
-        store_code=terminal_info.store_code,
-        terminal_no=terminal_info.terminal_no,
-        terminal_info=terminal_info,
-    )
-    payment_master_repo = PaymentMasterWebRepository(tenant_id=tenant_id, terminal_info=terminal_info)
-    transaction_status_repo = TransactionStatusRepository(db=db, terminal_info=terminal_info)
-    await transaction_status_repo.initialize()
-
-    return TranService(
-        terminal_info=terminal_info,
-        terminal_counter_repo=terminal_counter_repo,
-        tranlog_repo=tranlog_repo,
-        tranlog_delivery_status_repo=tranlog_delivery_status_repo,
-        settings_master_repo=settings_master_repo,
-        payment_master_repo=payment_master_repo,
-        transaction_status_repo=transaction_status_repo,
-    )
+    return await container.create_tran_service_async(terminal_info)
 
 
 def parse_sort(sort: str = Query(default=None, description="?sort=field1:1,field2:-1")) -> list[tuple[str, int]]:
@@ -602,3 +538,70 @@ async def notify_delivery_status(
     )
 
     return response
+
+
+# notify delivery statuses in bulk
+@router.post(
+    "/tenants/{tenant_id}/delivery-status/bulk",
+    response_model=ApiResponse[BulkDeliveryStatusUpdateResponse],
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_400_BAD_REQUEST: StatusCodes.get(status.HTTP_400_BAD_REQUEST),
+        status.HTTP_401_UNAUTHORIZED: StatusCodes.get(status.HTTP_401_UNAUTHORIZED),
+        status.HTTP_403_FORBIDDEN: StatusCodes.get(status.HTTP_403_FORBIDDEN),
+        status.HTTP_422_UNPROCESSABLE_ENTITY: StatusCodes.get(status.HTTP_422_UNPROCESSABLE_ENTITY),
+        status.HTTP_500_INTERNAL_SERVER_ERROR: StatusCodes.get(status.HTTP_500_INTERNAL_SERVER_ERROR),
+    },
+)
+async def notify_delivery_status_bulk(
+    bulk_request: BulkDeliveryStatusUpdateRequest,
+    tenant_id: str = Path(...),
+    auth_info: dict = Depends(verify_pubsub_notification_auth),
+    container: CartServiceContainer = Depends(get_service_container),
+):
+    """
+    Notify the delivery statuses of many transactions at once.
+
+    Used by the receiving services to acknowledge the transaction logs in batches
+    instead of one request per transaction. All statuses are applied with one bulk write.
+
+    Args:
+        bulk_request: Delivery statuses with event ID, service, status, and optional message
+        tenant_id: The tenant ID in the path
+        auth_info: Authentication information from JWT or API key
+        container: Service container building the delivery status repository
+
+    Returns:
+        API response with the number of statuses requested and of delivery statuses found
+
+    Raises:
+        HTTPException: If the service token belongs to another tenant
+    """
+    logger.debug(f"notify_delivery_status_bulk: tenant_id->{tenant_id}, count->{len(bulk_request.statuses)}")
+
+    if auth_info.get("tenant_id") and auth_info.get("tenant_id") != tenant_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Tenant ID does not match the token")
+
+    repo = await container.create_tranlog_delivery_status_repository_async()
+    statuses = [
+        {
+            "event_id": delivery_status.event_id,
+            "service_name": delivery_status.service,
+            "status": delivery_status.status,
+            "message": delivery_status.message,
+        }
+        for delivery_status in bulk_request.statuses
+    ]
+    matched = await repo.bulk_update_service_status_async(tenant_id=tenant_id, statuses=statuses)
+    if matched < len(statuses):
+        logger.warning(f"Delivery status not found for {len(statuses) - matched} of {len(statuses)} events")
+
+    response = ApiResponse(
+        success=True,
+        code=status.HTTP_200_OK,
+        message="Success to update delivery statuses",
+        data=BulkDeliveryStatusUpdateResponse(requested=len(statuses), matched=matched).model_dump(),
+        operation=f"{inspect.currentframe().f_code.co_name}",
+    )
+
+    return response
@@ -11,6 +11,15 @@ class CartSettings(BaseSettings):
     # undelivered check failed period in minutes
     UNDELIVERED_CHECK_FAILED_PERIOD_IN_MINUTES: int = 15
 
+    # Republish settings
+    REPUBLISH_PAGE_SIZE: int = Field(
+        default=500, description="Number of undelivered tranlogs loaded from the database per page when republishing"
+    )
+    REPUBLISH_CONCURRENCY: int = Field(default=10, description="Maximum number of tranlogs republished concurrently")
+    REPUBLISH_RATE_PER_SECOND: float = Field(
+        default=200.0, description="Maximum number of tranlogs republished per second, 0 for no limit"
+    )
+
     # debug mode
     DEBUG: str = "false"
     # This port is used for debugging purposes
@@ -24,6 +33,53 @@ class CartSettings(BaseSettings):
     # Item master cache settings
     ITEM_CACHE_TTL_SECONDS: int = Field(default=300, description="Item cache TTL in seconds (default: 5 minutes)")
     USE_ITEM_CACHE: bool = Field(default=True, description="Use item cache to avoid redundant API/gRPC calls")
+    ITEM_CACHE_MAX_SIZE: int = Field(
+        default=10000, description="Maximum number of cached items per (tenant, store) before LRU eviction"
+    )
+
+    # Promotion cache settings
+    PROMOTION_CACHE_TTL_SECONDS: int = Field(
+        default=60, description="Age in seconds after which cached active promotions are refreshed in the background"
+    )
+    USE_PROMOTION_CACHE: bool = Field(default=True, description="Cache active promotions per store in-process")
+
+    # Settings master snapshot settings
+    SETTINGS_SNAPSHOT_TTL_SECONDS: int = Field(
+        default=60, description="Age in seconds after which a terminal's settings snapshot is refreshed in the background"
+    )
+    USE_SETTINGS_SNAPSHOT: bool = Field(
+        default=True, description="Resolve and parse the settings master once per terminal in-process for billing"
+    )
+
+    # Subtotal calculation settings
+    USE_INCREMENTAL_SUBTOTAL: bool = Field(
+        default=True, description="Recalculate only changed line items and tax codes on subtotal"
+    )
+    SUBTOTAL_CALC_STATE_MAX_CARTS: int = Field(
+        default=1000, description="Maximum number of carts whose subtotal calculation state is kept in-process"
+    )
+
+    # Cart state store settings
+    USE_SLIM_CART_STATE: bool = Field(
+        default=True, description="Store settings and tax masters by version key instead of embedding them in every cart write"
+    )
+    CART_MASTER_REFRESH_SECONDS: int = Field(
+        default=3600, description="Interval to re-save shared cart master data so it outlives the state store TTL"
+    )
+
+    # Counter settings
+    USE_COUNTER_BLOCKS: bool = Field(
+        default=False,
+        description="Reserve transaction and receipt numbers in blocks per terminal and hand them out in-process. "
+        "Numbers reserved but not used when the process stops are skipped, and with several replicas the numbers "
+        "of a terminal are unique but not in the order of the transactions",
+    )
+    COUNTER_BLOCK_SIZE: int = Field(default=20, description="Number of counter values reserved with one update")
+
+    # Dependency settings
+    USE_SERVICE_CONTAINER: bool = Field(
+        default=True, description="Reuse database handles and collections across requests when building cart services"
+    )
 
     # gRPC settings
     USE_GRPC: bool = Field(default=False, description="Use gRPC for master-data communication")
@@ -104,8 +104,8 @@ async def republish_undelivered_tranlog_async():
 
     logger.info("Start republishing undelivered tranlog messages...")
     try:
-        await tran_service.republish_undelivered_tranlog_async()
-        logger.info("Finished republishing undelivered tranlog messages.")
+        stats = await tran_service.republish_undelivered_tranlog_async()
+        logger.info(f"Finished republishing undelivered tranlog messages: {stats}")
     finally:
         # Always close the TranService to cleanup resources
         await tran_service.close()
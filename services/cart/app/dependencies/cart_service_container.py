@@ -0,0 +1,242 @@
+# Copyright 2025 masa@kugel  # # Licensed under the Apache License, Version 2.0 (the "License");  # you may not use this file except in compliance with the License.  # You may obtain a copy of the License at  # #     http://www.apache.org/licenses/LICENSE-2.0  # # Unless required by applicable law or agreed to in writing, software  # distributed under the License is distributed on an "AS IS" BASIS,  # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  # See the License for the specific language governing permissions and  # limitations under the License.
+
+"""
+Service container for the cart and transaction service dependencies.
+
+The container lives for the whole application and keeps the per-tenant database
+handles, MongoDB collections and the pubsub manager, so that building the services
+of a request only binds the repositories to the terminal of the request.
+"""
+
+from logging import getLogger
+from typing import AsyncIterator
+
+from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorCollection
+
+from kugel_common.database import database as db_helper
+from kugel_common.models.documents.terminal_info_document import TerminalInfoDocument
+from kugel_common.models.repositories.abstract_repository import AbstractRepository
+from kugel_common.models.repositories.store_info_web_repository import StoreInfoWebRepository
+from app.config.settings import settings
+from app.models.repositories.cart_repository import CartRepository
+from app.models.repositories.terminal_counter_repository import TerminalCounterRepository
+from app.models.repositories.tax_master_repository import TaxMasterRepository
+from app.models.repositories.tranlog_repository import TranlogRepository
+from app.models.repositories.tranlog_delivery_status_repository import TranlogDeliveryStatusRepository
+from app.models.repositories.transaction_status_repository import TransactionStatusRepository
+from app.models.repositories.item_master_repository_factory import create_item_master_repository
+from app.models.repositories.payment_master_web_repository import PaymentMasterWebRepository
+from app.models.repositories.settings_master_web_repository import SettingsMasterWebRepository
+from app.services.cart_service import CartService
+from app.services.tran_service import TranService
+from app.utils.pubsub_manager import PubsubManager
+
+logger = getLogger(__name__)
+
+
+class CartServiceContainer:
+    """
+    Container caching the objects shared by the cart and transaction services.
+
+    Only terminal-specific objects (repositories bound to the terminal, services and
+    their plugins) are created per request.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty container.
+        """
+        self._dbs: dict[str, AsyncIOMotorDatabase] = {}
+        self._collections: dict[tuple[str, str], AsyncIOMotorCollection] = {}
+        self._pubsub_manager: PubsubManager = None
+
+    async def get_db_async(self, db_name: str) -> AsyncIOMotorDatabase:
+        """
+        Get the database handle, reusing it while the MongoDB client is unchanged.
+
+        Args:
+            db_name: Name of the database
+
+        Returns:
+            AsyncIOMotorDatabase: The database handle
+        """
+        db = self._dbs.get(db_name)
+        if db is not None and db.client is db_helper.client:
+            return db
+
+        # First use, or the client has been reset after a connection error
+        db = await db_helper.get_db_async(db_name)
+        self._dbs[db_name] = db
+        for key in [key for key in self._collections.keys() if key[0] == db_name]:
+            del self._collections[key]
+        return db
+
+    def bind_collection(self, repo: AbstractRepository, db_name: str) -> AbstractRepository:
+        """
+        Attach the cached collection to a repository instead of calling initialize().
+
+        Args:
+            repo: The repository to bind
+            db_name: Name of the database the repository was created with
+
+        Returns:
+            AbstractRepository: The repository with its collection set
+        """
+        key = (db_name, repo.collection_name)
+        collection = self._collections.get(key)
+        if collection is None:
+            collection = repo.db.get_collection(repo.collection_name)
+            self._collections[key] = collection
+        repo.dbcollection = collection
+        return repo
+
+    def get_pubsub_manager(self) -> PubsubManager:
+        """
+        Get the pubsub manager shared by the transaction services of this container.
+
+        Returns:
+            PubsubManager: The shared pubsub manager
+        """
+        if self._pubsub_manager is None:
+            self._pubsub_manager = PubsubManager()
+        return self._pubsub_manager
+
+    async def create_tran_service_async(self, terminal_info: TerminalInfoDocument) -> TranService:
+        """
+        Create a transaction service for the terminal of the request.
+
+        Args:
+            terminal_info: Terminal information for the request
+
+        Returns:
+            Fully configured TranService instance
+        """
+        tenant_id = terminal_info.tenant_id
+        # db for tenant
+        db_name = f"{settings.DB_NAME_PREFIX}_{tenant_id}"
+        db = await self.get_db_async(db_name)
+        # db for all tenant
+        db_common_name = f"{settings.DB_NAME_PREFIX}_commons"
+        db_common = await self.get_db_async(db_common_name)
+
+        terminal_counter_repo = self.bind_collection(
+            TerminalCounterRepository(db=db, terminal_info=terminal_info), db_name
+        )
+        tranlog_repo = self.bind_collection(TranlogRepository(db=db, terminal_info=terminal_info), db_name)
+        tranlog_delivery_status_repo = self.bind_collection(
+            TranlogDeliveryStatusRepository(db=db_common, terminal_info=terminal_info),  # use common db
+            db_common_name,
+        )
+        transaction_status_repo = self.bind_collection(
+            TransactionStatusRepository(db=db, terminal_info=terminal_info), db_name
+        )
+        settings_master_repo = SettingsMasterWebRepository(
+            tenant_id=tenant_id,
+            store_code=terminal_info.store_code,
+            terminal_no=terminal_info.terminal_no,
+            terminal_info=terminal_info,
+        )
+        payment_master_repo = PaymentMasterWebRepository(tenant_id=tenant_id, terminal_info=terminal_info)
+
+        return TranService(
+            terminal_info=terminal_info,
+            terminal_counter_repo=terminal_counter_repo,
+            tranlog_repo=tranlog_repo,
+            tranlog_delivery_status_repo=tranlog_delivery_status_repo,
+            settings_master_repo=settings_master_repo,
+            payment_master_repo=payment_master_repo,
+            transaction_status_repo=transaction_status_repo,
+            pubsub_manager=self.get_pubsub_manager(),
+        )
+
+    async def create_tranlog_delivery_status_repository_async(self) -> TranlogDeliveryStatusRepository:
+        """
+        Create a delivery status repository that is not bound to a terminal,
+        for the bulk delivery status notifications of the receiving services.
+
+        Returns:
+            TranlogDeliveryStatusRepository: Repository on the common database
+        """
+        db_common_name = f"{settings.DB_NAME_PREFIX}_commons"
+        db_common = await self.get_db_async(db_common_name)
+        return self.bind_collection(
+            TranlogDeliveryStatusRepository(db=db_common, terminal_info=None), db_common_name
+        )
+
+    async def create_cart_service_async(self, terminal_info: TerminalInfoDocument, cart_id: str = None) -> CartService:
+        """
+        Create a cart service for the terminal of the request.
+
+        Args:
+            terminal_info: Terminal information for the request
+            cart_id: Optional cart identifier
+
+        Returns:
+            Fully configured CartService instance
+        """
+        tenant_id = terminal_info.tenant_id
+        db = await self.get_db_async(f"{settings.DB_NAME_PREFIX}_{tenant_id}")
+        tran_service = await self.create_tran_service_async(terminal_info)
+
+        cart_repo = CartRepository(db=db, terminal_info=terminal_info)
+        tax_master_repo = TaxMasterRepository(db=db, terminal_info=terminal_info)
+        item_master_repo = create_item_master_repository(
+            tenant_id=tenant_id,
+            store_code=terminal_info.store_code,
+            terminal_info=terminal_info,
+        )
+        store_info_repo = StoreInfoWebRepository(tenant_id=tenant_id, terminal_info=terminal_info)
+
+        # repositories used by both services
+        return CartService(
+            terminal_info=terminal_info,
+            cart_repo=cart_repo,
+            terminal_counter_repo=tran_service.terminal_counter_repository,
+            settings_master_repo=tran_service.settings_master_repo,
+            store_info_repo=store_info_repo,
+            tax_master_repo=tax_master_repo,
+            item_master_repo=item_master_repo,
+            payment_master_repo=tran_service.payment_master_repo,
+            tran_service=tran_service,
+            cart_id=cart_id,
+        )
+
+    async def close_async(self) -> None:
+        """
+        Close the shared pubsub manager and drop all cached objects.
+        """
+        if self._pubsub_manager is not None:
+            await self._pubsub_manager.close()
+            self._pubsub_manager = None
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Drop all cached database handles and collections.
+        """
+        self._dbs.clear()
+        self._collections.clear()
+
+
+# Create a singleton container shared by all cart requests
+cart_service_container = CartServiceContainer()
+
+
+async def get_service_container() -> AsyncIterator[CartServiceContainer]:
+    """
+    Dependency providing the container used to build the services of a request.
+
+    Yields:
+        The shared container, or a new request-scoped container if USE_SERVICE_CONTAINER is disabled.
+        A request-scoped container is closed after the request, together with its pubsub manager.
+    """
+    if settings.USE_SERVICE_CONTAINER:
+        yield cart_service_container
+        return
+
+    # every request looks up the databases and collections and creates a pubsub manager again
+    container = CartServiceContainer()
+    try:
+        yield container
+    finally:
+        await container.close_async()
@@ -2,7 +2,7 @@
 Terminal info cache dependency for cart service.
 """
 
-from fastapi import Depends, HTTPException, Query, Security, status
+from fastapi import Depends, HTTPException, Query, Request, Security, status
 from typing import Optional, List
 from logging import getLogger
 
@@ -12,6 +12,7 @@ from kugel_common.security import (
     get_terminal_info_from_terminal_service,
     verify_terminal_token,
     terminal_claims_to_terminal_info,
+    set_request_terminal_info,
 )
 from kugel_common.models.documents.terminal_info_document import TerminalInfoDocument
 from app.utils.terminal_cache import TerminalInfoCache
@@ -62,6 +63,7 @@ async def get_terminal_info_with_jwt_or_cache(
     terminal_id: Optional[str] = Query(None),
     api_key: Optional[str] = Security(api_key_header),
     token: Optional[str] = Depends(oauth2_scheme),
+    request: Request = None,
 ) -> TerminalInfoDocument:
     """
     FastAPI dependency that retrieves terminal info from JWT claims or cache.
@@ -77,6 +79,8 @@ async def get_terminal_info_with_jwt_or_cache(
         terminal_id: Optional terminal ID from query parameter (legacy flow)
         api_key: Optional API key from header (legacy flow)
         token: Optional Bearer token from Authorization header
+        request: The request, injected by FastAPI. Terminal information resolved by API key
+            is stored on it for the request logging middleware.
 
     Returns:
         TerminalInfoDocument containing the terminal information
@@ -95,7 +99,9 @@ async def get_terminal_info_with_jwt_or_cache(
 
     # Priority 2: Legacy API key + cache flow
     if terminal_id and api_key:
-        return await get_terminal_info_with_cache(terminal_id, api_key)
+        terminal_info = await get_terminal_info_with_cache(terminal_id, api_key)
+        set_request_terminal_info(request, terminal_info)
+        return terminal_info
 
     # No valid authentication
     raise HTTPException(
@@ -16,6 +16,7 @@ logger_request = getLogger("requestLogger")
 # Import the required application modules after the logger is configured
 from kugel_common.database import database as db_helper
 from kugel_common.middleware.log_requests import log_requests
+from kugel_common.utils.request_log_writer import request_log_writer
 from kugel_common.exceptions import register_exception_handlers
 from kugel_common.schemas.health import HealthCheckResponse, HealthStatus, ComponentHealth
 from kugel_common.utils.health_check import HealthChecker
@@ -65,6 +66,24 @@ app.middleware("http")(log_requests("cart"))
 register_exception_handlers(app)
 
 
+# Define Dapr pub/sub subscription endpoints  # This tells Dapr which topics to subscribe to and which routes to invoke when messages arrive
+@app.get("/dapr/subscribe")
+def subscribe_topics():
+    """
+    Define Dapr pub/sub subscriptions for this service.
+
+    The cart service subscribes to master data change events to invalidate
+    the in-process promotion cache and settings snapshots when promotions or settings
+    are changed in master-data.
+
+    Returns:
+        list: List of subscription configurations with pubsubname, topic, and route
+    """
+    return [
+        {"pubsubname": "pubsub-master-data", "topic": "topic-master-data", "route": "/api/v1/cache/master-data/events"},
+    ]
+
+
 @app.get("/")
 async def root():
     """
@@ -169,6 +188,9 @@ async def close_event():
     """
     logger.info("closing the application")
 
+    # Write the queued request logs before the database connection is closed
+    await request_log_writer.close_async()
+
     logger.info("Closing the database connection")
     await db_helper.close_client_async()
 
@@ -193,6 +215,12 @@ async def close_event():
 
     await close_master_data_grpc_channels()
 
+    # Close the shared service container (pubsub manager, cached database handles)
+    logger.info("Closing the service container")
+    from app.dependencies.cart_service_container import cart_service_container
+
+    await cart_service_container.close_async()
+
     # add shutdown tasks here
     logger.info("Application closed")
 
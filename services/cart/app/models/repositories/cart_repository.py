@@ -19,9 +19,13 @@ from app.models.documents.item_master_document import ItemMasterDocument
 from app.config.settings import settings
 from app.exceptions import NotFoundException, CannotCreateException, UpdateNotWorkException, CannotDeleteException
 from app.utils.dapr_statestore_session_helper import get_dapr_statestore_session
+from app.utils.cart_master_cache import cart_master_cache
 
 logger = getLogger(__name__)
 
+# Version of the slim cart state format (master data stored by reference)
+CART_STATE_FORMAT_VERSION = 2
+
 
 class CartRepository(AbstractRepository[CartDocument]):
     """
@@ -243,7 +247,10 @@ class CartRepository(AbstractRepository[CartDocument]):
             CartCannotCreateException is raised if there is an error when creating the cart
             UpdateNotWorkException is raised if there is an error when updating the cart
         """
-        cart_data = cart.model_dump()
+        if settings.USE_SLIM_CART_STATE:
+            cart_data = await self.__to_slim_cart_data_async(cart)
+        else:
+            cart_data = cart.model_dump()
         state_post_data = [{"key": cart.cart_id, "value": cart_data}]
         logger.debug(f"State post data: {state_post_data}")
 
@@ -283,10 +290,136 @@ class CartRepository(AbstractRepository[CartDocument]):
                 raise NotFoundException(message, self.collection_name, cart_id, logger)
             cart_data = await response.json()
             logger.debug(f"Cart data: {cart_data}")
+            if cart_data.get("format_version") == CART_STATE_FORMAT_VERSION:
+                cart_data = await self.__from_slim_cart_data_async(cart_data)
             cart_doc = CartDocument(**cart_data)
             cart_doc.staff = CartDocument.Staff(id=self.terminal_info.staff.id, name=self.terminal_info.staff.name)
             return cart_doc
 
+    async def __to_slim_cart_data_async(self, cart: CartDocument) -> dict:
+        """
+        Convert the cart to the slim state store format.
+
+        Settings and tax masters are replaced by version keys pointing to shared
+        per-store entries. Item masters stay embedded in the cart, because the item
+        list changes with every scan and a versioned copy would be written each time.
+
+        args:
+            cart: CartDocument to convert
+        return:
+            dict to be stored in the state store
+        """
+        cart_data = cart.model_dump(exclude={"masters": {"settings", "taxes"}})
+        masters = cart.masters or CartDocument.ReferenceMasters()
+        cart_data["format_version"] = CART_STATE_FORMAT_VERSION
+        cart_data["masters_ref"] = {
+            "settings": await self.__save_masters_async(
+                cart, "settings", [doc.model_dump() for doc in masters.settings or []]
+            ),
+            "taxes": await self.__save_masters_async(cart, "taxes", [doc.model_dump() for doc in masters.taxes or []]),
+        }
+        return cart_data
+
+    async def __from_slim_cart_data_async(self, cart_data: dict) -> dict:
+        """
+        Rehydrate master data of a cart stored in the slim state store format.
+
+        args:
+            cart_data: dict read from the state store
+        return:
+            dict that can be used to construct CartDocument
+        exceptions:
+            NotFoundException is raised if the settings master entry is not found
+        """
+        tenant_id = cart_data.get("tenant_id")
+        store_code = cart_data.get("store_code")
+        masters_ref = cart_data.pop("masters_ref", None) or {}
+        item_master = (cart_data.get("masters") or {}).get("items") or []
+        cart_data.pop("format_version", None)
+
+        settings_master = await self.__get_masters_async(tenant_id, store_code, masters_ref.get("settings"))
+        if settings_master is None:
+            message = f"settings master not found. key->{masters_ref.get('settings')}"
+            raise NotFoundException(message, self.collection_name, cart_data.get("cart_id"), logger)
+        tax_master = await self.__get_masters_async(tenant_id, store_code, masters_ref.get("taxes"))
+        if tax_master is None:
+            # tax master is static configuration, reload it from settings
+            logger.warning(f"Tax master not found for key {masters_ref.get('taxes')}, reloading it from settings")
+            tax_master = [TaxMasterDocument(**tax).model_dump() for tax in settings.TAX_MASTER or []]
+
+        cart_data["masters"] = {"settings": settings_master, "taxes": tax_master, "items": item_master}
+        return cart_data
+
+    async def __save_masters_async(self, cart: CartDocument, kind: str, documents: list[dict]) -> str:
+        """
+        Save a master data list to the state store under its version key.
+
+        The list is only written when this process has not saved the version recently,
+        so carts sharing the same master data do not rewrite it.
+
+        args:
+            cart: CartDocument the master data belongs to
+            kind: Kind of master data ("settings" or "taxes")
+            documents: Master data documents as dictionaries
+        return:
+            str which is the version key
+        exceptions:
+            UpdateNotWorkException is raised if the master data cannot be saved
+        """
+        key = cart_master_cache.make_key(kind, documents)
+        if not cart_master_cache.needs_save(cart.tenant_id, cart.store_code, key):
+            return key
+
+        state_key = self.__get_masters_state_key(cart.tenant_id, cart.store_code, key)
+        state_post_data = [{"key": state_key, "value": documents}]
+        session = await get_dapr_statestore_session()
+        async with session.post(self.base_url_cartstore, json=state_post_data) as response:
+            if response.status != 204:
+                message = f"Failed to cache cart masters. key->{key}"
+                raise UpdateNotWorkException(message, self.collection_name, cart.cart_id, logger)
+        cart_master_cache.set(cart.tenant_id, cart.store_code, key, documents)
+        logger.debug(f"Cart masters cached: key->{key}")
+        return key
+
+    async def __get_masters_async(self, tenant_id: str, store_code: str, key: str) -> list[dict]:
+        """
+        Get a master data list by version key from the local cache or the state store.
+
+        args:
+            tenant_id: str
+            store_code: str
+            key: str which is the version key
+        return:
+            list of master data documents as dictionaries, None if not found
+        """
+        if key is None:
+            return None
+        documents = cart_master_cache.get(tenant_id, store_code, key)
+        if documents is not None:
+            return documents
+
+        session = await get_dapr_statestore_session()
+        async with session.get(
+            f"{self.base_url_cartstore}/{self.__get_masters_state_key(tenant_id, store_code, key)}"
+        ) as response:
+            if response.status != 200:
+                return None
+            documents = await response.json()
+        cart_master_cache.set(tenant_id, store_code, key, documents, saved=False)
+        return documents
+
+    def __get_masters_state_key(self, tenant_id: str, store_code: str, key: str) -> str:
+        """
+        This is the get_masters_state_key method
+        args:
+            tenant_id: str
+            store_code: str
+            key: str which is the version key
+        return:
+            str which is the state store key of the shared master data
+        """
+        return f"cart_masters_{tenant_id}_{store_code}_{key}"
+
     async def __delete_cached_cart_async(self, cart_id: str) -> None:
         """
         Delete the cart from Dapr state store cache.
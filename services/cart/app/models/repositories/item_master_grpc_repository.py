@@ -21,12 +21,13 @@ Maintains compatibility with HTTP-based repository interface.
 import grpc
 import time
 from datetime import datetime
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 from kugel_common.grpc import item_service_pb2, item_service_pb2_grpc
 from kugel_common.exceptions import RepositoryException, NotFoundException
 from kugel_common.models.documents.terminal_info_document import TerminalInfoDocument
 from app.models.documents.item_master_document import ItemMasterDocument
 from app.config.settings_cart import cart_settings
+from app.utils.item_master_cache import item_master_cache
 from app.utils.grpc_channel_helper import get_master_data_grpc_stub
 from logging import getLogger
 
@@ -63,12 +64,11 @@ class ItemMasterGrpcRepository:
         self.tenant_id = tenant_id
         self.store_code = store_code
         self.terminal_info = terminal_info
-        # Cache stores (ItemMasterDocument, timestamp) tuples
-        self._item_cache: List[Tuple[ItemMasterDocument, float]] = []
+        # Items used by this cart: item_code -> (ItemMasterDocument, timestamp)
+        self._item_cache: Dict[str, Tuple[ItemMasterDocument, float]] = {}
         # Initialize cache with pre-loaded documents if provided
         if item_master_documents:
-            current_time = time.time()
-            self._item_cache = [(doc, current_time) for doc in item_master_documents]
+            self.set_item_master_documents(item_master_documents)
 
     def set_item_master_documents(self, item_master_documents: list):
         """
@@ -78,7 +78,7 @@ class ItemMasterGrpcRepository:
             item_master_documents: List of item master documents to cache
         """
         current_time = time.time()
-        self._item_cache = [(doc, current_time) for doc in item_master_documents]
+        self._item_cache = {doc.item_code: (doc, current_time) for doc in item_master_documents}
 
     @property
     def item_master_documents(self) -> List[ItemMasterDocument]:
@@ -88,7 +88,7 @@ class ItemMasterGrpcRepository:
         Returns:
             List of ItemMasterDocument objects (without timestamps)
         """
-        return [doc for doc, _ in self._item_cache]
+        return [doc for doc, _ in self._item_cache.values()]
 
     @item_master_documents.setter
     def item_master_documents(self, documents: list):
@@ -101,6 +101,63 @@ class ItemMasterGrpcRepository:
         if documents:
             self.set_item_master_documents(documents)
 
+    def _get_cached_item(self, item_code: str) -> Optional[ItemMasterDocument]:
+        """
+        Look up an item in the repository cache, then in the process-wide shared cache.
+
+        Items found in the shared cache are also recorded in the repository cache
+        so that they are persisted with the cart's master data.
+
+        Args:
+            item_code: The code of the item to look up
+
+        Returns:
+            ItemMasterDocument if cached and not expired, None otherwise
+        """
+        entry = self._item_cache.get(item_code)
+        if entry is not None:
+            doc, ts = entry
+            if time.time() - ts < cart_settings.ITEM_CACHE_TTL_SECONDS:
+                return doc
+            # Remove expired entry
+            del self._item_cache[item_code]
+
+        doc = item_master_cache.get(self.tenant_id, self.store_code, item_code)
+        if doc is not None:
+            self._item_cache[item_code] = (doc, time.time())
+        return doc
+
+    def _add_to_cache(self, item: ItemMasterDocument) -> None:
+        """
+        Add a fetched item to the repository cache and to the process-wide shared cache.
+
+        Args:
+            item: The item master document to cache
+        """
+        self._item_cache[item.item_code] = (item, time.time())
+        item_master_cache.set(self.tenant_id, self.store_code, item)
+
+    def _to_item_master_document(self, response) -> ItemMasterDocument:
+        """
+        Convert an ItemDetailResponse message to ItemMasterDocument.
+
+        Args:
+            response: The gRPC ItemDetailResponse message
+
+        Returns:
+            ItemMasterDocument built from the response
+        """
+        return ItemMasterDocument(
+            tenant_id=self.tenant_id,
+            store_code=self.store_code,
+            item_code=response.item_code,
+            description=response.item_name,
+            unit_price=float(response.price),
+            tax_code=response.tax_code,  # Use tax_code field instead of tax_rate
+            category_code=response.category_code,
+            is_deleted=not response.is_active,
+        )
+
     async def get_item_by_code_async(self, item_code: str) -> ItemMasterDocument:
         """
         Get an item by its code from cache or via gRPC.
@@ -120,20 +177,12 @@ class ItemMasterGrpcRepository:
         """
         # Check cache only if caching is enabled
         if cart_settings.USE_ITEM_CACHE:
-            current_time = time.time()
-            # Remove expired entries and find the requested item
-            self._item_cache = [
-                (doc, ts) for doc, ts in self._item_cache
-                if current_time - ts < cart_settings.ITEM_CACHE_TTL_SECONDS
-            ]
-
-            # Search for item in cache
-            for doc, ts in self._item_cache:
-                if doc.item_code == item_code:
-                    logger.info(
-                        f"ItemMasterGrpcRepository.get_item_by_code: item_code->{item_code} found in cache"
-                    )
-                    return doc
+            cached_item = self._get_cached_item(item_code)
+            if cached_item is not None:
+                logger.info(
+                    f"ItemMasterGrpcRepository.get_item_by_code: item_code->{item_code} found in cache"
+                )
+                return cached_item
 
         # Fetch via gRPC
         try:
@@ -162,20 +211,11 @@ class ItemMasterGrpcRepository:
                 )
 
             # Convert gRPC response to ItemMasterDocument
-            item = ItemMasterDocument(
-                tenant_id=self.tenant_id,
-                store_code=self.store_code,
-                item_code=response.item_code,
-                description=response.item_name,
-                unit_price=float(response.price),
-                tax_code=response.tax_code,  # Use tax_code field instead of tax_rate
-                category_code=response.category_code,
-                is_deleted=not response.is_active,
-            )
+            item = self._to_item_master_document(response)
 
             # Add to cache only if caching is enabled
             if cart_settings.USE_ITEM_CACHE:
-                self._item_cache.append((item, time.time()))
+                self._add_to_cache(item)
                 logger.debug(f"Added item {item_code} to cache via gRPC")
 
             logger.info(f"ItemMasterGrpcRepository.get_item_by_code: fetched item_code->{item_code} via gRPC")
@@ -207,3 +247,75 @@ class ItemMasterGrpcRepository:
                 logger=logger,
                 original_exception=e,
             )
+
+    async def get_items_by_codes_async(self, item_codes: list[str]) -> Dict[str, ItemMasterDocument]:
+        """
+        Get multiple items by their codes, serving cache hits locally and fetching all misses in one RPC.
+
+        Args:
+            item_codes: The codes of the items to retrieve
+
+        Returns:
+            Dict mapping item_code to ItemMasterDocument. Codes that could not be found are omitted.
+
+        Raises:
+            RepositoryException: If there's an error communicating via gRPC
+        """
+        items: Dict[str, ItemMasterDocument] = {}
+        missing_codes = []
+        for item_code in dict.fromkeys(item_codes):
+            cached_item = self._get_cached_item(item_code) if cart_settings.USE_ITEM_CACHE else None
+            if cached_item is not None:
+                items[item_code] = cached_item
+            else:
+                missing_codes.append(item_code)
+
+        logger.info(
+            f"ItemMasterGrpcRepository.get_items_by_codes: cache hits->{len(items)}, misses->{len(missing_codes)}"
+        )
+        if not missing_codes:
+            return items
+
+        try:
+            stub = await get_master_data_grpc_stub(self.tenant_id, self.store_code)
+
+            request = item_service_pb2.ItemDetailsRequest(
+                tenant_id=self.tenant_id,
+                store_code=self.store_code,
+                item_codes=missing_codes,
+                terminal_id=self.terminal_info.terminal_id
+            )
+
+            response = await stub.GetItemDetails(
+                request,
+                timeout=cart_settings.GRPC_TIMEOUT
+            )
+
+        except grpc.RpcError as e:
+            message = f"gRPC error for items {missing_codes}: {e.code()} - {e.details()}"
+            raise RepositoryException(
+                message=message,
+                collection_name="item grpc",
+                logger=logger,
+                original_exception=e,
+            )
+        except Exception as e:
+            message = f"Unexpected error fetching items {missing_codes}"
+            raise RepositoryException(
+                message=message,
+                collection_name="item grpc",
+                logger=logger,
+                original_exception=e,
+            )
+
+        for item_response in response.items:
+            item = self._to_item_master_document(item_response)
+            items[item.item_code] = item
+            if cart_settings.USE_ITEM_CACHE:
+                self._add_to_cache(item)
+
+        if response.not_found_item_codes:
+            logger.info(
+                f"ItemMasterGrpcRepository.get_items_by_codes: not found->{list(response.not_found_item_codes)}"
+            )
+        return items
@@ -5,8 +5,9 @@ from kugel_common.models.documents.terminal_info_document import TerminalInfoDoc
 from app.models.documents.item_master_document import ItemMasterDocument
 from app.config.settings import settings
 from app.config.settings_cart import cart_settings
+from app.utils.item_master_cache import item_master_cache
 import time
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from logging import getLogger
 
@@ -41,12 +42,11 @@ class ItemMasterWebRepository:
         self.tenant_id = tenant_id
         self.store_code = store_code
         self.terminal_info = terminal_info
-        # Cache stores (ItemMasterDocument, timestamp) tuples
-        self._item_cache: List[Tuple[ItemMasterDocument, float]] = []
+        # Items used by this cart: item_code -> (ItemMasterDocument, timestamp)
+        self._item_cache: Dict[str, Tuple[ItemMasterDocument, float]] = {}
         # Initialize cache with pre-loaded documents if provided
         if item_master_documents:
-            current_time = time.time()
-            self._item_cache = [(doc, current_time) for doc in item_master_documents]
+            self.set_item_master_documents(item_master_documents)
         self.base_url = settings.BASE_URL_MASTER_DATA
 
     def set_item_master_documents(self, item_master_documents: list):
@@ -57,7 +57,7 @@ class ItemMasterWebRepository:
             item_master_documents: List of item master documents to cache
         """
         current_time = time.time()
-        self._item_cache = [(doc, current_time) for doc in item_master_documents]
+        self._item_cache = {doc.item_code: (doc, current_time) for doc in item_master_documents}
 
     @property
     def item_master_documents(self) -> List[ItemMasterDocument]:
@@ -67,7 +67,7 @@ class ItemMasterWebRepository:
         Returns:
             List of ItemMasterDocument objects (without timestamps)
         """
-        return [doc for doc, _ in self._item_cache]
+        return [doc for doc, _ in self._item_cache.values()]
 
     @item_master_documents.setter
     def item_master_documents(self, documents: list):
@@ -80,6 +80,42 @@ class ItemMasterWebRepository:
         if documents:
             self.set_item_master_documents(documents)
 
+    def _get_cached_item(self, item_code: str) -> Optional[ItemMasterDocument]:
+        """
+        Look up an item in the repository cache, then in the process-wide shared cache.
+
+        Items found in the shared cache are also recorded in the repository cache
+        so that they are persisted with the cart's master data.
+
+        Args:
+            item_code: The code of the item to look up
+
+        Returns:
+            ItemMasterDocument if cached and not expired, None otherwise
+        """
+        entry = self._item_cache.get(item_code)
+        if entry is not None:
+            doc, ts = entry
+            if time.time() - ts < cart_settings.ITEM_CACHE_TTL_SECONDS:
+                return doc
+            # Remove expired entry
+            del self._item_cache[item_code]
+
+        doc = item_master_cache.get(self.tenant_id, self.store_code, item_code)
+        if doc is not None:
+            self._item_cache[item_code] = (doc, time.time())
+        return doc
+
+    def _add_to_cache(self, item: ItemMasterDocument) -> None:
+        """
+        Add a fetched item to the repository cache and to the process-wide shared cache.
+
+        Args:
+            item: The item master document to cache
+        """
+        self._item_cache[item.item_code] = (item, time.time())
+        item_master_cache.set(self.tenant_id, self.store_code, item)
+
     # get item
     async def get_item_by_code_async(self, item_code: str) -> ItemMasterDocument:
         """
@@ -100,20 +136,12 @@ class ItemMasterWebRepository:
         """
         # Check cache only if caching is enabled
         if cart_settings.USE_ITEM_CACHE:
-            current_time = time.time()
-            # Remove expired entries and find the requested item
-            self._item_cache = [
-                (doc, ts) for doc, ts in self._item_cache
-                if current_time - ts < cart_settings.ITEM_CACHE_TTL_SECONDS
-            ]
-
-            # Search for item in cache
-            for doc, ts in self._item_cache:
-                if doc.item_code == item_code:
-                    logger.info(
-                        f"ItemMasterRepository.get_item_by_code: item_code->{item_code} found in cache"
-                    )
-                    return doc
+            cached_item = self._get_cached_item(item_code)
+            if cached_item is not None:
+                logger.info(
+                    f"ItemMasterRepository.get_item_by_code: item_code->{item_code} found in cache"
+                )
+                return cached_item
 
         # Use pooled client for connection reuse (eliminates 50-100ms overhead per request)
         client = await get_pooled_client("master-data")
@@ -150,7 +178,65 @@ class ItemMasterWebRepository:
 
         # Add to cache only if caching is enabled
         if cart_settings.USE_ITEM_CACHE:
-            self._item_cache.append((item, time.time()))
+            self._add_to_cache(item)
             logger.debug(f"Added item {item_code} to cache")
 
         return item
+
+    async def get_items_by_codes_async(self, item_codes: list[str]) -> Dict[str, ItemMasterDocument]:
+        """
+        Get multiple items by their codes, serving cache hits locally and fetching all misses in one call.
+
+        Args:
+            item_codes: The codes of the items to retrieve
+
+        Returns:
+            Dict mapping item_code to ItemMasterDocument. Codes that could not be found are omitted.
+
+        Raises:
+            RepositoryException: If there's an error communicating with the API
+        """
+        items: Dict[str, ItemMasterDocument] = {}
+        missing_codes = []
+        for item_code in dict.fromkeys(item_codes):
+            cached_item = self._get_cached_item(item_code) if cart_settings.USE_ITEM_CACHE else None
+            if cached_item is not None:
+                items[item_code] = cached_item
+            else:
+                missing_codes.append(item_code)
+
+        logger.info(
+            f"ItemMasterRepository.get_items_by_codes: cache hits->{len(items)}, misses->{len(missing_codes)}"
+        )
+        if not missing_codes:
+            return items
+
+        client = await get_pooled_client("master-data")
+        jwt_token = getattr(self.terminal_info, "jwt_token", None)
+        if jwt_token:
+            headers = {"Authorization": f"Bearer {jwt_token}"}
+            params = {}
+        else:
+            headers = {"X-API-KEY": self.terminal_info.api_key}
+            params = {"terminal_id": self.terminal_info.terminal_id}
+        endpoint = f"/tenants/{self.tenant_id}/stores/{self.store_code}/items/details"
+
+        try:
+            response_data = await client.post(
+                endpoint, params=params, json={"itemCodes": missing_codes}, headers=headers
+            )
+        except Exception as e:
+            message = f"Request error for item codes {missing_codes}"
+            raise RepositoryException(
+                message=message, collection_name="item web", logger=logger, original_exception=e
+            )
+
+        logger.debug(f"response: {response_data}")
+
+        for item_data in response_data.get("data") or []:
+            item = ItemMasterDocument(**item_data)
+            items[item.item_code] = item
+            if cart_settings.USE_ITEM_CACHE:
+                self._add_to_cache(item)
+
+        return items
@@ -9,6 +9,9 @@ from app.config.settings import settings
 
 logger = getLogger(__name__)
 
+# Number of settings requested per page when loading all settings of a terminal
+SETTINGS_PAGE_SIZE = 100
+
 
 class SettingsMasterWebRepository:
     """
@@ -58,7 +61,8 @@ class SettingsMasterWebRepository:
         Retrieve all settings for the specified tenant, store, and terminal.
 
         Fetches all settings from the master data service that match the tenant, store,
-        and terminal criteria provided during initialization.
+        and terminal criteria provided during initialization, page by page until the
+        total count reported by the service has been read.
 
         Returns:
             list[SettingsMasterDocument]: A list of all matching settings
@@ -84,25 +88,39 @@ class SettingsMasterWebRepository:
             }
         endpoint = f"/tenants/{self.tenant_id}/settings"
 
-        try:
-            response_data = await client.get(endpoint, params=params, headers=headers)
-        except Exception as e:
-            if hasattr(e, "status_code") and e.status_code == 404:
-                message = f"settings not found: {e.status_code}"
-                logger.info(message)
-                response_data = {"success": False, "data": None}
-            else:
-                message = f"Request error: {e}"
-                raise RepositoryException(message, logger)
-
-        logger.debug(f"response: {response_data}")
-
-        if response_data.get("success") and response_data.get("data"):
-            self.settings_master_documents = [
-                SettingsMasterDocument(**setting) for setting in response_data.get("data")
-            ]
-        else:
-            self.settings_master_documents = []
+        setting_list = []
+        total_count = None
+        page = 1
+        while True:
+            page_params = {**params, "limit": SETTINGS_PAGE_SIZE, "page": page}
+            try:
+                response_data = await client.get(endpoint, params=page_params, headers=headers)
+            except Exception as e:
+                if hasattr(e, "status_code") and e.status_code == 404:
+                    message = f"settings not found: {e.status_code}"
+                    logger.info(message)
+                    response_data = {"success": False, "data": None}
+                else:
+                    message = f"Request error: {e}"
+                    raise RepositoryException(message, logger)
+
+            logger.debug(f"response: {response_data}")
+
+            if not (response_data.get("success") and response_data.get("data")):
+                break
+            page_data = response_data.get("data")
+            setting_list.extend(page_data)
+            total_count = (response_data.get("metadata") or {}).get("total")
+            if total_count is None or len(setting_list) >= total_count or len(page_data) < SETTINGS_PAGE_SIZE:
+                break
+            page += 1
+
+        if total_count is not None and len(setting_list) < total_count:
+            logger.warning(
+                f"Settings truncated for tenant {self.tenant_id}: read {len(setting_list)} of {total_count} settings"
+            )
+
+        self.settings_master_documents = [SettingsMasterDocument(**setting) for setting in setting_list]
         return self.settings_master_documents
 
     # get settings value by name
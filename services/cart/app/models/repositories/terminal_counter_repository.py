@@ -1,6 +1,7 @@
 # Copyright 2025 masa@kugel  # # Licensed under the Apache License, Version 2.0 (the "License");  # you may not use this file except in compliance with the License.  # You may obtain a copy of the License at  # #     http://www.apache.org/licenses/LICENSE-2.0  # # Unless required by applicable law or agreed to in writing, software  # distributed under the License is distributed on an "AS IS" BASIS,  # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  # See the License for the specific language governing permissions and  # limitations under the License.
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from logging import getLogger
+import asyncio
 import sys
 from pymongo import ReturnDocument
 
@@ -12,6 +13,11 @@ from app.config.settings import settings
 
 logger = getLogger(__name__)
 
+# Counter values reserved by reserve_count_block and not handed out yet, as [next value, last value],
+# by terminal ID, counter type, start value and end value. Shared by the repository instances of the process.
+_reserved_blocks: dict[tuple[str, str, int, int], list[int]] = {}
+_reserved_block_locks: dict[tuple[str, str, int, int], asyncio.Lock] = {}
+
 
 def make_terminal_id(tenant_id: str, store_code: str, terminal_no: int) -> str:
     """
@@ -73,10 +79,15 @@ class TerminalCounterRepository(AbstractRepository[TerminalCounterDocument]):
         Returns:
             int: The new counter value after incrementing/initialization/rollover
 
+        When USE_COUNTER_BLOCKS is enabled, the value is handed out from a block reserved
+        by reserve_count_block instead, see there for the gaps this causes.
+
         Raises:
             UpdateNotWorkException: If the atomic operation fails
         """
         logger.debug(f"numbering_count: countType->{countType}, start_value->{start_value}, end_value->{end_value}")
+        if settings.USE_COUNTER_BLOCKS and settings.COUNTER_BLOCK_SIZE > 1:
+            return await self.__numbering_count_from_block(countType, start_value, end_value)
 
         tenant_id = self.terminal_info.tenant_id
         store_code = self.terminal_info.store_code
@@ -138,3 +149,116 @@ class TerminalCounterRepository(AbstractRepository[TerminalCounterDocument]):
 
         new_count = result["count_dic"][countType]
         return new_count
+
+    async def reserve_count_block(
+        self, countType: str, block_size: int, start_value: int = 1, end_value: int = sys.maxsize
+    ) -> tuple[int, int]:
+        """
+        Reserve the next values of a counter for the current terminal in a single atomic operation.
+
+        The stored counter is advanced to the last value of the block, so the block is
+        the same as block_size calls of numbering_count. A block never crosses end_value:
+        it ends at end_value, and the next block starts again from start_value.
+
+        Gap policy: the values of a block that are not handed out before the process stops
+        are never used, so the numbers of a terminal can have gaps after a restart. With
+        several processes, each hands out its own block, so the numbers are unique (until
+        the rollover) but not in the order of the transactions.
+
+        Args:
+            countType: Type of counter to reserve (e.g., "receipt", "transaction")
+            block_size: Maximum number of values to reserve
+            start_value: Value to start from if counter doesn't exist (default: 1)
+            end_value: Maximum value before resetting to start_value (default: sys.maxsize)
+
+        Returns:
+            tuple[int, int]: The first and the last value of the block
+
+        Raises:
+            UpdateNotWorkException: If the atomic operation fails
+        """
+        tenant_id = self.terminal_info.tenant_id
+        store_code = self.terminal_info.store_code
+        terminal_no = self.terminal_info.terminal_no
+        terminal_id = make_terminal_id(tenant_id=tenant_id, store_code=store_code, terminal_no=terminal_no)
+
+        target_field = f"count_dic.{countType}"
+        first_block_last_value = min(start_value + block_size - 1, end_value)
+
+        if self.dbcollection is None:
+            await self.initialize()
+        try:
+            # Same stages as numbering_count, advancing the counter by a block instead of 1
+            before = await self.dbcollection.find_one_and_update(
+                filter={"terminal_id": terminal_id},
+                update=[
+                    {
+                        "$set": {
+                            "terminal_id": {"$ifNull": ["$terminal_id", terminal_id]},
+                            "shard_key": {"$ifNull": ["$shard_key", terminal_id]},
+                            "count_dic": {"$ifNull": ["$count_dic", {}]},
+                        }
+                    },
+                    {
+                        "$set": {
+                            target_field: {
+                                "$cond": {
+                                    # first access or rollover: the block starts from start_value
+                                    "if": {
+                                        "$or": [
+                                            {"$eq": [{"$type": f"${target_field}"}, "missing"]},
+                                            {"$gte": [f"${target_field}", end_value]},
+                                        ]
+                                    },
+                                    "then": first_block_last_value,
+                                    "else": {"$min": [{"$add": [f"${target_field}", block_size]}, end_value]},
+                                }
+                            }
+                        }
+                    },
+                ],
+                upsert=True,
+                return_document=ReturnDocument.BEFORE,  # the block is derived from the previous value
+                projection={target_field: 1, "_id": 0},
+            )
+        except Exception as e:
+            message = f"Failed to reserve counter block for countType={countType}, terminal_id={terminal_id}"
+            raise UpdateNotWorkException(message, self.collection_name, terminal_id, logger, e) from e
+
+        previous = (before or {}).get("count_dic", {}).get(countType)
+        if previous is None or previous >= end_value:
+            first, last = start_value, first_block_last_value
+        else:
+            first, last = previous + 1, min(previous + block_size, end_value)
+        logger.debug(f"reserve_count_block: countType->{countType}, terminal_id->{terminal_id}, block->{first}-{last}")
+        return first, last
+
+    async def __numbering_count_from_block(self, countType: str, start_value: int, end_value: int) -> int:
+        """
+        Hand out the next value of the block reserved in this process, reserving a new block when it is used up.
+
+        Args:
+            countType: Type of counter to increment
+            start_value: Value to start from if counter doesn't exist
+            end_value: Maximum value before resetting to start_value
+
+        Returns:
+            int: The counter value
+        """
+        terminal_id = make_terminal_id(
+            tenant_id=self.terminal_info.tenant_id,
+            store_code=self.terminal_info.store_code,
+            terminal_no=self.terminal_info.terminal_no,
+        )
+        key = (terminal_id, countType, start_value, end_value)
+        lock = _reserved_block_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            block = _reserved_blocks.get(key)
+            if block is None or block[0] > block[1]:
+                first, last = await self.reserve_count_block(
+                    countType, settings.COUNTER_BLOCK_SIZE, start_value=start_value, end_value=end_value
+                )
+                block = _reserved_blocks[key] = [first, last]
+            value = block[0]
+            block[0] += 1
+            return value
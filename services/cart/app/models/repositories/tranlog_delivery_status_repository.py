@@ -7,10 +7,12 @@ It handles storing, retrieving, and updating the delivery status of transaction
 """
 from logging import getLogger
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List
 from datetime import datetime, timedelta
+from pymongo import UpdateOne
 
 from kugel_common.utils.misc import get_app_time
+from kugel_common.exceptions import RepositoryException
 from kugel_common.models.repositories.abstract_repository import AbstractRepository
 from kugel_common.models.documents.terminal_info_document import TerminalInfoDocument
 from app.models.documents.tranlog_delivery_status_document import TranlogDeliveryStatus
@@ -19,6 +21,39 @@ from app.config.settings import settings
 logger = getLogger(__name__)
 
 
+def _all_services_in_status(status: str) -> dict:
+    """
+    Aggregation expression: True if all services of the document are in the given status.
+    """
+    return {
+        "$allElementsTrue": [{"$map": {"input": "$services", "as": "service", "in": {"$eq": ["$$service.status", status]}}}]
+    }
+
+
+def _any_service_in_status(status: str) -> dict:
+    """
+    Aggregation expression: True if any service of the document is in the given status.
+    """
+    return {"$in": [status, "$services.status"]}
+
+
+# Overall status derived from the service statuses, as in TranService.update_delivery_status_async
+# after update_service_status
+_OVERALL_STATUS_EXPRESSION = {
+    "$switch": {
+        "branches": [
+            {"case": _all_services_in_status("received"), "then": "delivered"},
+            {"case": _any_service_in_status("received"), "then": "partially_delivered"},
+            {"case": _all_services_in_status("failed"), "then": "failed"},
+            {"case": _any_service_in_status("failed"), "then": "partially_delivered"},
+            {"case": _all_services_in_status("delivered"), "then": "delivered"},
+            {"case": _any_service_in_status("pending"), "then": "published"},
+        ],
+        "default": "$status",
+    }
+}
+
+
 class TranlogDeliveryStatusRepository(AbstractRepository[TranlogDeliveryStatus]):
     """
     Transaction Log Delivery Status Repository
@@ -165,6 +200,48 @@ class TranlogDeliveryStatusRepository(AbstractRepository[TranlogDeliveryStatus])
         }
         return await self.get_list_async(filter_dict)
 
+    async def find_pending_deliveries_pages(
+        self, hours_ago: int = 24, page_size: int = 500
+    ) -> AsyncIterator[List[TranlogDeliveryStatus]]:
+        """
+        Find pending delivery statuses page by page
+
+        Same as find_pending_deliveries, but the documents are read in pages ordered by _id,
+        each page continuing after the last _id of the previous one, so that a large backlog
+        is never loaded at once.
+
+        Args:
+            hours_ago: How many hours back to search (default: 24 hours)
+            page_size: Maximum number of documents per page
+
+        Yields:
+            List[TranlogDeliveryStatus]: The pending delivery status documents of a page
+        """
+        if self.dbcollection is None:
+            await self.initialize()
+
+        time_threshold = get_app_time() - timedelta(hours=hours_ago)
+        filter_dict = {"published_at": {"$gte": time_threshold}, "status": {"$nin": ["delivered"]}}
+        last_id = None
+        while True:
+            page_filter = filter_dict if last_id is None else {**filter_dict, "_id": {"$gt": last_id}}
+            try:
+                docs = (
+                    await self.dbcollection.find(page_filter, session=self.session)
+                    .sort("_id", 1)
+                    .limit(page_size)
+                    .to_list(page_size)
+                )
+            except Exception as e:
+                message = f"Failed to find pending deliveries: filter->{page_filter}"
+                raise RepositoryException(message, self.collection_name, logger, e) from e
+            if not docs:
+                return
+            last_id = docs[-1]["_id"]
+            yield [TranlogDeliveryStatus(**doc) for doc in docs]
+            if len(docs) < page_size:
+                return
+
     async def update_service_status(
         self, event_id: str, service_name: str, status: str, update_time: datetime = None, message: str = None
     ) -> bool:
@@ -228,6 +305,105 @@ class TranlogDeliveryStatusRepository(AbstractRepository[TranlogDeliveryStatus])
             logger.error(f"Failed to update service status: {e}")
             return False
 
+    async def bulk_update_service_status_async(self, tenant_id: str, statuses: List[dict]) -> int:
+        """
+        Update the service statuses of many events with one bulk write
+
+        Each update sets the status of the service and derives the overall status
+        from the updated service statuses in the same operation. The updates are
+        applied in the given order.
+
+        Args:
+            tenant_id: Tenant ID the events belong to
+            statuses: List of dictionaries with event_id, service_name, status and optional message
+
+        Returns:
+            int: Number of delivery status documents found
+
+        Raises:
+            RepositoryException: If the bulk write fails
+        """
+        if not statuses:
+            return 0
+
+        now = get_app_time()
+        operations = []
+        for status in statuses:
+            service_update = {"status": {"$literal": status["status"]}, "update_time": now}
+            if status.get("message") is not None:
+                service_update["message"] = {"$literal": status["message"]}
+            pipeline = [
+                {
+                    "$set": {
+                        "services": {
+                            "$map": {
+                                "input": {"$ifNull": ["$services", []]},
+                                "as": "service",
+                                "in": {
+                                    "$cond": [
+                                        {"$eq": ["$$service.service_name", {"$literal": status["service_name"]}]},
+                                        {"$mergeObjects": ["$$service", service_update]},
+                                        "$$service",
+                                    ]
+                                },
+                            }
+                        },
+                        "last_updated_at": now,
+                    }
+                },
+                {"$set": {"status": _OVERALL_STATUS_EXPRESSION}},
+            ]
+            operations.append(UpdateOne({"event_id": status["event_id"], "tenant_id": tenant_id}, pipeline))
+
+        if self.dbcollection is None:
+            await self.initialize()
+
+        try:
+            result = await self.dbcollection.bulk_write(operations, ordered=True, session=self.session)
+        except Exception as e:
+            message = f"Failed to update {len(operations)} delivery statuses: {e}"
+            raise RepositoryException(message, self.collection_name, logger, e) from e
+        return result.matched_count
+
+    async def bulk_update_delivery_status_async(self, event_ids_by_status: dict[str, List[str]]) -> int:
+        """
+        Update the overall delivery status of many events, with one update per status
+
+        Events delivered in the meantime, e.g. by an acknowledgement received while they were
+        republished, are not set back to another status.
+
+        Args:
+            event_ids_by_status: Event IDs to update, grouped by their new status
+
+        Returns:
+            int: Number of delivery status documents found and not protected as delivered
+
+        Raises:
+            RepositoryException: If an update fails
+        """
+        if self.dbcollection is None:
+            await self.initialize()
+
+        now = get_app_time()
+        matched_count = 0
+        for status, event_ids in event_ids_by_status.items():
+            if not event_ids:
+                continue
+            filter_dict = {"event_id": {"$in": event_ids}}
+            if status != "delivered":
+                filter_dict["status"] = {"$ne": "delivered"}
+            try:
+                result = await self.dbcollection.update_many(
+                    filter_dict,
+                    {"$set": {"status": status, "last_updated_at": now}},
+                    session=self.session,
+                )
+            except Exception as e:
+                message = f"Failed to update {len(event_ids)} delivery statuses to {status}: {e}"
+                raise RepositoryException(message, self.collection_name, logger, e) from e
+            matched_count += result.matched_count
+        return matched_count
+
     async def update_delivery_status(self, event_id: str, status: str) -> bool:
         """
         Update overall delivery status
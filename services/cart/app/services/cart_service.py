@@ -40,6 +40,7 @@ from app.models.repositories.settings_master_web_repository import (
     SettingsMasterWebRepository,
 )
 from app.models.documents.cart_document import CartDocument
+from app.config.settings import settings
 from app.enums.terminal_status import TerminalStatus
 from app.services.cart_service_interface import ICartService
 from app.services.cart_state_manager import CartStateManager
@@ -48,11 +49,13 @@ from app.services.logics import calc_tax_logic
 from app.services.logics import add_discount_to_cart_logic
 from app.services.logics import calc_line_item_logic
 from app.services.logics import calc_subtotal_logic
+from app.services.logics.subtotal_calc_state import subtotal_calc_state_cache
 from app.services.strategies.payments.abstract_payment import AbstractPayment
 from app.services.strategies.sales_promo.abstract_sales_promo import AbstractSalesPromo
 from app.services.tran_service import TranService
 from app.enums.cart_status import CartStatus
 from app.utils.settings import get_setting_value
+from app.utils.settings_snapshot import get_setting_value_async
 
 
 # Define CartService class
@@ -295,7 +298,7 @@ class CartService(ICartService):
         """
         Add one or more items to the cart.
 
-        Retrieves item details from the item master and adds them to the cart.
+        Retrieves item details for all items from the item master in one batch and adds them to the cart.
 
         Args:
             add_item_list: List of items to add, each containing item_code, unit_price, and quantity
@@ -312,14 +315,17 @@ class CartService(ICartService):
         # Check if the event can be accepted in the current state
         self.state_manager.check_event_sequence(self)
 
+        # Get item master information for all items at once
+        items = await self.item_master_repo.get_items_by_codes_async(
+            [add_item["item_code"] for add_item in add_item_list]
+        )
+
         # Add items to cart
         for add_item in add_item_list:
-            try:
-                # Get item master information
-                item = await self.item_master_repo.get_item_by_code_async(add_item["item_code"])
-            except NotFoundException as e:
+            item = items.get(add_item["item_code"])
+            if item is None:
                 message = f"Item not found: item_code->{add_item['item_code']}"
-                raise ItemNotFoundException(message, logger, e) from e
+                raise ItemNotFoundException(message, logger)
 
             logger.info(f"item: {item}")
             cart_item = CartDocument.CartLineItem()
@@ -555,15 +561,18 @@ class CartService(ICartService):
         Returns:
             CartDocument: The cart document with updated totals
         """
+        # Only changed lines and tax codes are recalculated when incremental calculation is enabled
+        calc_state = subtotal_calc_state_cache.get(cart_doc.cart_id) if settings.USE_INCREMENTAL_SUBTOTAL else None
+
         # Phase 1: line-item level promotions (e.g., category discounts)
         cart_doc = await self._apply_sales_promotions_async(cart_doc, phase="line_item")
-        cart_doc = await calc_subtotal_logic.calc_subtotal_async(cart_doc, self.tax_master_repo)
+        cart_doc = await calc_subtotal_logic.calc_subtotal_async(cart_doc, self.tax_master_repo, calc_state)
 
         # Phase 2: subtotal level promotions (e.g., subtotal threshold discounts)
         # Only run if any plugins are registered for the subtotal phase
         if any(s.execution_phase == "subtotal" for s in self.sales_promo_strategies):
             cart_doc = await self._apply_sales_promotions_async(cart_doc, phase="subtotal")
-            cart_doc = await calc_subtotal_logic.calc_subtotal_async(cart_doc, self.tax_master_repo)
+            cart_doc = await calc_subtotal_logic.calc_subtotal_async(cart_doc, self.tax_master_repo, calc_state)
 
         return cart_doc
 
@@ -840,6 +849,7 @@ class CartService(ICartService):
         Raises:
             CartNotFoundException: If the cart cannot be found in the cache
         """
+        subtotal_calc_state_cache.remove(cart_id)
         try:
             await self.cart_repo.delete_cart_async(cart_id)
         except Exception as e:
@@ -867,6 +877,9 @@ class CartService(ICartService):
         Returns:
             Any: The setting value
         """
+        if settings.USE_SETTINGS_SNAPSHOT:
+            return await get_setting_value_async(self.settings_master_repo, self.terminal_info, name)
+
         try:
             setting_doc = await self.settings_master_repo.get_settings_value_by_name_async(name)
         except NotFoundException:
@@ -1,6 +1,10 @@
 # Copyright 2025 masa@kugel  # # Licensed under the Apache License, Version 2.0 (the "License");  # you may not use this file except in compliance with the License.  # You may obtain a copy of the License at  # #     http://www.apache.org/licenses/LICENSE-2.0  # # Unless required by applicable law or agreed to in writing, software  # distributed under the License is distributed on an "AS IS" BASIS,  # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  # See the License for the specific language governing permissions and  # limitations under the License.
 import json, importlib
 
+from kugel_common.utils.plugin_registry import plugin_registry
+
+from app.config.settings import settings
+
 
 class CartStrategyManager:
     """
@@ -11,16 +15,23 @@ class CartStrategyManager:
     instantiate strategy classes or functions based on the plugin configuration.
 
     The class supports both class-based strategies and function-based strategies.
+
+    With USE_PLUGIN_REGISTRY, the configuration file and the strategy classes are kept in
+    the process-wide plugin registry, so creating a manager per request does not read the
+    file nor import the modules again.
     """
 
     def __init__(self):
         """
         Initialize the strategy manager.
 
-        Loads the plugin configuration file.
+        Loads the plugin configuration file, or gets it from the plugin registry.
         """
         self.config_path = "app/services/strategies/plugins.json"
-        self.config = self.__load_config(self.config_path)
+        if settings.USE_PLUGIN_REGISTRY:
+            self.config = plugin_registry.get_config(self.config_path)
+        else:
+            self.config = self.__load_config(self.config_path)
 
     # Load the plugin configuration file
     def __load_config(self, path):
@@ -52,12 +63,8 @@ class CartStrategyManager:
         """
         strategies = []
         for strategy in self.config[strategy_name]:
-            module_name = strategy["module"]
-            module = importlib.import_module(module_name)
-
             if "class" in strategy:
-                class_name = strategy["class"]
-                strategy_class = getattr(module, class_name)
+                strategy_class = self.__resolve(strategy["module"], strategy["class"])
                 # Get constructor arguments
                 args = strategy.get("args", [])
                 kwargs = strategy.get("kwargs", {})
@@ -65,7 +72,40 @@ class CartStrategyManager:
                 strategy_instance = strategy_class(*args, **kwargs)
                 strategies.append(strategy_instance)
             elif "function" in strategy:
-                function_name = strategy["function"]
-                function = getattr(module, function_name)
+                function = self.__resolve(strategy["module"], strategy["function"])
                 strategies.append(function)
         return strategies
+
+    def load_shared_strategies(self, strategy_name: str):
+        """
+        Load a set of stateless strategy implementations shared by all requests.
+
+        The strategies are created once per version of the configuration file. They must
+        not keep any state of a request; use load_strategies for strategies configured
+        per request.
+
+        Args:
+            strategy_name: Name of the strategy group to load (e.g., "receipt_data_strategies")
+
+        Returns:
+            list: List of shared strategy objects or functions
+        """
+        if not settings.USE_PLUGIN_REGISTRY:
+            return self.load_strategies(strategy_name)
+        return plugin_registry.get_shared(self.config_path, strategy_name, lambda: self.load_strategies(strategy_name))
+
+    def __resolve(self, module_name: str, attr_name: str):
+        """
+        Get a strategy class or function, from the plugin registry if enabled.
+
+        Args:
+            module_name: Name of the strategy module
+            attr_name: Name of the class or function in the module
+
+        Returns:
+            The strategy class or function
+        """
+        if settings.USE_PLUGIN_REGISTRY:
+            return plugin_registry.resolve(self.config_path, module_name, attr_name)
+        module = importlib.import_module(module_name)
+        return getattr(module, attr_name)
@@ -1,13 +1,18 @@
 # Copyright 2025 masa@kugel  # # Licensed under the Apache License, Version 2.0 (the "License");  # you may not use this file except in compliance with the License.  # You may obtain a copy of the License at  # #     http://www.apache.org/licenses/LICENSE-2.0  # # Unless required by applicable law or agreed to in writing, software  # distributed under the License is distributed on an "AS IS" BASIS,  # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  # See the License for the specific language governing permissions and  # limitations under the License.
 
+from typing import Optional
+
 from kugel_common.enums import TaxType
 from app.models.documents.cart_document import CartDocument
 from app.models.repositories.tax_master_repository import TaxMasterRepository
 from app.services.logics import calc_line_item_logic
 from app.services.logics import calc_tax_logic
+from app.services.logics.subtotal_calc_state import SubtotalCalcState
 
 
-async def calc_subtotal_async(cart_doc: CartDocument, tax_master_repo: TaxMasterRepository) -> CartDocument:
+async def calc_subtotal_async(
+    cart_doc: CartDocument, tax_master_repo: TaxMasterRepository, calc_state: Optional[SubtotalCalcState] = None
+) -> CartDocument:
     """
     Calculate all cart totals including line items, taxes, and sales information.
 
@@ -19,9 +24,13 @@ async def calc_subtotal_async(cart_doc: CartDocument, tax_master_repo: TaxMaster
     The function ensures all cart amounts are correctly calculated and
     synchronized across the cart document structure.
 
+    When a calculation state is given, only line items and tax codes that changed since
+    the previous calculation are recalculated. The result is identical to a full recalculation.
+
     Args:
         cart_doc: The cart document to calculate totals for
         tax_master_repo: Repository for accessing tax master information
+        calc_state: Optional calculation state of the cart for incremental calculation
 
     Returns:
         CartDocument: The cart document with all totals calculated and updated
@@ -29,10 +38,17 @@ async def calc_subtotal_async(cart_doc: CartDocument, tax_master_repo: TaxMaster
     # Step 1: Recalculate amount for each line item
     for line_item in cart_doc.line_items:
         if not line_item.is_cancelled:
-            await calc_line_item_logic.calc_line_item_async(line_item)
+            if calc_state is None:
+                await calc_line_item_logic.calc_line_item_async(line_item)
+            elif calc_state.is_line_dirty(line_item):
+                await calc_line_item_logic.calc_line_item_async(line_item)
+                calc_state.mark_line_calculated(line_item)
 
     # Step 2: Calculate taxes (this modifies cart_doc.taxes)
-    cart_doc = await calc_tax_logic.calc_tax_async(cart_doc, tax_master_repo)
+    if calc_state is None:
+        cart_doc = await calc_tax_logic.calc_tax_async(cart_doc, tax_master_repo)
+    else:
+        cart_doc = await calc_tax_logic.calc_tax_incremental_async(cart_doc, tax_master_repo, calc_state)
 
     # Step 3: Update sales information from cart properties
     cart_doc = await update_sales_info_async(cart_doc)
@@ -2,7 +2,9 @@
 from kugel_common.enums import TaxType
 from kugel_common.enums import RoundMethod
 from app.models.documents.cart_document import CartDocument
+from app.models.documents.tax_master_document import TaxMasterDocument
 from app.models.repositories.tax_master_repository import TaxMasterRepository
+from app.services.logics.subtotal_calc_state import SubtotalCalcState
 from decimal import Decimal, ROUND_FLOOR, ROUND_HALF_UP, ROUND_CEILING
 import math
 
@@ -30,6 +32,68 @@ async def calc_tax_async(cart: CartDocument, tax_master_repo: TaxMasterRepositor
     return await __calc_tax(tax_master_repo, cart)
 
 
+async def calc_tax_incremental_async(
+    cart: CartDocument, tax_master_repo: TaxMasterRepository, calc_state: SubtotalCalcState
+) -> CartDocument:
+    """
+    Calculate tax amounts for all items in the cart, reusing unchanged results.
+
+    Produces the same tax entries as calc_tax_async. The target contribution of each line
+    item and the tax amount of each tax code are taken from the calculation state while
+    their inputs are unchanged, so only changed tax codes are recalculated.
+
+    Args:
+        cart: Cart document containing items to calculate taxes for
+        tax_master_repo: Repository for accessing tax master information
+        calc_state: Calculation state of the cart
+
+    Returns:
+        CartDocument: The updated cart document with calculated tax amounts
+    """
+    # Group target contributions by tax code in order of first appearance
+    groups: dict[str, tuple[list[float], list[int]]] = {}
+    for line_item in cart.line_items:
+        if line_item.is_cancelled:
+            continue
+        amounts, quantities = groups.setdefault(line_item.tax_code, ([], []))
+        amounts.append(calc_state.get_tax_contribution(line_item))
+        quantities.append(line_item.quantity)
+
+    cart.taxes = []
+    for tax_code, (amounts, quantities) in groups.items():
+        new_tax = CartDocument.Tax()
+        new_tax.tax_no = len(cart.taxes) + 1
+        new_tax.tax_code = tax_code
+        new_tax.tax_amount = 0.0
+        # Accumulate in line order, exactly as __set_target_amount_for_tax_code does
+        new_tax.target_amount = amounts[0]
+        for amount in amounts[1:]:
+            new_tax.target_amount += amount
+        new_tax.target_quantity = quantities[0]
+        for quantity in quantities[1:]:
+            new_tax.target_quantity += quantity
+
+        tax_master = await tax_master_repo.get_tax_by_code(tax_code)
+        key = (
+            tuple(amounts),
+            tuple(quantities),
+            tax_master.tax_type,
+            tax_master.tax_name,
+            tax_master.rate,
+            tax_master.round_method,
+            tax_master.round_digit,
+        )
+        cached = calc_state.get_tax(tax_code, key)
+        if cached is None:
+            __apply_tax_master(tax_master, new_tax)
+            calc_state.set_tax(tax_code, key, new_tax)
+        else:
+            new_tax.tax_amount, new_tax.tax_type, new_tax.tax_name = cached
+        cart.taxes.append(new_tax)
+
+    return cart
+
+
 async def __set_target_amount_for_tax_code(cart: CartDocument) -> CartDocument:
     """
     Set target amounts for tax calculation by tax code.
@@ -95,34 +159,50 @@ async def __calc_tax(tax_master_repo: TaxMasterRepository, cart: CartDocument) -
     for tax in cart.taxes:
         # Get tax master information for this tax code
         tax_master = await tax_master_repo.get_tax_by_code(tax.tax_code)
-        tax.tax_name = tax_master.tax_name
-
-        # Calculate tax amount based on tax type
-        match tax_master.tax_type:
-            case TaxType.External.value:
-                # External tax: Simple percentage of target amount
-                tax.tax_amount = float(Decimal(tax.target_amount) * Decimal(tax_master.rate) / Decimal(100))
-                tax.tax_type = TaxType.External.value
-            case TaxType.Internal.value:
-                # Internal tax: Extract tax amount from target amount (target already includes tax)
-                tax.tax_amount = float(
-                    Decimal(tax.target_amount)
-                    / (Decimal(1) + Decimal(tax_master.rate) / Decimal(100))
-                    * Decimal(tax_master.rate)
-                    / Decimal(100)
-                )
-                tax.tax_type = TaxType.Internal.value
-            case TaxType.Exempt.value:
-                # Tax exempt: No tax
-                tax.tax_amount = 0.0
-                tax.tax_type = TaxType.Exempt.value
-
-        # Apply rounding method
-        tax.tax_amount = float(__round(tax_master.round_method, Decimal(tax.tax_amount), tax_master.round_digit))
+        __apply_tax_master(tax_master, tax)
 
     return cart
 
 
+def __apply_tax_master(tax_master: TaxMasterDocument, tax: CartDocument.Tax) -> CartDocument.Tax:
+    """
+    Calculate the tax amount of a tax entry from its target amount and the tax master.
+
+    Args:
+        tax_master: Tax master of the tax code
+        tax: Tax entry with the target amount set
+
+    Returns:
+        CartDocument.Tax: The tax entry with tax name, type and rounded amount set
+    """
+    tax.tax_name = tax_master.tax_name
+
+    # Calculate tax amount based on tax type
+    match tax_master.tax_type:
+        case TaxType.External.value:
+            # External tax: Simple percentage of target amount
+            tax.tax_amount = float(Decimal(tax.target_amount) * Decimal(tax_master.rate) / Decimal(100))
+            tax.tax_type = TaxType.External.value
+        case TaxType.Internal.value:
+            # Internal tax: Extract tax amount from target amount (target already includes tax)
+            tax.tax_amount = float(
+                Decimal(tax.target_amount)
+                / (Decimal(1) + Decimal(tax_master.rate) / Decimal(100))
+                * Decimal(tax_master.rate)
+                / Decimal(100)
+            )
+            tax.tax_type = TaxType.Internal.value
+        case TaxType.Exempt.value:
+            # Tax exempt: No tax
+            tax.tax_amount = 0.0
+            tax.tax_type = TaxType.Exempt.value
+
+    # Apply rounding method
+    tax.tax_amount = float(__round(tax_master.round_method, Decimal(tax.tax_amount), tax_master.round_digit))
+
+    return tax
+
+
 def __round(round_method: str, value: Decimal, round_digit: int) -> float:
     """
     Round a decimal value using the specified rounding method and precision.
@@ -0,0 +1,182 @@
+# Copyright 2025 masa@kugel  # # Licensed under the Apache License, Version 2.0 (the "License");  # you may not use this file except in compliance with the License.  # You may obtain a copy of the License at  # #     http://www.apache.org/licenses/LICENSE-2.0  # # Unless required by applicable law or agreed to in writing, software  # distributed under the License is distributed on an "AS IS" BASIS,  # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  # See the License for the specific language governing permissions and  # limitations under the License.
+"""
+State for the incremental subtotal calculation.
+
+The state remembers, per cart, the fingerprint of every line item as it was after its
+last calculation, the tax target contribution of every line item and the tax result of
+every tax code. Lines and tax codes whose inputs are unchanged are not recalculated.
+
+Fingerprints contain both the inputs and the calculated outputs of a line item, so a
+state that does not match the cart (e.g. created by another instance) only causes a
+recalculation and never a different result.
+"""
+
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Optional
+
+from app.models.documents.cart_document import CartDocument
+from app.config.settings_cart import cart_settings
+
+
+class SubtotalCalcState:
+    """Per-cart memo of calculated line items and taxes."""
+
+    def __init__(self):
+        """
+        Initialize an empty calculation state.
+        """
+        self._lines: dict[int, tuple] = {}
+        self._contributions: dict[int, tuple[tuple, float]] = {}
+        self._taxes: dict[str, tuple[tuple, tuple]] = {}
+        # Number of recalculations, useful to verify how much work was skipped
+        self.lines_calculated = 0
+        self.taxes_calculated = 0
+
+    @staticmethod
+    def __line_fingerprint(line_item: CartDocument.CartLineItem) -> tuple:
+        """
+        Build the fingerprint of a line item from the fields used and set by calc_line_item_async.
+
+        Args:
+            line_item: The cart line item
+
+        Returns:
+            tuple identifying the inputs and outputs of the line item calculation
+        """
+        return (
+            line_item.unit_price,
+            line_item.quantity,
+            tuple(
+                (discount.discount_type, discount.discount_value, discount.discount_amount)
+                for discount in line_item.discounts
+            ),
+            line_item.amount,
+        )
+
+    def is_line_dirty(self, line_item: CartDocument.CartLineItem) -> bool:
+        """
+        Check whether a line item has to be recalculated.
+
+        Args:
+            line_item: The cart line item
+
+        Returns:
+            True if the line item changed since its last calculation
+        """
+        return self._lines.get(line_item.line_no) != self.__line_fingerprint(line_item)
+
+    def mark_line_calculated(self, line_item: CartDocument.CartLineItem) -> None:
+        """
+        Record a line item right after it has been calculated.
+
+        Args:
+            line_item: The calculated cart line item
+        """
+        self._lines[line_item.line_no] = self.__line_fingerprint(line_item)
+        self.lines_calculated += 1
+
+    def get_tax_contribution(self, line_item: CartDocument.CartLineItem) -> float:
+        """
+        Get the amount a line item contributes to the tax target amount of its tax code.
+
+        The contribution is the line item amount minus the subtotal discounts allocated to it,
+        calculated exactly as in calc_tax_async and reused while both are unchanged.
+
+        Args:
+            line_item: The cart line item
+
+        Returns:
+            float which is the tax target contribution of the line item
+        """
+        key = (line_item.amount, tuple(discount.discount_amount for discount in line_item.discounts_allocated))
+        cached = self._contributions.get(line_item.line_no)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        contribution = float(
+            Decimal(line_item.amount)
+            - sum([Decimal(discount.discount_amount) for discount in line_item.discounts_allocated])
+        )
+        self._contributions[line_item.line_no] = (key, contribution)
+        return contribution
+
+    def get_tax(self, tax_code: str, key: tuple) -> Optional[tuple]:
+        """
+        Get the calculated tax of a tax code if its inputs are unchanged.
+
+        Args:
+            tax_code: The tax code
+            key: Tuple of the target contributions, quantities and tax master values
+
+        Returns:
+            tuple of (tax_amount, tax_type, tax_name) or None if the tax has to be recalculated
+        """
+        cached = self._taxes.get(tax_code)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        return None
+
+    def set_tax(self, tax_code: str, key: tuple, tax: CartDocument.Tax) -> None:
+        """
+        Record the calculated tax of a tax code.
+
+        Args:
+            tax_code: The tax code
+            key: Tuple of the target contributions, quantities and tax master values
+            tax: The calculated tax entry
+        """
+        self._taxes[tax_code] = (key, (tax.tax_amount, tax.tax_type, tax.tax_name))
+        self.taxes_calculated += 1
+
+
+class SubtotalCalcStateCache:
+    """Process-wide LRU of subtotal calculation states keyed by cart_id."""
+
+    def __init__(self, max_size: int = 1000):
+        """
+        Initialize the state cache.
+
+        Args:
+            max_size: Maximum number of carts whose state is kept (default: 1000)
+        """
+        self._states: OrderedDict[str, SubtotalCalcState] = OrderedDict()
+        self._max_size = max_size
+
+    def get(self, cart_id: str) -> SubtotalCalcState:
+        """
+        Get the calculation state of a cart, creating it if necessary.
+
+        Args:
+            cart_id: The cart identifier
+
+        Returns:
+            SubtotalCalcState of the cart
+        """
+        state = self._states.get(cart_id)
+        if state is None:
+            state = SubtotalCalcState()
+            self._states[cart_id] = state
+            while len(self._states) > self._max_size:
+                self._states.popitem(last=False)
+        else:
+            self._states.move_to_end(cart_id)
+        return state
+
+    def remove(self, cart_id: str) -> None:
+        """
+        Remove the calculation state of a cart.
+
+        Args:
+            cart_id: The cart identifier
+        """
+        self._states.pop(cart_id, None)
+
+    def clear(self) -> None:
+        """
+        Remove all calculation states.
+        """
+        self._states.clear()
+
+
+# Create a singleton state cache shared by all cart requests
+subtotal_calc_state_cache = SubtotalCalcStateCache(max_size=cart_settings.SUBTOTAL_CALC_STATE_MAX_CARTS)
@@ -1,4 +1,5 @@
 # Copyright 2025 masa@kugel  # # Licensed under the Apache License, Version 2.0 (the "License");  # you may not use this file except in compliance with the License.  # You may obtain a copy of the License at  # #     http://www.apache.org/licenses/LICENSE-2.0  # # Unless required by applicable law or agreed to in writing, software  # distributed under the License is distributed on an "AS IS" BASIS,  # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  # See the License for the specific language governing permissions and  # limitations under the License.
+import asyncio
 from logging import getLogger
 from typing import Optional, TypedDict
 
@@ -11,9 +12,14 @@ from app.models.repositories.promotion_master_web_repository import PromotionMas
 from app.models.documents.cart_document import CartDocument
 from app.models.documents.promotion_master_document import PromotionMasterDocument
 from kugel_common.models.documents.base_tranlog import BaseTransaction
+from app.config.settings import settings
+from app.utils.promotion_cache import promotion_cache, PromotionCacheEntry
 
 logger = getLogger(__name__)
 
+# Keep references to running background refreshes so they are not garbage collected
+_refresh_tasks: set[asyncio.Task] = set()
+
 
 class PromotionInfo(TypedDict):
     promotion_code: str
@@ -87,17 +93,17 @@ class CategoryPromoPlugin(AbstractSalesPromo):
 
         # Get active promotions for the current store
         try:
-            active_promotions = await self.promotion_master_repo.get_active_promotions_by_store_async()
+            entry = await self._get_active_promotions_async(cart_doc.tenant_id, cart_doc.store_code)
         except Exception as e:
             logger.error(f"Failed to get active promotions: {e}")
             return cart_doc
 
-        if not active_promotions:
+        if not entry.promotions:
             logger.debug("No active promotions found")
             return cart_doc
 
-        # Build a mapping of category_code to best promotion (highest discount)
-        category_promotions = self._build_category_promotion_map(active_promotions)
+        # Mapping of category_code to best promotion (highest discount), built when loaded
+        category_promotions = entry.category_map
 
         if not category_promotions:
             logger.debug("No category promotions applicable")
@@ -131,6 +137,72 @@ class CategoryPromoPlugin(AbstractSalesPromo):
 
         return cart_doc
 
+    async def _get_active_promotions_async(self, tenant_id: str, store_code: str) -> PromotionCacheEntry:
+        """
+        Get the active promotions of the store and their category promotion map.
+
+        Promotions are served from the shared promotion cache. An entry older than the TTL
+        is still returned while it is refreshed in the background, so only the first request
+        for a store (or the first one after an invalidation) calls the master-data service.
+
+        Args:
+            tenant_id: The tenant identifier
+            store_code: The store code
+
+        Returns:
+            PromotionCacheEntry: Active promotions and the category promotion map
+
+        Raises:
+            Exception: If the promotions cannot be loaded and no cached entry exists
+        """
+        if not settings.USE_PROMOTION_CACHE:
+            return await self._load_active_promotions_async()
+
+        entry = promotion_cache.get(tenant_id, store_code)
+        if entry is None:
+            generation = promotion_cache.get_generation(tenant_id, store_code)
+            entry = await self._load_active_promotions_async()
+            promotion_cache.set(tenant_id, store_code, entry, generation)
+            return entry
+
+        if promotion_cache.is_stale(entry) and promotion_cache.begin_refresh(tenant_id, store_code):
+            task = asyncio.create_task(self._refresh_active_promotions_async(tenant_id, store_code))
+            _refresh_tasks.add(task)
+            task.add_done_callback(_refresh_tasks.discard)
+        return entry
+
+    async def _load_active_promotions_async(self) -> PromotionCacheEntry:
+        """
+        Load the active promotions from the master-data service and build the category promotion map.
+
+        Returns:
+            PromotionCacheEntry: Active promotions and the category promotion map
+        """
+        promotions = await self.promotion_master_repo.get_active_promotions_by_store_async()
+        return PromotionCacheEntry(
+            promotions=promotions, category_map=self._build_category_promotion_map(promotions)
+        )
+
+    async def _refresh_active_promotions_async(self, tenant_id: str, store_code: str) -> None:
+        """
+        Reload the cached promotions of a store in the background.
+
+        The stale entry is kept when the reload fails, and the next request retries.
+
+        Args:
+            tenant_id: The tenant identifier
+            store_code: The store code
+        """
+        try:
+            generation = promotion_cache.get_generation(tenant_id, store_code)
+            entry = await self._load_active_promotions_async()
+            promotion_cache.set(tenant_id, store_code, entry, generation)
+            logger.debug(f"Promotion cache refreshed for {tenant_id}/{store_code}")
+        except Exception as e:
+            logger.warning(f"Failed to refresh active promotions for {tenant_id}/{store_code}: {e}")
+        finally:
+            promotion_cache.end_refresh(tenant_id, store_code)
+
     def _parse_detail(self, promo: PromotionMasterDocument) -> Optional[CategoryPromoDetail]:
         """
         Parse the generic detail dict into a CategoryPromoDetail model.
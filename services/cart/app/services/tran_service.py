@@ -2,9 +2,9 @@
 from typing import Any
 from logging import getLogger
 import aiohttp
+import asyncio
+import time
 import uuid
-import json
-import ast
 from datetime import datetime, timedelta
 
 logger = getLogger(__name__)
@@ -15,6 +15,7 @@ from kugel_common.receipt.abstract_receipt_data import AbstractReceiptData
 from kugel_common.utils.misc import get_app_time_str, get_app_time
 from kugel_common.enums import TransactionType
 from kugel_common.utils.slack_notifier import send_warning_notification
+from kugel_common.utils.rate_limiter import TokenBucket
 
 from app.models.repositories.tranlog_repository import TranlogRepository
 from app.models.repositories.tranlog_delivery_status_repository import (
@@ -28,9 +29,9 @@ from app.models.repositories.settings_master_web_repository import SettingsMaste
 from app.models.repositories.payment_master_web_repository import PaymentMasterWebRepository
 from app.models.repositories.transaction_status_repository import TransactionStatusRepository
 from app.models.documents.cart_document import CartDocument
-from app.models.receipt_types import validate_receipt_lines
 from app.enums.counter_type import CounterType
 from app.utils.settings import get_setting_value
+from app.utils.settings_snapshot import get_setting_value_async, get_settings_snapshot_async, parse_json_or_literal
 from app.services.cart_strategy_manager import CartStrategyManager
 from app.exceptions import (
     DocumentNotFoundException,
@@ -66,6 +67,7 @@ class TranService:
         settings_master_repo: SettingsMasterWebRepository,
         payment_master_repo: PaymentMasterWebRepository,
         transaction_status_repo: TransactionStatusRepository,
+        pubsub_manager: PubsubManager = None,
     ):
         """
         Initialize the transaction service with required repositories and information.
@@ -76,6 +78,8 @@ class TranService:
             tranlog_repo: Repository for transaction logs
             settings_master_repo: Repository for settings
             payment_master_repo: Repository for payment methods
+            pubsub_manager: Optional shared pubsub manager. If omitted, the service creates
+                            its own manager and closes it in close()
         """
         self.terminal_info = terminal_info
         self.terminal_counter_repository = terminal_counter_repo
@@ -86,14 +90,15 @@ class TranService:
         self.transaction_status_repo = transaction_status_repo
 
         # Initialize pubsub manager for publishing messages with circuit breaker
-        self.pubsub_manager = PubsubManager()
+        self.__owns_pubsub_manager = pubsub_manager is None
+        self.pubsub_manager = PubsubManager() if pubsub_manager is None else pubsub_manager
 
         self.strategy_manager = CartStrategyManager()
         self.receipt_data_strategy: AbstractReceiptData = None
 
         try:
-            # Load receipt_data plugins
-            receipt_data_strategies = self.strategy_manager.load_strategies("receipt_data_strategies")
+            # Load receipt_data plugins, stateless and shared by all requests
+            receipt_data_strategies = self.strategy_manager.load_shared_strategies("receipt_data_strategies")
             logger.debug(f"receipt_data_strategies: {receipt_data_strategies}")
 
             # Select receipt_data plugin in receipt_data_strategies by name "default"
@@ -163,10 +168,12 @@ class TranService:
         tranlog.open_counter = self.terminal_info.open_counter
         tranlog.business_counter = self.terminal_info.business_counter
         tranlog.generate_date_time = get_app_time_str()
+        # Settings resolved and parsed once per terminal, no lookup or parsing on each bill
+        settings_snapshot = await get_settings_snapshot_async(self.settings_master_repo, self.terminal_info)
         tranlog.receipt_no = await self.terminal_counter_repository.numbering_count(
             countType=CounterType.Receipt.value,
-            start_value=await self._get_setting_value_async("RECEIPT_NO_START_VALUE"),
-            end_value=await self._get_setting_value_async("RECEIPT_NO_END_VALUE"),
+            start_value=settings_snapshot.receipt_no_start_value,
+            end_value=settings_snapshot.receipt_no_end_value,
         )
         tranlog.user = cart.user
         tranlog.sales = cart.sales
@@ -196,59 +203,14 @@ class TranService:
                 break
         # set invoice registration number
         tranlog.additional_info = {}
-        invoice_registration_number = await self._get_setting_value_async("INVOICE_REGISTRATION_NUMBER")
-        if invoice_registration_number is not None:
-            try:
-                if isinstance(invoice_registration_number, str):
-                    tranlog.additional_info["invoice_registration_number"] = invoice_registration_number
-                    logger.debug(f"Invoice registration number set: {invoice_registration_number}")
-                else:
-                    message = f"Invalid INVOICE_REGISTRATION_NUMBER format: {invoice_registration_number}"
-                    logger.warning(message)
-            except Exception as e:
-                logger.warning(f"Error processing invoice registration number: {e}")
-
-        # Set receipt header
-        # Expected format: [{"text": "Header 1", "align": "left"}, {"text": "Header 2", "align": "right"}]
-        # Note: Settings stored as strings in MongoDB may use single quotes (Python str() representation)
-        receipt_headers = await self._get_setting_value_async("RECEIPT_HEADERS")
-        if receipt_headers is not None:
-            try:
-                # Parse the setting value which may be stored as a string
-                parsed_headers = await self._parse_json_or_literal_async(receipt_headers, "RECEIPT_HEADERS")
-
-                if parsed_headers is not None:
-                    validated_headers = validate_receipt_lines(parsed_headers)
-                    if validated_headers:
-                        tranlog.additional_info["receipt_headers"] = [
-                            {"text": header["text"], "align": header["align"]} for header in validated_headers
-                        ]
-                        logger.debug(f"Receipt headers set: {len(validated_headers)} lines")
-                    else:
-                        logger.warning("No valid receipt headers found in RECEIPT_HEADERS")
-            except Exception as e:
-                logger.warning(f"Error processing receipt headers: {e}")
+        if settings_snapshot.invoice_registration_number is not None:
+            tranlog.additional_info["invoice_registration_number"] = settings_snapshot.invoice_registration_number
 
-        # Set receipt footer
-        # Expected format: [{"text": "Footer 1", "align": "left"}, {"text": "Footer 2", "align": "right"}]
-        # Note: Settings stored as strings in MongoDB may use single quotes (Python str() representation)
-        receipt_footers = await self._get_setting_value_async("RECEIPT_FOOTERS")
-        if receipt_footers is not None:
-            try:
-                # Parse the setting value which may be stored as a string
-                parsed_footers = await self._parse_json_or_literal_async(receipt_footers, "RECEIPT_FOOTERS")
-
-                if parsed_footers is not None:
-                    validated_footers = validate_receipt_lines(parsed_footers)
-                    if validated_footers:
-                        tranlog.additional_info["receipt_footers"] = [
-                            {"text": footer["text"], "align": footer["align"]} for footer in validated_footers
-                        ]
-                        logger.debug(f"Receipt footers set: {len(validated_footers)} lines")
-                    else:
-                        logger.warning("No valid receipt footers found in RECEIPT_FOOTERS")
-            except Exception as e:
-                logger.warning(f"Error processing receipt footers: {e}")
+        # Set receipt header and footer, validated when the snapshot was built
+        if settings_snapshot.receipt_headers:
+            tranlog.additional_info["receipt_headers"] = [dict(line) for line in settings_snapshot.receipt_headers]
+        if settings_snapshot.receipt_footers:
+            tranlog.additional_info["receipt_footers"] = [dict(line) for line in settings_snapshot.receipt_footers]
 
         # Make receipt data
         try:
@@ -731,6 +693,9 @@ class TranService:
         """
         logger.debug(f"TranService._get_setting_value: name->{name}")
 
+        if settings.USE_SETTINGS_SNAPSHOT:
+            return await get_setting_value_async(self.settings_master_repo, self.terminal_info, name)
+
         try:
             setting_doc = await self.settings_master_repo.get_settings_value_by_name_async(name)
         except Exception:
@@ -763,35 +728,7 @@ class TranService:
         Returns:
             Parsed value or None if parsing fails
         """
-        # If already parsed, return as-is
-        if isinstance(value, (list, dict)):
-            return value
-
-        # If not a string, return None
-        if not isinstance(value, str):
-            logger.warning(f"Unexpected type for {setting_name}: {type(value)}")
-            return None
-
-        # Try multiple parsing strategies
-        # 1. Standard JSON (double quotes)
-        try:
-            return json.loads(value)
-        except json.JSONDecodeError:
-            pass
-
-        # 2. Python literal (single quotes, safe eval)
-        try:
-            return ast.literal_eval(value)
-        except (ValueError, SyntaxError):
-            pass
-
-        # 3. Quote replacement (risky but sometimes necessary)
-        try:
-            value_with_double_quotes = value.replace("'", '"')
-            return json.loads(value_with_double_quotes)
-        except json.JSONDecodeError as e:
-            logger.warning(f"Failed to parse {setting_name}: {e}")
-            return None
+        return parse_json_or_literal(value, setting_name)
 
     async def _publish_tranlog_async(self, tranlog_dict: dict) -> None:
         """
@@ -892,46 +829,95 @@ class TranService:
             message = f"Delivery status not found for event_id: {event_id}"
             raise InternalErrorException(message, logger)
 
-    async def republish_undelivered_tranlog_async(self) -> None:
+    async def republish_undelivered_tranlog_async(self) -> dict:
         """
         Republish undelivered transaction logs to the tranlog topic.
 
-        This function retrieves undelivered transaction logs from the database
-        and republishes them to the tranlog topic for processing.
+        This function reads the undelivered transaction logs from the database page by page
+        and republishes them to the tranlog topic for processing. The tranlogs of a page are
+        republished concurrently (REPUBLISH_CONCURRENCY) at a limited rate (REPUBLISH_RATE_PER_SECOND),
+        and the delivery statuses of the page are updated with one update per status.
 
         Returns:
-            None
+            dict: Number of tranlogs checked, already delivered, skipped, republished and failed to publish
         """
         hours_ago = settings.UNDELIVERED_CHECK_PERIOD_IN_HOURS
-        undelivered_tranlog_status_list = await self.tranlog_delivery_status_repo.find_pending_deliveries(
-            hours_ago=hours_ago
-        )
-        if not undelivered_tranlog_status_list:
+        rate_limiter = TokenBucket(settings.REPUBLISH_RATE_PER_SECOND)
+        semaphore = asyncio.Semaphore(max(1, settings.REPUBLISH_CONCURRENCY))
+        stats = {"checked": 0, "delivered": 0, "skipped": 0, "republished": 0, "publish_failed": 0}
+        started = time.monotonic()
+
+        async for page in self.tranlog_delivery_status_repo.find_pending_deliveries_pages(
+            hours_ago=hours_ago, page_size=settings.REPUBLISH_PAGE_SIZE
+        ):
+            event_ids_by_status = {"delivered": [], "published": [], "failed": []}
+            republish_list = []
+            for status in page:
+                stats["checked"] += 1
+                # Check if all services have been received
+                all_services_received = all(service.status == "received" for service in status.services)
+                if all_services_received:
+                    # Update overall delivery status to "delivered"
+                    event_ids_by_status["delivered"].append(status.event_id)
+                    stats["delivered"] += 1
+                    logger.debug(f"tranlog already delivered: event_id->{status.event_id}")
+                    continue
+
+                # Check if the tranlog is undelivered shorter than the threshold for skipping
+                if status.created_at > datetime.now() - timedelta(minutes=settings.UNDELIVERED_CHECK_INTERVAL_IN_MINUTES):
+                    # Skip the tranlog if it was created recently
+                    stats["skipped"] += 1
+                    logger.debug(f"Skipping tranlog: event_id->{status.event_id}")
+                    continue
+                republish_list.append(status)
+
+            # Republish the tranlogs of the page concurrently
+            results = await asyncio.gather(
+                *(self.__republish_tranlog_async(status, rate_limiter, semaphore) for status in republish_list)
+            )
+            for status, (success, error_msg) in zip(republish_list, results):
+                if success:
+                    event_ids_by_status["published"].append(status.event_id)
+                    stats["republished"] += 1
+                else:
+                    event_ids_by_status["failed"].append(status.event_id)
+                    stats["publish_failed"] += 1
+                    logger.error(f"Failed to republish tranlog: event_id->{status.event_id}, error->{error_msg}")
+
+            try:
+                await self.tranlog_delivery_status_repo.bulk_update_delivery_status_async(event_ids_by_status)
+            except Exception as e:
+                message = f"Error updating delivery statuses: {e}"
+                raise InternalErrorException(message, logger) from e
+            logger.info(f"Republishing undelivered tranlogs: {stats}, elapsed->{time.monotonic() - started:.1f}s")
+
+        if stats["checked"] == 0:
             logger.debug("Don`t worry!  No undelivered tranlogs found")
-            return
+        else:
+            logger.warning(f"Undelivered tranlogs found: {stats}")
+        return stats
 
-        logger.warning(f"Undelivered tranlogs found: {len(undelivered_tranlog_status_list)}")
+    async def __republish_tranlog_async(
+        self, status: TranlogDeliveryStatus, rate_limiter: TokenBucket, semaphore: asyncio.Semaphore
+    ) -> tuple[bool, str]:
+        """
+        Republish an undelivered transaction log, waiting for the concurrency and rate limits.
 
-        # Republish undelivered tranlogs
-        for status in undelivered_tranlog_status_list:
-            # Check if all services have been received
-            all_services_received = all(service.status == "received" for service in status.services)
-            if all_services_received:
-                # Update overall delivery status to "delivered"
-                await self._update_delivery_status_internal_async(event_id=status.event_id, status="delivered")
-                logger.debug(f"tranlog already delivered: event_id->{status.event_id}")
-                continue
-
-            # Check if the tranlog is undelivered shorter than the threshold for skipping
-            if status.created_at > datetime.now() - timedelta(minutes=settings.UNDELIVERED_CHECK_INTERVAL_IN_MINUTES):
-                # Skip the tranlog if it was created recently
-                logger.debug(f"Skipping tranlog: event_id->{status.event_id}")
-                continue
+        A tranlog undelivered longer than UNDELIVERED_CHECK_FAILED_PERIOD_IN_MINUTES is
+        notified as a warning before it is republished.
+
+        Args:
+            status: The delivery status of the transaction log
+            rate_limiter: Rate limit shared by the republished tranlogs
+            semaphore: Concurrency limit shared by the republished tranlogs
+
+        Returns:
+            tuple[bool, str]: (True, None) if published, (False, error message) otherwise
+        """
+        async with semaphore:
             # Check if the tranlog is undelivered longer than the threshold
             failed_minutes = settings.UNDELIVERED_CHECK_FAILED_PERIOD_IN_MINUTES
             if status.created_at < datetime.now() - timedelta(minutes=failed_minutes):
-                # Update the delivery status to "failed"
-                await self._update_delivery_status_internal_async(event_id=status.event_id, status="failed")
                 # notify warning
                 await send_warning_notification(
                     message="Undelivered tranlog found: "
@@ -942,11 +928,15 @@ class TranService:
                     f"transaction_no->{status.transaction_no}",
                     service="cart",
                     context=status.model_dump(),
-                )  # Republish the tranlog
+                )
+
+            await rate_limiter.acquire()
             logger.debug(
                 f"Republishing tranlog: event_id->{status.event_id}, tenant_id->{status.tenant_id}, transaction_no->{status.transaction_no}"
             )
-            await self._publish_tranlog_async(status.payload)
+            return await self.pubsub_manager.publish_message_async(
+                pubsub_name="pubsub-tranlog-report", topic_name="topic-tranlog", message=status.payload
+            )
 
     async def get_transaction_list_with_status_async(
         self, transaction_list: list[BaseTransaction]
@@ -994,6 +984,7 @@ class TranService:
 
         This method ensures that all resources are properly cleaned up,
         including closing the pubsub manager which contains HTTP clients.
+        A shared pubsub manager is left open for its owner.
         """
-        if hasattr(self, "pubsub_manager") and self.pubsub_manager:
+        if hasattr(self, "pubsub_manager") and self.pubsub_manager and self.__owns_pubsub_manager:
             await self.pubsub_manager.close()
@@ -0,0 +1,122 @@
+"""
+Shared cache of versioned master data referenced by slim cart state documents.
+
+Master data lists (settings, taxes) are stored once per content version instead of
+being embedded in every cart written to the state store. The version key is derived
+from the content, so every cart of a store with the same master data shares one entry.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from logging import getLogger
+
+from app.config.settings_cart import cart_settings
+
+logger = getLogger(__name__)
+
+
+class CartMasterCache:
+    """In-process cache of versioned master data lists per (tenant, store)."""
+
+    def __init__(self, refresh_seconds: int = 3600, max_versions: int = 64):
+        """
+        Initialize the cart master cache.
+
+        Args:
+            refresh_seconds: Interval after which an entry should be saved to the state store again
+                             so that it outlives the state store TTL (default: 3600)
+            max_versions: Maximum number of versions kept per (tenant, store) (default: 64)
+        """
+        self._cache: Dict[Tuple[str, str], OrderedDict[str, Tuple[list[dict], float]]] = {}
+        self._refresh_seconds = refresh_seconds
+        self._max_versions = max_versions
+
+    @staticmethod
+    def make_key(kind: str, documents: list[dict]) -> str:
+        """
+        Build the version key for a master data list from its content.
+
+        Args:
+            kind: Kind of master data ("settings" or "taxes")
+            documents: Master data documents as dictionaries
+
+        Returns:
+            Version key such as "settings_1a2b3c4d5e6f7a8b"
+        """
+        content = json.dumps(documents, sort_keys=True, default=str)
+        return f"{kind}_{hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]}"
+
+    def get(self, tenant_id: str, store_code: str, key: str) -> Optional[list[dict]]:
+        """
+        Get a master data list by version key.
+
+        Args:
+            tenant_id: The tenant identifier
+            store_code: The store code
+            key: The version key
+
+        Returns:
+            List of master data documents as dictionaries, or None if not cached
+        """
+        partition = self._cache.get((tenant_id, store_code))
+        if partition is None or key not in partition:
+            return None
+        partition.move_to_end(key)
+        return partition[key][0]
+
+    def set(self, tenant_id: str, store_code: str, key: str, documents: list[dict], saved: bool = True) -> None:
+        """
+        Store a master data list in the cache.
+
+        Args:
+            tenant_id: The tenant identifier
+            store_code: The store code
+            key: The version key
+            documents: Master data documents as dictionaries
+            saved: True if this process has just saved the list to the state store.
+                   Lists read from the state store are saved again on the next write.
+        """
+        partition = self._cache.setdefault((tenant_id, store_code), OrderedDict())
+        partition[key] = (documents, time.time() if saved else 0.0)
+        partition.move_to_end(key)
+        while len(partition) > self._max_versions:
+            partition.popitem(last=False)
+
+    def needs_save(self, tenant_id: str, store_code: str, key: str) -> bool:
+        """
+        Check whether a version has to be (re)written to the state store.
+
+        Args:
+            tenant_id: The tenant identifier
+            store_code: The store code
+            key: The version key
+
+        Returns:
+            True if the version is unknown or was saved longer ago than the refresh interval
+        """
+        partition = self._cache.get((tenant_id, store_code))
+        if partition is None or key not in partition:
+            return True
+        _, saved_at = partition[key]
+        return time.time() - saved_at >= self._refresh_seconds
+
+    def clear(self, tenant_id: Optional[str] = None) -> None:
+        """
+        Clear cached entries.
+
+        Args:
+            tenant_id: If provided, clear only entries for this tenant.
+                      If None, clear all entries.
+        """
+        if tenant_id is None:
+            self._cache.clear()
+        else:
+            for key in [key for key in self._cache.keys() if key[0] == tenant_id]:
+                self._cache.pop(key, None)
+
+
+# Create a singleton cache instance shared by all cart repositories
+cart_master_cache = CartMasterCache(refresh_seconds=cart_settings.CART_MASTER_REFRESH_SECONDS)
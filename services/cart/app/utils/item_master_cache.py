@@ -0,0 +1,148 @@
+"""
+Process-wide item master cache shared by all cart requests.
+
+Entries are partitioned per (tenant_id, store_code) and indexed by item_code,
+so lookups are O(1). Each partition is bounded by TTL and by size with LRU eviction.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from logging import getLogger
+
+from app.models.documents.item_master_document import ItemMasterDocument
+from app.config.settings_cart import cart_settings
+
+logger = getLogger(__name__)
+
+
+class ItemMasterCache:
+    """Shared item master cache with TTL and LRU eviction per (tenant, store)."""
+
+    def __init__(self, ttl_seconds: int = 300, max_size: int = 10000):
+        """
+        Initialize the item master cache.
+
+        Args:
+            ttl_seconds: Time to live for cached entries in seconds (default: 300)
+            max_size: Maximum number of items kept per (tenant, store) (default: 10000)
+        """
+        self._cache: Dict[Tuple[str, str], OrderedDict[str, Tuple[ItemMasterDocument, float]]] = {}
+        self._ttl = ttl_seconds
+        self._max_size = max_size
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, tenant_id: str, store_code: str, item_code: str) -> Optional[ItemMasterDocument]:
+        """
+        Get an item from cache if available and not expired.
+
+        Args:
+            tenant_id: The tenant identifier
+            store_code: The store code
+            item_code: The item code to look up
+
+        Returns:
+            ItemMasterDocument if found and not expired, None otherwise
+        """
+        partition = self._cache.get((tenant_id, store_code))
+        entry = partition.get(item_code) if partition is not None else None
+        if entry is not None:
+            item, timestamp = entry
+            if time.time() - timestamp < self._ttl:
+                partition.move_to_end(item_code)
+                self._hits += 1
+                logger.debug(f"Item cache hit for {tenant_id}/{store_code}/{item_code}")
+                return item
+            # Remove expired entry
+            del partition[item_code]
+
+        self._misses += 1
+        logger.debug(f"Item cache miss for {tenant_id}/{store_code}/{item_code}")
+        return None
+
+    def set(self, tenant_id: str, store_code: str, item: ItemMasterDocument) -> None:
+        """
+        Store an item in cache with current timestamp, evicting the least recently used entry if full.
+
+        Args:
+            tenant_id: The tenant identifier
+            store_code: The store code
+            item: The item master document to cache
+        """
+        partition = self._cache.setdefault((tenant_id, store_code), OrderedDict())
+        partition[item.item_code] = (item, time.time())
+        partition.move_to_end(item.item_code)
+        while len(partition) > self._max_size:
+            partition.popitem(last=False)
+            self._evictions += 1
+
+    def remove(self, tenant_id: str, store_code: str, item_code: str) -> None:
+        """
+        Remove a specific item from cache.
+
+        Args:
+            tenant_id: The tenant identifier
+            store_code: The store code
+            item_code: The item code to remove
+        """
+        partition = self._cache.get((tenant_id, store_code))
+        if partition is not None:
+            partition.pop(item_code, None)
+
+    def clear(self, tenant_id: Optional[str] = None) -> None:
+        """
+        Clear cached entries.
+
+        Args:
+            tenant_id: If provided, clear only entries for this tenant.
+                      If None, clear all entries and reset statistics.
+        """
+        if tenant_id is None:
+            self._cache.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+        else:
+            for key in [key for key in self._cache.keys() if key[0] == tenant_id]:
+                self._cache.pop(key, None)
+
+    def size(self, tenant_id: Optional[str] = None) -> int:
+        """
+        Get the number of items in cache.
+
+        Args:
+            tenant_id: If provided, count only entries for this tenant.
+                      If None, count all entries.
+
+        Returns:
+            Number of cached items
+        """
+        return sum(
+            len(partition) for key, partition in self._cache.items() if tenant_id is None or key[0] == tenant_id
+        )
+
+    def stats(self) -> dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss/eviction counters and configured limits
+        """
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+            "ttl_seconds": self._ttl,
+            "max_size_per_store": self._max_size,
+        }
+
+
+# Create a singleton cache instance shared by all item master repositories
+item_master_cache = ItemMasterCache(
+    ttl_seconds=cart_settings.ITEM_CACHE_TTL_SECONDS,
+    max_size=cart_settings.ITEM_CACHE_MAX_SIZE,
+)
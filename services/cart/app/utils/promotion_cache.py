@@ -0,0 +1,205 @@
+"""
+Process-wide cache of active promotions shared by all cart requests.
+
+Entries are kept per (tenant_id, store_code) and hold both the parsed promotion
+documents and the category promotion map built from them, so applying promotions
+on subtotal does not require a call to the master-data service.
+
+Stale entries are still served while a single background refresh reloads them.
+Entries are dropped immediately when master-data publishes a promotion change.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+from logging import getLogger
+
+from app.config.settings_cart import cart_settings
+
+logger = getLogger(__name__)
+
+
+@dataclass
+class PromotionCacheEntry:
+    """Cached promotions of a store together with the precomputed category promotion map."""
+
+    promotions: list
+    category_map: Dict[str, Any]
+    loaded_at: float = field(default_factory=time.time)
+
+
+class PromotionCache:
+    """Shared active promotion cache with TTL based background refresh per (tenant, store)."""
+
+    def __init__(self, ttl_seconds: int = 60):
+        """
+        Initialize the promotion cache.
+
+        Args:
+            ttl_seconds: Age in seconds after which an entry is refreshed in the background (default: 60)
+        """
+        self._cache: Dict[Tuple[str, str], PromotionCacheEntry] = {}
+        # Incremented on invalidations of all tenants, of a tenant or of a store, so that loads
+        # started before a change are not stored while loads of other tenants and stores are
+        self._generation = 0
+        self._tenant_generations: Dict[str, int] = {}
+        self._store_generations: Dict[Tuple[str, str], int] = {}
+        self._refreshing: set[Tuple[str, str]] = set()
+        self._ttl = ttl_seconds
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def get(self, tenant_id: str, store_code: str) -> Optional[PromotionCacheEntry]:
+        """
+        Get the cached promotions of a store, including stale entries.
+
+        Args:
+            tenant_id: The tenant identifier
+            store_code: The store code
+
+        Returns:
+            PromotionCacheEntry if cached, None otherwise
+        """
+        entry = self._cache.get((tenant_id, store_code))
+        if entry is None:
+            self._misses += 1
+            logger.debug(f"Promotion cache miss for {tenant_id}/{store_code}")
+            return None
+        self._hits += 1
+        return entry
+
+    def is_stale(self, entry: PromotionCacheEntry) -> bool:
+        """
+        Check whether an entry is older than the TTL and should be refreshed.
+
+        Args:
+            entry: The cache entry to check
+
+        Returns:
+            True if the entry should be refreshed
+        """
+        return time.time() - entry.loaded_at >= self._ttl
+
+    def get_generation(self, tenant_id: str, store_code: str) -> Tuple[int, int, int]:
+        """
+        Get the current generation of a store, to be passed to set() after loading.
+
+        Args:
+            tenant_id: The tenant identifier
+            store_code: The store code
+
+        Returns:
+            Invalidation counters of the cache, the tenant and the store
+        """
+        return (
+            self._generation,
+            self._tenant_generations.get(tenant_id, 0),
+            self._store_generations.get((tenant_id, store_code), 0),
+        )
+
+    def set(
+        self, tenant_id: str, store_code: str, entry: PromotionCacheEntry, generation: Tuple[int, int, int]
+    ) -> bool:
+        """
+        Store the promotions of a store unless they were invalidated while loading.
+
+        Args:
+            tenant_id: The tenant identifier
+            store_code: The store code
+            entry: The cache entry to store
+            generation: Generation returned by get_generation() before the load started
+
+        Returns:
+            True if the entry was stored, False if it was discarded
+        """
+        if self.get_generation(tenant_id, store_code) != generation:
+            logger.debug(f"Discarding promotions loaded before invalidation for {tenant_id}/{store_code}")
+            return False
+        self._cache[(tenant_id, store_code)] = entry
+        return True
+
+    def begin_refresh(self, tenant_id: str, store_code: str) -> bool:
+        """
+        Mark a store as being refreshed.
+
+        Args:
+            tenant_id: The tenant identifier
+            store_code: The store code
+
+        Returns:
+            True if the caller should refresh, False if a refresh is already running
+        """
+        key = (tenant_id, store_code)
+        if key in self._refreshing:
+            return False
+        self._refreshing.add(key)
+        return True
+
+    def end_refresh(self, tenant_id: str, store_code: str) -> None:
+        """
+        Mark the refresh of a store as finished.
+
+        Args:
+            tenant_id: The tenant identifier
+            store_code: The store code
+        """
+        self._refreshing.discard((tenant_id, store_code))
+
+    def invalidate(self, tenant_id: Optional[str] = None, store_code: Optional[str] = None) -> None:
+        """
+        Drop cached promotions.
+
+        Args:
+            tenant_id: If provided, drop only entries for this tenant.
+                      If None, drop all entries.
+            store_code: If provided together with tenant_id, drop only this store.
+        """
+        keys = [
+            key
+            for key in self._cache.keys()
+            if (tenant_id is None or key[0] == tenant_id) and (store_code is None or key[1] == store_code)
+        ]
+        for key in keys:
+            self._cache.pop(key, None)
+        if tenant_id is None:
+            self._generation += 1
+        elif store_code is None:
+            self._tenant_generations[tenant_id] = self._tenant_generations.get(tenant_id, 0) + 1
+        else:
+            key = (tenant_id, store_code)
+            self._store_generations[key] = self._store_generations.get(key, 0) + 1
+        self._invalidations += 1
+        logger.info(f"Promotion cache invalidated: tenant_id={tenant_id}, store_code={store_code}")
+
+    def clear(self) -> None:
+        """
+        Clear all entries and reset statistics.
+        """
+        self._cache.clear()
+        self._generation += 1
+        self._tenant_generations.clear()
+        self._store_generations.clear()
+        self._refreshing.clear()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def stats(self) -> dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss/invalidation counters, number of cached stores and the TTL
+        """
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "invalidations": self._invalidations,
+            "cached_stores": len(self._cache),
+            "ttl_seconds": self._ttl,
+        }
+
+
+# Create a singleton cache instance shared by all category promotion plugins
+promotion_cache = PromotionCache(ttl_seconds=cart_settings.PROMOTION_CACHE_TTL_SECONDS)
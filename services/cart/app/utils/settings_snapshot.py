@@ -0,0 +1,498 @@
+"""
+Process-wide snapshot of the settings master shared by all cart requests.
+
+Snapshots are kept per (tenant_id, store_code, terminal_no). Each one is built from a
+single load of all settings and holds the values resolved for the terminal together with
+the parsed and validated structures used on billing (receipt number range, invoice
+registration number, receipt headers and footers), so creating a transaction log does
+not require a call to the master-data service nor any parsing.
+
+Stale snapshots are still served while a single background refresh reloads them.
+Each stored snapshot gets a new version number.
+"""
+
+import ast
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+from logging import getLogger
+
+from kugel_common.models.documents.terminal_info_document import TerminalInfoDocument
+
+from app.config.settings import settings
+from app.config.settings_cart import cart_settings
+from app.models.documents.settings_master_document import SettingsMasterDocument
+from app.models.receipt_types import validate_receipt_lines
+from app.utils.settings import get_setting_value
+
+logger = getLogger(__name__)
+
+# Settings used when a transaction log is created
+BILLING_SETTING_NAMES = [
+    "RECEIPT_NO_START_VALUE",
+    "RECEIPT_NO_END_VALUE",
+    "INVOICE_REGISTRATION_NUMBER",
+    "RECEIPT_HEADERS",
+    "RECEIPT_FOOTERS",
+]
+
+# Keep references to background refresh tasks so they are not garbage collected
+_refresh_tasks: set[asyncio.Task] = set()
+
+
+@dataclass
+class SettingsSnapshot:
+    """Settings values resolved for a terminal together with the precomputed billing settings."""
+
+    values: Dict[str, Any]
+    receipt_no_start_value: Any = None
+    receipt_no_end_value: Any = None
+    invoice_registration_number: Optional[str] = None
+    receipt_headers: Optional[list[dict]] = None
+    receipt_footers: Optional[list[dict]] = None
+    # True when only the billing settings were looked up, other settings must be looked up by name
+    billing_only: bool = False
+    version: int = 0
+    loaded_at: float = field(default_factory=time.time)
+
+    def get_value(self, name: str) -> Any:
+        """
+        Get a setting value, falling back to the settings module default when it is not in the master.
+
+        Args:
+            name: Name of the setting
+
+        Returns:
+            The value of the setting or None if not found
+        """
+        if name in self.values:
+            return self.values[name]
+        return getattr(settings, name, None)
+
+
+def parse_json_or_literal(value: Any, setting_name: str) -> Any:
+    """
+    Parse a setting value that may be stored as a JSON string or Python literal.
+
+    List/dict settings are often stored as strings in MongoDB. The parsing strategies are:
+    1. If already a list/dict, return as-is
+    2. Try standard JSON parsing (double quotes)
+    3. Try Python literal evaluation (single quotes)
+    4. Try quote replacement as last resort
+
+    Args:
+        value: The value to parse (may be string, list, dict, etc.)
+        setting_name: Name of the setting for logging purposes
+
+    Returns:
+        Parsed value or None if parsing fails
+    """
+    # If already parsed, return as-is
+    if isinstance(value, (list, dict)):
+        return value
+
+    # If not a string, return None
+    if not isinstance(value, str):
+        logger.warning(f"Unexpected type for {setting_name}: {type(value)}")
+        return None
+
+    # 1. Standard JSON (double quotes)
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        pass
+
+    # 2. Python literal (single quotes, safe eval)
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        pass
+
+    # 3. Quote replacement (risky but sometimes necessary)
+    try:
+        value_with_double_quotes = value.replace("'", '"')
+        return json.loads(value_with_double_quotes)
+    except json.JSONDecodeError as e:
+        logger.warning(f"Failed to parse {setting_name}: {e}")
+        return None
+
+
+def make_receipt_lines(value: Any, setting_name: str) -> Optional[list[dict]]:
+    """
+    Parse and validate the receipt header or footer lines of a setting.
+
+    Expected format: [{"text": "Header 1", "align": "left"}, {"text": "Header 2", "align": "right"}]
+
+    Args:
+        value: The setting value, a list or its string representation
+        setting_name: Name of the setting for logging purposes
+
+    Returns:
+        The validated lines with their text and alignment, None if there is no valid line
+    """
+    if value is None:
+        return None
+    try:
+        parsed_lines = parse_json_or_literal(value, setting_name)
+        if parsed_lines is None:
+            return None
+        validated_lines = validate_receipt_lines(parsed_lines)
+        if not validated_lines:
+            logger.warning(f"No valid receipt lines found in {setting_name}")
+            return None
+        return [{"text": line["text"], "align": line["align"]} for line in validated_lines]
+    except Exception as e:
+        logger.warning(f"Error processing {setting_name}: {e}")
+        return None
+
+
+def build_settings_snapshot(values: Dict[str, Any], version: int = 0) -> SettingsSnapshot:
+    """
+    Build a snapshot from the setting values resolved for a terminal.
+
+    Args:
+        values: Setting values by name, settings missing from the master are omitted
+        version: Version number of the snapshot
+
+    Returns:
+        SettingsSnapshot: The snapshot with the precomputed billing settings
+    """
+    snapshot = SettingsSnapshot(values=values, version=version)
+    snapshot.receipt_no_start_value = snapshot.get_value("RECEIPT_NO_START_VALUE")
+    snapshot.receipt_no_end_value = snapshot.get_value("RECEIPT_NO_END_VALUE")
+
+    invoice_registration_number = snapshot.get_value("INVOICE_REGISTRATION_NUMBER")
+    if isinstance(invoice_registration_number, str):
+        snapshot.invoice_registration_number = invoice_registration_number
+    elif invoice_registration_number is not None:
+        logger.warning(f"Invalid INVOICE_REGISTRATION_NUMBER format: {invoice_registration_number}")
+
+    snapshot.receipt_headers = make_receipt_lines(snapshot.get_value("RECEIPT_HEADERS"), "RECEIPT_HEADERS")
+    snapshot.receipt_footers = make_receipt_lines(snapshot.get_value("RECEIPT_FOOTERS"), "RECEIPT_FOOTERS")
+    return snapshot
+
+
+class SettingsSnapshotCache:
+    """Shared settings snapshot cache with TTL based background refresh per (tenant, store, terminal)."""
+
+    def __init__(self, ttl_seconds: int = 60):
+        """
+        Initialize the settings snapshot cache.
+
+        Args:
+            ttl_seconds: Age in seconds after which a snapshot is refreshed in the background (default: 60)
+        """
+        self._cache: Dict[Tuple[str, str, int], SettingsSnapshot] = {}
+        # Incremented on every invalidation so that loads started before a change are not stored
+        self._generation = 0
+        self._version = 0
+        self._refreshing: set[Tuple[str, str, int]] = set()
+        self._ttl = ttl_seconds
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def get(self, tenant_id: str, store_code: str, terminal_no: int) -> Optional[SettingsSnapshot]:
+        """
+        Get the cached snapshot of a terminal, including stale snapshots.
+
+        Args:
+            tenant_id: The tenant identifier
+            store_code: The store code
+            terminal_no: The terminal number
+
+        Returns:
+            SettingsSnapshot if cached, None otherwise
+        """
+        snapshot = self._cache.get((tenant_id, store_code, terminal_no))
+        if snapshot is None:
+            self._misses += 1
+            logger.debug(f"Settings snapshot miss for {tenant_id}/{store_code}/{terminal_no}")
+            return None
+        self._hits += 1
+        return snapshot
+
+    def is_stale(self, snapshot: SettingsSnapshot) -> bool:
+        """
+        Check whether a snapshot is older than the TTL and should be refreshed.
+
+        Args:
+            snapshot: The snapshot to check
+
+        Returns:
+            True if the snapshot should be refreshed
+        """
+        return time.time() - snapshot.loaded_at >= self._ttl
+
+    def get_generation(self) -> int:
+        """
+        Get the current generation, to be passed to set() after loading.
+
+        Returns:
+            Invalidation counter of the cache
+        """
+        return self._generation
+
+    def set(
+        self, tenant_id: str, store_code: str, terminal_no: int, snapshot: SettingsSnapshot, generation: int
+    ) -> bool:
+        """
+        Store the snapshot of a terminal with a new version unless it was invalidated while loading.
+
+        Args:
+            tenant_id: The tenant identifier
+            store_code: The store code
+            terminal_no: The terminal number
+            snapshot: The snapshot to store
+            generation: Generation returned by get_generation() before the load started
+
+        Returns:
+            True if the snapshot was stored, False if it was discarded
+        """
+        if self._generation != generation:
+            logger.debug(f"Discarding settings loaded before invalidation for {tenant_id}/{store_code}/{terminal_no}")
+            return False
+        self._version += 1
+        snapshot.version = self._version
+        self._cache[(tenant_id, store_code, terminal_no)] = snapshot
+        return True
+
+    def begin_refresh(self, tenant_id: str, store_code: str, terminal_no: int) -> bool:
+        """
+        Mark a terminal as being refreshed.
+
+        Args:
+            tenant_id: The tenant identifier
+            store_code: The store code
+            terminal_no: The terminal number
+
+        Returns:
+            True if the caller should refresh, False if a refresh is already running
+        """
+        key = (tenant_id, store_code, terminal_no)
+        if key in self._refreshing:
+            return False
+        self._refreshing.add(key)
+        return True
+
+    def end_refresh(self, tenant_id: str, store_code: str, terminal_no: int) -> None:
+        """
+        Mark the refresh of a terminal as finished.
+
+        Args:
+            tenant_id: The tenant identifier
+            store_code: The store code
+            terminal_no: The terminal number
+        """
+        self._refreshing.discard((tenant_id, store_code, terminal_no))
+
+    def invalidate(self, tenant_id: Optional[str] = None, store_code: Optional[str] = None) -> None:
+        """
+        Drop cached snapshots.
+
+        Args:
+            tenant_id: If provided, drop only snapshots for this tenant.
+                      If None, drop all snapshots.
+            store_code: If provided together with tenant_id, drop only the terminals of this store.
+        """
+        keys = [
+            key
+            for key in self._cache.keys()
+            if (tenant_id is None or key[0] == tenant_id) and (store_code is None or key[1] == store_code)
+        ]
+        for key in keys:
+            self._cache.pop(key, None)
+        self._generation += 1
+        self._invalidations += 1
+        logger.info(f"Settings snapshot cache invalidated: tenant_id={tenant_id}, store_code={store_code}")
+
+    def clear(self) -> None:
+        """
+        Clear all snapshots and reset statistics.
+        """
+        self._cache.clear()
+        self._generation += 1
+        self._refreshing.clear()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def stats(self) -> dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss/invalidation counters, number of cached terminals, the latest version and the TTL
+        """
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "invalidations": self._invalidations,
+            "cached_terminals": len(self._cache),
+            "version": self._version,
+            "ttl_seconds": self._ttl,
+        }
+
+
+# Create a singleton cache instance shared by the cart and transaction services
+settings_snapshot_cache = SettingsSnapshotCache(ttl_seconds=cart_settings.SETTINGS_SNAPSHOT_TTL_SECONDS)
+
+
+async def get_settings_snapshot_async(settings_master_repo, terminal_info: TerminalInfoDocument) -> SettingsSnapshot:
+    """
+    Get the settings snapshot of a terminal, loading it on the first request.
+
+    A stale snapshot is returned immediately while it is refreshed in the background.
+    With the snapshot disabled, or when all settings cannot be loaded, only the billing
+    settings are looked up by name on each call.
+
+    Args:
+        settings_master_repo: Settings master repository of the terminal
+        terminal_info: Terminal information of the request
+
+    Returns:
+        SettingsSnapshot: The settings snapshot of the terminal
+    """
+    if not settings.USE_SETTINGS_SNAPSHOT:
+        return await _lookup_billing_settings_async(settings_master_repo, terminal_info)
+
+    key = (terminal_info.tenant_id, terminal_info.store_code, terminal_info.terminal_no)
+    snapshot = settings_snapshot_cache.get(*key)
+    if snapshot is None:
+        generation = settings_snapshot_cache.get_generation()
+        try:
+            snapshot = await _load_settings_snapshot_async(settings_master_repo, terminal_info)
+        except Exception as e:
+            logger.warning(f"Failed to load settings snapshot for {key}, looking up settings by name: {e}")
+            return await _lookup_billing_settings_async(settings_master_repo, terminal_info)
+        settings_snapshot_cache.set(*key, snapshot, generation)
+        return snapshot
+
+    if settings_snapshot_cache.is_stale(snapshot) and settings_snapshot_cache.begin_refresh(*key):
+        task = asyncio.create_task(_refresh_settings_snapshot_async(settings_master_repo, terminal_info))
+        _refresh_tasks.add(task)
+        task.add_done_callback(_refresh_tasks.discard)
+    return snapshot
+
+
+async def get_setting_value_async(settings_master_repo, terminal_info: TerminalInfoDocument, name: str) -> Any:
+    """
+    Get a setting value of a terminal from its settings snapshot.
+
+    When the snapshot holds the billing settings only, other settings are looked up
+    by name instead of falling back to the settings module defaults.
+
+    Args:
+        settings_master_repo: Settings master repository of the terminal
+        terminal_info: Terminal information of the request
+        name: Name of the setting
+
+    Returns:
+        The value of the setting or None if not found
+    """
+    snapshot = await get_settings_snapshot_async(settings_master_repo, terminal_info)
+    if not snapshot.billing_only or name in BILLING_SETTING_NAMES:
+        return snapshot.get_value(name)
+    setting_doc = await _lookup_setting_async(settings_master_repo, name)
+    if setting_doc is None:
+        return getattr(settings, name, None)
+    return _resolve_value(setting_doc, terminal_info)
+
+
+async def _load_settings_snapshot_async(settings_master_repo, terminal_info: TerminalInfoDocument) -> SettingsSnapshot:
+    """
+    Load all settings of the terminal with one request and build the snapshot.
+
+    Args:
+        settings_master_repo: Settings master repository of the terminal
+        terminal_info: Terminal information of the request
+
+    Returns:
+        SettingsSnapshot: The new snapshot
+    """
+    setting_docs = await settings_master_repo.get_all_settings_async()
+    values = {doc.name: _resolve_value(doc, terminal_info) for doc in setting_docs if doc.name is not None}
+    return build_settings_snapshot(values)
+
+
+async def _refresh_settings_snapshot_async(settings_master_repo, terminal_info: TerminalInfoDocument) -> None:
+    """
+    Reload the cached snapshot of a terminal in the background.
+
+    The stale snapshot is kept when the reload fails, and the next request retries.
+
+    Args:
+        settings_master_repo: Settings master repository of the terminal
+        terminal_info: Terminal information of the request
+    """
+    key = (terminal_info.tenant_id, terminal_info.store_code, terminal_info.terminal_no)
+    try:
+        generation = settings_snapshot_cache.get_generation()
+        snapshot = await _load_settings_snapshot_async(settings_master_repo, terminal_info)
+        settings_snapshot_cache.set(*key, snapshot, generation)
+        logger.debug(f"Settings snapshot refreshed for {key}")
+    except Exception as e:
+        logger.warning(f"Failed to refresh settings snapshot for {key}: {e}")
+    finally:
+        settings_snapshot_cache.end_refresh(*key)
+
+
+async def _lookup_billing_settings_async(
+    settings_master_repo, terminal_info: TerminalInfoDocument
+) -> SettingsSnapshot:
+    """
+    Build a snapshot that is not cached from the billing settings looked up one by one.
+
+    Args:
+        settings_master_repo: Settings master repository of the terminal
+        terminal_info: Terminal information of the request
+
+    Returns:
+        SettingsSnapshot: Snapshot holding the billing settings only
+    """
+    values = {}
+    for name in BILLING_SETTING_NAMES:
+        setting_doc = await _lookup_setting_async(settings_master_repo, name)
+        if setting_doc is not None:
+            values[name] = _resolve_value(setting_doc, terminal_info)
+    snapshot = build_settings_snapshot(values)
+    snapshot.billing_only = True
+    return snapshot
+
+
+async def _lookup_setting_async(settings_master_repo, name: str) -> Optional[SettingsMasterDocument]:
+    """
+    Look up a single setting by name, as done before the snapshot was introduced.
+
+    Args:
+        settings_master_repo: Settings master repository of the terminal
+        name: Name of the setting
+
+    Returns:
+        The settings document, None if it is not in the master or cannot be retrieved
+    """
+    try:
+        return await settings_master_repo.get_settings_value_by_name_async(name)
+    except Exception:
+        return None
+
+
+def _resolve_value(setting_doc: SettingsMasterDocument, terminal_info: TerminalInfoDocument) -> Any:
+    """
+    Resolve the value of a setting for the store and terminal.
+
+    Args:
+        setting_doc: The settings document
+        terminal_info: Terminal information of the request
+
+    Returns:
+        The value for the terminal, the store, the tenant or the default value of the setting
+    """
+    return get_setting_value(
+        name=setting_doc.name,
+        store_code=terminal_info.store_code,
+        terminal_no=terminal_info.terminal_no,
+        setting=setting_doc,
+    )
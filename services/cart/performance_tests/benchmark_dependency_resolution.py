@@ -0,0 +1,140 @@
+# Copyright 2025 masa@kugel
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro-benchmark of the cart service dependency resolution
+
+Compares the request-scoped construction (USE_SERVICE_CONTAINER=False) with the
+shared service container (USE_SERVICE_CONTAINER=True). The MongoDB client is created
+without the initial connection test and connects lazily, so neither MongoDB nor the
+other services need to be running.
+
+Usage (from services/cart):
+    PYTHONPATH=../commons/src python -m performance_tests.benchmark_dependency_resolution [iterations]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from kugel_common.database import database as db_helper
+from kugel_common.models.documents.terminal_info_document import TerminalInfoDocument
+from app.config.settings import settings
+from app.dependencies.cart_service_container import (
+    CartServiceContainer,
+    cart_service_container,
+    get_service_container,
+)
+from app.dependencies.get_cart_service import get_cart_service_with_cart_id_async
+from app.models.repositories.terminal_counter_repository import TerminalCounterRepository
+from app.models.repositories.tranlog_repository import TranlogRepository
+from app.models.repositories.tranlog_delivery_status_repository import TranlogDeliveryStatusRepository
+from app.models.repositories.transaction_status_repository import TransactionStatusRepository
+
+TERMINAL_INFO = TerminalInfoDocument(
+    tenant_id="T9999",
+    store_code="S9999",
+    terminal_no=1,
+    terminal_id="T9999-S9999-1",
+    api_key="benchmark",
+)
+
+
+async def setup_repositories_async(container: CartServiceContainer) -> None:
+    """
+    Database part of the dependency: database handles and the repositories with a collection.
+
+    Args:
+        container: The container used to look up databases and collections
+    """
+    db_name = f"{settings.DB_NAME_PREFIX}_{TERMINAL_INFO.tenant_id}"
+    db_common_name = f"{settings.DB_NAME_PREFIX}_commons"
+    db = await container.get_db_async(db_name)
+    db_common = await container.get_db_async(db_common_name)
+    container.bind_collection(TerminalCounterRepository(db=db, terminal_info=TERMINAL_INFO), db_name)
+    container.bind_collection(TranlogRepository(db=db, terminal_info=TERMINAL_INFO), db_name)
+    container.bind_collection(
+        TranlogDeliveryStatusRepository(db=db_common, terminal_info=TERMINAL_INFO), db_common_name
+    )
+    container.bind_collection(TransactionStatusRepository(db=db, terminal_info=TERMINAL_INFO), db_name)
+
+
+async def measure_async(func, iterations: int) -> list[float]:
+    """
+    Measure an async function.
+
+    Args:
+        func: Coroutine function without arguments
+        iterations: Number of measured calls
+
+    Returns:
+        List of durations in microseconds
+    """
+    for _ in range(min(iterations, 100)):  # warm up
+        await func()
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await func()
+        durations.append((time.perf_counter() - start) * 1_000_000)
+    return durations
+
+
+def print_result(name: str, before: list[float], after: list[float]) -> None:
+    """
+    Print the comparison of two measurements.
+
+    Args:
+        name: Name of the measured part
+        before: Durations with the request-scoped construction
+        after: Durations with the shared service container
+    """
+    before_median = statistics.median(before)
+    after_median = statistics.median(after)
+    print(f"{name}")
+    print(f"  request-scoped : median {before_median:9.1f} us, mean {statistics.mean(before):9.1f} us")
+    print(f"  container      : median {after_median:9.1f} us, mean {statistics.mean(after):9.1f} us")
+    print(f"  reduction      : {(1 - after_median / before_median) * 100:.1f} %")
+
+
+async def main_async(iterations: int) -> None:
+    async def resolve_dependency_async():
+        # resolved like FastAPI does, the request-scoped container is closed after the request
+        dependency = get_service_container()
+        container = await dependency.__anext__()
+        await get_cart_service_with_cart_id_async(
+            terminal_info=TERMINAL_INFO, cart_id="benchmark-cart", container=container
+        )
+        await dependency.aclose()
+
+    # Same client as get_client_async() creates, without the server_info() connection test
+    db_helper.client = AsyncIOMotorClient(host=db_helper.MONGODB_URI)
+
+    print(f"Cart service dependency resolution ({iterations} iterations)")
+
+    before = await measure_async(lambda: setup_repositories_async(CartServiceContainer()), iterations)
+    after = await measure_async(lambda: setup_repositories_async(cart_service_container), iterations)
+    print_result("Database handles and repository collections", before, after)
+
+    settings.USE_SERVICE_CONTAINER = False
+    before = await measure_async(resolve_dependency_async, iterations)
+    settings.USE_SERVICE_CONTAINER = True
+    after = await measure_async(resolve_dependency_async, iterations)
+    print_result("Complete dependency (including services and plugins)", before, after)
+
+
+if __name__ == "__main__":
+    asyncio.run(main_async(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
@@ -0,0 +1,155 @@
+# Copyright 2025 masa@kugel
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro-benchmark of the receipt and journal text rendering
+
+Compares the XML round trip (USE_COMPILED_RECEIPT=False) with the compiled renderer
+(USE_COMPILED_RECEIPT=True) on the sample receipt of a transaction log, checks that both
+produce the same texts and prints the number of receipts rendered per second.
+No running services are required.
+
+Usage (from services/cart):
+    PYTHONPATH=../commons/src python -m performance_tests.benchmark_receipt_rendering [iterations]
+"""
+
+import sys
+import time
+
+from kugel_common.config.settings import settings
+from kugel_common.models.documents.base_tranlog import BaseTransaction
+from kugel_common.receipt.receipt_renderer import receipt_renderer
+from app.services.strategies.receipt_data.receipt_data_sample import ReceiptDataSample
+
+
+def make_tranlog(item_count: int = 10) -> BaseTransaction:
+    """
+    Create a sales transaction log with the receipt headers and footers of a store.
+
+    Args:
+        item_count: Number of line items
+
+    Returns:
+        BaseTransaction: The transaction log
+    """
+    line_items = [
+        BaseTransaction.LineItem(
+            line_no=no,
+            item_code=f"49{no:011d}",
+            description=f"商品{no:03d} サンプル",
+            unit_price=120.0 * no,
+            quantity=no % 3 + 1,
+            amount=120.0 * no * (no % 3 + 1),
+            tax_code="01",
+        )
+        for no in range(1, item_count + 1)
+    ]
+    total_amount = sum(line_item.amount for line_item in line_items)
+    return BaseTransaction(
+        tenant_id="T9999",
+        store_code="S9999",
+        terminal_no=1,
+        transaction_no=1,
+        transaction_type=101,
+        receipt_no=1,
+        generate_date_time="2025-01-01T10:00:00",
+        staff=BaseTransaction.Staff(id="STF001", name="Staff"),
+        sales=BaseTransaction.SalesInfo(
+            total_amount=total_amount,
+            total_amount_with_tax=total_amount * 1.1,
+            total_quantity=sum(line_item.quantity for line_item in line_items),
+        ),
+        line_items=line_items,
+        taxes=[
+            BaseTransaction.Tax(
+                tax_no=1,
+                tax_code="01",
+                tax_type="External",
+                tax_name="外税10%",
+                tax_amount=total_amount * 0.1,
+                target_amount=total_amount,
+            )
+        ],
+        payments=[
+            BaseTransaction.Payment(
+                payment_no=1,
+                payment_code="01",
+                deposit_amount=total_amount * 1.1,
+                amount=total_amount * 1.1,
+                description="現金",
+            )
+        ],
+        additional_info={
+            "invoice_registration_number": "T1234567890123",
+            "receipt_headers": [
+                {"text": "Kugel Store", "align": "center"},
+                {"text": "Tokyo 1-2-3", "align": "center"},
+                {"text": "TEL 03-0000-0000", "align": "center"},
+            ],
+            "receipt_footers": [{"text": "Thank you", "align": "center"}],
+        },
+    )
+
+
+def measure(func, iterations: int) -> float:
+    """
+    Measure a function.
+
+    Args:
+        func: Function without arguments
+        iterations: Number of measured calls
+
+    Returns:
+        Number of calls per second
+    """
+    for _ in range(min(iterations, 100)):  # warm up
+        func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return iterations / (time.perf_counter() - start)
+
+
+def main(iterations: int) -> None:
+    receipt_data = ReceiptDataSample(name="benchmark", width=32)
+    tranlog = make_tranlog()
+    print_data = receipt_data.generate_print_data(tranlog)
+
+    settings.USE_COMPILED_RECEIPT = False
+    expected = (receipt_data.make_receipt_text(print_data), receipt_data.make_journal_text(print_data))
+    texts_before = measure(
+        lambda: (receipt_data.make_receipt_text(print_data), receipt_data.make_journal_text(print_data)), iterations
+    )
+    receipts_before = measure(lambda: receipt_data.make_receipt_data(tranlog), iterations)
+
+    settings.USE_COMPILED_RECEIPT = True
+    rendered = (receipt_data.make_receipt_text(print_data), receipt_data.make_journal_text(print_data))
+    if rendered != expected:
+        raise SystemExit("The compiled renderer does not produce the same texts")
+    texts_after = measure(
+        lambda: (receipt_data.make_receipt_text(print_data), receipt_data.make_journal_text(print_data)), iterations
+    )
+    receipts_after = measure(lambda: receipt_data.make_receipt_data(tranlog), iterations)
+
+    print(f"Receipt rendering ({iterations} iterations, {len(print_data.pages[0].lines)} lines per receipt)")
+    print("Receipt and journal texts from the print data")
+    print(f"  XML round trip : {texts_before:9.0f} receipts/s")
+    print(f"  compiled       : {texts_after:9.0f} receipts/s ({texts_after / texts_before:.1f}x)")
+    print("Complete receipt data (including the print data of the transaction log)")
+    print(f"  XML round trip : {receipts_before:9.0f} receipts/s")
+    print(f"  compiled       : {receipts_after:9.0f} receipts/s ({receipts_after / receipts_before:.1f}x)")
+    print(f"Renderer statistics: {receipt_renderer.stats()}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -23,6 +23,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 from app.models.repositories.item_master_grpc_repository import ItemMasterGrpcRepository
 from kugel_common.models.documents.terminal_info_document import TerminalInfoDocument
 import app.utils.grpc_channel_helper as channel_helper
+from app.utils.item_master_cache import item_master_cache
 
 
 @pytest.fixture
@@ -55,6 +56,14 @@ def clear_channel_cache():
     channel_helper._stubs.clear()
 
 
+@pytest.fixture(autouse=True)
+def clear_shared_item_cache():
+    """Clear the process-wide item master cache before and after each test"""
+    item_master_cache.clear()
+    yield
+    item_master_cache.clear()
+
+
 @pytest.mark.asyncio
 async def test_get_item_by_code_uses_module_level_stub(repository):
     """Test that get_item_by_code_async uses module-level channel helper"""
@@ -210,3 +219,41 @@ async def test_set_item_master_documents(repository):
     assert len(repository.item_master_documents) == 2
     assert repository.item_master_documents[0].item_code == "ITEM001"
     assert repository.item_master_documents[1].item_code == "ITEM002"
+
+
+@pytest.mark.asyncio
+async def test_get_items_by_codes_fetches_misses_in_one_rpc(repository):
+    """Test that get_items_by_codes_async serves cache hits and fetches all misses with GetItemDetails"""
+    from app.models.documents.item_master_document import ItemMasterDocument
+
+    repository.set_item_master_documents([ItemMasterDocument(item_code="CACHED_ITEM")])
+
+    def _item_response(code):
+        item_response = MagicMock()
+        item_response.item_code = code
+        item_response.item_name = f"Item {code}"
+        item_response.price = 100
+        item_response.tax_code = "T1"
+        item_response.category_code = "CAT1"
+        item_response.is_active = True
+        return item_response
+
+    mock_response = MagicMock()
+    mock_response.items = [_item_response("ITEM001"), _item_response("ITEM002")]
+    mock_response.not_found_item_codes = ["MISSING"]
+
+    mock_stub = MagicMock()
+    mock_stub.GetItemDetails = AsyncMock(return_value=mock_response)
+
+    with patch(
+        'app.models.repositories.item_master_grpc_repository.get_master_data_grpc_stub',
+        new_callable=AsyncMock,
+        return_value=mock_stub,
+    ):
+        items = await repository.get_items_by_codes_async(["CACHED_ITEM", "ITEM001", "ITEM002", "MISSING"])
+
+    assert set(items.keys()) == {"CACHED_ITEM", "ITEM001", "ITEM002"}
+    mock_stub.GetItemDetails.assert_awaited_once()
+    request = mock_stub.GetItemDetails.call_args.args[0]
+    assert list(request.item_codes) == ["ITEM001", "ITEM002", "MISSING"]
+    assert item_master_cache.get("test_tenant", "STORE01", "ITEM002") is not None
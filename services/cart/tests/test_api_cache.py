@@ -134,3 +134,120 @@ async def test_clear_cache_when_empty():
     body = resp.json()
     assert body["data"]["items_cleared"] == 0
     mock_clear.assert_called_once_with("tenant1")
+
+
+# ---------------------------------------------------------------------------
+# item cache
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_get_item_cache_status_success():
+    app = _make_app()
+    app.dependency_overrides[get_current_user] = lambda: MOCK_USER
+
+    mock_cache = MagicMock()
+    mock_cache.size.side_effect = [4, 12]
+    mock_cache.stats.return_value = {"hits": 8, "misses": 2}
+
+    with patch("app.api.v1.cache.item_master_cache", mock_cache):
+        transport = ASGITransport(app=app, raise_app_exceptions=False)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.get("/api/v1/cache/item/status")
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["data"]["cache_type"] == "item_master"
+    assert body["data"]["tenant_cache_size"] == 4
+    assert body["data"]["total_cache_size"] == 12
+    assert body["data"]["statistics"] == {"hits": 8, "misses": 2}
+
+
+@pytest.mark.asyncio
+async def test_clear_item_cache_success():
+    app = _make_app()
+    app.dependency_overrides[get_current_user] = lambda: MOCK_USER
+
+    mock_cache = MagicMock()
+    mock_cache.size.return_value = 7
+
+    with patch("app.api.v1.cache.item_master_cache", mock_cache):
+        transport = ASGITransport(app=app, raise_app_exceptions=False)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.delete("/api/v1/cache/item")
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["data"]["items_cleared"] == 7
+    mock_cache.clear.assert_called_once_with("tenant1")
+
+
+# ---------------------------------------------------------------------------
+# promotion cache
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_clear_promotion_cache_success():
+    app = _make_app()
+    app.dependency_overrides[get_current_user] = lambda: MOCK_USER
+
+    mock_cache = MagicMock()
+
+    with patch("app.api.v1.cache.promotion_cache", mock_cache):
+        transport = ASGITransport(app=app, raise_app_exceptions=False)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.delete("/api/v1/cache/promotion")
+
+    assert resp.status_code == 200
+    assert resp.json()["data"]["cache_type"] == "promotion"
+    mock_cache.invalidate.assert_called_once_with("tenant1")
+
+
+@pytest.mark.asyncio
+async def test_promotion_event_invalidates_tenant():
+    app = _make_app()
+    mock_cache = MagicMock()
+    event = {"data": {"tenant_id": "tenant1", "promotion_code": "PROMO-01", "operation": "update"}}
+
+    with patch("app.api.v1.cache.promotion_cache", mock_cache):
+        transport = ASGITransport(app=app, raise_app_exceptions=False)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.post("/api/v1/cache/master-data/events", json=event)
+
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "SUCCESS"}
+    mock_cache.invalidate.assert_called_once_with("tenant1")
+
+
+@pytest.mark.asyncio
+async def test_promotion_event_without_tenant_is_dropped():
+    app = _make_app()
+    mock_cache = MagicMock()
+
+    with patch("app.api.v1.cache.promotion_cache", mock_cache):
+        transport = ASGITransport(app=app, raise_app_exceptions=False)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.post("/api/v1/cache/master-data/events", json={"data": {}})
+
+    assert resp.json() == {"status": "DROP"}
+    mock_cache.invalidate.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_settings_event_invalidates_settings_snapshots():
+    app = _make_app()
+    mock_promotion_cache = MagicMock()
+    mock_settings_cache = MagicMock()
+    event = {"data": {"tenant_id": "tenant1", "master_type": "settings", "name": "RECEIPT_HEADERS"}}
+
+    with patch("app.api.v1.cache.promotion_cache", mock_promotion_cache), patch(
+        "app.api.v1.cache.settings_snapshot_cache", mock_settings_cache
+    ):
+        transport = ASGITransport(app=app, raise_app_exceptions=False)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.post("/api/v1/cache/master-data/events", json=event)
+
+    assert resp.json() == {"status": "SUCCESS"}
+    mock_settings_cache.invalidate.assert_called_once_with("tenant1")
+    mock_promotion_cache.invalidate.assert_not_called()
@@ -0,0 +1,234 @@
+# Copyright 2025 masa@kugel  # # Licensed under the Apache License, Version 2.0 (the "License");  # you may not use this file except in compliance with the License.  # You may obtain a copy of the License at  # #     http://www.apache.org/licenses/LICENSE-2.0  # # Unless required by applicable law or agreed to in writing, software  # distributed under the License is distributed on an "AS IS" BASIS,  # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  # See the License for the specific language governing permissions and  # limitations under the License.
+"""
+Property-based equivalence tests for the incremental subtotal calculation.
+
+Random carts are generated and changed by random cart operations. After every
+operation the incremental calculation must produce exactly the same cart document
+as a full recalculation of a copy of the cart.
+"""
+
+import random
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from kugel_common.enums import TaxType, RoundMethod
+from kugel_common.models.documents.base_tranlog import BaseTransaction
+from app.enums.discount_type import DiscountType
+from app.models.documents.cart_document import CartDocument
+from app.models.documents.tax_master_document import TaxMasterDocument
+from app.services.logics import calc_subtotal_logic
+from app.services.logics.subtotal_calc_state import SubtotalCalcState, SubtotalCalcStateCache
+
+
+TAX_MASTERS = {
+    "01": TaxMasterDocument(
+        tax_code="01", tax_type=TaxType.External.value, tax_name="External 10%", rate=10.0,
+        round_digit=0, round_method=RoundMethod.Floor.value,
+    ),
+    "02": TaxMasterDocument(
+        tax_code="02", tax_type=TaxType.Internal.value, tax_name="Internal 8%", rate=8.0,
+        round_digit=0, round_method=RoundMethod.Round.value,
+    ),
+    "03": TaxMasterDocument(
+        tax_code="03", tax_type=TaxType.External.value, tax_name="External 7.5%", rate=7.5,
+        round_digit=2, round_method=RoundMethod.Ceil.value,
+    ),
+    "04": TaxMasterDocument(
+        tax_code="04", tax_type=TaxType.Exempt.value, tax_name="Exempt", rate=0.0,
+        round_digit=0, round_method=RoundMethod.Round.value,
+    ),
+}
+
+
+def _make_tax_master_repo():
+    repo = MagicMock()
+    repo.get_tax_by_code = AsyncMock(side_effect=lambda tax_code: TAX_MASTERS[tax_code])
+    return repo
+
+
+def _random_price(rng: random.Random) -> float:
+    # Mix integral prices with prices that are not exactly representable as floats
+    return rng.choice([float(rng.randint(1, 5000)), rng.randint(1, 50000) / 100, rng.randint(1, 999) / 10])
+
+
+def _random_discount(rng: random.Random, seq_no: int) -> BaseTransaction.DiscountInfo:
+    if rng.random() < 0.6:
+        return BaseTransaction.DiscountInfo(
+            seq_no=seq_no,
+            discount_type=DiscountType.DiscountPercentage.value,
+            discount_value=float(rng.choice([5, 10, 12.5, 15, 33, 50])),
+        )
+    return BaseTransaction.DiscountInfo(
+        seq_no=seq_no,
+        discount_type=DiscountType.DiscountAmount.value,
+        discount_value=float(rng.randint(1, 50)),
+    )
+
+
+def _random_line_item(rng: random.Random, line_no: int) -> CartDocument.CartLineItem:
+    line_item = CartDocument.CartLineItem(
+        line_no=line_no,
+        item_code=f"ITEM{line_no:04d}",
+        unit_price=_random_price(rng),
+        quantity=rng.randint(1, 12),
+        tax_code=rng.choice(list(TAX_MASTERS.keys())),
+        discounts=[],
+        discounts_allocated=[],
+    )
+    for seq_no in range(1, rng.randint(0, 2) + 1):
+        line_item.discounts.append(_random_discount(rng, seq_no))
+    return line_item
+
+
+def _random_cart(rng: random.Random, line_count: int) -> CartDocument:
+    cart = CartDocument(
+        cart_id=f"cart-{rng.randint(0, 10**9)}",
+        tenant_id="T001",
+        store_code="S001",
+        sales=BaseTransaction.SalesInfo(),
+        line_items=[_random_line_item(rng, line_no) for line_no in range(1, line_count + 1)],
+        subtotal_discounts=[],
+        payments=[],
+    )
+    return cart
+
+
+def _mutate(rng: random.Random, cart: CartDocument) -> None:
+    """Apply one random cart operation, as the cart service would."""
+    active = [line_item for line_item in cart.line_items if not line_item.is_cancelled]
+    operation = rng.choice(
+        ["add", "add", "cancel", "quantity", "price", "discount", "allocate", "subtotal_discount", "payment", "none"]
+    )
+    if operation == "add" or not active:
+        cart.line_items.append(_random_line_item(rng, len(cart.line_items) + 1))
+    elif operation == "cancel":
+        rng.choice(active).is_cancelled = True
+    elif operation == "quantity":
+        rng.choice(active).quantity = rng.randint(1, 12)
+    elif operation == "price":
+        line_item = rng.choice(active)
+        line_item.unit_price = _random_price(rng)
+        line_item.is_unit_price_changed = True
+    elif operation == "discount":
+        line_item = rng.choice(active)
+        line_item.discounts.append(_random_discount(rng, len(line_item.discounts) + 1))
+    elif operation == "allocate":
+        line_item = rng.choice(active)
+        line_item.discounts_allocated = [
+            BaseTransaction.DiscountInfo(seq_no=1, discount_amount=float(rng.randint(0, 30)) + rng.choice([0, 0.5]))
+        ]
+    elif operation == "subtotal_discount":
+        cart.subtotal_discounts.append(
+            BaseTransaction.DiscountInfo(
+                seq_no=len(cart.subtotal_discounts) + 1,
+                discount_type=DiscountType.DiscountAmount.value,
+                discount_amount=float(rng.randint(1, 100)),
+            )
+        )
+        # the subtotal discount is allocated to every active line item
+        for line_item in active:
+            line_item.discounts_allocated = [
+                BaseTransaction.DiscountInfo(seq_no=1, discount_amount=rng.randint(0, 200) / 10)
+            ]
+    elif operation == "payment":
+        cart.payments.append(BaseTransaction.Payment(payment_no=len(cart.payments) + 1, amount=float(rng.randint(1, 1000))))
+
+
+async def _assert_equivalent(cart: CartDocument, calc_state: SubtotalCalcState, tax_master_repo) -> None:
+    expected = cart.model_copy(deep=True)
+    expected = await calc_subtotal_logic.calc_subtotal_async(expected, tax_master_repo)
+    actual = await calc_subtotal_logic.calc_subtotal_async(cart, tax_master_repo, calc_state)
+    assert actual.model_dump() == expected.model_dump()
+
+
+class TestIncrementalSubtotalEquivalence:
+    """The incremental calculation always equals the full recalculation."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("seed", range(40))
+    async def test_random_operation_sequences(self, seed):
+        rng = random.Random(seed)
+        tax_master_repo = _make_tax_master_repo()
+        cart = _random_cart(rng, rng.randint(0, 40))
+        calc_state = SubtotalCalcState()
+
+        await _assert_equivalent(cart, calc_state, tax_master_repo)
+        for _ in range(25):
+            _mutate(rng, cart)
+            await _assert_equivalent(cart, calc_state, tax_master_repo)
+            if rng.random() < 0.3:
+                # recalculate without changes, e.g. the second subtotal phase
+                await _assert_equivalent(cart, calc_state, tax_master_repo)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("seed", range(5))
+    async def test_state_of_another_cart_gives_same_result(self, seed):
+        """A state that does not belong to the cart only causes recalculation."""
+        rng = random.Random(1000 + seed)
+        tax_master_repo = _make_tax_master_repo()
+        calc_state = SubtotalCalcState()
+        await calc_subtotal_logic.calc_subtotal_async(_random_cart(rng, 30), tax_master_repo, calc_state)
+
+        await _assert_equivalent(_random_cart(rng, 30), calc_state, tax_master_repo)
+
+
+class TestIncrementalSubtotalWork:
+    """The incremental calculation only recalculates what changed."""
+
+    @pytest.mark.asyncio
+    async def test_single_line_change_recalculates_one_line_and_tax(self):
+        rng = random.Random(42)
+        tax_master_repo = _make_tax_master_repo()
+        cart = _random_cart(rng, 300)
+        calc_state = SubtotalCalcState()
+        await calc_subtotal_logic.calc_subtotal_async(cart, tax_master_repo, calc_state)
+        assert calc_state.lines_calculated == 300
+
+        cart.line_items[150].quantity += 1
+        await calc_subtotal_logic.calc_subtotal_async(cart, tax_master_repo, calc_state)
+
+        assert calc_state.lines_calculated == 301
+        assert calc_state.taxes_calculated == len(cart.taxes) + 1
+
+    @pytest.mark.asyncio
+    async def test_unchanged_cart_recalculates_nothing(self):
+        rng = random.Random(7)
+        tax_master_repo = _make_tax_master_repo()
+        cart = _random_cart(rng, 50)
+        calc_state = SubtotalCalcState()
+        await calc_subtotal_logic.calc_subtotal_async(cart, tax_master_repo, calc_state)
+        lines_calculated, taxes_calculated = calc_state.lines_calculated, calc_state.taxes_calculated
+
+        await calc_subtotal_logic.calc_subtotal_async(cart, tax_master_repo, calc_state)
+
+        assert calc_state.lines_calculated == lines_calculated
+        assert calc_state.taxes_calculated == taxes_calculated
+
+
+class TestSubtotalCalcStateCache:
+    """Tests for the per-cart state LRU."""
+
+    def test_get_returns_same_state_for_cart(self):
+        cache = SubtotalCalcStateCache(max_size=2)
+
+        assert cache.get("cart-1") is cache.get("cart-1")
+
+    def test_least_recently_used_state_is_evicted(self):
+        cache = SubtotalCalcStateCache(max_size=2)
+        state1 = cache.get("cart-1")
+        cache.get("cart-2")
+        cache.get("cart-1")
+        cache.get("cart-3")
+
+        assert cache.get("cart-1") is state1
+        assert len(cache._states) == 2
+        assert "cart-2" not in cache._states
+
+    def test_remove(self):
+        cache = SubtotalCalcStateCache(max_size=2)
+        state = cache.get("cart-1")
+
+        cache.remove("cart-1")
+
+        assert cache.get("cart-1") is not state
@@ -89,6 +89,7 @@ def _build_service(terminal_info=None, cart_doc=None):
     item_master_repo.item_master_documents = []
     item_master_repo.set_item_master_documents = MagicMock()
     item_master_repo.get_item_by_code_async = AsyncMock()
+    item_master_repo.get_items_by_codes_async = AsyncMock(return_value={})
     settings_master_repo.set_settings_master_documents = MagicMock()
     tax_master_repo.set_tax_master_documents = MagicMock()
     tax_master_repo.tax_master_documents = []
@@ -114,7 +115,7 @@ def _build_service(terminal_info=None, cart_doc=None):
         "app.services.cart_service.calc_subtotal_logic"
     )
     mock_subtotal_logic = patcher.start()
-    mock_subtotal_logic.calc_subtotal_async = AsyncMock(side_effect=lambda cart, repo: cart)
+    mock_subtotal_logic.calc_subtotal_async = AsyncMock(side_effect=lambda cart, repo, calc_state=None: cart)
 
     # Patch CartStrategyManager to avoid file I/O
     with patch("app.services.cart_service.CartStrategyManager") as MockStrategyMgr:
@@ -231,7 +232,7 @@ class TestCartServiceAddItem:
         mock_item.unit_price = 500.0
         mock_item.tax_code = "T01"
         mock_item.is_discount_restricted = False
-        svc.item_master_repo.get_item_by_code_async = AsyncMock(return_value=mock_item)
+        svc.item_master_repo.get_items_by_codes_async = AsyncMock(return_value={"ITEM001": mock_item})
 
         add_list = [{"item_code": "ITEM001", "unit_price": None, "quantity": 2}]
         result = await svc.add_item_to_cart_async(add_list)
@@ -245,13 +246,39 @@ class TestCartServiceAddItem:
         cart = _make_cart_doc(status="Idle")
         svc = _build_service(cart_doc=cart)
         svc.state_manager.set_state(CartStatus.Idle.value)
-        svc.item_master_repo.get_item_by_code_async = AsyncMock(
-            side_effect=NotFoundException("not found", "item_master", "BAD")
-        )
+        svc.item_master_repo.get_items_by_codes_async = AsyncMock(return_value={})
 
         with pytest.raises(ItemNotFoundException):
             await svc.add_item_to_cart_async([{"item_code": "BAD", "unit_price": 100, "quantity": 1}])
 
+    @pytest.mark.asyncio
+    async def test_add_multiple_items_uses_single_batch_lookup(self):
+        """Items of a multi-item request should be resolved with one batch lookup."""
+        cart = _make_cart_doc(status="Idle")
+        svc = _build_service(cart_doc=cart)
+        svc.state_manager.set_state(CartStatus.Idle.value)
+
+        def _mock_item(code):
+            item = MagicMock()
+            item.item_code = code
+            item.store_price = None
+            item.unit_price = 100.0
+            return item
+
+        svc.item_master_repo.get_items_by_codes_async = AsyncMock(
+            return_value={"ITEM001": _mock_item("ITEM001"), "ITEM002": _mock_item("ITEM002")}
+        )
+
+        add_list = [
+            {"item_code": "ITEM001", "unit_price": None, "quantity": 1},
+            {"item_code": "ITEM002", "unit_price": None, "quantity": 1},
+            {"item_code": "ITEM001", "unit_price": None, "quantity": 3},
+        ]
+        result = await svc.add_item_to_cart_async(add_list)
+
+        svc.item_master_repo.get_items_by_codes_async.assert_awaited_once_with(["ITEM001", "ITEM002", "ITEM001"])
+        assert [line.item_code for line in result.line_items] == ["ITEM001", "ITEM002", "ITEM001"]
+
 
 class TestCartServiceCancelLineItem:
     """Tests for cancel_line_item_from_cart_async."""
@@ -0,0 +1,145 @@
+# Copyright 2025 masa@kugel  # # Licensed under the Apache License, Version 2.0 (the "License");  # you may not use this file except in compliance with the License.  # You may obtain a copy of the License at  # #     http://www.apache.org/licenses/LICENSE-2.0  # # Unless required by applicable law or agreed to in writing, software  # distributed under the License is distributed on an "AS IS" BASIS,  # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  # See the License for the specific language governing permissions and  # limitations under the License.
+"""
+Unit tests for the cart service container.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from kugel_common.database import database as db_helper
+from kugel_common.models.documents.terminal_info_document import TerminalInfoDocument
+from app.config.settings import settings
+from app.dependencies.cart_service_container import (
+    CartServiceContainer,
+    cart_service_container,
+    get_service_container,
+)
+from app.services.cart_service import CartService
+
+
+@pytest.fixture
+def fake_db_helper(monkeypatch):
+    """Replace the MongoDB helper with one returning mock databases of the current client."""
+    calls = []
+
+    async def fake_get_db_async(db_name):
+        calls.append(db_name)
+        db = MagicMock(name=db_name)
+        db.client = db_helper.client
+        db.get_collection.side_effect = lambda name: MagicMock(name=f"{db_name}.{name}")
+        return db
+
+    monkeypatch.setattr(db_helper, "client", MagicMock(name="client"))
+    monkeypatch.setattr(db_helper, "get_db_async", fake_get_db_async)
+    return calls
+
+
+def _terminal_info(terminal_no: int = 1) -> TerminalInfoDocument:
+    return TerminalInfoDocument(
+        tenant_id="T0001",
+        store_code="S0001",
+        terminal_no=terminal_no,
+        terminal_id=f"T0001-S0001-{terminal_no}",
+        api_key="test-api-key",
+    )
+
+
+class TestCartServiceContainer:
+    """Tests for CartServiceContainer."""
+
+    @pytest.mark.asyncio
+    async def test_db_handle_is_reused(self, fake_db_helper):
+        container = CartServiceContainer()
+
+        db1 = await container.get_db_async("db_cart_T0001")
+        db2 = await container.get_db_async("db_cart_T0001")
+
+        assert db1 is db2
+        assert fake_db_helper == ["db_cart_T0001"]
+
+    @pytest.mark.asyncio
+    async def test_db_handle_is_renewed_after_client_reset(self, fake_db_helper, monkeypatch):
+        container = CartServiceContainer()
+        db1 = await container.get_db_async("db_cart_T0001")
+        repo = MagicMock(db=db1, collection_name="tranlog")
+        collection1 = container.bind_collection(repo, "db_cart_T0001").dbcollection
+
+        # the client is replaced e.g. after a connection error
+        monkeypatch.setattr(db_helper, "client", MagicMock(name="new_client"))
+        db2 = await container.get_db_async("db_cart_T0001")
+        repo = MagicMock(db=db2, collection_name="tranlog")
+        collection2 = container.bind_collection(repo, "db_cart_T0001").dbcollection
+
+        assert db2 is not db1
+        assert collection2 is not collection1
+        assert fake_db_helper == ["db_cart_T0001", "db_cart_T0001"]
+
+    @pytest.mark.asyncio
+    async def test_services_share_collections_but_not_repositories(self, fake_db_helper):
+        container = CartServiceContainer()
+
+        service1 = await container.create_cart_service_async(_terminal_info(1))
+        service2 = await container.create_cart_service_async(_terminal_info(2), cart_id="cart-1")
+
+        assert isinstance(service1, CartService)
+        assert service2.cart_id == "cart-1"
+        # one lookup each for the tenant and the common database
+        assert fake_db_helper == ["db_cart_T0001", "db_cart_commons"]
+        # repositories are bound to the terminal of the request
+        assert service1.terminal_counter_repo is not service2.terminal_counter_repo
+        assert service1.terminal_counter_repo.terminal_info.terminal_no == 1
+        assert service2.terminal_counter_repo.terminal_info.terminal_no == 2
+        # collections are looked up once
+        assert service1.terminal_counter_repo.dbcollection is service2.terminal_counter_repo.dbcollection
+        assert service1.tran_service.tranlog_repository.dbcollection is service2.tran_service.tranlog_repository.dbcollection
+
+    @pytest.mark.asyncio
+    async def test_tran_services_share_pubsub_manager(self, fake_db_helper):
+        container = CartServiceContainer()
+
+        tran_service1 = await container.create_tran_service_async(_terminal_info(1))
+        tran_service2 = await container.create_tran_service_async(_terminal_info(2))
+
+        assert tran_service1.pubsub_manager is tran_service2.pubsub_manager
+        assert tran_service1.terminal_info.terminal_no == 1
+
+    @pytest.mark.asyncio
+    async def test_shared_pubsub_manager_is_closed_by_container_only(self, fake_db_helper):
+        container = CartServiceContainer()
+        tran_service = await container.create_tran_service_async(_terminal_info())
+        pubsub_manager = tran_service.pubsub_manager
+        pubsub_manager.close = AsyncMock()
+
+        await tran_service.close()
+        pubsub_manager.close.assert_not_awaited()
+
+        await container.close_async()
+        pubsub_manager.close.assert_awaited_once()
+        assert container.get_pubsub_manager() is not pubsub_manager
+
+
+class TestGetServiceContainer:
+    """Tests for get_service_container."""
+
+    @pytest.mark.asyncio
+    async def test_shared_container_is_used_when_enabled(self, monkeypatch):
+        monkeypatch.setattr(settings, "USE_SERVICE_CONTAINER", True)
+        dependency = get_service_container()
+
+        assert await dependency.__anext__() is cart_service_container
+        with pytest.raises(StopAsyncIteration):
+            await dependency.__anext__()
+
+    @pytest.mark.asyncio
+    async def test_request_scoped_container_is_closed_after_request(self, monkeypatch):
+        monkeypatch.setattr(settings, "USE_SERVICE_CONTAINER", False)
+        dependency = get_service_container()
+
+        container = await dependency.__anext__()
+        pubsub_manager = container.get_pubsub_manager()
+        pubsub_manager.close = AsyncMock()
+        assert container is not cart_service_container
+
+        with pytest.raises(StopAsyncIteration):
+            await dependency.__anext__()
+        pubsub_manager.close.assert_awaited_once()
@@ -1,10 +1,22 @@
 # Copyright 2025 masa@kugel  # # Licensed under the Apache License, Version 2.0 (the "License");  # you may not use this file except in compliance with the License.  # You may obtain a copy of the License at  # #     http://www.apache.org/licenses/LICENSE-2.0  # # Unless required by applicable law or agreed to in writing, software  # distributed under the License is distributed on an "AS IS" BASIS,  # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  # See the License for the specific language governing permissions and  # limitations under the License.
+import asyncio
+import time
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from app.services.strategies.sales_promo.category_promo import CategoryPromoPlugin, CategoryPromoDetail
 from app.models.documents.cart_document import CartDocument
 from app.models.documents.promotion_master_document import PromotionMasterDocument
+from app.utils.promotion_cache import promotion_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_promotion_cache():
+    """Clear the shared promotion cache before and after each test."""
+    promotion_cache.clear()
+    yield
+    promotion_cache.clear()
 
 
 def make_line_item(
@@ -254,6 +266,84 @@ class TestCategoryPromoPluginApply:
         assert result.line_items[0].discounts[0].discount_value == 10.0
 
 
+class TestCategoryPromoPluginCache:
+    """Tests for serving active promotions from the shared promotion cache."""
+
+    @pytest.fixture
+    def plugin(self):
+        p = CategoryPromoPlugin()
+        p.promotion_master_repo = AsyncMock()
+        p.promotion_master_repo.get_active_promotions_by_store_async.return_value = [
+            make_promotion(target_category_codes=["001"], discount_rate=10.0)
+        ]
+        return p
+
+    @pytest.mark.asyncio
+    async def test_second_apply_served_from_cache(self, plugin):
+        """Promotions are fetched once per store and reused by later subtotals."""
+        await plugin.apply(make_cart(line_items=[make_line_item(category_code="001")]))
+        result = await plugin.apply(make_cart(line_items=[make_line_item(category_code="001")]))
+
+        assert len(result.line_items[0].discounts) == 1
+        plugin.promotion_master_repo.get_active_promotions_by_store_async.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_cache_shared_between_plugin_instances(self, plugin):
+        """A plugin configured for another request uses the cached promotions."""
+        await plugin.apply(make_cart(line_items=[make_line_item(category_code="001")]))
+        other = CategoryPromoPlugin()
+        other.promotion_master_repo = AsyncMock()
+
+        result = await other.apply(make_cart(line_items=[make_line_item(category_code="001")]))
+
+        assert len(result.line_items[0].discounts) == 1
+        other.promotion_master_repo.get_active_promotions_by_store_async.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_invalidation_reloads_promotions(self, plugin):
+        """Invalidating the tenant forces a reload on the next subtotal."""
+        await plugin.apply(make_cart(line_items=[make_line_item(category_code="001")]))
+        plugin.promotion_master_repo.get_active_promotions_by_store_async.return_value = [
+            make_promotion(target_category_codes=["001"], discount_rate=30.0)
+        ]
+
+        promotion_cache.invalidate("T001")
+        result = await plugin.apply(make_cart(line_items=[make_line_item(category_code="001")]))
+
+        assert result.line_items[0].discounts[0].discount_value == 30.0
+        assert plugin.promotion_master_repo.get_active_promotions_by_store_async.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_while_refreshing(self, plugin):
+        """A stale entry is returned immediately and refreshed in the background."""
+        await plugin.apply(make_cart(line_items=[make_line_item(category_code="001")]))
+        entry = promotion_cache.get("T001", "S001")
+        entry.loaded_at = time.time() - 3600
+        plugin.promotion_master_repo.get_active_promotions_by_store_async.return_value = [
+            make_promotion(target_category_codes=["001"], discount_rate=20.0)
+        ]
+
+        result = await plugin.apply(make_cart(line_items=[make_line_item(category_code="001")]))
+        assert result.line_items[0].discounts[0].discount_value == 10.0
+
+        await asyncio.sleep(0)  # let the background refresh run
+        result = await plugin.apply(make_cart(line_items=[make_line_item(category_code="001")]))
+        assert result.line_items[0].discounts[0].discount_value == 20.0
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_stale_entry(self, plugin):
+        """A failed background refresh keeps serving the stale promotions."""
+        await plugin.apply(make_cart(line_items=[make_line_item(category_code="001")]))
+        promotion_cache.get("T001", "S001").loaded_at = time.time() - 3600
+        plugin.promotion_master_repo.get_active_promotions_by_store_async.side_effect = Exception("API error")
+
+        await plugin.apply(make_cart(line_items=[make_line_item(category_code="001")]))
+        await asyncio.sleep(0)
+        result = await plugin.apply(make_cart(line_items=[make_line_item(category_code="001")]))
+
+        assert result.line_items[0].discounts[0].discount_value == 10.0
+
+
 class TestCategoryPromoDetailParsing:
     """Tests for CategoryPromoDetail parsing via model_validate."""
 
@@ -0,0 +1,116 @@
+"""
+Unit tests for ItemMasterCache.
+"""
+
+import time
+
+from app.utils.item_master_cache import ItemMasterCache
+from app.models.documents.item_master_document import ItemMasterDocument
+
+
+def create_item(item_code: str, description: str = "Test Item") -> ItemMasterDocument:
+    """Create an ItemMasterDocument for testing."""
+    return ItemMasterDocument(item_code=item_code, description=description, unit_price=100.0)
+
+
+class TestItemMasterCache:
+    """Test cases for ItemMasterCache class."""
+
+    def test_cache_set_and_get(self):
+        """Test setting and getting items from cache."""
+        cache = ItemMasterCache(ttl_seconds=300)
+        cache.set("tenant1", "STORE01", create_item("ITEM01"))
+
+        cached = cache.get("tenant1", "STORE01", "ITEM01")
+        assert cached is not None
+        assert cached.item_code == "ITEM01"
+        assert cache.size() == 1
+
+    def test_cache_is_partitioned_by_tenant_and_store(self):
+        """Test that entries are only visible to their own (tenant, store)."""
+        cache = ItemMasterCache()
+        cache.set("tenant1", "STORE01", create_item("ITEM01"))
+
+        assert cache.get("tenant1", "STORE02", "ITEM01") is None
+        assert cache.get("tenant2", "STORE01", "ITEM01") is None
+
+    def test_cache_expiration(self):
+        """Test that cached items expire after TTL."""
+        cache = ItemMasterCache(ttl_seconds=1)
+        cache.set("tenant1", "STORE01", create_item("ITEM01"))
+        assert cache.get("tenant1", "STORE01", "ITEM01") is not None
+
+        time.sleep(1.1)
+        assert cache.get("tenant1", "STORE01", "ITEM01") is None
+        assert cache.size() == 0  # Expired entry should be removed
+
+    def test_lru_eviction(self):
+        """Test that the least recently used item is evicted when the store partition is full."""
+        cache = ItemMasterCache(max_size=2)
+        cache.set("tenant1", "STORE01", create_item("ITEM01"))
+        cache.set("tenant1", "STORE01", create_item("ITEM02"))
+
+        # Touch ITEM01 so ITEM02 becomes the least recently used
+        assert cache.get("tenant1", "STORE01", "ITEM01") is not None
+        cache.set("tenant1", "STORE01", create_item("ITEM03"))
+
+        assert cache.get("tenant1", "STORE01", "ITEM02") is None
+        assert cache.get("tenant1", "STORE01", "ITEM01") is not None
+        assert cache.get("tenant1", "STORE01", "ITEM03") is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_set_replaces_existing_item(self):
+        """Test that setting an existing item code replaces the cached document."""
+        cache = ItemMasterCache()
+        cache.set("tenant1", "STORE01", create_item("ITEM01", "Old"))
+        cache.set("tenant1", "STORE01", create_item("ITEM01", "New"))
+
+        assert cache.size() == 1
+        assert cache.get("tenant1", "STORE01", "ITEM01").description == "New"
+
+    def test_hit_and_miss_counters(self):
+        """Test hit/miss statistics."""
+        cache = ItemMasterCache()
+        cache.set("tenant1", "STORE01", create_item("ITEM01"))
+
+        cache.get("tenant1", "STORE01", "ITEM01")
+        cache.get("tenant1", "STORE01", "ITEM01")
+        cache.get("tenant1", "STORE01", "MISSING")
+
+        stats = cache.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == round(2 / 3, 4)
+
+    def test_cache_clear_by_tenant(self):
+        """Test clearing items for a specific tenant."""
+        cache = ItemMasterCache()
+        cache.set("tenant1", "STORE01", create_item("ITEM01"))
+        cache.set("tenant1", "STORE02", create_item("ITEM02"))
+        cache.set("tenant2", "STORE01", create_item("ITEM03"))
+
+        cache.clear("tenant1")
+
+        assert cache.size("tenant1") == 0
+        assert cache.size("tenant2") == 1
+        assert cache.size() == 1
+
+    def test_cache_clear_all(self):
+        """Test clearing all items and statistics."""
+        cache = ItemMasterCache()
+        cache.set("tenant1", "STORE01", create_item("ITEM01"))
+        cache.get("tenant1", "STORE01", "ITEM01")
+
+        cache.clear()
+
+        assert cache.size() == 0
+        assert cache.stats()["hits"] == 0
+
+    def test_remove(self):
+        """Test removing a specific item."""
+        cache = ItemMasterCache()
+        cache.set("tenant1", "STORE01", create_item("ITEM01"))
+        cache.remove("tenant1", "STORE01", "ITEM01")
+        cache.remove("tenant1", "STORE01", "NOT_CACHED")
+
+        assert cache.get("tenant1", "STORE01", "ITEM01") is None
@@ -0,0 +1,103 @@
+"""Unit tests for the shared active promotion cache (app/utils/promotion_cache.py)."""
+
+import time
+
+from app.utils.promotion_cache import PromotionCache, PromotionCacheEntry
+
+
+def _entry(code="PROMO-01"):
+    return PromotionCacheEntry(promotions=[code], category_map={"001": {"promotion_code": code}})
+
+
+def test_get_returns_none_when_not_cached():
+    cache = PromotionCache(ttl_seconds=60)
+
+    assert cache.get("T001", "S001") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_set_and_get_entry():
+    cache = PromotionCache(ttl_seconds=60)
+    entry = _entry()
+
+    assert cache.set("T001", "S001", entry, cache.get_generation("T001", "S001")) is True
+
+    assert cache.get("T001", "S001") is entry
+    assert cache.get("T001", "S002") is None
+    assert cache.stats()["hits"] == 1
+
+
+def test_is_stale_after_ttl():
+    cache = PromotionCache(ttl_seconds=60)
+    entry = _entry()
+
+    assert cache.is_stale(entry) is False
+    entry.loaded_at = time.time() - 61
+    assert cache.is_stale(entry) is True
+
+
+def test_invalidate_tenant_drops_all_stores():
+    cache = PromotionCache(ttl_seconds=60)
+    cache.set("T001", "S001", _entry(), cache.get_generation("T001", "S001"))
+    cache.set("T001", "S002", _entry(), cache.get_generation("T001", "S002"))
+    cache.set("T002", "S001", _entry(), cache.get_generation("T002", "S001"))
+
+    cache.invalidate("T001")
+
+    assert cache.get("T001", "S001") is None
+    assert cache.get("T001", "S002") is None
+    assert cache.get("T002", "S001") is not None
+
+
+def test_invalidate_single_store():
+    cache = PromotionCache(ttl_seconds=60)
+    cache.set("T001", "S001", _entry(), cache.get_generation("T001", "S001"))
+    cache.set("T001", "S002", _entry(), cache.get_generation("T001", "S002"))
+
+    cache.invalidate("T001", "S001")
+
+    assert cache.get("T001", "S001") is None
+    assert cache.get("T001", "S002") is not None
+
+
+def test_load_started_before_invalidation_is_discarded():
+    cache = PromotionCache(ttl_seconds=60)
+    generation = cache.get_generation("T001", "S001")
+
+    cache.invalidate("T001")
+
+    assert cache.set("T001", "S001", _entry(), generation) is False
+    assert cache.get("T001", "S001") is None
+
+
+def test_invalidation_keeps_loads_of_other_tenants_and_stores():
+    cache = PromotionCache(ttl_seconds=60)
+    other_tenant = cache.get_generation("T002", "S001")
+    other_store = cache.get_generation("T001", "S002")
+    same_store = cache.get_generation("T001", "S001")
+
+    cache.invalidate("T001", "S001")
+
+    assert cache.set("T002", "S001", _entry(), other_tenant) is True
+    assert cache.set("T001", "S002", _entry(), other_store) is True
+    assert cache.set("T001", "S001", _entry(), same_store) is False
+
+
+def test_invalidation_of_all_tenants_discards_every_load():
+    cache = PromotionCache(ttl_seconds=60)
+    generation = cache.get_generation("T002", "S001")
+
+    cache.invalidate()
+
+    assert cache.set("T002", "S001", _entry(), generation) is False
+
+
+def test_only_one_refresh_per_store():
+    cache = PromotionCache(ttl_seconds=60)
+
+    assert cache.begin_refresh("T001", "S001") is True
+    assert cache.begin_refresh("T001", "S001") is False
+    assert cache.begin_refresh("T001", "S002") is True
+
+    cache.end_refresh("T001", "S001")
+    assert cache.begin_refresh("T001", "S001") is True
@@ -17,6 +17,7 @@ from unittest.mock import AsyncMock, MagicMock, patch, PropertyMock
 
 import pytest
 import pytest_asyncio
+from pymongo import ReturnDocument
 
 from kugel_common.models.documents.terminal_info_document import TerminalInfoDocument
 from kugel_common.models.documents.staff_master_document import StaffMasterDocument
@@ -25,6 +26,7 @@ from kugel_common.exceptions import (
     NotFoundException,
     LoadDataNoExistException,
     CannotCreateException,
+    RepositoryException,
 )
 
 from app.enums.cart_status import CartStatus
@@ -45,6 +47,7 @@ from app.models.repositories.terminal_counter_repository import (
     make_terminal_id,
 )
 from app.models.repositories.tax_master_repository import TaxMasterRepository
+from app.models.repositories import terminal_counter_repository as terminal_counter_module
 
 
 # ---------------------------------------------------------------------------
@@ -351,6 +354,176 @@ class TestCartRepositoryCacheCartAsync:
         repo._CartRepository__delete_cart_from_db_async.assert_awaited_once_with("cart-xyz")
 
 
+class _FakeStateResponse:
+    """Async context manager mimicking an aiohttp response from the Dapr state store."""
+
+    def __init__(self, status, body=None):
+        self.status = status
+        self._body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def json(self):
+        return self._body
+
+    async def text(self):
+        return ""
+
+
+class _FakeStateStoreSession:
+    """In-memory replacement for the Dapr state store session."""
+
+    def __init__(self):
+        self.store = {}
+        self.posted_keys = []
+
+    def post(self, url, json=None):
+        for entry in json:
+            self.store[entry["key"]] = entry["value"]
+            self.posted_keys.append(entry["key"])
+        return _FakeStateResponse(204)
+
+    def get(self, url):
+        key = url.rsplit("/", 1)[-1]
+        if key not in self.store:
+            return _FakeStateResponse(204)
+        return _FakeStateResponse(200, self.store[key])
+
+
+class TestCartRepositorySlimState:
+    """Tests for the slim cart state format where master data is stored by version key."""
+
+    @pytest.fixture(autouse=True)
+    def clear_master_caches(self):
+        from app.utils.cart_master_cache import cart_master_cache
+
+        cart_master_cache.clear()
+        yield
+        cart_master_cache.clear()
+
+    @pytest.fixture
+    def session(self):
+        session = _FakeStateStoreSession()
+        with patch(
+            "app.models.repositories.cart_repository.get_dapr_statestore_session",
+            AsyncMock(return_value=session),
+        ):
+            yield session
+
+    def _make_cart(self, cart_id="cart-001"):
+        cart = CartDocument(cart_id=cart_id, tenant_id="T001", store_code="S001", business_date="20240601")
+        cart.masters = CartDocument.ReferenceMasters(
+            settings=[SettingsMasterDocument(tenant_id="T001", name="RECEIPT_HEADER", default_value="Welcome")],
+            taxes=[TaxMasterDocument(tax_code="01", tax_type="External", tax_name="VAT", rate=10.0)],
+            items=[ItemMasterDocument(tenant_id="T001", store_code="S001", item_code="ITEM001", price=100.0)],
+        )
+        return cart
+
+    @pytest.mark.asyncio
+    async def test_cart_payload_references_masters(self, session):
+        repo = CartRepository(_make_mock_db(), _make_terminal_info())
+
+        await repo.cache_cart_async(self._make_cart())
+
+        payload = session.store["cart-001"]
+        assert payload["masters"] == {"items": [self._make_cart().masters.items[0].model_dump()]}
+        assert payload["format_version"] == 2
+        assert "items" not in payload["masters_ref"]
+        assert payload["masters_ref"]["settings"].startswith("settings_")
+        assert payload["masters_ref"]["taxes"].startswith("taxes_")
+
+    @pytest.mark.asyncio
+    async def test_masters_saved_once_for_carts_sharing_them(self, session):
+        repo = CartRepository(_make_mock_db(), _make_terminal_info())
+
+        await repo.cache_cart_async(self._make_cart("cart-001"))
+        await repo.cache_cart_async(self._make_cart("cart-002"))
+
+        master_keys = [key for key in session.posted_keys if key.startswith("cart_masters_")]
+        assert len(master_keys) == 2
+        assert session.posted_keys.count("cart-002") == 1
+
+    @pytest.mark.asyncio
+    async def test_scanned_items_do_not_write_master_entries(self, session):
+        repo = CartRepository(_make_mock_db(), _make_terminal_info())
+        cart = self._make_cart()
+        await repo.cache_cart_async(cart)
+
+        cart.masters.items.append(
+            ItemMasterDocument(tenant_id="T001", store_code="S001", item_code="ITEM002", price=200.0)
+        )
+        await repo.cache_cart_async(cart)
+
+        assert session.posted_keys[-1] == "cart-001"
+        assert len([key for key in session.posted_keys if key.startswith("cart_masters_")]) == 2
+        assert [item["item_code"] for item in session.store["cart-001"]["masters"]["items"]] == ["ITEM001", "ITEM002"]
+
+    @pytest.mark.asyncio
+    async def test_round_trip_rehydrates_masters(self, session):
+        from app.utils.cart_master_cache import cart_master_cache
+
+        repo = CartRepository(_make_mock_db(), _make_terminal_info())
+        await repo.cache_cart_async(self._make_cart())
+        # simulate another instance which has to read the shared masters from the state store
+        cart_master_cache.clear()
+
+        result = await repo.get_cached_cart_async("cart-001")
+
+        assert result.masters.settings[0].name == "RECEIPT_HEADER"
+        assert result.masters.taxes[0].tax_code == "01"
+        assert [item.item_code for item in result.masters.items] == ["ITEM001"]
+        assert result.staff.id == "staff01"
+
+    @pytest.mark.asyncio
+    async def test_legacy_payload_is_still_readable(self, session):
+        repo = CartRepository(_make_mock_db(), _make_terminal_info())
+        session.store["cart-legacy"] = self._make_cart("cart-legacy").model_dump()
+
+        result = await repo.get_cached_cart_async("cart-legacy")
+
+        assert result.cart_id == "cart-legacy"
+        assert result.masters.taxes[0].tax_code == "01"
+
+    def _store_slim_cart(self, session, settings_ref="settings_v1"):
+        session.store["cart_masters_T001_S001_settings_v1"] = [{"name": "RECEIPT_HEADER", "default_value": "Welcome"}]
+        session.store["cart-001"] = {
+            "cart_id": "cart-001",
+            "tenant_id": "T001",
+            "store_code": "S001",
+            "format_version": 2,
+            "masters_ref": {"settings": settings_ref, "taxes": "taxes_missing"},
+            "masters": {"items": [{"item_code": "ITEM001", "price": 100.0}]},
+        }
+
+    @pytest.mark.asyncio
+    async def test_missing_tax_master_is_reloaded_from_settings(self, session):
+        repo = CartRepository(_make_mock_db(), _make_terminal_info())
+        self._store_slim_cart(session)
+
+        with patch(
+            "app.models.repositories.cart_repository.settings",
+            MagicMock(TAX_MASTER=[{"tax_code": "99", "tax_name": "Default"}]),
+        ):
+            result = await repo.get_cached_cart_async("cart-001")
+
+        assert result.masters.settings[0].name == "RECEIPT_HEADER"
+        assert [tax.tax_code for tax in result.masters.taxes] == ["99"]
+        assert [item.item_code for item in result.masters.items] == ["ITEM001"]
+
+    @pytest.mark.asyncio
+    async def test_missing_settings_is_an_error(self, session):
+        repo = CartRepository(_make_mock_db(), _make_terminal_info())
+        repo.get_one_async = AsyncMock(return_value=None)
+        self._store_slim_cart(session, settings_ref="settings_missing")
+
+        with pytest.raises(NotFoundException):
+            await repo.get_cached_cart_async("cart-001")
+
+
 # =========================================================================
 # TransactionStatusRepository tests
 # =========================================================================
@@ -883,6 +1056,112 @@ class TestTranlogDeliveryStatusRepository:
 
         assert result is False
 
+    @pytest.mark.asyncio
+    async def test_bulk_update_service_status_uses_one_bulk_write(self):
+        repo = self._make_repo()
+
+        mock_collection = MagicMock()
+        mock_bulk_result = MagicMock()
+        mock_bulk_result.matched_count = 1
+        mock_collection.bulk_write = AsyncMock(return_value=mock_bulk_result)
+        repo.dbcollection = mock_collection
+
+        matched = await repo.bulk_update_service_status_async(
+            tenant_id="T001",
+            statuses=[
+                {"event_id": "evt-001", "service_name": "report", "status": "received", "message": ""},
+                {"event_id": "evt-002", "service_name": "journal", "status": "received", "message": None},
+            ],
+        )
+
+        assert matched == 1
+        mock_collection.bulk_write.assert_awaited_once()
+        operations = mock_collection.bulk_write.call_args[0][0]
+        assert mock_collection.bulk_write.call_args.kwargs["ordered"] is True
+        assert operations[0]._filter == {"event_id": "evt-001", "tenant_id": "T001"}
+        # the service status and the overall status are updated by the same pipeline
+        pipeline = operations[0]._doc
+        service_map = pipeline[0]["$set"]["services"]["$map"]
+        condition, service_update, _ = service_map["in"]["$cond"]
+        assert condition == {"$eq": ["$$service.service_name", {"$literal": "report"}]}
+        assert service_update["$mergeObjects"][1]["status"] == {"$literal": "received"}
+        assert service_update["$mergeObjects"][1]["message"] == {"$literal": ""}
+        assert "message" not in operations[1]._doc[0]["$set"]["services"]["$map"]["in"]["$cond"][1]["$mergeObjects"][1]
+        assert pipeline[1]["$set"]["status"]["$switch"]["default"] == "$status"
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_service_status_raises_repository_exception(self):
+        repo = self._make_repo()
+
+        mock_collection = MagicMock()
+        mock_collection.bulk_write = AsyncMock(side_effect=Exception("DB error"))
+        repo.dbcollection = mock_collection
+
+        with pytest.raises(RepositoryException):
+            await repo.bulk_update_service_status_async(
+                tenant_id="T001", statuses=[{"event_id": "evt-001", "service_name": "report", "status": "received"}]
+            )
+
+    @pytest.mark.asyncio
+    async def test_find_pending_deliveries_pages_continue_after_last_id(self):
+        repo = self._make_repo()
+
+        def make_doc(object_id, event_id):
+            return {
+                "_id": object_id,
+                "event_id": event_id,
+                "published_at": datetime(2024, 6, 1),
+                "tenant_id": "T001",
+                "store_code": "S001",
+                "terminal_no": 1,
+                "transaction_no": 1,
+                "business_date": "20240601",
+                "open_counter": 1,
+                "payload": {},
+                "last_updated_at": datetime(2024, 6, 1),
+            }
+
+        cursor = MagicMock()
+        cursor.sort.return_value = cursor
+        cursor.limit.return_value = cursor
+        cursor.to_list = AsyncMock(side_effect=[[make_doc(1, "evt-1"), make_doc(2, "evt-2")], [make_doc(3, "evt-3")]])
+        mock_collection = MagicMock()
+        mock_collection.find = MagicMock(return_value=cursor)
+        repo.dbcollection = mock_collection
+
+        pages = [page async for page in repo.find_pending_deliveries_pages(hours_ago=12, page_size=2)]
+
+        assert [[status.event_id for status in page] for page in pages] == [["evt-1", "evt-2"], ["evt-3"]]
+        first_filter = mock_collection.find.call_args_list[0][0][0]
+        second_filter = mock_collection.find.call_args_list[1][0][0]
+        assert "_id" not in first_filter
+        assert second_filter["_id"] == {"$gt": 2}
+        assert second_filter["status"] == {"$nin": ["delivered"]}
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_delivery_status_updates_once_per_status(self):
+        repo = self._make_repo()
+
+        mock_collection = MagicMock()
+        mock_result = MagicMock()
+        mock_result.matched_count = 2
+        mock_collection.update_many = AsyncMock(return_value=mock_result)
+        repo.dbcollection = mock_collection
+
+        matched = await repo.bulk_update_delivery_status_async(
+            {"published": ["evt-1", "evt-2"], "failed": [], "delivered": ["evt-3"]}
+        )
+
+        assert matched == 4
+        assert mock_collection.update_many.await_count == 2
+        filter_dict, update_dict = mock_collection.update_many.call_args_list[0][0]
+        # events delivered while they were republished are not set back to published
+        assert filter_dict == {"event_id": {"$in": ["evt-1", "evt-2"]}, "status": {"$ne": "delivered"}}
+        assert update_dict["$set"]["status"] == "published"
+        filter_dict, update_dict = mock_collection.update_many.call_args_list[1][0]
+        assert filter_dict == {"event_id": {"$in": ["evt-3"]}}
+        assert update_dict["$set"]["status"] == "delivered"
+
     @pytest.mark.asyncio
     async def test_update_delivery_status_uses_correct_filter_and_retries(self):
         repo = self._make_repo()
@@ -1163,6 +1442,45 @@ class TestTerminalCounterRepository:
         assert len(update) == 2
 
 
+    @pytest.mark.asyncio
+    async def test_reserve_count_block_derives_block_from_previous_value(self):
+        db = _make_mock_db()
+        repo = TerminalCounterRepository(db, _make_terminal_info())
+
+        mock_collection = MagicMock()
+        mock_collection.find_one_and_update = AsyncMock(
+            side_effect=[None, {"count_dic": {"receipt": 9995}}, {"count_dic": {"receipt": 9999}}]
+        )
+        repo.dbcollection = mock_collection
+
+        # first access, near the end value and after the end value
+        assert await repo.reserve_count_block("receipt", 20, start_value=1, end_value=9999) == (1, 20)
+        assert await repo.reserve_count_block("receipt", 20, start_value=1, end_value=9999) == (9996, 9999)
+        assert await repo.reserve_count_block("receipt", 20, start_value=1, end_value=9999) == (1, 20)
+        call_args = mock_collection.find_one_and_update.call_args
+        assert call_args[1]["return_document"] == ReturnDocument.BEFORE
+        assert call_args[1]["update"][1]["$set"]["count_dic.receipt"]["$cond"]["then"] == 20
+
+    @pytest.mark.asyncio
+    async def test_numbering_count_hands_out_reserved_block(self):
+        db = _make_mock_db()
+        repo = TerminalCounterRepository(db, _make_terminal_info())
+
+        mock_collection = MagicMock()
+        mock_collection.find_one_and_update = AsyncMock(
+            side_effect=[{"count_dic": {"transaction": 10}}, {"count_dic": {"transaction": 12}}]
+        )
+        repo.dbcollection = mock_collection
+
+        with patch.object(terminal_counter_module, "_reserved_blocks", {}), patch.object(
+            terminal_counter_module.settings, "USE_COUNTER_BLOCKS", True
+        ), patch.object(terminal_counter_module.settings, "COUNTER_BLOCK_SIZE", 2):
+            values = [await repo.numbering_count("transaction") for _ in range(3)]
+
+        assert values == [11, 12, 13]
+        assert mock_collection.find_one_and_update.await_count == 2
+
+
 # =========================================================================
 # TaxMasterRepository tests
 # =========================================================================
@@ -1308,7 +1626,10 @@ class TestCartRepositoryDaprCacheAsync:
         ):
             await repo._CartRepository__cache_cart_async(cart)
 
-        mock_session.post.assert_called_once()
+        # shared master entries are written first, the cart itself last
+        posted_keys = [call.kwargs["json"][0]["key"] for call in mock_session.post.call_args_list]
+        assert posted_keys[-1] == "cart-dapr-01"
+        assert posted_keys.count("cart-dapr-01") == 1
 
     @pytest.mark.asyncio
     async def test_cache_cart_non_204_raises_update_not_work(self):
@@ -0,0 +1,159 @@
+"""Unit tests for the shared settings master snapshot (app/utils/settings_snapshot.py)."""
+
+import time
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.models.documents.settings_master_document import SettingsMasterDocument, SettingsValue
+from app.utils import settings_snapshot as settings_snapshot_module
+from app.utils.settings_snapshot import (
+    SettingsSnapshotCache,
+    build_settings_snapshot,
+    get_setting_value_async,
+    get_settings_snapshot_async,
+    settings_snapshot_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_snapshot_cache():
+    settings_snapshot_cache.clear()
+    yield
+    settings_snapshot_cache.clear()
+
+
+def _terminal_info(terminal_no=1):
+    terminal_info = MagicMock()
+    terminal_info.tenant_id = "T001"
+    terminal_info.store_code = "S001"
+    terminal_info.terminal_no = terminal_no
+    return terminal_info
+
+
+def _settings_docs():
+    return [
+        SettingsMasterDocument(
+            name="RECEIPT_HEADERS",
+            default_value="[{'text': 'Welcome', 'align': 'center'}]",
+            values=[SettingsValue(store_code="S001", terminal_no=2, value='[{"text": "Terminal 2"}]')],
+        ),
+        SettingsMasterDocument(
+            name="INVOICE_REGISTRATION_NUMBER",
+            values=[SettingsValue(store_code="S001", value="T1234567890123")],
+        ),
+        SettingsMasterDocument(name="RECEIPT_NO_END_VALUE", default_value="9999", values=[]),
+    ]
+
+
+def test_build_snapshot_precomputes_billing_settings():
+    snapshot = build_settings_snapshot(
+        {
+            "RECEIPT_NO_START_VALUE": "100",
+            "INVOICE_REGISTRATION_NUMBER": "T1234567890123",
+            "RECEIPT_HEADERS": "[{'text': 'Welcome', 'align': 'center'}, {'text': 'Store', 'align': 'invalid'}]",
+            "RECEIPT_FOOTERS": "not valid json or python",
+        }
+    )
+
+    assert snapshot.receipt_no_start_value == "100"
+    assert snapshot.invoice_registration_number == "T1234567890123"
+    assert snapshot.receipt_headers == [
+        {"text": "Welcome", "align": "center"},
+        {"text": "Store", "align": "left"},
+    ]
+    assert snapshot.receipt_footers is None
+
+
+def test_snapshot_falls_back_to_settings_module_defaults():
+    snapshot = build_settings_snapshot({"INVOICE_REGISTRATION_NUMBER": 12345})
+
+    assert snapshot.invoice_registration_number is None
+    assert snapshot.get_value("NOT_A_SETTING") is None
+    with patch.object(settings_snapshot_module.settings, "RECEIPT_NO_END_VALUE", 500, create=True):
+        assert snapshot.get_value("RECEIPT_NO_END_VALUE") == 500
+
+
+def test_cache_versions_and_invalidation():
+    cache = SettingsSnapshotCache(ttl_seconds=60)
+    first = build_settings_snapshot({})
+    second = build_settings_snapshot({})
+
+    assert cache.set("T001", "S001", 1, first, cache.get_generation()) is True
+    assert cache.set("T001", "S001", 2, second, cache.get_generation()) is True
+    assert (first.version, second.version) == (1, 2)
+    assert cache.get("T001", "S001", 1) is first
+
+    generation = cache.get_generation()
+    cache.invalidate("T001")
+    assert cache.get("T001", "S001", 1) is None
+    assert cache.set("T001", "S001", 1, first, generation) is False
+
+    assert cache.is_stale(second) is False
+    second.loaded_at = time.time() - 61
+    assert cache.is_stale(second) is True
+
+
+@pytest.mark.asyncio
+async def test_snapshot_is_loaded_once_per_terminal():
+    repo = MagicMock()
+    repo.get_all_settings_async = AsyncMock(return_value=_settings_docs())
+    repo.get_settings_value_by_name_async = AsyncMock()
+
+    snapshot = await get_settings_snapshot_async(repo, _terminal_info())
+    assert await get_settings_snapshot_async(repo, _terminal_info()) is snapshot
+    other_terminal = await get_settings_snapshot_async(repo, _terminal_info(terminal_no=2))
+
+    assert repo.get_all_settings_async.await_count == 2
+    repo.get_settings_value_by_name_async.assert_not_called()
+    assert snapshot.receipt_headers == [{"text": "Welcome", "align": "center"}]
+    assert other_terminal.receipt_headers == [{"text": "Terminal 2", "align": "left"}]
+    assert snapshot.invoice_registration_number == "T1234567890123"
+    assert snapshot.receipt_no_end_value == "9999"
+
+
+@pytest.mark.asyncio
+async def test_stale_snapshot_is_served_while_refreshed():
+    repo = MagicMock()
+    repo.get_all_settings_async = AsyncMock(return_value=_settings_docs())
+    snapshot = await get_settings_snapshot_async(repo, _terminal_info())
+    snapshot.loaded_at = time.time() - 3600
+
+    assert await get_settings_snapshot_async(repo, _terminal_info()) is snapshot
+    for task in list(settings_snapshot_module._refresh_tasks):
+        await task
+
+    refreshed = settings_snapshot_cache.get("T001", "S001", 1)
+    assert refreshed is not snapshot
+    assert refreshed.version > snapshot.version
+
+
+@pytest.mark.asyncio
+async def test_billing_settings_are_looked_up_by_name_when_load_fails():
+    repo = MagicMock()
+    repo.get_all_settings_async = AsyncMock(side_effect=Exception("master-data unavailable"))
+    repo.get_settings_value_by_name_async = AsyncMock(
+        side_effect=lambda name: SettingsMasterDocument(name=name, default_value="T9") if name.startswith("INV") else None
+    )
+
+    snapshot = await get_settings_snapshot_async(repo, _terminal_info())
+
+    assert snapshot.invoice_registration_number == "T9"
+    assert repo.get_settings_value_by_name_async.await_count == len(settings_snapshot_module.BILLING_SETTING_NAMES)
+    assert settings_snapshot_cache.stats()["cached_terminals"] == 0
+
+
+@pytest.mark.asyncio
+async def test_other_settings_are_looked_up_by_name_when_load_fails():
+    repo = MagicMock()
+    repo.get_all_settings_async = AsyncMock(side_effect=Exception("master-data unavailable"))
+    repo.get_settings_value_by_name_async = AsyncMock(
+        side_effect=lambda name: (
+            SettingsMasterDocument(name=name, default_value="7") if name == "TAX_ROUNDING" else None
+        )
+    )
+
+    value = await get_setting_value_async(repo, _terminal_info(), "TAX_ROUNDING")
+
+    assert value == "7"
+    repo.get_settings_value_by_name_async.assert_any_await("TAX_ROUNDING")
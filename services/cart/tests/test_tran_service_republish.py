@@ -0,0 +1,66 @@
+"""
+Unit tests for republishing undelivered transaction logs.
+"""
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services import tran_service as tran_service_module
+from app.services.tran_service import TranService
+
+
+def make_delivery_status(event_id: str, minutes_ago: int, service_statuses: list[str]) -> MagicMock:
+    status = MagicMock()
+    status.event_id = event_id
+    status.created_at = datetime.now() - timedelta(minutes=minutes_ago)
+    status.services = [MagicMock(status=service_status) for service_status in service_statuses]
+    status.payload = {"event_id": event_id}
+    return status
+
+
+@pytest.mark.asyncio
+async def test_pages_are_republished_and_statuses_updated_in_bulk():
+    pages = [
+        [
+            make_delivery_status("evt-delivered", 10, ["received", "received"]),
+            make_delivery_status("evt-recent", 0, ["pending"]),
+            make_delivery_status("evt-1", 10, ["pending", "received"]),
+        ],
+        [make_delivery_status("evt-2", 10, ["failed"]), make_delivery_status("evt-3", 10, ["pending"])],
+    ]
+
+    async def find_pending_deliveries_pages(hours_ago, page_size):
+        for page in pages:
+            yield page
+
+    delivery_status_repo = MagicMock()
+    delivery_status_repo.find_pending_deliveries_pages = find_pending_deliveries_pages
+    delivery_status_repo.bulk_update_delivery_status_async = AsyncMock(return_value=0)
+    pubsub_manager = MagicMock()
+    pubsub_manager.publish_message_async = AsyncMock(
+        side_effect=lambda pubsub_name, topic_name, message: (
+            (False, "circuit open") if message["event_id"] == "evt-3" else (True, None)
+        )
+    )
+    service = TranService(
+        terminal_info=None,
+        terminal_counter_repo=None,
+        tranlog_repo=None,
+        tranlog_delivery_status_repo=delivery_status_repo,
+        settings_master_repo=None,
+        payment_master_repo=None,
+        transaction_status_repo=None,
+        pubsub_manager=pubsub_manager,
+    )
+
+    with patch.object(tran_service_module.settings, "REPUBLISH_RATE_PER_SECOND", 0):
+        stats = await service.republish_undelivered_tranlog_async()
+
+    assert stats == {"checked": 5, "delivered": 1, "skipped": 1, "republished": 2, "publish_failed": 1}
+    assert pubsub_manager.publish_message_async.await_count == 3
+    updates = [call.args[0] for call in delivery_status_repo.bulk_update_delivery_status_async.call_args_list]
+    assert updates == [
+        {"delivered": ["evt-delivered"], "published": ["evt-1"], "failed": []},
+        {"delivered": [], "published": ["evt-2"], "failed": ["evt-3"]},
+    ]
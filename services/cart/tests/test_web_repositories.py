@@ -26,6 +26,7 @@ from app.models.repositories.item_master_web_repository import ItemMasterWebRepo
 from app.models.repositories.payment_master_web_repository import PaymentMasterWebRepository
 from app.models.repositories.settings_master_web_repository import SettingsMasterWebRepository
 from app.models.repositories.promotion_master_web_repository import PromotionMasterWebRepository
+from app.utils.item_master_cache import item_master_cache
 
 
 # ---------------------------------------------------------------------------
@@ -51,6 +52,14 @@ def _make_terminal_info(**overrides) -> TerminalInfoDocument:
 # =========================================================================
 
 
+@pytest.fixture(autouse=True)
+def clear_shared_item_cache():
+    """Isolate tests from the process-wide item master cache."""
+    item_master_cache.clear()
+    yield
+    item_master_cache.clear()
+
+
 class TestItemMasterWebRepositoryCacheHit:
     """Tests for cache hit scenario."""
 
@@ -130,7 +139,138 @@ class TestItemMasterWebRepositoryCacheMiss:
 
         # The item should now be in the cache
         assert len(repo._item_cache) == 1
-        assert repo._item_cache[0][0].item_code == "ITEM-03"
+        assert repo._item_cache["ITEM-03"][0].item_code == "ITEM-03"
+        # ...and in the process-wide shared cache
+        assert item_master_cache.get("T001", "S001", "ITEM-03") is not None
+
+
+class TestItemMasterWebRepositorySharedCache:
+    """Tests for the process-wide item cache shared between repository instances."""
+
+    @pytest.mark.asyncio
+    async def test_item_fetched_by_one_repository_is_served_to_another(self):
+        terminal = _make_terminal_info()
+        mock_client = AsyncMock()
+        mock_client.get.return_value = {
+            "data": {"item_code": "ITEM-SH", "description": "Shared"}
+        }
+
+        with patch("app.models.repositories.item_master_web_repository.cart_settings") as mock_cs:
+            mock_cs.USE_ITEM_CACHE = True
+            mock_cs.ITEM_CACHE_TTL_SECONDS = 300
+            with patch(
+                "app.models.repositories.item_master_web_repository.get_pooled_client",
+                return_value=mock_client,
+            ):
+                first = ItemMasterWebRepository(tenant_id="T001", store_code="S001", terminal_info=terminal)
+                await first.get_item_by_code_async("ITEM-SH")
+                second = ItemMasterWebRepository(tenant_id="T001", store_code="S001", terminal_info=terminal)
+                result = await second.get_item_by_code_async("ITEM-SH")
+
+        assert result.description == "Shared"
+        mock_client.get.assert_awaited_once()
+        # The shared hit is recorded in the repository so it is saved with the cart
+        assert [doc.item_code for doc in second.item_master_documents] == ["ITEM-SH"]
+
+    @pytest.mark.asyncio
+    async def test_shared_cache_is_partitioned_by_store(self):
+        terminal = _make_terminal_info()
+        item_master_cache.set("T001", "S002", ItemMasterDocument(item_code="ITEM-ST", description="Other store"))
+        repo = ItemMasterWebRepository(tenant_id="T001", store_code="S001", terminal_info=terminal)
+
+        mock_client = AsyncMock()
+        mock_client.get.return_value = {
+            "data": {"item_code": "ITEM-ST", "description": "This store"}
+        }
+
+        with patch("app.models.repositories.item_master_web_repository.cart_settings") as mock_cs:
+            mock_cs.USE_ITEM_CACHE = True
+            mock_cs.ITEM_CACHE_TTL_SECONDS = 300
+            with patch(
+                "app.models.repositories.item_master_web_repository.get_pooled_client",
+                return_value=mock_client,
+            ):
+                result = await repo.get_item_by_code_async("ITEM-ST")
+
+        assert result.description == "This store"
+        mock_client.get.assert_awaited_once()
+
+
+class TestItemMasterWebRepositoryBatchLookup:
+    """Tests for get_items_by_codes_async."""
+
+    @pytest.mark.asyncio
+    async def test_cache_hits_served_locally_and_misses_fetched_in_one_call(self):
+        terminal = _make_terminal_info()
+        repo = ItemMasterWebRepository(
+            tenant_id="T001",
+            store_code="S001",
+            terminal_info=terminal,
+            item_master_documents=[ItemMasterDocument(item_code="ITEM-B1", description="Cached")],
+        )
+
+        mock_client = AsyncMock()
+        mock_client.post.return_value = {
+            "data": [
+                {"item_code": "ITEM-B2", "description": "From API 2"},
+                {"item_code": "ITEM-B3", "description": "From API 3"},
+            ]
+        }
+
+        with patch("app.models.repositories.item_master_web_repository.cart_settings") as mock_cs:
+            mock_cs.USE_ITEM_CACHE = True
+            mock_cs.ITEM_CACHE_TTL_SECONDS = 300
+            with patch(
+                "app.models.repositories.item_master_web_repository.get_pooled_client",
+                return_value=mock_client,
+            ):
+                result = await repo.get_items_by_codes_async(["ITEM-B1", "ITEM-B2", "ITEM-B3", "ITEM-B9", "ITEM-B2"])
+
+        assert set(result.keys()) == {"ITEM-B1", "ITEM-B2", "ITEM-B3"}
+        assert result["ITEM-B1"].description == "Cached"
+        mock_client.post.assert_awaited_once()
+        assert mock_client.post.call_args.kwargs["json"] == {"itemCodes": ["ITEM-B2", "ITEM-B3", "ITEM-B9"]}
+        assert item_master_cache.get("T001", "S001", "ITEM-B3") is not None
+
+    @pytest.mark.asyncio
+    async def test_no_call_when_all_items_cached(self):
+        terminal = _make_terminal_info()
+        repo = ItemMasterWebRepository(
+            tenant_id="T001",
+            store_code="S001",
+            terminal_info=terminal,
+            item_master_documents=[ItemMasterDocument(item_code="ITEM-B4")],
+        )
+
+        mock_client = AsyncMock()
+        with patch("app.models.repositories.item_master_web_repository.cart_settings") as mock_cs:
+            mock_cs.USE_ITEM_CACHE = True
+            mock_cs.ITEM_CACHE_TTL_SECONDS = 300
+            with patch(
+                "app.models.repositories.item_master_web_repository.get_pooled_client",
+                return_value=mock_client,
+            ):
+                result = await repo.get_items_by_codes_async(["ITEM-B4"])
+
+        assert list(result.keys()) == ["ITEM-B4"]
+        mock_client.post.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_error_raises_repository_exception(self):
+        terminal = _make_terminal_info()
+        repo = ItemMasterWebRepository(tenant_id="T001", store_code="S001", terminal_info=terminal)
+
+        mock_client = AsyncMock()
+        mock_client.post.side_effect = Exception("Connection refused")
+
+        with patch("app.models.repositories.item_master_web_repository.cart_settings") as mock_cs:
+            mock_cs.USE_ITEM_CACHE = False
+            with patch(
+                "app.models.repositories.item_master_web_repository.get_pooled_client",
+                return_value=mock_client,
+            ):
+                with pytest.raises(RepositoryException):
+                    await repo.get_items_by_codes_async(["ITEM-ERR"])
 
 
 class TestItemMasterWebRepositoryCacheExpiration:
@@ -146,7 +286,7 @@ class TestItemMasterWebRepositoryCacheExpiration:
             terminal_info=terminal,
         )
         # Manually add an expired cache entry
-        repo._item_cache = [(item, time.time() - 999)]
+        repo._item_cache = {"ITEM-04": (item, time.time() - 999)}
 
         mock_client = AsyncMock()
         mock_client.get.return_value = {
@@ -276,7 +416,7 @@ class TestItemMasterWebRepositoryProperties:
         items = [ItemMasterDocument(item_code="C")]
         repo.item_master_documents = items
         assert len(repo._item_cache) == 1
-        assert repo._item_cache[0][0].item_code == "C"
+        assert repo._item_cache["C"][0].item_code == "C"
 
     def test_item_master_documents_setter_with_none(self):
         terminal = _make_terminal_info()
@@ -300,7 +440,7 @@ class TestItemMasterWebRepositoryProperties:
         items = [ItemMasterDocument(item_code="D")]
         repo.set_item_master_documents(items)
         assert len(repo._item_cache) == 1
-        assert repo._item_cache[0][0].item_code == "D"
+        assert repo._item_cache["D"][0].item_code == "D"
 
 
 # =========================================================================
@@ -446,6 +586,30 @@ class TestSettingsMasterWebRepositoryGetAll:
         assert result[1].name == "setting2"
         assert repo.settings_master_documents == result
 
+    @pytest.mark.asyncio
+    async def test_get_all_settings_reads_all_pages(self):
+        repo = self._make_repo()
+
+        def _page(page_no, names):
+            return {
+                "success": True,
+                "data": [{"name": name, "default_value": "v"} for name in names],
+                "metadata": {"total": 3, "page": page_no, "limit": 2},
+            }
+
+        mock_client = AsyncMock()
+        mock_client.get.side_effect = [_page(1, ["s1", "s2"]), _page(2, ["s3"])]
+
+        with patch(
+            "app.models.repositories.settings_master_web_repository.get_pooled_client",
+            return_value=mock_client,
+        ), patch("app.models.repositories.settings_master_web_repository.SETTINGS_PAGE_SIZE", 2):
+            result = await repo.get_all_settings_async()
+
+        assert [doc.name for doc in result] == ["s1", "s2", "s3"]
+        pages = [call.kwargs["params"]["page"] for call in mock_client.get.call_args_list]
+        assert pages == [1, 2]
+
     @pytest.mark.asyncio
     async def test_get_all_settings_empty_on_no_data(self):
         repo = self._make_repo()
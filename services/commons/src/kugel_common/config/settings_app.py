@@ -19,8 +19,22 @@ class AppSettings(BaseSettings):
         RECEIPT_NO_START_VALUE: Starting value for receipt number sequences
         RECEIPT_NO_END_VALUE: Ending value for receipt number sequences (cycles back to start)
         SLACK_WEBHOOK_URL: URL for Slack webhook notifications
+        REQUEST_LOG_BODY_MAX_BYTES: Maximum number of bytes of a request or response body kept in the request log (default: 65536)
+        REQUEST_LOG_BODY_CONTENT_TYPES: Media types of the bodies kept in the request log (default: application/json)
+        REQUEST_LOG_BODY_EXCLUDE_PATHS: URL path patterns (fnmatch) of the routes whose bodies are not kept in the request log
+        USE_COMPILED_RECEIPT: Render the receipt and journal texts with the compiled renderer instead of the XML round trip (default: True)
+        RECEIPT_FRAGMENT_CACHE_MAX_ENTRIES: Maximum number of compiled receipt line fragments kept in memory (default: 10000)
+        USE_PLUGIN_REGISTRY: Keep the plugin configuration files and plugin classes in memory instead of loading them per request (default: True)
+        PLUGIN_CONFIG_CHECK_INTERVAL_SECONDS: Minimum interval between checks of the plugin configuration files for changes (default: 10)
     """
     ROUND_METHOD_FOR_DISCOUNT: str = RoundMethod.Round.value
     RECEIPT_NO_START_VALUE: int = 111111
     RECEIPT_NO_END_VALUE: int = 999999
-    SLACK_WEBHOOK_URL: str = ""
\ No newline at end of file
+    SLACK_WEBHOOK_URL: str = ""
+    REQUEST_LOG_BODY_MAX_BYTES: int = 65536
+    REQUEST_LOG_BODY_CONTENT_TYPES: list[str] = ["application/json"]
+    REQUEST_LOG_BODY_EXCLUDE_PATHS: list[str] = []
+    USE_COMPILED_RECEIPT: bool = True
+    RECEIPT_FRAGMENT_CACHE_MAX_ENTRIES: int = 10000
+    USE_PLUGIN_REGISTRY: bool = True
+    PLUGIN_CONFIG_CHECK_INTERVAL_SECONDS: float = 10.0
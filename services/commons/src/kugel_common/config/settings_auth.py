@@ -32,10 +32,20 @@ class AuthSettings(BaseSettings):
         TOKEN_URL: URL endpoint for token generation
         TOKEN_EXPIRE_MINUTES: JWT token expiration time in minutes
         PUBSUB_NOTIFY_API_KEY: API key for Pub/Sub notifications
+        TERMINAL_TOKEN_EXPIRE_HOURS: Terminal JWT token expiration time in hours
+        USE_TERMINAL_INFO_CACHE: Cache the terminal information resolved by API key from the terminal service
+        TERMINAL_INFO_CACHE_TTL_SECONDS: Time to live of a cached terminal information in seconds
+        TERMINAL_INFO_CACHE_MAX_ENTRIES: Maximum number of cached terminals, the least recently used is dropped first
+        SERVICE_TOKEN_REUSE_SECONDS: Time a service-to-service token is reused before a new one is created,
+            0 creates a token for every call (default: 240, the tokens expire after 5 minutes)
     """
     SECRET_KEY: str = "test-secret-key-for-development-only"  # Override with environment variable in production
     ALGORITHM: str = "HS256"
     TOKEN_URL: str = "http://localhost:8000/api/v1/accounts/token"
     TOKEN_EXPIRE_MINUTES: int = 30
     PUBSUB_NOTIFY_API_KEY: str = "test-api-key-for-development-only"  # Override with environment variable in production
-    TERMINAL_TOKEN_EXPIRE_HOURS: int = 24
\ No newline at end of file
+    TERMINAL_TOKEN_EXPIRE_HOURS: int = 24
+    USE_TERMINAL_INFO_CACHE: bool = True
+    TERMINAL_INFO_CACHE_TTL_SECONDS: int = 60
+    TERMINAL_INFO_CACHE_MAX_ENTRIES: int = 10000
+    SERVICE_TOKEN_REUSE_SECONDS: int = 240
@@ -35,6 +35,13 @@ class DBSettings(BaseSettings):
         DB_SERVER_SELECTION_TIMEOUT_MS: Server selection timeout in milliseconds (default: 5000)
         DB_CONNECT_TIMEOUT_MS: Connection timeout in milliseconds (default: 10000)
         DB_SOCKET_TIMEOUT_MS: Socket operation timeout in milliseconds (default: 30000)
+        USE_REQUEST_LOG_WRITER: Write request logs in batches from a queue instead of one task per request (default: True)
+        REQUEST_LOG_QUEUE_SIZE: Maximum number of request logs waiting to be written, further logs are dropped (default: 10000)
+        REQUEST_LOG_BATCH_SIZE: Maximum number of request logs written with one insert per database (default: 500)
+        REQUEST_LOG_FLUSH_INTERVAL_SECONDS: Maximum time a request log waits for its batch to fill up (default: 1.0)
+        USE_EVENT_ID_CACHE: Check the event IDs of the processed pub/sub messages in memory before the Dapr state store (default: True)
+        EVENT_ID_CACHE_TTL_SECONDS: Time a processed event ID is kept in memory (default: 3600)
+        EVENT_ID_CACHE_MAX_ENTRIES: Maximum number of event IDs kept in memory, the least recently used is dropped first (default: 100000)
     """
     MONGODB_URI: str = "mongodb://localhost:27017/?replicaSet=rs0"
     DB_NAME_PREFIX: str = "db_common"
@@ -45,6 +52,13 @@ class DBSettings(BaseSettings):
     DB_SERVER_SELECTION_TIMEOUT_MS: int = 5000
     DB_CONNECT_TIMEOUT_MS: int = 10000
     DB_SOCKET_TIMEOUT_MS: int = 30000
+    USE_REQUEST_LOG_WRITER: bool = True
+    REQUEST_LOG_QUEUE_SIZE: int = 10000
+    REQUEST_LOG_BATCH_SIZE: int = 500
+    REQUEST_LOG_FLUSH_INTERVAL_SECONDS: float = 1.0
+    USE_EVENT_ID_CACHE: bool = True
+    EVENT_ID_CACHE_TTL_SECONDS: int = 3600
+    EVENT_ID_CACHE_MAX_ENTRIES: int = 100000
 
 class DBCollectionCommonSettings(BaseSettings):
     """
@@ -34,6 +34,21 @@ class WebServiceSettings(BaseSettings):
         BASE_URL_REPORT: URL for the Report microservice
         BASE_URL_JOURNAL: URL for the Journal microservice
         BASE_URL_STOCK: URL for the Stock microservice
+        USE_DELIVERY_STATUS_BATCH: Send the pub/sub delivery statuses in batches to the bulk delivery-status
+            endpoints of cart and terminal instead of one request per message (default: True)
+        DELIVERY_STATUS_QUEUE_SIZE: Maximum number of delivery statuses waiting to be sent, further statuses are dropped (default: 10000)
+        DELIVERY_STATUS_BATCH_SIZE: Maximum number of delivery statuses sent with one request (default: 200)
+        DELIVERY_STATUS_FLUSH_INTERVAL_SECONDS: Maximum time a delivery status waits for its batch to fill up (default: 0.5)
+        USE_BULK_SUBSCRIBE: Subscribe to the transaction logs with Dapr bulk subscribe, receiving the messages
+            in batches instead of one request per message (default: True)
+        BULK_SUBSCRIBE_MAX_MESSAGES: Maximum number of messages delivered in one batch (default: 100)
+        BULK_SUBSCRIBE_MAX_AWAIT_MS: Maximum time Dapr waits for a batch to fill up in milliseconds (default: 1000)
+        HTTP_CLIENT_HTTP2: Use HTTP/2 for the pooled clients of the other services, requires the h2 package (default: False)
+        HTTP_CLIENT_MAX_CONNECTIONS: Maximum number of connections of a pooled client (default: 100)
+        HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS: Maximum number of idle keep-alive connections of a pooled client (default: 20)
+        HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS: Time an idle keep-alive connection is kept open (default: 30)
+        HTTP_CLIENT_SERVICE_LIMITS: Per-service overrides of the pooled client settings, keyed by service name, e.g.
+            {"master-data": {"max_connections": 200, "http2": true}}
     """
     BASE_URL_DAPR: str = "http://localhost:3500/v1.0"
     BASE_URL_MASTER_DATA: str = "http://localhost:8002/api/v1"
@@ -41,4 +56,16 @@ class WebServiceSettings(BaseSettings):
     BASE_URL_CART: str = "http://localhost:8003/api/v1"
     BASE_URL_REPORT: str = "http://localhost:8004/api/v1"
     BASE_URL_JOURNAL: str = "http://localhost:8005/api/v1"
-    BASE_URL_STOCK: str = "http://localhost:8006/api/v1"
\ No newline at end of file
+    BASE_URL_STOCK: str = "http://localhost:8006/api/v1"
+    USE_DELIVERY_STATUS_BATCH: bool = True
+    DELIVERY_STATUS_QUEUE_SIZE: int = 10000
+    DELIVERY_STATUS_BATCH_SIZE: int = 200
+    DELIVERY_STATUS_FLUSH_INTERVAL_SECONDS: float = 0.5
+    USE_BULK_SUBSCRIBE: bool = True
+    BULK_SUBSCRIBE_MAX_MESSAGES: int = 100
+    BULK_SUBSCRIBE_MAX_AWAIT_MS: int = 1000
+    HTTP_CLIENT_HTTP2: bool = False
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_CLIENT_SERVICE_LIMITS: dict[str, dict] = {}
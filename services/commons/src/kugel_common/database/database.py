@@ -278,7 +278,8 @@ async def create_collection_with_indexes_async(
                     collection_name=collection_name, 
                     index_keys=keys_dict, 
                     index_name=index_name, 
-                    unique=unique
+                    unique=unique,
+                    partial_filter_expression=index_info.get("partial_filter_expression")
                 )
                 await execute_command_async(command=command_json, db=db)
     except Exception as e:
@@ -366,7 +367,13 @@ async def execute_command_async(command: dict, db: AsyncIOMotorDatabase):
         raise DatabaseException(message, logger, e) from e
     return True
 
-def create_indexes_command(collection_name: str, index_keys: dict, index_name: str, unique: Optional[bool] = None):
+def create_indexes_command(
+    collection_name: str,
+    index_keys: dict,
+    index_name: str,
+    unique: Optional[bool] = None,
+    partial_filter_expression: Optional[dict] = None,
+):
     """
     Create a MongoDB command for creating indexes
     
@@ -377,6 +384,7 @@ def create_indexes_command(collection_name: str, index_keys: dict, index_name: s
         index_keys: Dictionary of field names and index directions
         index_name: Name for the index
         unique: Whether the index should enforce uniqueness
+        partial_filter_expression: Filter of the documents to index, all documents if None
         
     Returns:
         dict: MongoDB command for creating the specified indexes
@@ -391,6 +399,9 @@ def create_indexes_command(collection_name: str, index_keys: dict, index_name: s
     if unique is not None:
         index["unique"] = unique
 
+    if partial_filter_expression is not None:
+        index["partialFilterExpression"] = partial_filter_expression
+
     indexes.append(index)
 
     return {
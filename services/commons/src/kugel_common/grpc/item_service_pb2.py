@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x12item_service.proto\x12\x0citem_service\"b\n\x11ItemDetailRequest\x12\x11\n\ttenant_id\x18\x01 \x01(\t\x12\x12\n\nstore_code\x18\x02 \x01(\t\x12\x11\n\titem_code\x18\x03 \x01(\t\x12\x13\n\x0bterminal_id\x18\x04 \x01(\t\"\xd0\x01\n\x12ItemDetailResponse\x12\x11\n\titem_code\x18\x01 \x01(\t\x12\x11\n\titem_name\x18\x02 \x01(\t\x12\r\n\x05price\x18\x03 \x01(\x05\x12\x10\n\x08tax_rate\x18\x04 \x01(\x05\x12\x15\n\rcategory_code\x18\x05 \x01(\t\x12\x0f\n\x07\x62\x61rcode\x18\x06 \x01(\t\x12\x11\n\tis_active\x18\x07 \x01(\x08\x12\x12\n\ncreated_at\x18\x08 \x01(\t\x12\x12\n\nupdated_at\x18\t \x01(\t\x12\x10\n\x08tax_code\x18\n \x01(\t2a\n\x0bItemService\x12R\n\rGetItemDetail\x12\x1f.item_service.ItemDetailRequest\x1a .item_service.ItemDetailResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x12item_service.proto\x12\x0citem_service\"b\n\x11ItemDetailRequest\x12\x11\n\ttenant_id\x18\x01 \x01(\t\x12\x12\n\nstore_code\x18\x02 \x01(\t\x12\x11\n\titem_code\x18\x03 \x01(\t\x12\x13\n\x0bterminal_id\x18\x04 \x01(\t\"\xd0\x01\n\x12ItemDetailResponse\x12\x11\n\titem_code\x18\x01 \x01(\t\x12\x11\n\titem_name\x18\x02 \x01(\t\x12\r\n\x05price\x18\x03 \x01(\x05\x12\x10\n\x08tax_rate\x18\x04 \x01(\x05\x12\x15\n\rcategory_code\x18\x05 \x01(\t\x12\x0f\n\x07\x62\x61rcode\x18\x06 \x01(\t\x12\x11\n\tis_active\x18\x07 \x01(\x08\x12\x12\n\ncreated_at\x18\x08 \x01(\t\x12\x12\n\nupdated_at\x18\t \x01(\t\x12\x10\n\x08tax_code\x18\n \x01(\t\"d\n\x12ItemDetailsRequest\x12\x11\n\ttenant_id\x18\x01 \x01(\t\x12\x12\n\nstore_code\x18\x02 \x01(\t\x12\x12\n\nitem_codes\x18\x03 \x03(\t\x12\x13\n\x0bterminal_id\x18\x04 \x01(\t\"d\n\x13ItemDetailsResponse\x12/\n\x05items\x18\x01 \x03(\x0b\x32 .item_service.ItemDetailResponse\x12\x1c\n\x14not_found_item_codes\x18\x02 \x03(\t2\xb8\x01\n\x0bItemService\x12R\n\rGetItemDetail\x12\x1f.item_service.ItemDetailRequest\x1a .item_service.ItemDetailResponse\x12U\n\x0eGetItemDetails\x12 .item_service.ItemDetailsRequest\x1a!.item_service.ItemDetailsResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -35,6 +35,10 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_ITEMDETAILREQUEST']._serialized_end=134
   _globals['_ITEMDETAILRESPONSE']._serialized_start=137
   _globals['_ITEMDETAILRESPONSE']._serialized_end=345
-  _globals['_ITEMSERVICE']._serialized_start=347
-  _globals['_ITEMSERVICE']._serialized_end=444
+  _globals['_ITEMDETAILSREQUEST']._serialized_start=347
+  _globals['_ITEMDETAILSREQUEST']._serialized_end=447
+  _globals['_ITEMDETAILSRESPONSE']._serialized_start=449
+  _globals['_ITEMDETAILSRESPONSE']._serialized_end=549
+  _globals['_ITEMSERVICE']._serialized_start=552
+  _globals['_ITEMSERVICE']._serialized_end=736
 # @@protoc_insertion_point(module_scope)
@@ -39,6 +39,11 @@ class ItemServiceStub(object):
                 request_serializer=item__service__pb2.ItemDetailRequest.SerializeToString,
                 response_deserializer=item__service__pb2.ItemDetailResponse.FromString,
                 _registered_method=True)
+        self.GetItemDetails = channel.unary_unary(
+                '/item_service.ItemService/GetItemDetails',
+                request_serializer=item__service__pb2.ItemDetailsRequest.SerializeToString,
+                response_deserializer=item__service__pb2.ItemDetailsResponse.FromString,
+                _registered_method=True)
 
 
 class ItemServiceServicer(object):
@@ -50,6 +55,12 @@ class ItemServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetItemDetails(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_ItemServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -58,6 +69,11 @@ def add_ItemServiceServicer_to_server(servicer, server):
                     request_deserializer=item__service__pb2.ItemDetailRequest.FromString,
                     response_serializer=item__service__pb2.ItemDetailResponse.SerializeToString,
             ),
+            'GetItemDetails': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetItemDetails,
+                    request_deserializer=item__service__pb2.ItemDetailsRequest.FromString,
+                    response_serializer=item__service__pb2.ItemDetailsResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'item_service.ItemService', rpc_method_handlers)
@@ -95,3 +111,30 @@ class ItemService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def GetItemDetails(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/item_service.ItemService/GetItemDetails',
+            item__service__pb2.ItemDetailsRequest.SerializeToString,
+            item__service__pb2.ItemDetailsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
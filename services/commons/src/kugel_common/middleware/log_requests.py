@@ -20,33 +20,43 @@ user context, terminal information and authentication details, storing them both
 log files and in the database.
 """
 from fastapi import Request, Response
-from logging import getLogger
+from starlette.background import BackgroundTasks
+from logging import getLogger, INFO
 from pydantic import ValidationError
+from typing import AsyncIterator, Optional, Union
+from fnmatch import fnmatch
 import json
 import time
 import asyncio
 
 from kugel_common.database import database as db_helper
 from kugel_common.schemas.api_response import ApiResponse
-from kugel_common.security import get_terminal_info, get_current_user
+from kugel_common.security import get_terminal_info, get_request_terminal_info, get_current_user
 from kugel_common.models.documents.terminal_info_document import TerminalInfoDocument
 from kugel_common.models.repositories.request_log_repository import RequestLogRepository
 from kugel_common.models.documents.request_log_document import RequestLog
 from kugel_common.config.settings import settings
 from kugel_common.utils.misc import get_app_time_str
+from kugel_common.utils.request_log_writer import request_log_writer
 
 logger = getLogger(__name__)
 logger_request = getLogger("requestLogger")
 
-def log_requests(service_name: str = "NO_SERVICE_NAME"):
+def log_requests(service_name: str = "NO_SERVICE_NAME", exclude_body_paths: list[str] = None):
     """
     FastAPI middleware factory for request logging
     
     Creates a middleware that logs all requests and responses, including details
     about the client, request content, response content, and processing time.
+
+    The response body is passed through to the client chunk by chunk while only its first
+    REQUEST_LOG_BODY_MAX_BYTES are kept for the log, so the log is written after the
+    response has been sent. Bodies are only kept for the media types in
+    REQUEST_LOG_BODY_CONTENT_TYPES and not for the routes matching REQUEST_LOG_BODY_EXCLUDE_PATHS.
     
     Args:
         service_name: Name of the service using this middleware (e.g., "terminal")
+        exclude_body_paths: URL path patterns (fnmatch) of the routes of this service whose bodies are not logged
         
     Returns:
         An async middleware function to be used with FastAPI
@@ -63,36 +73,92 @@ def log_requests(service_name: str = "NO_SERVICE_NAME"):
         accept_time = get_app_time_str()
         process_time_ms = 0
         response: Response = None
+        request_info = None
         try:
             start_time = time.time()
-            request_info = await _make_request_info(request, accept_time)
+            request_info = await _make_request_info(request, accept_time, exclude_body_paths)
             response = await call_next(request)
             process_time_ms = int((time.time() - start_time) * 1000)
-        except Exception as e:
-            raise
         finally:
-            is_terminal_service = True if service_name == "terminal" else False
-            terminal_info = await _get_terminal_info(request, is_terminal_service)
-            user_dict = await _get_current_user(request)
-            request_log = RequestLog(
-                tenant_id=await _make_tenant_id(terminal_info, user_dict),
-                client_info=await _make_client_info(request),
-                request_info=request_info,
-                response_info=await _make_response_info(response, process_time_ms),
-                staff_info=await _make_staff_info(terminal_info),
-                user_info=await _make_user_info(user_dict),
-                terminal_info=await _make_terminal_info(terminal_info),
-                service_name=service_name  # Add service name to the log
-            )
-            # Log to file synchronously (fast operation)
-            await _output_request_log_to_file(request_log)
-
-            # Log to database asynchronously (fire-and-forget)
-            # This prevents database write latency from blocking API responses
-            asyncio.create_task(_output_request_log_to_db_async(request_log))
+            if response is None:
+                # no response to stream, log the failed request right away
+                await _write_request_log(request, service_name, request_info, None, process_time_ms)
+
+        body_capture = None
+        if _is_body_logged(request.url.path, response.headers.get("content-type"), exclude_body_paths):
+            body_capture = _BodyCapture(settings.REQUEST_LOG_BODY_MAX_BYTES)
+            response.body_iterator = body_capture.tee(response.body_iterator)
+
+        # Starlette runs the background tasks of the response after its body has been sent
+        background = BackgroundTasks()
+        if response.background is not None:
+            background.add_task(response.background)
+        background.add_task(
+            _write_request_log_after_response,
+            request, service_name, request_info, response, process_time_ms, body_capture
+        )
+        response.background = background
         return response
     return middleware
 
+async def _write_request_log(
+    request: Request,
+    service_name: str,
+    request_info: RequestLog.RequestInfo,
+    response: Response,
+    process_time_ms: int,
+    body_capture: "_BodyCapture" = None,
+):
+    """
+    Create the request log and output it to the log file and the database
+    
+    Args:
+        request: FastAPI request object
+        service_name: Name of the service using the middleware
+        request_info: Request information created when the request was accepted
+        response: FastAPI response object or None if the request failed
+        process_time_ms: Request processing time in milliseconds
+        body_capture: Captured response body or None if the body is not logged
+    """
+    is_terminal_service = True if service_name == "terminal" else False
+    terminal_info = await _get_terminal_info(request, is_terminal_service)
+    user_dict = await _get_current_user(request)
+    request_log = RequestLog(
+        tenant_id=await _make_tenant_id(terminal_info, user_dict),
+        client_info=await _make_client_info(request),
+        request_info=request_info,
+        response_info=await _make_response_info(response, process_time_ms, body_capture),
+        staff_info=await _make_staff_info(terminal_info),
+        user_info=await _make_user_info(user_dict),
+        terminal_info=await _make_terminal_info(terminal_info),
+        service_name=service_name  # Add service name to the log
+    )
+    # Log to file synchronously (fast operation)
+    await _output_request_log_to_file(request_log)
+
+    # Log to database asynchronously
+    # This prevents database write latency from blocking API responses
+    if settings.USE_REQUEST_LOG_WRITER:
+        # queued and written in batches by the request log writer
+        request_log_writer.write(request_log)
+    else:
+        # fire-and-forget task per request
+        asyncio.create_task(_output_request_log_to_db_async(request_log))
+
+async def _write_request_log_after_response(*args):
+    """
+    Write the request log as a background task of the response
+
+    The response has already been sent, so errors are only logged.
+
+    Args:
+        *args: Arguments of _write_request_log
+    """
+    try:
+        await _write_request_log(*args)
+    except Exception as e:
+        logger.error(f"Failed to write request log: error->{e}", exc_info=True)
+
 async def _output_request_log_to_file(request_log: RequestLog):
     """
     Output request log information to the log file
@@ -100,6 +166,9 @@ async def _output_request_log_to_file(request_log: RequestLog):
     Args:
         request_log: RequestLog document containing all request/response information
     """
+    if not logger_request.isEnabledFor(INFO):
+        # skip formatting the message
+        return
     logger_request.info(
         f"\n[Client:]\n"
         f"ip_address-> {request_log.client_info.ip_address}\n"
@@ -176,30 +245,99 @@ async def _output_request_log_to_db(request_log: RequestLog):
         except Exception as e:
             logger.error(f"Failed to output request log to db: request_log->{request_log},  error->{e}")
 
-async def _create_async_iterator(body: bytes, chunk_size: int = 1024) -> bytes:
+class _BodyCapture:
     """
-    Create an async iterator for response body streaming
-    
-    This is used to read the response body without consuming it, allowing the
-    original body to still be sent to the client.
-    
+    Keeps the first bytes of a request or response body for the request log
+
+    Attributes:
+        max_bytes: Maximum number of bytes kept
+        prefix: First bytes of the body
+        size: Total size of the body in bytes
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        Initialize the body capture
+
+        Args:
+            max_bytes: Maximum number of bytes kept
+        """
+        self.max_bytes = max_bytes
+        self.prefix = bytearray()
+        self.size = 0
+
+    def append(self, chunk: bytes):
+        """
+        Add a chunk of the body, keeping only what still fits into the prefix
+
+        Args:
+            chunk: Chunk of the body
+        """
+        self.size += len(chunk)
+        remaining = self.max_bytes - len(self.prefix)
+        if remaining > 0:
+            self.prefix += chunk[:remaining]
+
+    async def tee(self, body_iterator: AsyncIterator):
+        """
+        Pass the chunks of a response body through while capturing them
+
+        Args:
+            body_iterator: Body iterator of the response
+
+        Returns:
+            Async generator yielding the chunks unchanged
+        """
+        async for chunk in body_iterator:
+            if isinstance(chunk, (bytes, bytearray, memoryview)):
+                self.append(bytes(chunk))
+            elif isinstance(chunk, str):
+                self.append(chunk.encode())
+            yield chunk
+
+    def get_body(self) -> Optional[Union[list, dict]]:
+        """
+        Get the body for the request log
+
+        Returns:
+            Parsed JSON body, a truncation marker with the size and the decoded prefix
+            if the body was larger than max_bytes, or None if the body is empty or not JSON
+        """
+        if self.size == 0:
+            return None
+        if self.size > len(self.prefix):
+            return {"truncated": True, "size": self.size, "prefix": self.prefix.decode(errors="ignore")}
+        try:
+            return json.loads(self.prefix)
+        except Exception:
+            return None
+
+def _is_body_logged(path: str, content_type: Optional[str], exclude_body_paths: list[str] = None) -> bool:
+    """
+    Check whether a body is kept in the request log
+
     Args:
-        body: Response body bytes
-        chunk_size: Size of chunks to yield
-        
+        path: URL path of the request
+        content_type: Content-Type header of the body
+        exclude_body_paths: URL path patterns (fnmatch) of the service whose bodies are not logged
+
     Returns:
-        Async generator for body chunks
-    """
-    async def async_generator():
-        for i in range(0, len(body), chunk_size):
-            yield body[i:i + chunk_size]
-    return async_generator()
+        True if the body is kept in the request log
+    """
+    if settings.REQUEST_LOG_BODY_MAX_BYTES <= 0 or not content_type:
+        return False
+    patterns = settings.REQUEST_LOG_BODY_EXCLUDE_PATHS + (exclude_body_paths or [])
+    if any(fnmatch(path, pattern) for pattern in patterns):
+        return False
+    media_type = content_type.split(";")[0].strip().lower()
+    return media_type in (allowed.lower() for allowed in settings.REQUEST_LOG_BODY_CONTENT_TYPES)
 
 async def _get_terminal_info(request: Request, is_terminal_service: bool = False) -> TerminalInfoDocument:
     """
     Extract terminal information from the request
     
-    Attempts to retrieve terminal information based on API key and terminal ID
+    Reuses the terminal information resolved by the security dependencies during the request.
+    Otherwise attempts to retrieve terminal information based on API key and terminal ID
     in the request headers, query parameters, or path parameters.
     
     Args:
@@ -209,7 +347,10 @@ async def _get_terminal_info(request: Request, is_terminal_service: bool = False
     Returns:
         TerminalInfoDocument or None if terminal information cannot be retrieved
     """
-    terminal_info = None
+    terminal_info = get_request_terminal_info(request)
+    if terminal_info is not None:
+        logger.debug(f"terminal_info resolved during the request: {terminal_info.terminal_id}")
+        return terminal_info
     terminal_id = None
 
     api_key = request.headers.get("X-API-Key")
@@ -247,56 +388,30 @@ async def _get_current_user(request: Request) -> dict:
     logger.debug(f"user_dict: {user_dict}")
     return user_dict
 
-async def _get_response_body(response):
-    """
-    Extract response body without consuming it
-    
-    Reads the response body and creates a new iterator so the body can still
-    be sent to the client.
-    
-    Args:
-        response: FastAPI response object
-        
-    Returns:
-        Response body as bytes or None if body cannot be read
-    """
-    response_body = b""
-    try:
-        async for chunk in response.body_iterator:
-            response_body += chunk
-        response.body_iterator = await _create_async_iterator(response_body)
-        return response_body
-    except Exception:
-        return None
-
-async def _parse_response_body(response_body: bytes):
-    """
-    Parse response body bytes as JSON
-    
-    Args:
-        response_body: Response body as bytes
-        
-    Returns:
-        Parsed JSON object or None if parsing fails
-    """
-    try:
-        return json.loads(response_body.decode())
-    except Exception:
-        return None
-
-async def _get_request_body(request: Request):
+async def _get_request_body(request: Request, exclude_body_paths: list[str] = None):
     """
     Extract and parse request body as JSON
     
+    Bodies larger than REQUEST_LOG_BODY_MAX_BYTES are not read here if their Content-Length
+    is known, so the route reads them from the stream without a copy kept for the log.
+    
     Args:
         request: FastAPI request object
+        exclude_body_paths: URL path patterns (fnmatch) of the service whose bodies are not logged
         
     Returns:
-        Parsed JSON object or None if parsing fails
+        Parsed JSON object, a truncation marker if the body is too large, or None if the body is not logged
     """
+    if not _is_body_logged(request.url.path, request.headers.get("content-type"), exclude_body_paths):
+        return None
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > settings.REQUEST_LOG_BODY_MAX_BYTES:
+        logger.debug(f"request body not logged, content-length: {content_length}")
+        return {"truncated": True, "size": int(content_length)}
     try:
-        body = await request.body()
-        json_body = json.loads(body)
+        body_capture = _BodyCapture(settings.REQUEST_LOG_BODY_MAX_BYTES)
+        body_capture.append(await request.body())
+        json_body = body_capture.get_body()
         logger.debug(f"request body: {json_body}")
         return json_body
     except Exception:
@@ -337,13 +452,16 @@ async def _make_client_info(request: Request) -> RequestLog.ClientInfo:
     """
     return RequestLog.ClientInfo(ip_address=request.client.host)
     
-async def _make_request_info(request: Request, accept_time: str) -> RequestLog.RequestInfo:
+async def _make_request_info(
+    request: Request, accept_time: str, exclude_body_paths: list[str] = None
+) -> RequestLog.RequestInfo:
     """
     Create request information object from request
     
     Args:
         request: FastAPI request object
         accept_time: Timestamp when the request was accepted
+        exclude_body_paths: URL path patterns (fnmatch) of the service whose bodies are not logged
         
     Returns:
         RequestLog.RequestInfo object with request details
@@ -351,17 +469,20 @@ async def _make_request_info(request: Request, accept_time: str) -> RequestLog.R
     return RequestLog.RequestInfo(
         method=request.method, 
         url=str(request.url), 
-        body=await _get_request_body(request),
+        body=await _get_request_body(request, exclude_body_paths),
         accept_time=accept_time
     )
 
-async def _make_response_info(response: Response, process_time_ms: int) -> RequestLog.ResponseInfo:
+async def _make_response_info(
+    response: Response, process_time_ms: int, body_capture: _BodyCapture = None
+) -> RequestLog.ResponseInfo:
     """
     Create response information object from response
     
     Args:
         response: FastAPI response object
         process_time_ms: Request processing time in milliseconds
+        body_capture: Captured response body or None if the body is not logged
         
     Returns:
         RequestLog.ResponseInfo object with response details
@@ -373,12 +494,10 @@ async def _make_response_info(response: Response, process_time_ms: int) -> Reque
             body=None
         )
 
-    response_body = await _get_response_body(response)
-    json_body = await _parse_response_body(response_body)
     return RequestLog.ResponseInfo(
         status_code=response.status_code,
         process_time_ms=process_time_ms,
-        body=json_body
+        body=body_capture.get_body() if body_capture else None
     )
 
 async def _make_staff_info(terminal_info: TerminalInfoDocument) -> RequestLog.StaffInfo:
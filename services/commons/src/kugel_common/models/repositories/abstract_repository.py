@@ -19,10 +19,10 @@ It provides a comprehensive set of CRUD operations and transaction management
 for document models used throughout the application.
 """
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic, Type
+from typing import TypeVar, Generic, Type, Optional
 from logging import getLogger
 from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorClientSession
-from pymongo.errors import DuplicateKeyError, OperationFailure
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
 import asyncio
 from kugel_common.models.documents.abstract_document import AbstractDocument
 from kugel_common.utils.misc import get_app_time
@@ -192,6 +192,47 @@ class AbstractRepository(ABC, Generic[Tdocument]):
             message = f"Failed to save document to database: {document}"
             raise RepositoryException(message, self.collection_name, logger, e) from e
 
+    async def create_many_async(self, documents: list[Tdocument]) -> int:
+        """
+        Create new documents in the database with one ordered bulk insert
+        
+        Inserts the documents in the given order and sets their creation timestamp.
+        The insert stops at the first error, use a transaction to insert all or none.
+        
+        Args:
+            documents: The document model instances to insert
+            
+        Returns:
+            int: Number of inserted documents
+            
+        Raises:
+            DuplicateKeyException: If a document with the same key already exists
+            RepositoryException: If any other database error occurs
+        """
+        if not documents:
+            return 0
+        if self.dbcollection is None:
+            await self.initialize()
+        try:
+            now = get_app_time()
+            for document in documents:
+                document.created_at = now
+            response = await self.dbcollection.insert_many(
+                [document.model_dump() for document in documents], ordered=True, session=self.session
+            )
+            return len(response.inserted_ids)
+        except BulkWriteError as e:
+            write_errors = e.details.get("writeErrors", [])
+            if write_errors and write_errors[0].get("code") == 11000:
+                message = f"Duplicate key error: {write_errors[0].get('errmsg')}"
+                key = write_errors[0].get("keyValue", None)
+                raise DuplicateKeyException(message, self.collection_name, key, logger) from e
+            message = f"Failed to save {len(documents)} documents to database"
+            raise RepositoryException(message, self.collection_name, logger, e) from e
+        except Exception as e:
+            message = f"Failed to save {len(documents)} documents to database"
+            raise RepositoryException(message, self.collection_name, logger, e) from e
+
     async def get_all_async(self, max: int = 0) -> list[Tdocument]:
         """
         Retrieve all documents from the collection
@@ -259,7 +300,12 @@ class AbstractRepository(ABC, Generic[Tdocument]):
             raise RepositoryException(message, self.collection_name, logger, e) from e
 
     async def get_list_async_with_sort_and_paging(
-        self, filter: dict, limit: int = 0, page: int = 1, sort: list[tuple[str, int]] = None
+        self,
+        filter: dict,
+        limit: int = 0,
+        page: int = 1,
+        sort: list[tuple[str, int]] = None,
+        projection: Optional[dict] = None,
     ) -> list[Tdocument]:
         """
         Retrieve documents with sorting and pagination
@@ -272,6 +318,8 @@ class AbstractRepository(ABC, Generic[Tdocument]):
             limit: Maximum number of documents per page (0 for unlimited)
             page: Page number to retrieve (1-based index)
             sort: List of tuples specifying the sort order (field, direction)
+            projection: Optional MongoDB projection, the fields not returned keep
+                their default values in the document models
             
         Returns:
             list[Tdocument]: List of document model instances
@@ -283,7 +331,7 @@ class AbstractRepository(ABC, Generic[Tdocument]):
             await self.initialize()
         try:
             skip = (page - 1) * limit
-            cursor = self.dbcollection.find(filter).skip(skip)
+            cursor = self.dbcollection.find(filter, projection).skip(skip)
             if limit != 0:
                 cursor = cursor.limit(limit)
             if sort is None:
@@ -328,7 +376,7 @@ class AbstractRepository(ABC, Generic[Tdocument]):
             total_count = await self.dbcollection.count_documents(filter)
 
             skip = (page - 1) * limit
-            cursor = self.dbcollection.find(filter).skip(skip)
+            cursor = self.dbcollection.find(filter, projection).skip(skip)
 
             if limit != 0:
                 cursor = cursor.limit(limit)
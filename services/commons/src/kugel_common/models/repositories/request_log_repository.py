@@ -20,11 +20,13 @@ It implements the repository pattern for the RequestLog document model.
 from typing import Type
 from logging import getLogger
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import BulkWriteError
 
 from kugel_common.models.documents.request_log_document import RequestLog
 from kugel_common.models.repositories.abstract_repository import AbstractRepository
 from kugel_common.exceptions import CannotCreateException
 from kugel_common.config.settings import settings
+from kugel_common.utils.misc import get_app_time
 
 logger = getLogger(__name__)
 
@@ -74,6 +76,46 @@ class RequestLogRepository(AbstractRepository[RequestLog]):
             )
             raise CannotCreateException(message, logger, e) from e
 
+    async def create_request_logs_async(self, request_logs: list[RequestLog]) -> int:
+        """
+        Create multiple request log entries with a single insert
+
+        The insert is unordered, so a document that cannot be inserted (e.g. a duplicate
+        key) does not prevent the others from being inserted.
+
+        Args:
+            request_logs: The RequestLog documents to persist
+
+        Returns:
+            int: The number of request logs inserted
+
+        Raises:
+            CannotCreateException: If the insert fails entirely
+        """
+        if not request_logs:
+            return 0
+        if self.dbcollection is None:
+            await self.initialize()
+        created_at = get_app_time()
+        documents = []
+        for request_log in request_logs:
+            request_log.shard_key = self.__get_shard_key(request_log)
+            request_log.created_at = created_at
+            documents.append(request_log.model_dump())
+        try:
+            result = await self.dbcollection.insert_many(documents, ordered=False)
+            return len(result.inserted_ids)
+        except BulkWriteError as e:
+            inserted = e.details.get("nInserted", 0)
+            logger.warning(
+                f"Failed to create {len(documents) - inserted} of {len(documents)} request logs: "
+                f"{e.details.get('writeErrors', [])[:1]}"
+            )
+            return inserted
+        except Exception as e:
+            message = "Failed to create request logs"
+            raise CannotCreateException(message, self.collection_name, f"{len(documents)} request logs", logger, e) from e
+
     def __get_shard_key(self, request_log: RequestLog) -> str:
         """
         Generate a shard key for the request log document
@@ -19,7 +19,7 @@ from the backend service. It implements a repository pattern that fetches
 data over HTTP rather than from a direct database connection.
 """
 from kugel_common.config.settings import settings
-from kugel_common.utils.http_client_helper import get_service_client
+from kugel_common.utils.http_client_helper import get_pooled_client
 from kugel_common.exceptions import NotFoundException, RepositoryException
 from kugel_common.models.documents.staff_master_document import StaffMasterDocument
 from kugel_common.models.documents.terminal_info_document import TerminalInfoDocument
@@ -69,40 +69,40 @@ class StaffMasterWebRepository():
             NotFoundException: If the staff information cannot be found
             RepositoryException: If there's an error communicating with the API
         """
-        async with get_service_client("master-data") as client:
-            jwt_token = getattr(self.terminal_info, "jwt_token", None)
-            if jwt_token:
-                headers = {"Authorization": f"Bearer {jwt_token}"}
-                params = {}
+        client = await get_pooled_client("master-data")
+        jwt_token = getattr(self.terminal_info, "jwt_token", None)
+        if jwt_token:
+            headers = {"Authorization": f"Bearer {jwt_token}"}
+            params = {}
+        else:
+            headers = {"X-API-KEY": self.terminal_info.api_key}
+            params = {"terminal_id": self.terminal_info.terminal_id}
+        endpoint = f"/tenants/{self.tenant_id}/staff/{id}"
+        
+        logger.debug(f"endpoint: {endpoint}, params: {params}, headers: {headers}")
+        
+        try:
+            response_data = await client.get(endpoint, params=params, headers=headers)
+        except Exception as e:
+            if hasattr(e, 'status_code') and e.status_code == 404:
+                message = f"staff not found for id {id}"
+                raise NotFoundException(
+                    message=message, 
+                    collection_name="staff web", 
+                    find_key=id, 
+                    logger=logger, 
+                    original_exception=e
+                )
             else:
-                headers = {"X-API-KEY": self.terminal_info.api_key}
-                params = {"terminal_id": self.terminal_info.terminal_id}
-            endpoint = f"/tenants/{self.tenant_id}/staff/{id}"
-            
-            logger.debug(f"endpoint: {endpoint}, params: {params}, headers: {headers}")
+                message = f"Request error for id {id}"
+                raise RepositoryException(
+                    message=message,
+                    collection_name="staff web",
+                    logger=logger,
+                    original_exception=e
+                )
             
-            try:
-                response_data = await client.get(endpoint, params=params, headers=headers)
-            except Exception as e:
-                if hasattr(e, 'status_code') and e.status_code == 404:
-                    message = f"staff not found for id {id}"
-                    raise NotFoundException(
-                        message=message, 
-                        collection_name="staff web", 
-                        find_key=id, 
-                        logger=logger, 
-                        original_exception=e
-                    )
-                else:
-                    message = f"Request error for id {id}"
-                    raise RepositoryException(
-                        message=message,
-                        collection_name="staff web",
-                        logger=logger,
-                        original_exception=e
-                    )
-                
-            logger.debug(f"response: {response_data}")
-            return StaffMasterDocument(**response_data.get("data"))
+        logger.debug(f"response: {response_data}")
+        return StaffMasterDocument(**response_data.get("data"))
 
 
@@ -19,7 +19,7 @@ from the backend service. It implements a repository pattern that fetches
 data over HTTP rather than from a direct database connection.
 """
 from kugel_common.exceptions import NotFoundException, RepositoryException
-from kugel_common.utils.http_client_helper import get_service_client
+from kugel_common.utils.http_client_helper import get_pooled_client
 from kugel_common.config.settings import settings
 from kugel_common.models.documents.terminal_info_document import TerminalInfoDocument
 from kugel_common.models.documents.store_info_document import StoreInfoDocument
@@ -67,38 +67,38 @@ class StoreInfoWebRepository():
             RepositoryException: If there's an error communicating with the API
         """
         store_code = self.terminal_info.store_code
-        async with get_service_client("terminal") as client:
-            jwt_token = getattr(self.terminal_info, "jwt_token", None)
-            if jwt_token:
-                headers = {"Authorization": f"Bearer {jwt_token}"}
-                params = {}
+        client = await get_pooled_client("terminal")
+        jwt_token = getattr(self.terminal_info, "jwt_token", None)
+        if jwt_token:
+            headers = {"Authorization": f"Bearer {jwt_token}"}
+            params = {}
+        else:
+            headers = {"X-API-KEY": self.terminal_info.api_key}
+            params = {"terminal_id": self.terminal_info.terminal_id}
+        endpoint = f"/tenants/{self.tenant_id}/stores/{store_code}"
+        
+        try:
+            response_data = await client.get(endpoint, params=params, headers=headers)
+        except Exception as e:
+            if hasattr(e, 'status_code') and e.status_code == 404:
+                message = f"store info not found for store_code {store_code}"
+                raise NotFoundException(
+                    message=message, 
+                    collection_name="Store Info Web",
+                    find_key=store_code, 
+                    logger=logger, 
+                    original_exception=e
+                )
             else:
-                headers = {"X-API-KEY": self.terminal_info.api_key}
-                params = {"terminal_id": self.terminal_info.terminal_id}
-            endpoint = f"/tenants/{self.tenant_id}/stores/{store_code}"
+                message = f"Request error for store_code {store_code}"
+                raise RepositoryException(
+                    message=message,
+                    collection_name="Store Info Web",
+                    logger=logger,
+                    original_exception=e
+                )
             
-            try:
-                response_data = await client.get(endpoint, params=params, headers=headers)
-            except Exception as e:
-                if hasattr(e, 'status_code') and e.status_code == 404:
-                    message = f"store info not found for store_code {store_code}"
-                    raise NotFoundException(
-                        message=message, 
-                        collection_name="Store Info Web",
-                        find_key=store_code, 
-                        logger=logger, 
-                        original_exception=e
-                    )
-                else:
-                    message = f"Request error for store_code {store_code}"
-                    raise RepositoryException(
-                        message=message,
-                        collection_name="Store Info Web",
-                        logger=logger,
-                        original_exception=e
-                    )
-                
-            logger.debug(f"response: {response_data}")
-            return StoreInfoDocument(**response_data.get("data"))
+        logger.debug(f"response: {response_data}")
+        return StoreInfoDocument(**response_data.get("data"))
 
 
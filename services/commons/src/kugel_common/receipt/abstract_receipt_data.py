@@ -22,7 +22,9 @@ import locale
 
 logger = getLogger(__name__)
 
+from kugel_common.config.settings import settings
 from kugel_common.receipt.receipt_data_model import Page, Line, PrintData, Constants as const
+from kugel_common.receipt.receipt_renderer import receipt_renderer
 from kugel_common.utils.text_helper import TextHelper
 
 T = TypeVar('T', bound=BaseModel)
@@ -52,6 +54,12 @@ class AbstractReceiptData(ABC, Generic[T]):
         return print_data
 
     def make_receipt_text(self, print_data: PrintData) -> str:
+        if settings.USE_COMPILED_RECEIPT:
+            # same text as the XML round trip below, from cached line fragments
+            print_xml_str = receipt_renderer.render_receipt_text(print_data)
+            if print_xml_str is not None:
+                logger.debug(f"receipt_text: {print_xml_str}")
+                return print_xml_str
         print_str = parseString(print_data.to_xml())
         print_xml_str = print_str.toprettyxml(indent="\t")
         print_xml_str = print_xml_str.encode('utf-8').decode('utf-8')
@@ -75,7 +83,10 @@ class AbstractReceiptData(ABC, Generic[T]):
         return dt_formatted
 
     def make_journal_text(self, print_data: PrintData) -> str:
-        journal_text = print_data.to_text(width=self.width)
+        if settings.USE_COMPILED_RECEIPT:
+            journal_text = receipt_renderer.render_journal_text(print_data, width=self.width)
+        else:
+            journal_text = print_data.to_text(width=self.width)
         logger.debug(f"journal_text: {journal_text}")
         return journal_text
 
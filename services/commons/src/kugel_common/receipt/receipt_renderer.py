@@ -0,0 +1,308 @@
+# Copyright 2025 masa@kugel
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Compiled renderer of the receipt and journal texts
+
+The receipt text used to be produced by serializing the print data with pydantic-xml,
+parsing the XML again with minidom and pretty printing it, and the journal text by
+formatting every line with the width-aware text helpers. Both are done for every
+transaction log and report.
+
+The renderer writes the same texts directly. Each line is compiled once into its XML
+and journal text fragments, which are cached by content: the header and footer blocks
+of a store, borders and fixed labels are rendered once, and a change of the store
+settings simply produces new fragments. The output is identical to the original path,
+which is still used for print data that cannot be written without the XML round trip.
+"""
+import re
+from io import StringIO
+from logging import getLogger
+from typing import Optional
+from xml.dom.minidom import Document, Text
+
+from kugel_common.config.settings import settings
+from kugel_common.receipt.receipt_data_model import Page, Line, Table, PrintData, Constants as const
+from kugel_common.utils.text_helper import TextHelper
+
+logger = getLogger(__name__)
+
+# characters that are not allowed in XML 1.0, rejected by the XML serialization
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+_INDENT = "\t"
+_XML_DECLARATION = '<?xml version="1.0" ?>\n'
+
+
+class ReceiptRenderer:
+    """
+    Renders print data to the receipt (pretty printed XML) and journal (fixed width) texts
+    with a cache of the compiled fragment of each line.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        """
+        Initialize the renderer.
+
+        Args:
+            max_entries: Maximum number of cached line fragments, the oldest is dropped first
+        """
+        self._xml_fragments: dict[tuple, str] = {}
+        self._text_fragments: dict[tuple, str] = {}
+        self._escaped_attrs: dict[str, str] = {}
+        self._max_entries = max_entries
+        self._hits = 0
+        self._misses = 0
+
+    def render_receipt_text(self, print_data: PrintData) -> Optional[str]:
+        """
+        Render the receipt text, the print data as pretty printed XML.
+
+        Args:
+            print_data: The print data of the receipt
+
+        Returns:
+            str: The receipt text, None if the print data contains characters not allowed in XML
+        """
+        parts = [_XML_DECLARATION]
+        if not print_data.pages:
+            parts.append("<PrintData/>\n")
+            return "".join(parts)
+
+        parts.append("<PrintData>\n")
+        for page in print_data.pages:
+            page_xml = self._render_page_xml(page)
+            if page_xml is None:
+                return None
+            parts.append(page_xml)
+        parts.append("</PrintData>\n")
+        return "".join(parts)
+
+    def render_journal_text(self, print_data: PrintData, width: int = 32) -> str:
+        """
+        Render the journal text, one fixed width line per line of the print data.
+
+        Args:
+            print_data: The print data of the receipt
+            width: Character width of the journal
+
+        Returns:
+            str: The journal text
+
+        Raises:
+            ValueError: If the print data contains a line type that cannot be printed as text
+        """
+        width = int(width)
+        parts = []
+        for page in print_data.pages:
+            for line in page.lines:
+                key = (line.type, line.align, line.description, line.item1, line.item2, width)
+                fragment = self._text_fragments.get(key)
+                if fragment is None:
+                    self._misses += 1
+                    fragment = self._compile_line_text(line, width)
+                    self._store(self._text_fragments, key, fragment)
+                else:
+                    self._hits += 1
+                parts.append(fragment)
+        return "".join(parts)
+
+    def clear(self) -> None:
+        """
+        Remove all compiled fragments and reset the statistics.
+        """
+        self._xml_fragments.clear()
+        self._text_fragments.clear()
+        self._escaped_attrs.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def stats(self) -> dict:
+        """
+        Get the renderer statistics.
+
+        Returns:
+            dict: Number of cached fragments, hits and misses
+        """
+        return {
+            "cached_fragments": len(self._xml_fragments) + len(self._text_fragments),
+            "hits": self._hits,
+            "misses": self._misses,
+        }
+
+    def _render_page_xml(self, page: Page) -> Optional[str]:
+        """
+        Render a page element at the first level of indentation.
+        """
+        if not page.lines and not page.tables:
+            return f"{_INDENT}<Page/>\n"
+
+        parts = [f"{_INDENT}<Page>\n"]
+        for line in page.lines:
+            key = (line.type, line.align, line.dimension, line.description, line.item1, line.item2)
+            fragment = self._xml_fragments.get(key)
+            if fragment is None:
+                self._misses += 1
+                if any(_has_invalid_chars(value) for value in key):
+                    return None
+                fragment = self._compile_line_xml(line)
+                self._store(self._xml_fragments, key, fragment)
+            else:
+                self._hits += 1
+            parts.append(fragment)
+        for table in page.tables:
+            table_xml = self._compile_table_xml(table)
+            if table_xml is None:
+                return None
+            parts.append(table_xml)
+        parts.append(f"{_INDENT}</Page>\n")
+        return "".join(parts)
+
+    def _compile_line_xml(self, line: Line) -> str:
+        """
+        Compile a line element at the second level of indentation.
+
+        A line always has the Item1 and Item2 elements, so its children are written
+        one per line, the description first when it is not empty.
+        """
+        indent = _INDENT * 2
+        child_indent = _INDENT * 3
+        attrs = self._attrs(type=line.type, align=line.align, dimension=line.dimension)
+        parts = [f"{indent}<Line{attrs}>\n"]
+        if line.description:
+            parts.append(f"{child_indent}{_escape_text(line.description)}\n")
+        parts.append(_element(child_indent, "Item1", line.item1))
+        parts.append(_element(child_indent, "Item2", line.item2))
+        parts.append(f"{indent}</Line>\n")
+        return "".join(parts)
+
+    def _compile_table_xml(self, table: Table) -> Optional[str]:
+        """
+        Compile a table element at the second level of indentation.
+        """
+        values = [table.border, table.frame, table.align]
+        values.extend(column for row in table.rows for column in row.columns)
+        if any(_has_invalid_chars(value) for value in values):
+            return None
+
+        indent = _INDENT * 2
+        attrs = self._attrs(border=table.border, frame=table.frame, align=table.align)
+        if not table.rows:
+            return f"{indent}<Table{attrs}/>\n"
+
+        row_indent = _INDENT * 3
+        parts = [f"{indent}<Table{attrs}>\n"]
+        for row in table.rows:
+            if not row.columns:
+                parts.append(f"{row_indent}<tr/>\n")
+                continue
+            parts.append(f"{row_indent}<tr>\n")
+            for column in row.columns:
+                parts.append(_element(_INDENT * 4, "td", column))
+            parts.append(f"{row_indent}</tr>\n")
+        parts.append(f"{indent}</Table>\n")
+        return "".join(parts)
+
+    def _compile_line_text(self, line: Line, width: int) -> str:
+        """
+        Compile the journal text of a line, as PrintData.to_text does.
+        """
+        if line.type == const.TYPE_TEXT:
+            if line.align is None:
+                logger.warning(f"Align is None. line->{line}")
+                return ""
+            desc = line.description if line.description is not None else ""
+            item1 = line.item1 if line.item1 is not None else ""
+            item2 = line.item2 if line.item2 is not None else ""
+            match line.align:
+                case const.ALIGN_CENTER:
+                    return TextHelper.fixed_center(desc, width) + "\n"
+                case const.ALIGN_LEFT:
+                    return TextHelper.fixed_left(desc, width) + "\n"
+                case const.ALIGN_RIGHT:
+                    return TextHelper.fixed_right(desc, width) + "\n"
+                case const.ALIGN_SPLIT:
+                    # item1 is already adjusted to the width of item2
+                    return item1 + " " + item2 + "\n"
+            return "\n"
+        if line.type == const.TYPE_LINE:
+            return "".center(width, "-") + "\n"
+        if line.type == const.TYPE_BYTE:
+            logger.debug(f"Byte: {line}")
+            raise ValueError("Not supported type: Byte")
+        return "\n"
+
+    def _attrs(self, **attrs) -> str:
+        """
+        Write the attributes of an element in order, missing values as empty strings.
+        """
+        parts = []
+        for name, value in attrs.items():
+            value = "" if value is None else value
+            escaped = self._escaped_attrs.get(value)
+            if escaped is None:
+                escaped = _escape_attr(value)
+                self._escaped_attrs[value] = escaped
+            parts.append(f' {name}="{escaped}"')
+        return "".join(parts)
+
+    def _store(self, fragments: dict, key: tuple, fragment: str) -> None:
+        """
+        Cache a compiled fragment, dropping the oldest one when the cache is full.
+        """
+        if len(fragments) >= self._max_entries:
+            fragments.pop(next(iter(fragments)))
+        fragments[key] = fragment
+
+
+def _element(indent: str, tag: str, value: Optional[str]) -> str:
+    """
+    Write an element holding a text, empty elements are self-closing.
+    """
+    if not value:
+        return f"{indent}<{tag}/>\n"
+    return f"{indent}<{tag}>{_escape_text(value)}</{tag}>\n"
+
+
+def _escape_text(data: str) -> str:
+    """
+    Escape a text node the way minidom writes it.
+    """
+    node = Text()
+    node.data = data
+    writer = StringIO()
+    node.writexml(writer)
+    return writer.getvalue()
+
+
+def _escape_attr(value: str) -> str:
+    """
+    Escape an attribute value the way minidom writes it.
+    """
+    element = Document().createElement("a")
+    element.setAttribute("v", value)
+    writer = StringIO()
+    element.writexml(writer)
+    # <a v="..."/>
+    return writer.getvalue()[len('<a v="') : -len('"/>')]
+
+
+def _has_invalid_chars(value: Optional[str]) -> bool:
+    """
+    Check whether a value contains characters that are not allowed in XML.
+    """
+    return value is not None and _INVALID_XML_CHARS.search(value) is not None
+
+
+# Create a singleton renderer shared by all receipt data strategies
+receipt_renderer = ReceiptRenderer(max_entries=settings.RECEIPT_FRAGMENT_CACHE_MAX_ENTRIES)
@@ -11,7 +11,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from fastapi import HTTPException, status, Depends, Security, Path, Query
+from fastapi import HTTPException, Request, status, Depends, Security, Path, Query
 from fastapi.security import OAuth2PasswordBearer, APIKeyHeader
 from jose import JWTError, jwt
 from logging import getLogger, Logger
@@ -23,6 +23,7 @@ from kugel_common.database import database as db_helper
 from kugel_common.models.documents.terminal_info_document import TerminalInfoDocument
 from kugel_common.models.documents.staff_master_document import StaffMasterDocument
 from kugel_common.utils.http_client_helper import get_pooled_client, HttpClientError
+from kugel_common.utils.terminal_info_cache import terminal_info_cache
 
 logger = getLogger(__name__)
 
@@ -215,25 +216,68 @@ def get_tenant_id(terminal_id: str):
 async def get_terminal_info(
     terminal_id: str,
     api_key: str,
-    is_terminal_service: Optional[bool] = False
+    is_terminal_service: Optional[bool] = False,
+    use_cache: Optional[bool] = True,
 ) -> TerminalInfoDocument:
     """
     Retrieves terminal information either from the database or from the terminal service.
+
+    Terminal information retrieved from the terminal service is cached per terminal ID
+    and API key (see TerminalInfoCache), the terminal service itself reads its database.
+    When the terminal service rejects the terminal (401 or 404), its cached entries are
+    dropped, so that other API keys of a deleted terminal are not served from the cache.
     
     Args:
         terminal_id: Terminal ID to retrieve information for
         api_key: API key for authentication
         is_terminal_service: Whether the caller is the terminal service itself
+        use_cache: False to read the current state of the terminal (e.g. the signed-in staff)
     Returns:
         TerminalInfoDocument containing the terminal information
     """
     if is_terminal_service:
-        terminal_doc = await get_terminal_info_for_terminal_service(terminal_id, api_key)
-    else:
-        terminal_doc = await get_terminal_info_from_terminal_service(terminal_id, api_key)
+        return await get_terminal_info_for_terminal_service(terminal_id, api_key)
 
+    use_cache = use_cache and settings.USE_TERMINAL_INFO_CACHE
+    if use_cache:
+        terminal_doc = terminal_info_cache.get(terminal_id, api_key)
+        if terminal_doc is not None:
+            return terminal_doc
+
+    try:
+        terminal_doc = await get_terminal_info_from_terminal_service(terminal_id, api_key)
+    except HTTPException as e:
+        if e.status_code in (status.HTTP_401_UNAUTHORIZED, status.HTTP_404_NOT_FOUND):
+            terminal_info_cache.invalidate(terminal_id=terminal_id)
+        raise
+    if settings.USE_TERMINAL_INFO_CACHE:
+        terminal_info_cache.set(terminal_id, api_key, terminal_doc)
     return terminal_doc
 
+def set_request_terminal_info(request: Optional[Request], terminal_info: TerminalInfoDocument) -> None:
+    """
+    Stores the terminal information resolved for a request on the request state,
+    so that the request logging middleware does not resolve it again.
+
+    Args:
+        request: The request being authenticated, None if called outside of a request
+        terminal_info: Terminal information resolved by API key
+    """
+    if request is not None:
+        request.state.terminal_info = terminal_info
+
+def get_request_terminal_info(request: Request) -> Optional[TerminalInfoDocument]:
+    """
+    Gets the terminal information stored on the request state by the security dependencies.
+
+    Args:
+        request: The request
+
+    Returns:
+        TerminalInfoDocument if resolved during the request, None otherwise
+    """
+    return getattr(request.state, "terminal_info", None)
+
 async def get_terminal_info_for_terminal_service(
     terminal_id: str, 
     api_key: str,
@@ -339,7 +383,8 @@ async def __get_tenant_id(
     terminal_id: Optional[str] = None,
     api_key: Optional[str] = None,
     token: Optional[str] = None,
-    is_terminal_service: Optional[bool] = False
+    is_terminal_service: Optional[bool] = False,
+    request: Optional[Request] = None
 ):
     """
     Internal helper function to retrieve tenant ID using API key, terminal JWT, or user JWT.
@@ -354,6 +399,7 @@ async def __get_tenant_id(
         api_key: Optional API key for terminal-based authentication
         token: Optional OAuth/JWT token for token-based authentication
         is_terminal_service: Whether the caller is the terminal service itself
+        request: Optional request to store the terminal information on
 
     Returns:
         Tenant ID string
@@ -380,6 +426,7 @@ async def __get_tenant_id(
     if terminal_id and api_key:
         logger.debug(f"Terminal_id: {terminal_id}, and API-KEY provided")
         terminal_info = await get_terminal_info(terminal_id, api_key, is_terminal_service)
+        set_request_terminal_info(request, terminal_info)
         return terminal_info.tenant_id
 
     message = "Unauthorized access : No token or API-KEY provided"
@@ -389,7 +436,8 @@ async def get_tenant_id_with_security(
     terminal_id: str = Path(..., description="terminal_id should be provided in the path"),
     api_key: Optional[str] = Security(api_key_header), 
     token: Optional[str] = Depends(oauth2_scheme),
-    is_terminal_service: Optional[bool] = False
+    is_terminal_service: Optional[bool] = False,
+    request: Request = None
 ):
     """
     FastAPI dependency that retrieves tenant ID using path parameter for terminal ID.
@@ -399,17 +447,19 @@ async def get_tenant_id_with_security(
         api_key: API key from header
         token: OAuth token from header
         is_terminal_service: Whether the caller is the terminal service itself
+        request: The request, injected by FastAPI
         
     Returns:
         Tenant ID string
     """
-    return await __get_tenant_id(terminal_id, api_key, token, is_terminal_service)
+    return await __get_tenant_id(terminal_id, api_key, token, is_terminal_service, request)
 
 async def get_tenant_id_with_security_by_query(
     terminal_id: str = Query(..., description="terminal_id should be provided by query parameter"),
     api_key: Optional[str] = Security(api_key_header),
     token: Optional[str] = Depends(oauth2_scheme),
-    is_terminal_service: Optional[bool] = False
+    is_terminal_service: Optional[bool] = False,
+    request: Request = None
 ):
     """
     FastAPI dependency that retrieves tenant ID using query parameter for terminal ID.
@@ -419,17 +469,19 @@ async def get_tenant_id_with_security_by_query(
         api_key: API key from header
         token: OAuth token from header
         is_terminal_service: Whether the caller is the terminal service itself
+        request: The request, injected by FastAPI
         
     Returns:
         Tenant ID string
     """
-    return await __get_tenant_id(terminal_id, api_key, token, is_terminal_service)
+    return await __get_tenant_id(terminal_id, api_key, token, is_terminal_service, request)
 
 async def get_tenant_id_with_security_by_query_optional(
     terminal_id: Optional[str] = Query(None, description="terminal_id should be provided by query parameter optional"),
     api_key: Optional[str] = Security(api_key_header),
     token: Optional[str] = Depends(oauth2_scheme),
-    is_terminal_service: Optional[bool] = False
+    is_terminal_service: Optional[bool] = False,
+    request: Request = None
 ):
     """
     FastAPI dependency that retrieves tenant ID using optional query parameter for terminal ID.
@@ -439,11 +491,12 @@ async def get_tenant_id_with_security_by_query_optional(
         api_key: API key from header
         token: OAuth token from header
         is_terminal_service: Whether the caller is the terminal service itself
+        request: The request, injected by FastAPI
         
     Returns:
         Tenant ID string
     """
-    return await __get_tenant_id(terminal_id, api_key, token, is_terminal_service)
+    return await __get_tenant_id(terminal_id, api_key, token, is_terminal_service, request)
 
 async def get_tenant_id_with_token(
     token: str = Depends(oauth2_scheme),
@@ -464,7 +517,8 @@ async def get_tenant_id_with_token(
 async def get_terminal_info_with_api_key(
     terminal_id: str = Query(...),
     api_key: str = Security(api_key_header),
-    is_terminal_service: Optional[bool] = False
+    is_terminal_service: Optional[bool] = False,
+    request: Request = None
 ):
     """
     FastAPI dependency that retrieves full terminal information using API key authentication.
@@ -473,11 +527,14 @@ async def get_terminal_info_with_api_key(
         terminal_id: Terminal ID from query parameter
         api_key: API key from header
         is_terminal_service: Whether the caller is the terminal service itself
+        request: The request, injected by FastAPI
         
     Returns:
         TerminalInfoDocument containing the terminal information
     """
-    return await get_terminal_info(terminal_id, api_key, is_terminal_service)
+    terminal_info = await get_terminal_info(terminal_id, api_key, is_terminal_service)
+    set_request_terminal_info(request, terminal_info)
+    return terminal_info
 
 async def verify_pubsub_notification_auth(
     api_key: Optional[str] = Security(api_key_header),
@@ -0,0 +1,191 @@
+# Copyright 2025 masa@kugel
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Bounded in-process queue processed in batches by a background task
+
+Items are put into the queue without waiting and processed by a single background task
+when a batch is full or the flush interval has passed. When the queue is full, new items
+are dropped instead of slowing down the caller. Subclasses implement the processing of
+a batch, e.g. one bulk insert or one HTTP request.
+"""
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from logging import getLogger
+from typing import Any, Optional
+
+logger = getLogger(__name__)
+
+
+class BatchQueue(ABC):
+    """
+    Bounded queue with a background task processing the queued items in batches.
+    """
+
+    def __init__(self, name: str, max_queue_size: int, batch_size: int, flush_interval_seconds: float):
+        """
+        Initialize the queue. The background task is started by the first put.
+
+        Args:
+            name: Name of the queued items used in the log messages, e.g. "Request log"
+            max_queue_size: Maximum number of items waiting to be processed
+            batch_size: Maximum number of items processed in one batch
+            flush_interval_seconds: Maximum time an item waits for its batch to fill up
+        """
+        self._name = name
+        self._max_queue_size = max_queue_size
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # batch being collected and batch being processed by the background task, kept for close_async
+        self._pending: list = []
+        self._current_batch: Optional[asyncio.Future] = None
+        self._enqueued = 0
+        self._dropped = 0
+        self._batches = 0
+
+    @abstractmethod
+    async def _process_batch_async(self, batch: list) -> None:
+        """
+        Process a batch of items. Errors must be handled here, never raised.
+
+        Args:
+            batch: The items to process
+        """
+        pass
+
+    def _put(self, item: Any) -> bool:
+        """
+        Queue an item to be processed. Never waits.
+
+        Args:
+            item: The item to queue
+
+        Returns:
+            bool: True if queued, False if dropped because the queue is full
+        """
+        self.__ensure_started()
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self._dropped += 1
+            # log the first drop and then every 1000th, not every item
+            if self._dropped % 1000 == 1:
+                logger.warning(
+                    f"{self._name} queue is full ({self._max_queue_size}), items are dropped: dropped->{self._dropped}"
+                )
+            return False
+        self._enqueued += 1
+        return True
+
+    async def flush_async(self) -> None:
+        """
+        Process all queued items now.
+        """
+        if self._queue is None:
+            return
+        while not self._queue.empty():
+            await self.__process_batch_counted_async(self.__take_batch())
+
+    async def close_async(self) -> None:
+        """
+        Stop the background task and process the items still queued.
+        Called on application shutdown, before the connections are closed.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                logger.error(f"{self._name} queue stopped with an error: {e}")
+            self._task = None
+        if self._current_batch is not None and not self._current_batch.done():
+            await self._current_batch
+        pending, self._pending = self._pending, []
+        await self.__process_batch_counted_async(pending)
+        await self.flush_async()
+        logger.info(f"{self._name} queue closed: {self.stats()}")
+
+    def stats(self) -> dict:
+        """
+        Get the queue statistics.
+
+        Returns:
+            dict: Counters of queued, dropped items and batches, and the current queue size
+        """
+        return {
+            "enqueued": self._enqueued,
+            "dropped": self._dropped,
+            "batches": self._batches,
+            "queue_size": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+    def __ensure_started(self) -> None:
+        """
+        Create the queue and start the background task in the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._task.get_loop() is loop:
+            return
+        if self._queue is None or self._task is None or self._task.get_loop() is not loop:
+            # a queue belongs to the event loop it is used in
+            self._queue = asyncio.Queue(maxsize=self._max_queue_size)
+        self._task = loop.create_task(self.__run_async())
+
+    async def __run_async(self) -> None:
+        """
+        Background task: process a batch when it is full or the flush interval has passed.
+        """
+        while True:
+            self._pending = [await self._queue.get()]
+            deadline = time.monotonic() + self._flush_interval
+            while len(self._pending) < self._batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    self._pending.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            batch, self._pending = self._pending, []
+            # a batch in progress is completed even if the task is cancelled on shutdown
+            self._current_batch = asyncio.ensure_future(self.__process_batch_counted_async(batch))
+            await asyncio.shield(self._current_batch)
+
+    def __take_batch(self) -> list:
+        """
+        Take up to one batch of items from the queue without waiting.
+
+        Returns:
+            list: The items taken
+        """
+        batch = []
+        while len(batch) < self._batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def __process_batch_counted_async(self, batch: list) -> None:
+        """
+        Process a batch unless it is empty and count it.
+
+        Args:
+            batch: The items to process
+        """
+        if not batch:
+            return
+        self._batches += 1
+        await self._process_batch_async(batch)
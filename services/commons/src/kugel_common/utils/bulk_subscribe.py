@@ -0,0 +1,115 @@
+# Copyright 2025 masa@kugel
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Helpers for the Dapr bulk pub/sub subscriptions
+
+With bulk subscribe, Dapr delivers a batch of messages in one request and expects
+a status for each entry of the batch in the response:
+
+    request:  {"entries": [{"entryId": "...", "event": {<cloud event>}, ...}], "topic": "...", ...}
+    response: {"statuses": [{"entryId": "...", "status": "SUCCESS" | "RETRY" | "DROP"}]}
+"""
+import json
+from logging import getLogger
+from typing import NamedTuple, Optional
+
+from kugel_common.config.settings import settings
+
+logger = getLogger(__name__)
+
+BULK_STATUS_SUCCESS = "SUCCESS"
+BULK_STATUS_RETRY = "RETRY"
+BULK_STATUS_DROP = "DROP"
+
+
+class BulkEntry(NamedTuple):
+    """
+    One message of a bulk delivery.
+    """
+
+    entry_id: str
+    data: Optional[dict]  # data of the cloud event, None if it cannot be read
+
+
+def make_subscription(pubsubname: str, topic: str, route: str, bulk_route: str = None) -> dict:
+    """
+    Create the Dapr subscription of a topic, with bulk subscribe if enabled and a bulk route is given.
+
+    Args:
+        pubsubname: Name of the pub/sub component
+        topic: Name of the topic
+        route: Route receiving one message per request
+        bulk_route: Route receiving the messages in batches
+
+    Returns:
+        dict: The subscription returned by the /dapr/subscribe endpoint
+    """
+    if not settings.USE_BULK_SUBSCRIBE or bulk_route is None:
+        return {"pubsubname": pubsubname, "topic": topic, "route": route}
+    return {
+        "pubsubname": pubsubname,
+        "topic": topic,
+        "route": bulk_route,
+        "bulkSubscribe": {
+            "enabled": True,
+            "maxMessagesCount": settings.BULK_SUBSCRIBE_MAX_MESSAGES,
+            "maxAwaitDurationMs": settings.BULK_SUBSCRIBE_MAX_AWAIT_MS,
+        },
+    }
+
+
+def get_bulk_entries(message: dict) -> list[BulkEntry]:
+    """
+    Get the entries of a bulk delivery with the data of their cloud events.
+
+    Args:
+        message: The JSON body of the bulk delivery request
+
+    Returns:
+        list[BulkEntry]: The entries in the order of delivery
+    """
+    entries = []
+    for entry in message.get("entries") or []:
+        event = _load_json(entry.get("event"))
+        data = _load_json(event.get("data")) if isinstance(event, dict) else None
+        if not isinstance(data, dict):
+            logger.error(f"Cannot read the data of the bulk entry: entry_id->{entry.get('entryId')}")
+            data = None
+        entries.append(BulkEntry(entry.get("entryId"), data))
+    return entries
+
+
+def make_bulk_response(statuses: dict[str, str]) -> dict:
+    """
+    Create the response to a bulk delivery.
+
+    Args:
+        statuses: Status of each entry by entry ID
+
+    Returns:
+        dict: The response body
+    """
+    return {"statuses": [{"entryId": entry_id, "status": status} for entry_id, status in statuses.items()]}
+
+
+def _load_json(value):
+    """
+    Parse a value delivered as a JSON string, other values are returned as they are.
+    """
+    if isinstance(value, (str, bytes)):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return None
+    return value
@@ -372,6 +372,49 @@ class DaprClientHelper:
             logger.error(f"Failed to get bulk state: {e}")
             return {}
 
+    
+    async def save_bulk_state(
+        self,
+        store_name: str,
+        states: Dict[str, Any],
+        metadata: Optional[Dict[str, str]] = None
+    ) -> bool:
+        """
+        Save multiple states with one request
+        
+        Args:
+            store_name: Name of the state store component
+            states: Dict mapping state keys to values
+            metadata: Optional metadata applied to each state
+            
+        Returns:
+            bool: True if successful
+        """
+        if not states:
+            return True
+        if not self._check_circuit_breaker():
+            logger.error("Circuit breaker OPEN - rejecting bulk save state operation")
+            return False
+        
+        endpoint = f"/state/{store_name}"
+        
+        state_data = []
+        for key, value in states.items():
+            item = {"key": key, "value": value}
+            if metadata:
+                item["metadata"] = metadata
+            state_data.append(item)
+        
+        try:
+            await self.client.post(endpoint, json=state_data)
+            self._record_success()
+            logger.info(f"Successfully saved {len(state_data)} states")
+            return True
+            
+        except Exception as e:
+            self._record_failure()
+            logger.error(f"Failed to save bulk state: {e}")
+            return False
 
 # Context manager for easy usage
 @asynccontextmanager
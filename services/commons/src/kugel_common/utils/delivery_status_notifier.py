@@ -0,0 +1,165 @@
+# Copyright 2025 masa@kugel
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Coalescing client for the pub/sub delivery status notifications
+
+The services receiving transaction and terminal logs (journal, report, stock) acknowledge
+each message to its publisher (cart or terminal). Instead of one HTTP request per message,
+the delivery statuses are queued and sent in batches to the bulk delivery-status endpoint
+of the publisher, one request per publisher and tenant.
+
+A status that cannot be sent is logged and counted. The message stays undelivered in the
+delivery status of the publisher, which republishes it, so it is acknowledged again.
+"""
+from logging import getLogger
+from typing import NamedTuple
+
+from kugel_common.config.settings import settings
+from kugel_common.utils.batch_queue import BatchQueue
+from kugel_common.utils.http_client_helper import get_pooled_client
+from kugel_common.utils.service_auth import create_service_token
+
+logger = getLogger(__name__)
+
+
+class DeliveryStatus(NamedTuple):
+    """
+    Delivery status of one message, queued to be sent to its publisher.
+    """
+
+    target_service: str  # publisher of the message ("cart" or "terminal")
+    tenant_id: str
+    service_name: str  # service that received the message
+    event_id: str
+    status: str
+    message: str
+
+
+def make_notification_headers(tenant_id: str, service_name: str) -> dict:
+    """
+    Create the authentication headers for a delivery status notification.
+
+    Uses a service JWT token, or the PUBSUB_NOTIFY_API_KEY if the token cannot be created.
+
+    Args:
+        tenant_id: Tenant ID of the notified messages
+        service_name: Name of the notifying service
+
+    Returns:
+        dict: HTTP headers
+    """
+    try:
+        service_token = create_service_token(tenant_id=tenant_id, service_name=service_name)
+        return {"Authorization": f"Bearer {service_token}"}
+    except Exception as e:
+        # Fall back to API key for backward compatibility
+        logger.warning(f"Failed to create service token: {e}. Falling back to API key.")
+        return {"X-API-Key": settings.PUBSUB_NOTIFY_API_KEY or ""}
+
+
+class DeliveryStatusNotifier(BatchQueue):
+    """
+    Bounded queue of delivery statuses with a background task sending them in batches.
+    """
+
+    def __init__(self, max_queue_size: int = 10000, batch_size: int = 200, flush_interval_seconds: float = 0.5):
+        """
+        Initialize the notifier. The background task is started by the first notification.
+
+        Args:
+            max_queue_size: Maximum number of delivery statuses waiting to be sent
+            batch_size: Maximum number of delivery statuses sent with one request
+            flush_interval_seconds: Maximum time a delivery status waits for its batch to fill up
+        """
+        super().__init__("Delivery status", max_queue_size, batch_size, flush_interval_seconds)
+        self._sent = 0
+        self._failed = 0
+
+    def notify(
+        self, target_service: str, tenant_id: str, service_name: str, event_id: str, status: str, message: str = ""
+    ) -> bool:
+        """
+        Queue a delivery status to be sent to the publisher of the message. Never waits for the request.
+
+        Args:
+            target_service: Publisher of the message ("cart" for tranlog, "terminal" for cashlog and opencloselog)
+            tenant_id: Tenant ID of the message
+            service_name: Name of the service that received the message
+            event_id: Event ID of the message
+            status: Status of the message (e.g. "received", "failed")
+            message: Optional message to include in the notification
+
+        Returns:
+            bool: True if queued, False if dropped because the queue is full
+        """
+        return self._put(DeliveryStatus(target_service, tenant_id, service_name, event_id, status, message))
+
+    def stats(self) -> dict:
+        """
+        Get the notifier statistics.
+
+        Returns:
+            dict: Counters of queued, dropped, sent and failed delivery statuses, and the current queue size
+        """
+        return {**super().stats(), "sent": self._sent, "failed": self._failed}
+
+    async def _process_batch_async(self, batch: list[DeliveryStatus]) -> None:
+        """
+        Send a batch of delivery statuses with one request per publisher, tenant and notifying service.
+        Errors are logged and counted, never raised.
+
+        Args:
+            batch: The delivery statuses to send
+        """
+        groups: dict[tuple[str, str, str], list[DeliveryStatus]] = {}
+        for delivery_status in batch:
+            key = (delivery_status.target_service, delivery_status.tenant_id, delivery_status.service_name)
+            groups.setdefault(key, []).append(delivery_status)
+
+        for (target_service, tenant_id, service_name), delivery_statuses in groups.items():
+            payload = {
+                "statuses": [
+                    {
+                        "event_id": delivery_status.event_id,
+                        "service": delivery_status.service_name,
+                        "status": delivery_status.status,
+                        "message": delivery_status.message,
+                    }
+                    for delivery_status in delivery_statuses
+                ]
+            }
+            try:
+                client = await get_pooled_client(service_name=target_service)
+                await client.post(
+                    endpoint=f"/tenants/{tenant_id}/delivery-status/bulk",
+                    headers=make_notification_headers(tenant_id, service_name),
+                    json=payload,
+                )
+            except Exception as e:
+                logger.error(
+                    f"Failed to notify {len(delivery_statuses)} delivery statuses to {target_service}: "
+                    f"tenant_id->{tenant_id}, service->{service_name}, error->{e}"
+                )
+                self._failed += len(delivery_statuses)
+                continue
+            self._sent += len(delivery_statuses)
+            logger.debug(f"Notified {len(delivery_statuses)} delivery statuses to {target_service}: {payload}")
+
+
+# Singleton notifier shared by the pub/sub handlers of a service
+delivery_status_notifier = DeliveryStatusNotifier(
+    max_queue_size=settings.DELIVERY_STATUS_QUEUE_SIZE,
+    batch_size=settings.DELIVERY_STATUS_BATCH_SIZE,
+    flush_interval_seconds=settings.DELIVERY_STATUS_FLUSH_INTERVAL_SECONDS,
+)
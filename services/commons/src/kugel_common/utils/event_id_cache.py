@@ -0,0 +1,101 @@
+# Copyright 2025 masa@kugel
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+In-memory cache of the event IDs of processed pub/sub messages
+
+The subscribers deduplicate messages by saving the event ID of each processed message
+in the Dapr state store and looking it up when a message arrives. The event IDs processed
+recently are also kept in memory, so a redelivered message is recognized without a call
+to the state store.
+
+Only processed event IDs are cached. An event ID that is not in memory is always looked up
+in the state store, which stays the reference after a restart or on another replica.
+"""
+import time
+from collections import OrderedDict
+from logging import getLogger
+from typing import Any, Optional
+
+logger = getLogger(__name__)
+
+
+class EventIdCache:
+    """
+    LRU cache with TTL of the processed event IDs and their saved state.
+    """
+
+    def __init__(self, ttl_seconds: int = 3600, max_entries: int = 100000):
+        """
+        Initialize the event ID cache.
+
+        Args:
+            ttl_seconds: Time to live of a cached event ID in seconds
+            max_entries: Maximum number of event IDs, the least recently used is dropped first
+        """
+        self._cache: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, event_id: str) -> Optional[Any]:
+        """
+        Get the state saved for a processed event ID.
+
+        Args:
+            event_id: Event ID of the message
+
+        Returns:
+            The saved state if the event ID is cached and not expired, None otherwise
+        """
+        entry = self._cache.get(event_id)
+        if entry is not None and time.time() - entry[1] >= self._ttl:
+            del self._cache[event_id]
+            entry = None
+        if entry is None:
+            self._misses += 1
+            return None
+        self._cache.move_to_end(event_id)
+        self._hits += 1
+        return entry[0]
+
+    def set(self, event_id: str, state: Any) -> None:
+        """
+        Cache a processed event ID with its saved state.
+
+        Args:
+            event_id: Event ID of the message
+            state: State saved for the event ID
+        """
+        self._cache[event_id] = (state, time.time())
+        self._cache.move_to_end(event_id)
+        while len(self._cache) > self._max_entries:
+            self._cache.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Remove all cached event IDs.
+        """
+        self._cache.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def stats(self) -> dict:
+        """
+        Get the cache statistics.
+
+        Returns:
+            dict: Number of cached event IDs, hits and misses
+        """
+        return {"cached_event_ids": len(self._cache), "hits": self._hits, "misses": self._misses}
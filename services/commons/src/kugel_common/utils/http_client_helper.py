@@ -7,6 +7,7 @@ Provides generic functions for calling APIs of other microservices
 import logging
 import time
 import asyncio
+import importlib.util
 import httpx
 from typing import Dict, Any, Optional, Union, Tuple, Awaitable, AsyncIterator
 from contextlib import asynccontextmanager
@@ -24,11 +25,52 @@ class HttpClientError(Exception):
         super().__init__(self.message)
 
 
+class ClientMetrics:
+    """Request counters and latency of an HTTP client"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, elapsed_seconds: float, error: bool) -> None:
+        """
+        Record a completed request, including its retries
+
+        Args:
+            elapsed_seconds: Time from the first attempt to the response or the final error
+            error: Whether the request failed (error status code or no response)
+        """
+        self.requests += 1
+        if error:
+            self.errors += 1
+        self.total_seconds += elapsed_seconds
+        self.max_seconds = max(self.max_seconds, elapsed_seconds)
+
+    def stats(self) -> dict:
+        """
+        Get the metrics
+
+        Returns:
+            Number of requests, errors and retries, average and maximum latency in milliseconds
+        """
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "avg_latency_ms": round(self.total_seconds * 1000 / self.requests, 3) if self.requests else 0.0,
+            "max_latency_ms": round(self.max_seconds * 1000, 3),
+        }
+
+
 class HttpClientHelper:
     """Helper class for sending HTTP requests asynchronously"""
 
     def __init__(self, base_url: str = "", timeout: int = 30, max_retries: int = 3, 
-                 retry_delay: int = 1, headers: Optional[Dict[str, str]] = None):
+                 retry_delay: int = 1, headers: Optional[Dict[str, str]] = None,
+                 http2: bool = False, limits: Optional[httpx.Limits] = None):
         """
         Constructor for HttpClientHelper class
         
@@ -38,6 +80,8 @@ class HttpClientHelper:
             max_retries: Maximum number of retry attempts
             retry_delay: Delay between retries in seconds
             headers: Default HTTP headers
+            http2: Use HTTP/2 if the h2 package is installed, HTTP/1.1 otherwise
+            limits: Connection pool limits, the httpx defaults if not given
         """
         self.base_url = base_url.rstrip('/') if base_url else ""
         self.timeout = timeout
@@ -47,8 +91,15 @@ class HttpClientHelper:
             "Content-Type": "application/json",
             "Accept": "application/json"
         }
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requires the h2 package (pip install httpx[http2]), using HTTP/1.1")
+            http2 = False
+        self.metrics = ClientMetrics()
         # Create async client
-        self.client = httpx.AsyncClient(timeout=self.timeout, headers=self.headers)
+        client_options = {"http2": http2}
+        if limits is not None:
+            client_options["limits"] = limits
+        self.client = httpx.AsyncClient(timeout=self.timeout, headers=self.headers, **client_options)
         self._closed = False # Flag to track if the client is closed
 
     async def __aenter__(self):
@@ -117,12 +168,16 @@ class HttpClientHelper:
             
         attempts = 0
         last_error = None
+        started = time.perf_counter()
         
         while attempts < self.max_retries:
+            if attempts > 0:
+                self.metrics.retries += 1
             try:
                 logger.debug(f"HTTP request: {method} {url}")
                 # Use async request
                 response = await self.client.request(method, url, headers=headers, params=params, json=payload, **kwargs)
+                self.metrics.record(time.perf_counter() - started, error=response.status_code >= 400)
                 
                 # Check for error status codes
                 if response.status_code >= 400:
@@ -152,6 +207,8 @@ class HttpClientHelper:
             await asyncio.sleep(self.retry_delay)
             attempts += 1
             
+        self.metrics.record(time.perf_counter() - started, error=True)
+
         # If all retries failed
         if last_error:
             logger.error(f"Retry failure ({self.max_retries} attempts): {url}")
@@ -291,6 +348,10 @@ def create_service_client(service_name: str, **kwargs) -> HttpClientHelper:
 async def get_pooled_client(service_name: str, **kwargs) -> HttpClientHelper:
     """
     Get a shared client from the pool or create a new one if needed
+
+    The client keeps its connections to the service alive between requests, with the
+    HTTP version and connection limits of the HTTP_CLIENT_* settings, overridden per
+    service by HTTP_CLIENT_SERVICE_LIMITS.
     
     Args:
         service_name: Name of the service (e.g., "cart", "account")
@@ -300,7 +361,8 @@ async def get_pooled_client(service_name: str, **kwargs) -> HttpClientHelper:
         A shared HttpClientHelper instance from the pool
         
     Note:
-        Do not call close() on clients obtained from this function as they are shared
+        Do not call close() on clients obtained from this function as they are shared.
+        Pass request-specific headers (e.g. the service token) to each request instead.
     """
     # Create a key for the client pool based on service name and important kwargs
     # Headers aren't included in the key as they may contain request-specific auth tokens
@@ -310,7 +372,8 @@ async def get_pooled_client(service_name: str, **kwargs) -> HttpClientHelper:
         if pool_key not in _client_pool:
             # Create a new client and add to the pool
             base_url = _get_service_url(service_name)
-            _client_pool[pool_key] = HttpClientHelper(base_url=base_url, **kwargs)
+            options = {**_get_pool_options(service_name), **kwargs}
+            _client_pool[pool_key] = HttpClientHelper(base_url=base_url, **options)
             logger.info(f"Created new pooled HTTP client for service: {service_name} (base_url: {base_url})")
         else:
             logger.debug(f"Reusing existing pooled HTTP client for service: {service_name}")
@@ -318,10 +381,21 @@ async def get_pooled_client(service_name: str, **kwargs) -> HttpClientHelper:
     return _client_pool[pool_key]
 
 
+def get_pooled_client_metrics() -> Dict[str, dict]:
+    """
+    Get the request metrics of the pooled clients
+
+    Returns:
+        Metrics (requests, errors, retries, latency) keyed by service name
+    """
+    return {service_name: client.metrics.stats() for service_name, client in _client_pool.items()}
+
+
 async def close_all_clients():
     """Close all clients in the pool"""
     async with _client_pool_lock:
         for key, client in list(_client_pool.items()):
+            logger.info(f"HTTP client metrics for service {key}: {client.metrics.stats()}")
             await client.close()
             del _client_pool[key]
 
@@ -349,6 +423,27 @@ async def get_service_client(service_name: str, **kwargs) -> AsyncIterator[HttpC
         await client.close()
 
 
+def _get_pool_options(service_name: str) -> Dict[str, Any]:
+    """
+    Get the HTTP version and connection limits of the pooled client of a service
+    
+    Args:
+        service_name: Name of the service
+    
+    Returns:
+        HttpClientHelper constructor parameters (http2, limits)
+    """
+    overrides = settings.HTTP_CLIENT_SERVICE_LIMITS.get(service_name, {})
+    limits = httpx.Limits(
+        max_connections=overrides.get("max_connections", settings.HTTP_CLIENT_MAX_CONNECTIONS),
+        max_keepalive_connections=overrides.get(
+            "max_keepalive_connections", settings.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS
+        ),
+        keepalive_expiry=overrides.get("keepalive_expiry", settings.HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS),
+    )
+    return {"http2": overrides.get("http2", settings.HTTP_CLIENT_HTTP2), "limits": limits}
+
+
 def _get_service_url(service_name: str) -> str:
     """
     Get the service URL for a given service name
@@ -0,0 +1,173 @@
+# Copyright 2025 masa@kugel
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Process-wide registry of the plugin configuration files
+
+The services load their plugins (cart strategies, report makers) from a JSON file that
+names the module and the class or function of each plugin. The registry reads each file
+once and keeps the classes and functions it references, so creating the plugins of a
+request neither reads the file nor looks up the modules again. Stateless plugins can also
+be shared by all requests.
+
+The modification time of a file is checked at most once per check interval. When the
+file changed, it is read again and the cached classes and shared instances are dropped.
+The cached configurations must not be modified by the callers.
+"""
+import importlib
+import json
+import os
+import time
+from logging import getLogger
+from typing import Any, Callable
+
+from kugel_common.config.settings import settings
+
+logger = getLogger(__name__)
+
+
+class PluginRegistry:
+    """
+    Cache of the plugin configuration files, the plugin classes or functions they
+    reference and the plugin instances shared by all requests.
+    """
+
+    def __init__(self, check_interval_seconds: float = 10.0):
+        """
+        Initialize the plugin registry.
+
+        Args:
+            check_interval_seconds: Minimum interval in seconds between checks of a file for changes
+        """
+        self._configs: dict[str, dict] = {}
+        self._mtimes: dict[str, float] = {}
+        self._checked_at: dict[str, float] = {}
+        self._targets: dict[tuple[str, str, str], Any] = {}
+        self._shared: dict[tuple[str, str], Any] = {}
+        self._check_interval = check_interval_seconds
+        self._reloads = 0
+
+    def get_config(self, path: str) -> dict:
+        """
+        Get the configuration of a plugin file, read on the first call and when the file changed.
+
+        Args:
+            path: Path of the plugin configuration JSON file
+
+        Returns:
+            dict: The plugin configuration
+        """
+        now = time.monotonic()
+        config = self._configs.get(path)
+        if config is not None and now - self._checked_at[path] < self._check_interval:
+            return config
+
+        self._checked_at[path] = now
+        mtime = self._get_mtime(path)
+        if config is not None and mtime == self._mtimes.get(path):
+            return config
+
+        with open(path, "r") as file:
+            config = json.load(file)
+        if path in self._configs:
+            self._reloads += 1
+            logger.info(f"Plugin configuration reloaded: {path}")
+        self._drop(path)
+        self._configs[path] = config
+        self._mtimes[path] = mtime
+        return config
+
+    def resolve(self, path: str, module_name: str, attr_name: str) -> Any:
+        """
+        Get a class or function of a plugin module, imported on the first call.
+
+        Args:
+            path: Path of the plugin configuration file referencing the plugin
+            module_name: Name of the plugin module
+            attr_name: Name of the class or function in the module
+
+        Returns:
+            The plugin class or function
+        """
+        key = (path, module_name, attr_name)
+        target = self._targets.get(key)
+        if target is None:
+            module = importlib.import_module(module_name)
+            target = getattr(module, attr_name)
+            self._targets[key] = target
+        return target
+
+    def get_shared(self, path: str, name: str, factory: Callable[[], Any]) -> Any:
+        """
+        Get plugin instances shared by all requests, created on the first call.
+
+        Args:
+            path: Path of the plugin configuration file of the plugins
+            name: Name of the shared plugins in the file
+            factory: Function creating the plugins
+
+        Returns:
+            The shared plugins
+        """
+        self.get_config(path)
+        key = (path, name)
+        if key not in self._shared:
+            self._shared[key] = factory()
+        return self._shared[key]
+
+    def clear(self) -> None:
+        """
+        Remove all cached configurations, plugin classes and shared instances.
+        """
+        self._configs.clear()
+        self._mtimes.clear()
+        self._checked_at.clear()
+        self._targets.clear()
+        self._shared.clear()
+        self._reloads = 0
+
+    def stats(self) -> dict:
+        """
+        Get the registry statistics.
+
+        Returns:
+            dict: Number of cached files, plugin classes or functions and shared plugins, and number of reloads
+        """
+        return {
+            "cached_files": len(self._configs),
+            "cached_plugins": len(self._targets),
+            "shared_plugins": len(self._shared),
+            "reloads": self._reloads,
+        }
+
+    def _get_mtime(self, path: str) -> float:
+        """
+        Get the modification time of a file, 0 if it cannot be read.
+        """
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return 0.0
+
+    def _drop(self, path: str) -> None:
+        """
+        Drop the plugin classes and shared instances of a configuration file.
+        """
+        for key in [key for key in self._targets if key[0] == path]:
+            del self._targets[key]
+        for key in [key for key in self._shared if key[0] == path]:
+            del self._shared[key]
+
+
+# Create a singleton registry shared by the plugin managers of the service
+plugin_registry = PluginRegistry(check_interval_seconds=settings.PLUGIN_CONFIG_CHECK_INTERVAL_SECONDS)
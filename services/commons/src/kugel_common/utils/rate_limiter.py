@@ -0,0 +1,61 @@
+# Copyright 2025 masa@kugel
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Token bucket rate limiter for asyncio tasks
+
+Limits the rate of operations shared by concurrent tasks, e.g. messages republished
+to the pub/sub after an outage, so that the backlog does not overload the broker and
+the subscribers.
+"""
+import asyncio
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at a constant rate. Each operation takes one token and waits
+    while the bucket is empty. Up to `capacity` operations can run in a burst.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: Optional[int] = None):
+        """
+        Initialize a full token bucket.
+
+        Args:
+            rate_per_second: Number of tokens added per second, 0 or less for no limit
+            capacity: Maximum number of tokens, the rate per second (at least 1) if omitted
+        """
+        self._rate = rate_per_second
+        self._capacity = capacity if capacity is not None else max(1, int(rate_per_second))
+        self._tokens = float(self._capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """
+        Take one token, waiting until one is available.
+        """
+        if self._rate <= 0:
+            return
+        # the lock keeps the waiting tasks in order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
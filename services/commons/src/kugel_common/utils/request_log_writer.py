@@ -0,0 +1,106 @@
+# Copyright 2025 masa@kugel
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Batched writer for the request logs of the log_requests middleware
+
+Request logs are put into a bounded in-process queue and written by a single background
+task, which inserts them with one insert_many per database when a batch is full or the
+flush interval has passed. Each log is written to the common database and to the database
+of its tenant.
+
+When MongoDB is slower than the incoming requests and the queue is full, new request logs
+are dropped instead of slowing down the API responses. The number of dropped logs is
+counted and reported in the stats.
+"""
+from logging import getLogger
+
+from kugel_common.config.settings import settings
+from kugel_common.database import database as db_helper
+from kugel_common.models.documents.request_log_document import RequestLog
+from kugel_common.models.repositories.request_log_repository import RequestLogRepository
+from kugel_common.utils.batch_queue import BatchQueue
+
+logger = getLogger(__name__)
+
+
+class RequestLogWriter(BatchQueue):
+    """
+    Bounded queue of request logs with a background task writing them in batches.
+    """
+
+    def __init__(self, max_queue_size: int = 10000, batch_size: int = 500, flush_interval_seconds: float = 1.0):
+        """
+        Initialize the request log writer. The background task is started by the first write.
+
+        Args:
+            max_queue_size: Maximum number of request logs waiting to be written
+            batch_size: Maximum number of request logs written with one insert per database
+            flush_interval_seconds: Maximum time a request log waits for its batch to fill up
+        """
+        super().__init__("Request log", max_queue_size, batch_size, flush_interval_seconds)
+        self._written = 0
+        self._failed = 0
+
+    def write(self, request_log: RequestLog) -> bool:
+        """
+        Queue a request log to be written. Never waits for the database.
+
+        Args:
+            request_log: The request log to write
+
+        Returns:
+            bool: True if queued, False if dropped because the queue is full
+        """
+        return self._put(request_log)
+
+    def stats(self) -> dict:
+        """
+        Get the writer statistics.
+
+        Returns:
+            dict: Counters of queued and dropped request logs, of documents written and failed
+                  (a request log with a tenant is written to two databases), and the current queue size
+        """
+        return {**super().stats(), "written": self._written, "failed": self._failed}
+
+    async def _process_batch_async(self, batch: list[RequestLog]) -> None:
+        """
+        Write a batch of request logs to the common database and to the database of each tenant.
+        Errors are logged and counted, never raised.
+
+        Args:
+            batch: The request logs to write
+        """
+        db_batches: dict[str, list[RequestLog]] = {f"{settings.DB_NAME_PREFIX}_commons": batch}
+        for request_log in batch:
+            if request_log.tenant_id:
+                db_batches.setdefault(f"{settings.DB_NAME_PREFIX}_{request_log.tenant_id}", []).append(request_log)
+
+        for db_name, request_logs in db_batches.items():
+            try:
+                db = await db_helper.get_db_async(db_name)
+                inserted = await RequestLogRepository(db).create_request_logs_async(request_logs)
+            except Exception as e:
+                logger.error(f"Failed to write {len(request_logs)} request logs to {db_name}: {e}")
+                inserted = 0
+            self._written += inserted
+            self._failed += len(request_logs) - inserted
+
+
+# Singleton writer shared by the log_requests middleware of a service
+request_log_writer = RequestLogWriter(
+    max_queue_size=settings.REQUEST_LOG_QUEUE_SIZE,
+    batch_size=settings.REQUEST_LOG_BATCH_SIZE,
+    flush_interval_seconds=settings.REQUEST_LOG_FLUSH_INTERVAL_SECONDS,
+)
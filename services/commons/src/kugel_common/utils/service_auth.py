@@ -17,7 +17,12 @@ Service-to-service authentication utilities
 This module provides JWT token generation for internal service communication.
 All services share the same SECRET_KEY, allowing them to generate and validate
 tokens for inter-service API calls.
+
+Tokens with the default expiration are reused for SERVICE_TOKEN_REUSE_SECONDS, so a
+service calling another one for every message or report line does not sign a new
+token each time.
 """
+import time
 from datetime import datetime, timedelta, timezone
 from jose import jwt
 from logging import getLogger
@@ -26,6 +31,13 @@ from kugel_common.config.settings import settings
 
 logger = getLogger(__name__)
 
+# Maximum number of cached tokens, the cache is emptied when it is full
+_TOKEN_CACHE_MAX_ENTRIES = 10000
+
+# (tenant_id, service_name, secret key, algorithm) -> (token, created at in monotonic seconds)
+_token_cache: dict[tuple[str, str, str, str], tuple[str, float]] = {}
+
+
 def create_service_token(
     tenant_id: str,
     service_name: str,
@@ -44,8 +56,15 @@ def create_service_token(
         expires_delta: Optional custom expiration time (default: 5 minutes)
         
     Returns:
-        str: The encoded JWT token
+        str: The encoded JWT token, a cached one if it is still valid and no expires_delta is given
     """
+    reuse_seconds = settings.SERVICE_TOKEN_REUSE_SECONDS
+    cache_key = (tenant_id, service_name, settings.SECRET_KEY, settings.ALGORITHM)
+    if expires_delta is None and reuse_seconds > 0:
+        cached = _token_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[1] < reuse_seconds:
+            return cached[0]
+
     # Token payload
     data = {
         "sub": f"service:{service_name}",  # Subject identifies this as a service account
@@ -67,5 +86,17 @@ def create_service_token(
     encoded_jwt = jwt.encode(data, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     
     logger.debug(f"Created service token for tenant {tenant_id} from {service_name}")
-    
-    return encoded_jwt
\ No newline at end of file
+
+    if expires_delta is None and reuse_seconds > 0:
+        if len(_token_cache) >= _TOKEN_CACHE_MAX_ENTRIES:
+            _token_cache.clear()
+        _token_cache[cache_key] = (encoded_jwt, time.monotonic())
+
+    return encoded_jwt
+
+
+def clear_service_token_cache() -> None:
+    """
+    Remove all cached service tokens.
+    """
+    _token_cache.clear()
\ No newline at end of file
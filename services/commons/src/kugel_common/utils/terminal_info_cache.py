@@ -0,0 +1,156 @@
+# Copyright 2025 masa@kugel
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Terminal information cache shared by the services authenticating terminals by API key
+
+Services other than the terminal service resolve the terminal of an API key request by
+calling the terminal service. The result is cached per terminal ID and API key, so that
+a terminal sending many requests costs one call per TTL instead of one or two per request.
+The API key is only kept as a hash, and a different key for the same terminal is a cache miss.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from logging import getLogger
+from typing import Optional, Tuple
+
+from kugel_common.config.settings import settings
+from kugel_common.models.documents.terminal_info_document import TerminalInfoDocument
+
+logger = getLogger(__name__)
+
+
+class TerminalInfoCache:
+    """
+    LRU cache of terminal information with TTL, keyed by terminal ID and API key hash.
+    """
+
+    def __init__(self, ttl_seconds: int = 60, max_entries: int = 10000):
+        """
+        Initialize the terminal information cache.
+
+        Args:
+            ttl_seconds: Time to live of a cached entry in seconds
+            max_entries: Maximum number of entries, the least recently used is dropped first
+        """
+        self._cache: OrderedDict[Tuple[str, str], Tuple[TerminalInfoDocument, float]] = OrderedDict()
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _make_key(terminal_id: str, api_key: str) -> Tuple[str, str]:
+        """
+        Create the cache key of a terminal ID and API key.
+
+        Args:
+            terminal_id: Terminal ID
+            api_key: API key of the terminal
+
+        Returns:
+            Tuple of the terminal ID and the SHA-256 hash of the API key
+        """
+        return terminal_id, hashlib.sha256(api_key.encode()).hexdigest()
+
+    def get(self, terminal_id: str, api_key: str) -> Optional[TerminalInfoDocument]:
+        """
+        Get a copy of the cached terminal information.
+
+        Args:
+            terminal_id: Terminal ID
+            api_key: API key of the terminal
+
+        Returns:
+            TerminalInfoDocument if cached and not expired, None otherwise
+        """
+        key = self._make_key(terminal_id, api_key)
+        entry = self._cache.get(key)
+        if entry is not None and time.time() - entry[1] >= self._ttl:
+            del self._cache[key]
+            entry = None
+        if entry is None:
+            self._misses += 1
+            logger.debug(f"Terminal info cache miss for {terminal_id}")
+            return None
+        self._hits += 1
+        self._cache.move_to_end(key)
+        # callers may modify the returned document
+        return entry[0].model_copy(deep=True)
+
+    def set(self, terminal_id: str, api_key: str, terminal_info: TerminalInfoDocument) -> None:
+        """
+        Store a copy of the terminal information.
+
+        Args:
+            terminal_id: Terminal ID
+            api_key: API key of the terminal
+            terminal_info: Terminal information resolved for the API key
+        """
+        key = self._make_key(terminal_id, api_key)
+        self._cache[key] = (terminal_info.model_copy(deep=True), time.time())
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._max_entries:
+            self._cache.popitem(last=False)
+
+    def invalidate(self, tenant_id: Optional[str] = None, terminal_id: Optional[str] = None) -> int:
+        """
+        Drop cached terminal information.
+
+        Args:
+            tenant_id: If provided, drop only the terminals of this tenant
+            terminal_id: If provided, drop only this terminal (all API keys)
+
+        Returns:
+            Number of entries dropped
+        """
+        keys = [
+            key
+            for key in self._cache.keys()
+            if (tenant_id is None or key[0].startswith(f"{tenant_id}-"))
+            and (terminal_id is None or key[0] == terminal_id)
+        ]
+        for key in keys:
+            del self._cache[key]
+        logger.info(f"Terminal info cache invalidated: tenant_id={tenant_id}, terminal_id={terminal_id}, entries={len(keys)}")
+        return len(keys)
+
+    def clear(self) -> None:
+        """
+        Clear all entries and reset the statistics.
+        """
+        self._cache.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def stats(self) -> dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with the hit and miss counters, the number of entries and the TTL
+        """
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "cached_terminals": len(self._cache),
+            "ttl_seconds": self._ttl,
+        }
+
+
+# Singleton cache instance shared by the security dependencies and the request logging middleware
+terminal_info_cache = TerminalInfoCache(
+    ttl_seconds=settings.TERMINAL_INFO_CACHE_TTL_SECONDS,
+    max_entries=settings.TERMINAL_INFO_CACHE_MAX_ENTRIES,
+)
@@ -0,0 +1,46 @@
+"""
+Unit tests for the Dapr bulk subscribe helpers.
+"""
+import json
+
+from kugel_common.utils import bulk_subscribe
+from kugel_common.utils.bulk_subscribe import BulkEntry, get_bulk_entries, make_bulk_response, make_subscription
+
+
+def test_entries_are_read_from_cloud_events():
+    message = {
+        "entries": [
+            {"entryId": "e1", "event": {"data": {"event_id": "evt-1"}}},
+            {"entryId": "e2", "event": json.dumps({"data": {"event_id": "evt-2"}})},
+            {"entryId": "e3", "event": {"data": json.dumps({"event_id": "evt-3"})}},
+            {"entryId": "e4", "event": "not json"},
+        ],
+        "topic": "topic-tranlog",
+    }
+
+    assert get_bulk_entries(message) == [
+        BulkEntry("e1", {"event_id": "evt-1"}),
+        BulkEntry("e2", {"event_id": "evt-2"}),
+        BulkEntry("e3", {"event_id": "evt-3"}),
+        BulkEntry("e4", None),
+    ]
+
+
+def test_bulk_response_has_status_per_entry():
+    assert make_bulk_response({"e1": "SUCCESS", "e2": "RETRY"}) == {
+        "statuses": [{"entryId": "e1", "status": "SUCCESS"}, {"entryId": "e2", "status": "RETRY"}]
+    }
+
+
+def test_subscription_uses_bulk_route_when_enabled(monkeypatch):
+    monkeypatch.setattr(bulk_subscribe.settings, "USE_BULK_SUBSCRIBE", True)
+    subscription = make_subscription("pubsub", "topic", "/api/v1/tranlog", bulk_route="/api/v1/tranlog/bulk")
+    assert subscription["route"] == "/api/v1/tranlog/bulk"
+    assert subscription["bulkSubscribe"]["enabled"] is True
+
+    monkeypatch.setattr(bulk_subscribe.settings, "USE_BULK_SUBSCRIBE", False)
+    assert make_subscription("pubsub", "topic", "/api/v1/tranlog", bulk_route="/api/v1/tranlog/bulk") == {
+        "pubsubname": "pubsub",
+        "topic": "topic",
+        "route": "/api/v1/tranlog",
+    }
@@ -0,0 +1,99 @@
+"""
+Unit tests for the coalescing delivery status notifier.
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from kugel_common.utils import delivery_status_notifier as notifier_module
+from kugel_common.utils.delivery_status_notifier import DeliveryStatusNotifier
+
+
+@pytest.fixture
+def clients():
+    """Record the bulk requests per service instead of sending them."""
+    pooled_clients: dict[str, MagicMock] = {}
+
+    async def get_pooled_client(service_name):
+        if service_name not in pooled_clients:
+            client = MagicMock()
+            client.post = AsyncMock(return_value={"success": True})
+            pooled_clients[service_name] = client
+        return pooled_clients[service_name]
+
+    with patch.object(notifier_module, "get_pooled_client", get_pooled_client), patch.object(
+        notifier_module, "create_service_token", return_value="token"
+    ):
+        yield pooled_clients
+
+
+@pytest.mark.asyncio
+async def test_statuses_are_sent_per_publisher_and_tenant(clients):
+    notifier = DeliveryStatusNotifier(batch_size=10, flush_interval_seconds=60)
+    notifier.notify("cart", "T001", "journal", "evt-1", "received")
+    notifier.notify("cart", "T001", "journal", "evt-2", "failed", "error")
+    notifier.notify("cart", "T002", "journal", "evt-3", "received")
+    notifier.notify("terminal", "T001", "journal", "evt-4", "received")
+    await notifier.close_async()
+
+    cart_calls = clients["cart"].post.call_args_list
+    assert [call.kwargs["endpoint"] for call in cart_calls] == [
+        "/tenants/T001/delivery-status/bulk",
+        "/tenants/T002/delivery-status/bulk",
+    ]
+    assert cart_calls[0].kwargs["json"] == {
+        "statuses": [
+            {"event_id": "evt-1", "service": "journal", "status": "received", "message": ""},
+            {"event_id": "evt-2", "service": "journal", "status": "failed", "message": "error"},
+        ]
+    }
+    assert cart_calls[0].kwargs["headers"] == {"Authorization": "Bearer token"}
+    clients["terminal"].post.assert_awaited_once()
+    assert notifier.stats()["sent"] == 4
+    assert notifier.stats()["batches"] == 1
+
+
+@pytest.mark.asyncio
+async def test_background_task_sends_after_flush_interval(clients):
+    notifier = DeliveryStatusNotifier(batch_size=10, flush_interval_seconds=0.01)
+    try:
+        notifier.notify("cart", "T001", "stock", "evt-1", "received")
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if notifier.stats()["sent"] == 1:
+                break
+        assert notifier.stats()["sent"] == 1
+    finally:
+        await notifier.close_async()
+
+
+@pytest.mark.asyncio
+async def test_failed_request_is_counted(clients):
+    cart_client = await notifier_module.get_pooled_client("cart")
+    cart_client.post.side_effect = Exception("connection refused")
+    notifier = DeliveryStatusNotifier(batch_size=10, flush_interval_seconds=60)
+    notifier.notify("cart", "T001", "report", "evt-1", "received")
+    notifier.notify("terminal", "T001", "report", "evt-2", "received")
+    await notifier.close_async()
+
+    assert notifier.stats()["failed"] == 1
+    assert notifier.stats()["sent"] == 1
+
+
+def test_api_key_is_used_without_service_token(monkeypatch):
+    monkeypatch.setattr(notifier_module.settings, "PUBSUB_NOTIFY_API_KEY", "pubsub-key")
+    with patch.object(notifier_module, "create_service_token", side_effect=Exception("no secret")):
+        headers = notifier_module.make_notification_headers("T001", "journal")
+
+    assert headers == {"X-API-Key": "pubsub-key"}
+
+
+@pytest.mark.asyncio
+async def test_statuses_are_dropped_when_queue_is_full(clients):
+    notifier = DeliveryStatusNotifier(max_queue_size=1, batch_size=10, flush_interval_seconds=60)
+    assert notifier.notify("cart", "T001", "journal", "evt-1", "received") is True
+    assert notifier.notify("cart", "T001", "journal", "evt-2", "received") is False
+    await notifier.close_async()
+
+    assert notifier.stats()["dropped"] == 1
+    assert notifier.stats()["sent"] == 1
@@ -0,0 +1,39 @@
+"""
+Unit tests for the in-memory cache of processed event IDs.
+"""
+from unittest.mock import patch
+
+from kugel_common.utils import event_id_cache as cache_module
+from kugel_common.utils.event_id_cache import EventIdCache
+
+
+def test_cached_event_id_is_found():
+    cache = EventIdCache()
+    cache.set("evt-1", {"status": "processed"})
+
+    assert cache.get("evt-1") == {"status": "processed"}
+    assert cache.get("evt-2") is None
+    assert cache.stats() == {"cached_event_ids": 1, "hits": 1, "misses": 1}
+
+
+def test_event_id_expires_after_ttl():
+    cache = EventIdCache(ttl_seconds=10)
+    with patch.object(cache_module.time, "time", return_value=1000.0):
+        cache.set("evt-1", {"status": "processed"})
+    with patch.object(cache_module.time, "time", return_value=1009.0):
+        assert cache.get("evt-1") == {"status": "processed"}
+    with patch.object(cache_module.time, "time", return_value=1010.0):
+        assert cache.get("evt-1") is None
+    assert cache.stats()["cached_event_ids"] == 0
+
+
+def test_least_recently_used_event_id_is_dropped():
+    cache = EventIdCache(max_entries=2)
+    cache.set("evt-1", {"status": "processed"})
+    cache.set("evt-2", {"status": "processed"})
+    cache.get("evt-1")
+    cache.set("evt-3", {"status": "processed"})
+
+    assert cache.get("evt-2") is None
+    assert cache.get("evt-1") is not None
+    assert cache.get("evt-3") is not None
@@ -0,0 +1,76 @@
+"""
+Unit tests for the pooled service clients and the cached service tokens.
+"""
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from kugel_common.config.settings import settings
+from kugel_common.utils import http_client_helper as helper_module
+from kugel_common.utils import service_auth
+from kugel_common.utils.http_client_helper import HttpClientError, HttpClientHelper
+
+
+@pytest.fixture
+def empty_pool():
+    with patch.object(helper_module, "_client_pool", {}):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_pooled_client_is_shared_with_service_limits(empty_pool):
+    overrides = {"master-data": {"max_connections": 7, "http2": True}}
+    with patch.object(settings, "HTTP_CLIENT_SERVICE_LIMITS", overrides), patch.object(
+        helper_module, "HttpClientHelper"
+    ) as helper_class:
+        client = await helper_module.get_pooled_client("master-data")
+        assert await helper_module.get_pooled_client("master-data") is client
+        await helper_module.get_pooled_client("cart")
+
+    master_data_options = helper_class.call_args_list[0].kwargs
+    assert master_data_options["http2"] is True
+    assert master_data_options["limits"].max_connections == 7
+    assert master_data_options["limits"].max_keepalive_connections == settings.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS
+    cart_options = helper_class.call_args_list[1].kwargs
+    assert cart_options["http2"] is settings.HTTP_CLIENT_HTTP2
+    assert cart_options["limits"].max_connections == settings.HTTP_CLIENT_MAX_CONNECTIONS
+
+
+@pytest.mark.asyncio
+async def test_client_records_latency_and_errors(empty_pool):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/missing":
+            return httpx.Response(404, json={"success": False})
+        return httpx.Response(200, json={"success": True})
+
+    client = HttpClientHelper(base_url="http://cart", http2=True)
+    await client.client.aclose()
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    helper_module._client_pool["cart"] = client
+
+    assert await client.get("/ok") == {"success": True}
+    with pytest.raises(HttpClientError):
+        await client.get("/missing")
+    await client.close()
+
+    metrics = helper_module.get_pooled_client_metrics()["cart"]
+    assert metrics["requests"] == 2
+    assert metrics["errors"] == 1
+    assert metrics["retries"] == 0
+    assert metrics["max_latency_ms"] >= metrics["avg_latency_ms"] > 0
+
+
+def test_service_token_is_reused():
+    service_auth.clear_service_token_cache()
+
+    token = service_auth.create_service_token("T0001", "report")
+    assert service_auth.create_service_token("T0001", "report") == token
+    assert service_auth.create_service_token("T0002", "report") != token
+
+    with patch.object(settings, "SERVICE_TOKEN_REUSE_SECONDS", 0), patch.object(
+        service_auth.jwt, "encode", return_value="new-token"
+    ):
+        assert service_auth.create_service_token("T0001", "report") == "new-token"
+
+    service_auth.clear_service_token_cache()
@@ -0,0 +1,134 @@
+"""
+Unit tests for the size-capped body capture of the request logging middleware.
+"""
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from kugel_common.config.settings import settings
+from kugel_common.middleware import log_requests
+
+
+@pytest.fixture
+def body_settings(monkeypatch):
+    monkeypatch.setattr(settings, "REQUEST_LOG_BODY_MAX_BYTES", 64)
+    monkeypatch.setattr(settings, "REQUEST_LOG_BODY_CONTENT_TYPES", ["application/json"])
+    monkeypatch.setattr(settings, "REQUEST_LOG_BODY_EXCLUDE_PATHS", [])
+
+
+def _request(app: FastAPI, method: str, url: str, **kwargs):
+    logged = []
+
+    async def output_to_file(request_log):
+        logged.append(request_log)
+
+    with patch.object(log_requests, "_output_request_log_to_file", output_to_file), patch.object(
+        log_requests, "request_log_writer", MagicMock()
+    ):
+        response = TestClient(app).request(method, url, **kwargs)
+    assert len(logged) == 1
+    return response, logged[0]
+
+
+def _make_app(exclude_body_paths=None) -> FastAPI:
+    app = FastAPI()
+    app.middleware("http")(log_requests.log_requests("test", exclude_body_paths=exclude_body_paths))
+
+    @app.post("/items")
+    async def create_item(request: Request):
+        return {"received": len(await request.body())}
+
+    @app.get("/items")
+    async def get_items(count: int = 1):
+        return [{"item_code": f"item{i:03}"} for i in range(count)]
+
+    @app.get("/journals")
+    async def get_journals():
+        async def generate():
+            for i in range(100):
+                yield json.dumps({"no": i}).encode()
+
+        return StreamingResponse(generate(), media_type="application/json")
+
+    @app.get("/text")
+    async def get_text():
+        return PlainTextResponse("hello")
+
+    return app
+
+
+class TestBodyCapture:
+    def test_small_body_is_parsed(self):
+        capture = log_requests._BodyCapture(64)
+        capture.append(b'{"a": ')
+        capture.append(b"1}")
+
+        assert capture.get_body() == {"a": 1}
+
+    def test_large_body_keeps_prefix(self):
+        capture = log_requests._BodyCapture(4)
+        capture.append(b'{"abc')
+        capture.append(b'": 1}')
+
+        assert capture.get_body() == {"truncated": True, "size": 10, "prefix": '{"ab'}
+        assert len(capture.prefix) == 4
+
+    def test_empty_or_invalid_body(self):
+        assert log_requests._BodyCapture(64).get_body() is None
+        capture = log_requests._BodyCapture(64)
+        capture.append(b"not json")
+        assert capture.get_body() is None
+
+
+def test_small_response_and_request_bodies_are_logged(body_settings):
+    response, request_log = _request(_make_app(), "POST", "/items", json={"item_code": "item001"})
+
+    assert response.json() == {"received": 23}
+    assert request_log.request_info.body == {"item_code": "item001"}
+    assert request_log.response_info.body == {"received": 23}
+    assert request_log.response_info.status_code == 200
+
+
+def test_large_response_is_streamed_completely(body_settings):
+    response, request_log = _request(_make_app(), "GET", "/items", params={"count": 100})
+
+    assert len(response.json()) == 100
+    body = request_log.response_info.body
+    assert body["truncated"] is True
+    assert body["size"] == len(response.content)
+    assert body["prefix"] == response.text[:64]
+
+
+def test_streaming_response_is_passed_through(body_settings):
+    response, request_log = _request(_make_app(), "GET", "/journals")
+
+    assert response.content == b"".join(json.dumps({"no": i}).encode() for i in range(100))
+    assert request_log.response_info.body["size"] == len(response.content)
+
+
+def test_large_request_body_is_not_read_by_middleware(body_settings):
+    payload = {"item_code": "x" * 100}
+    response, request_log = _request(_make_app(), "POST", "/items", json=payload)
+
+    assert response.json() == {"received": len(json.dumps(payload, separators=(",", ":")))}
+    assert request_log.request_info.body == {"truncated": True, "size": response.json()["received"]}
+
+
+def test_content_type_not_logged(body_settings):
+    response, request_log = _request(_make_app(), "GET", "/text")
+
+    assert response.text == "hello"
+    assert request_log.response_info.body is None
+
+
+def test_excluded_paths(body_settings, monkeypatch):
+    _, request_log = _request(_make_app(exclude_body_paths=["/item*"]), "POST", "/items", json={"a": 1})
+    assert request_log.request_info.body is None
+    assert request_log.response_info.body is None
+
+    monkeypatch.setattr(settings, "REQUEST_LOG_BODY_EXCLUDE_PATHS", ["/journals"])
+    _, request_log = _request(_make_app(), "GET", "/journals")
+    assert request_log.response_info.body is None
@@ -0,0 +1,57 @@
+"""
+Unit tests for the process-wide plugin registry.
+"""
+import json
+import os
+
+from kugel_common.utils.plugin_registry import PluginRegistry
+
+
+def write_config(path, config: dict, mtime: float) -> str:
+    path.write_text(json.dumps(config))
+    os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def test_config_is_read_once_until_the_file_changes(tmp_path):
+    registry = PluginRegistry(check_interval_seconds=0)
+    path = write_config(tmp_path / "plugins.json", {"a": 1}, mtime=1000)
+
+    first = registry.get_config(path)
+    assert registry.get_config(path) is first
+
+    write_config(tmp_path / "plugins.json", {"a": 2}, mtime=2000)
+    assert registry.get_config(path) == {"a": 2}
+    assert registry.stats()["reloads"] == 1
+
+
+def test_file_is_not_checked_within_the_interval(tmp_path):
+    registry = PluginRegistry(check_interval_seconds=3600)
+    path = write_config(tmp_path / "plugins.json", {"a": 1}, mtime=1000)
+    registry.get_config(path)
+
+    write_config(tmp_path / "plugins.json", {"a": 2}, mtime=2000)
+    assert registry.get_config(path) == {"a": 1}
+
+
+def test_resolved_plugins_and_shared_instances_are_dropped_on_reload(tmp_path):
+    registry = PluginRegistry(check_interval_seconds=0)
+    path = write_config(tmp_path / "plugins.json", {"a": 1}, mtime=1000)
+    created = []
+
+    def factory():
+        created.append(object())
+        return created[-1]
+
+    registry.get_config(path)
+    assert registry.resolve(path, "json", "dumps") is json.dumps
+    assert registry.get_shared(path, "shared", factory) is registry.get_shared(path, "shared", factory)
+    assert len(created) == 1
+    assert registry.stats() == {"cached_files": 1, "cached_plugins": 1, "shared_plugins": 1, "reloads": 0}
+
+    write_config(tmp_path / "plugins.json", {"a": 2}, mtime=2000)
+    assert registry.get_shared(path, "shared", factory) is created[1]
+    assert registry.stats()["cached_plugins"] == 0
+
+    registry.clear()
+    assert registry.stats() == {"cached_files": 0, "cached_plugins": 0, "shared_plugins": 0, "reloads": 0}
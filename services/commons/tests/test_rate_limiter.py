@@ -0,0 +1,29 @@
+"""
+Unit tests for the token bucket rate limiter.
+"""
+import time
+
+import pytest
+
+from kugel_common.utils.rate_limiter import TokenBucket
+
+
+@pytest.mark.asyncio
+async def test_burst_up_to_capacity_then_waits_for_refill():
+    bucket = TokenBucket(rate_per_second=50, capacity=5)
+    started = time.monotonic()
+    for _ in range(5):
+        await bucket.acquire()
+    assert time.monotonic() - started < 0.05
+
+    for _ in range(5):
+        await bucket.acquire()
+    # 5 more tokens are refilled at 50 per second
+    assert time.monotonic() - started >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_no_limit_with_zero_rate():
+    bucket = TokenBucket(rate_per_second=0)
+    for _ in range(1000):
+        await bucket.acquire()
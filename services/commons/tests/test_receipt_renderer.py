@@ -0,0 +1,121 @@
+"""
+Unit tests for the compiled renderer of the receipt and journal texts.
+"""
+from unittest.mock import patch
+
+import pytest
+
+from kugel_common.receipt import abstract_receipt_data as receipt_module
+from kugel_common.receipt.abstract_receipt_data import AbstractReceiptData
+from kugel_common.receipt.receipt_data_model import Line, Page, PrintData, Table, TableRow
+from kugel_common.receipt.receipt_renderer import ReceiptRenderer
+
+TEXTS = [
+    "【 領 収 証 】",
+    " ",
+    "",
+    "a<b&c\"'>",
+    "tab\tand\nnewline",
+    "carriage\rreturn",
+    "  leading and trailing  ",
+    "とても長い名前の商品ですとても長い名前の商品です",
+    "]]> <!-- -->",
+]
+
+
+class SampleReceiptData(AbstractReceiptData[dict]):
+    def make_receipt_header(self, model: dict, page: Page):
+        for text in model["texts"]:
+            page.lines.append(self.line_center(text))
+            page.lines.append(self.line_left(text))
+            page.lines.append(self.line_right(text))
+
+    def make_receipt_body(self, model: dict, page: Page):
+        page.lines.append(self.line_boarder())
+        for text in model["texts"]:
+            page.lines.append(self.line_split(text, self.comma(1234567) + "外"))
+            page.lines.append(self.line_split(self.space(2) + "合計", text))
+        page.lines.append(Line(type="Text", align="Split", item1="item only", item2=None))
+        page.lines.append(Line(type="Text", align=None, description="no align"))
+        page.lines.append(Line(type="Other", align="Left", dimension="QR_CODE", description="qr"))
+
+    def make_receipt_footer(self, model: dict, page: Page):
+        page.tables.append(
+            Table(
+                border="1",
+                frame="boarder",
+                rows=[TableRow(columns=model["texts"]), TableRow(columns=[])],
+            )
+        )
+        page.tables.append(Table(border="0", frame="hsides", align="Center"))
+
+
+def make_print_data(texts: list[str]) -> PrintData:
+    return SampleReceiptData("sample").generate_print_data({"texts": texts})
+
+
+def legacy_texts(receipt_data: AbstractReceiptData, print_data: PrintData) -> tuple[str, str]:
+    with patch.object(receipt_module.settings, "USE_COMPILED_RECEIPT", False):
+        return receipt_data.make_receipt_text(print_data), receipt_data.make_journal_text(print_data)
+
+
+@pytest.mark.parametrize("width", [32, 40])
+def test_rendered_texts_are_identical_to_xml_round_trip(width):
+    receipt_data = SampleReceiptData("sample", width=width)
+    print_data = make_print_data(TEXTS)
+    expected_receipt, expected_journal = legacy_texts(receipt_data, print_data)
+    renderer = ReceiptRenderer()
+
+    assert renderer.render_receipt_text(print_data) == expected_receipt
+    assert renderer.render_journal_text(print_data, width=width) == expected_journal
+    # rendered again from the cached fragments
+    assert renderer.render_receipt_text(print_data) == expected_receipt
+    assert renderer.render_journal_text(print_data, width=width) == expected_journal
+    assert renderer.stats()["hits"] > 0
+
+
+def test_empty_print_data_is_identical_to_xml_round_trip():
+    receipt_data = SampleReceiptData("sample")
+    renderer = ReceiptRenderer()
+
+    for print_data in (PrintData(), PrintData(pages=[Page()])):
+        expected_receipt, expected_journal = legacy_texts(receipt_data, print_data)
+        assert renderer.render_receipt_text(print_data) == expected_receipt
+        assert renderer.render_journal_text(print_data) == expected_journal
+
+
+def test_invalid_xml_characters_are_not_rendered():
+    renderer = ReceiptRenderer()
+    print_data = PrintData(pages=[Page(lines=[Line(type="Text", align="Left", description="bell\x07")])])
+
+    assert renderer.render_receipt_text(print_data) is None
+
+
+def test_byte_lines_are_not_printed_as_journal_text():
+    renderer = ReceiptRenderer()
+    print_data = PrintData(pages=[Page(lines=[Line(type="Byte", align="Left", description="raw")])])
+
+    with pytest.raises(ValueError):
+        renderer.render_journal_text(print_data)
+
+
+def test_oldest_fragment_is_dropped_when_full():
+    renderer = ReceiptRenderer(max_entries=2)
+    for text in ("a", "b", "c"):
+        renderer.render_journal_text(PrintData(pages=[Page(lines=[Line(type="Text", align="Left", description=text)])]))
+
+    assert renderer.stats()["cached_fragments"] == 2
+
+
+def test_receipt_data_uses_compiled_renderer():
+    receipt_data = SampleReceiptData("sample")
+    print_data = make_print_data(TEXTS[:2])
+    expected_receipt, expected_journal = legacy_texts(receipt_data, print_data)
+
+    with patch.object(receipt_module.settings, "USE_COMPILED_RECEIPT", True), patch.object(
+        PrintData, "to_xml", side_effect=AssertionError("XML round trip")
+    ), patch.object(PrintData, "to_text", side_effect=AssertionError("text helper")):
+        receipt = receipt_data.make_receipt_data({"texts": TEXTS[:2]})
+
+    assert receipt.receipt_text == expected_receipt
+    assert receipt.journal_text == expected_journal
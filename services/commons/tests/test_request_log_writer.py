@@ -0,0 +1,158 @@
+"""
+Unit tests for the batched request log writer.
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from pymongo.errors import BulkWriteError
+
+from kugel_common.config.settings import settings
+from kugel_common.models.documents.request_log_document import RequestLog
+from kugel_common.models.repositories.request_log_repository import RequestLogRepository
+from kugel_common.utils import request_log_writer as writer_module
+from kugel_common.utils.request_log_writer import RequestLogWriter
+
+
+def _make_request_log(no: int, tenant_id: str = None) -> RequestLog:
+    return RequestLog(
+        tenant_id=tenant_id,
+        client_info=RequestLog.ClientInfo(ip_address="127.0.0.1"),
+        request_info=RequestLog.RequestInfo(method="GET", url=f"/items/{no}", accept_time=f"2025-01-01T00:00:{no:02d}"),
+        response_info=RequestLog.ResponseInfo(status_code=200, process_time_ms=1),
+        user_info=RequestLog.UserInfo(tenant_id=tenant_id or "", username="user", is_superuser=False),
+    )
+
+
+@pytest.fixture
+def inserts():
+    """Record the request logs inserted per database instead of writing them."""
+    written: dict[str, list[str]] = {}
+
+    async def get_db_async(db_name):
+        db = MagicMock()
+        db.name = db_name
+        return db
+
+    async def create_request_logs_async(self, request_logs):
+        written.setdefault(self.db.name, []).extend(log.request_info.url for log in request_logs)
+        return len(request_logs)
+
+    with patch.object(writer_module.db_helper, "get_db_async", get_db_async), patch.object(
+        RequestLogRepository, "create_request_logs_async", create_request_logs_async
+    ):
+        yield written
+
+
+@pytest.mark.asyncio
+async def test_logs_are_written_per_database(inserts):
+    writer = RequestLogWriter(batch_size=10, flush_interval_seconds=60)
+    writer.write(_make_request_log(1, "T001"))
+    writer.write(_make_request_log(2))
+    writer.write(_make_request_log(3, "T002"))
+    await writer.close_async()
+
+    prefix = settings.DB_NAME_PREFIX
+    assert inserts == {
+        f"{prefix}_commons": ["/items/1", "/items/2", "/items/3"],
+        f"{prefix}_T001": ["/items/1"],
+        f"{prefix}_T002": ["/items/3"],
+    }
+    assert writer.stats()["written"] == 5
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_written_without_waiting(inserts):
+    writer = RequestLogWriter(batch_size=3, flush_interval_seconds=60)
+    try:
+        for no in range(7):
+            writer.write(_make_request_log(no))
+        for _ in range(100):
+            if writer.stats()["batches"] == 2:
+                break
+            await asyncio.sleep(0)
+
+        assert len(inserts[f"{settings.DB_NAME_PREFIX}_commons"]) == 6
+        assert writer.stats()["queue_size"] == 1
+    finally:
+        await writer.close_async()
+    assert len(inserts[f"{settings.DB_NAME_PREFIX}_commons"]) == 7
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_is_written_after_interval(inserts):
+    writer = RequestLogWriter(batch_size=100, flush_interval_seconds=0.05)
+    writer.write(_make_request_log(1))
+    writer.write(_make_request_log(2))
+    await asyncio.sleep(0.01)
+    assert inserts == {}
+
+    await asyncio.sleep(0.1)
+    assert inserts[f"{settings.DB_NAME_PREFIX}_commons"] == ["/items/1", "/items/2"]
+    await writer.close_async()
+
+
+@pytest.mark.asyncio
+async def test_logs_are_dropped_when_queue_is_full(inserts):
+    writer = RequestLogWriter(max_queue_size=2, batch_size=10, flush_interval_seconds=60)
+    assert writer.write(_make_request_log(1))
+    assert writer.write(_make_request_log(2))
+    assert not writer.write(_make_request_log(3))
+
+    assert writer.stats()["dropped"] == 1
+    assert writer.stats()["queue_size"] == 2
+    await writer.close_async()
+    assert inserts[f"{settings.DB_NAME_PREFIX}_commons"] == ["/items/1", "/items/2"]
+
+
+@pytest.mark.asyncio
+async def test_write_in_progress_is_completed_on_close():
+    started = asyncio.Event()
+    release = asyncio.Event()
+    written = []
+
+    async def slow_create_request_logs_async(self, request_logs):
+        started.set()
+        await release.wait()
+        written.extend(request_logs)
+        return len(request_logs)
+
+    writer = RequestLogWriter(batch_size=1, flush_interval_seconds=60)
+    with patch.object(writer_module.db_helper, "get_db_async", AsyncMock()), patch.object(
+        RequestLogRepository, "create_request_logs_async", slow_create_request_logs_async
+    ):
+        writer.write(_make_request_log(1))
+        writer.write(_make_request_log(2))
+        await started.wait()
+        close = asyncio.ensure_future(writer.close_async())
+        await asyncio.sleep(0)
+        release.set()
+        await close
+
+    assert [log.request_info.url for log in written] == ["/items/1", "/items/2"]
+
+
+@pytest.mark.asyncio
+async def test_failed_write_is_counted():
+    writer = RequestLogWriter(batch_size=10, flush_interval_seconds=60)
+    with patch.object(writer_module.db_helper, "get_db_async", AsyncMock(side_effect=Exception("down"))):
+        writer.write(_make_request_log(1, "T001"))
+        await writer.close_async()
+
+    assert writer.stats()["failed"] == 2
+    assert writer.stats()["written"] == 0
+
+
+@pytest.mark.asyncio
+async def test_create_request_logs_counts_partial_insert():
+    repository = RequestLogRepository(MagicMock())
+    repository.dbcollection = MagicMock()
+    repository.dbcollection.insert_many = AsyncMock(
+        side_effect=BulkWriteError({"nInserted": 1, "writeErrors": [{"code": 11000, "errmsg": "duplicate"}]})
+    )
+
+    inserted = await repository.create_request_logs_async([_make_request_log(1, "T001"), _make_request_log(2, "T001")])
+
+    assert inserted == 1
+    documents = repository.dbcollection.insert_many.call_args.args[0]
+    assert all(document["shard_key"] for document in documents)
+    assert repository.dbcollection.insert_many.call_args.kwargs == {"ordered": False}
@@ -0,0 +1,180 @@
+"""
+Unit tests for the terminal information cache and its use by the security dependencies.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from kugel_common import security
+from kugel_common.config.settings import settings
+from kugel_common.middleware import log_requests
+from kugel_common.models.documents.staff_master_document import StaffMasterDocument
+from kugel_common.models.documents.terminal_info_document import TerminalInfoDocument
+from kugel_common.utils.terminal_info_cache import TerminalInfoCache, terminal_info_cache
+
+
+def _make_terminal_info(terminal_id="T001-001-01") -> TerminalInfoDocument:
+    tenant_id, store_code, terminal_no = terminal_id.split("-")
+    return TerminalInfoDocument(
+        tenant_id=tenant_id,
+        store_code=store_code,
+        terminal_no=int(terminal_no),
+        terminal_id=terminal_id,
+        business_date="20250101",
+        open_counter=1,
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_terminal_info_cache():
+    terminal_info_cache.clear()
+    yield
+    terminal_info_cache.clear()
+
+
+class TestTerminalInfoCache:
+    def test_key_includes_api_key(self):
+        cache = TerminalInfoCache()
+        cache.set("T001-001-01", "key-1", _make_terminal_info())
+
+        assert cache.get("T001-001-01", "key-1").terminal_id == "T001-001-01"
+        assert cache.get("T001-001-01", "key-2") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_api_key_is_not_stored(self):
+        cache = TerminalInfoCache()
+        cache.set("T001-001-01", "secret-api-key", _make_terminal_info())
+        assert "secret-api-key" not in str(list(cache._cache.keys()))
+
+    def test_get_returns_copy(self):
+        cache = TerminalInfoCache()
+        cache.set("T001-001-01", "key", _make_terminal_info())
+
+        cache.get("T001-001-01", "key").business_date = "20991231"
+        assert cache.get("T001-001-01", "key").business_date == "20250101"
+
+    def test_expired_entry_is_dropped(self):
+        cache = TerminalInfoCache(ttl_seconds=60)
+        with patch("kugel_common.utils.terminal_info_cache.time.time", return_value=1000.0):
+            cache.set("T001-001-01", "key", _make_terminal_info())
+        with patch("kugel_common.utils.terminal_info_cache.time.time", return_value=1059.0):
+            assert cache.get("T001-001-01", "key") is not None
+        with patch("kugel_common.utils.terminal_info_cache.time.time", return_value=1060.0):
+            assert cache.get("T001-001-01", "key") is None
+
+    def test_least_recently_used_is_dropped(self):
+        cache = TerminalInfoCache(max_entries=2)
+        cache.set("T001-001-01", "key", _make_terminal_info("T001-001-01"))
+        cache.set("T001-001-02", "key", _make_terminal_info("T001-001-02"))
+        cache.get("T001-001-01", "key")
+        cache.set("T001-001-03", "key", _make_terminal_info("T001-001-03"))
+
+        assert cache.get("T001-001-01", "key") is not None
+        assert cache.get("T001-001-02", "key") is None
+        assert cache.get("T001-001-03", "key") is not None
+
+    def test_invalidate_by_tenant_and_terminal(self):
+        cache = TerminalInfoCache()
+        cache.set("T001-001-01", "key-1", _make_terminal_info("T001-001-01"))
+        cache.set("T001-001-01", "key-2", _make_terminal_info("T001-001-01"))
+        cache.set("T001-001-02", "key", _make_terminal_info("T001-001-02"))
+        cache.set("T0010-001-01", "key", _make_terminal_info("T0010-001-01"))
+
+        assert cache.invalidate(terminal_id="T001-001-01") == 2
+        assert cache.invalidate(tenant_id="T001") == 1
+        assert cache.get("T0010-001-01", "key") is not None
+
+
+class TestGetTerminalInfo:
+    @pytest.mark.asyncio
+    async def test_terminal_service_is_called_once(self):
+        with patch.object(
+            security, "get_terminal_info_from_terminal_service", AsyncMock(return_value=_make_terminal_info())
+        ) as remote:
+            first = await security.get_terminal_info("T001-001-01", "key")
+            second = await security.get_terminal_info("T001-001-01", "key")
+            await security.get_terminal_info("T001-001-01", "other-key")
+
+        assert first.terminal_id == second.terminal_id == "T001-001-01"
+        assert remote.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_disabled(self, monkeypatch):
+        monkeypatch.setattr(settings, "USE_TERMINAL_INFO_CACHE", False)
+        with patch.object(
+            security, "get_terminal_info_from_terminal_service", AsyncMock(return_value=_make_terminal_info())
+        ) as remote:
+            await security.get_terminal_info("T001-001-01", "key")
+            await security.get_terminal_info("T001-001-01", "key")
+        assert remote.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_bypassing_the_cache_reads_the_current_terminal(self):
+        signed_in = _make_terminal_info()
+        signed_in.staff = StaffMasterDocument(id="S001", name="Staff")
+        with patch.object(
+            security,
+            "get_terminal_info_from_terminal_service",
+            AsyncMock(side_effect=[_make_terminal_info(), signed_in]),
+        ):
+            await security.get_terminal_info("T001-001-01", "key")
+            current = await security.get_terminal_info("T001-001-01", "key", use_cache=False)
+
+        assert current.staff.id == "S001"
+        assert terminal_info_cache.get("T001-001-01", "key").staff.id == "S001"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status_code", [401, 404])
+    async def test_rejected_terminal_is_invalidated(self, status_code):
+        terminal_info_cache.set("T001-001-01", "old-key", _make_terminal_info())
+        with patch.object(
+            security,
+            "get_terminal_info_from_terminal_service",
+            AsyncMock(side_effect=HTTPException(status_code=status_code)),
+        ):
+            with pytest.raises(HTTPException):
+                await security.get_terminal_info("T001-001-01", "new-key")
+
+        assert terminal_info_cache.get("T001-001-01", "old-key") is None
+
+    @pytest.mark.asyncio
+    async def test_terminal_service_reads_database(self):
+        with patch.object(
+            security, "get_terminal_info_for_terminal_service", AsyncMock(return_value=_make_terminal_info())
+        ) as local:
+            await security.get_terminal_info("T001-001-01", "key", is_terminal_service=True)
+            await security.get_terminal_info("T001-001-01", "key", is_terminal_service=True)
+        assert local.await_count == 2
+        assert terminal_info_cache.stats()["cached_terminals"] == 0
+
+
+def test_middleware_reuses_terminal_info_of_dependency():
+    app = FastAPI()
+    app.middleware("http")(log_requests.log_requests("test"))
+
+    @app.get("/tenants/{tenant_id}/items")
+    async def get_items(tenant_id: str, tenant_id_with_security: str = Depends(security.get_tenant_id_with_security_by_query)):
+        return {"tenant_id": tenant_id_with_security}
+
+    logged = []
+
+    async def output_to_file(request_log):
+        logged.append(request_log)
+
+    with patch.object(
+        security, "get_terminal_info_from_terminal_service", AsyncMock(return_value=_make_terminal_info())
+    ) as remote, patch.object(log_requests, "get_terminal_info", AsyncMock()) as middleware_lookup, patch.object(
+        log_requests, "_output_request_log_to_file", output_to_file
+    ), patch.object(log_requests, "request_log_writer", MagicMock()) as writer:
+        response = TestClient(app).get(
+            "/tenants/T001/items", params={"terminal_id": "T001-001-01"}, headers={"X-API-KEY": "key"}
+        )
+
+    assert response.json() == {"tenant_id": "T001"}
+    assert remote.await_count == 1
+    middleware_lookup.assert_not_called()
+    assert logged[0].terminal_info.terminal_no == 1
+    assert logged[0].tenant_id == "T001"
+    writer.write.assert_called_once_with(logged[0])
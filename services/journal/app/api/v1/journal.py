@@ -128,6 +128,7 @@ async def get_journals(
     receipt_no_from: int = Query(None),
     receipt_no_to: int = Query(None),
     keywords: list[str] = Query(None, description="Search keywords"),
+    keywords_match_all: bool = Query(False, description="true: all keywords must match (AND), false: any keyword (OR)"),
     limit: int = Query(100),
     page: int = Query(1),
     sort: list[tuple[str, int]] = Depends(parse_sort),
@@ -156,6 +157,7 @@ async def get_journals(
         receipt_no_from: Optional start of receipt number range
         receipt_no_to: Optional end of receipt number range
         keywords: Optional list of keywords to search for in journal text
+        keywords_match_all: Whether all keywords must match (default: any keyword)
         limit: Maximum number of results to return (default: 100)
         page: Page number for pagination (default: 1)
         sort: Sorting criteria (default: terminal_no, business_date, receipt_no)
@@ -179,6 +181,7 @@ async def get_journals(
         receipt_no_from=receipt_no_from,
         receipt_no_to=receipt_no_to,
         keywords=keywords,
+        keywords_match_all=keywords_match_all,
         limit=limit,
         page=page,
         sort=sort,
@@ -23,6 +23,15 @@ class Settings(
     MONGODB_URI: str = Field(default="mongodb://localhost:27017/?replicaSet=rs0")
     DB_NAME_PREFIX: str = Field(default="db_journal")
 
+    # Journal search settings
+    USE_JOURNAL_SEARCH_INDEX: bool = Field(
+        default=False,
+        description=(
+            "Search keywords with the indexed search tokens instead of a regular expression over all journal texts. "
+            "Token search matches whole words only and ignores case, unlike the default partial match"
+        ),
+    )
+
     DEBUG: str = "false"
     DEBUG_PORT: int = 5678
 
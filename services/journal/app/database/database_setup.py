@@ -3,10 +3,14 @@ from typing import Optional
 from logging import getLogger
 from kugel_common.database import database as db_helper
 from app.config.settings import settings
+from app.models.repositories.journal_repository import JournalRepository
 
 # setup logger
 logger = getLogger(__name__)
 
+# multikey index of the normalized journal text tokens used by the keyword search
+JOURNAL_SEARCH_INDEX = {"keys": {"tenant_id": 1, "store_code": 1, "search_tokens": 1}, "unique": False}
+
 
 # create some collection
 async def create_some_collection(
@@ -95,12 +99,47 @@ async def create_journal_collection(tenant_id: str):
             "keys": {"tenant_id": 1, "store_code": 1, "terminal_no": 1, "business_date": 1, "receipt_no": 1},
             "unique": False,
         },
+        JOURNAL_SEARCH_INDEX,
     ]
     await create_some_collection(
         tenant_id=tenant_id, collection_name=name, index_keys_list=index_keys_list, index_name=name + "_index"
     )
 
 
+# add the keyword search index to an existing journal collection
+async def update_journal_search_index(tenant_id: str):
+    name = settings.DB_COLLECTION_NAME_JOURNAL
+    db = await db_helper.get_db_async(f"{settings.DB_NAME_PREFIX}_{tenant_id}")
+    keys = JOURNAL_SEARCH_INDEX["keys"]
+    # same name as create_collection_with_indexes_async gives it, so this is a no-op if it exists
+    index_name = name + "_index_" + "_".join(keys.keys())
+    command = db_helper.create_indexes_command(
+        collection_name=name, index_keys=keys, index_name=index_name, unique=JOURNAL_SEARCH_INDEX["unique"]
+    )
+    await db_helper.execute_command_async(command=command, db=db)
+
+    # set the search tokens of journals stored before the index was introduced
+    await JournalRepository(db=db, tenant_id=tenant_id).backfill_search_tokens_async()
+
+
+# add the keyword search index and tokens to the journal collections of all existing tenants
+async def update_journal_search_index_for_all_tenants():
+    client = await db_helper.get_client_async()
+    prefix = f"{settings.DB_NAME_PREFIX}_"
+    for db_name in await client.list_database_names():
+        tenant_id = db_name[len(prefix) :] if db_name.startswith(prefix) else None
+        if not tenant_id:
+            continue
+        collection_names = await client[db_name].list_collection_names()
+        if settings.DB_COLLECTION_NAME_JOURNAL not in collection_names:
+            continue
+        try:
+            await update_journal_search_index(tenant_id)
+        except Exception as e:
+            # the other tenants are migrated anyway, the failed one is retried on the next startup
+            logger.error(f"Failed to update the journal search index for tenant_id:{tenant_id}: {e}")
+
+
 # create request log collection
 async def create_request_log_collection(tenant_id: str):
     name = settings.DB_COLLECTION_NAME_REQUEST_LOG
@@ -127,4 +166,5 @@ async def create_collections(tenant_id: str):
 async def execute(tenant_id: str):
     logger.info(f"Setting up database for tenant_id:{tenant_id} execution started...")
     await create_collections(tenant_id)
+    await update_journal_search_index(tenant_id)
     # add more setup tasks here
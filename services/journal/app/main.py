@@ -15,15 +15,20 @@ logger.info("Application started - journal service")
 
 # Import the required application modules after the logger is configured  # This ensures all imported modules use the configured logger
 from kugel_common.database import database as db_helper
+from kugel_common.utils.http_client_helper import close_all_clients
 from kugel_common.schemas.api_response import ApiResponse
 from kugel_common.schemas.health import HealthCheckResponse, HealthStatus, ComponentHealth
 from kugel_common.utils.health_check import HealthChecker
 from kugel_common.exceptions import register_exception_handlers
 from kugel_common.middleware.log_requests import log_requests
+from kugel_common.utils.request_log_writer import request_log_writer
+from kugel_common.utils.delivery_status_notifier import delivery_status_notifier
+from kugel_common.utils.bulk_subscribe import make_subscription
 from app.api.v1.tenant import router as v1_tenant_router
 from app.api.v1.journal import router as v1_journal_router
 from app.api.v1.tran import router as v1_tran_router
 from app.config.settings import settings
+from app.database import database_setup
 
 # Create a FastAPI instance with API documentation URLs enabled
 app = FastAPI(docs_url="/docs", redoc_url="/redoc")
@@ -72,11 +77,15 @@ def subscribe_topics():
     The journal service subscribes to transaction logs, cash logs, and open/close logs
     to generate and store journal entries for each operation.
 
+    The transaction logs are received in batches when bulk subscribe is enabled (USE_BULK_SUBSCRIBE).
+
     Returns:
         list: List of subscription configurations with pubsubname, topic, and route
     """
     return [
-        {"pubsubname": "pubsub-tranlog-report", "topic": "topic-tranlog", "route": "/api/v1/tranlog"},
+        make_subscription(
+            "pubsub-tranlog-report", "topic-tranlog", "/api/v1/tranlog", bulk_route="/api/v1/tranlog/bulk"
+        ),
         {"pubsubname": "pubsub-cashlog-report", "topic": "topic-cashlog", "route": "/api/v1/cashlog"},
         {"pubsubname": "pubsub-opencloselog-report", "topic": "topic-opencloselog", "route": "/api/v1/opencloselog"},
     ]
@@ -153,6 +162,11 @@ async def startup_event():
         logger.error(f"Error connecting to the database: {e}")
         raise e
 
+    # Journals of tenants created before the search index was introduced have no search tokens yet
+    if settings.USE_JOURNAL_SEARCH_INDEX:
+        logger.info("Updating the journal search index of existing tenants...")
+        await database_setup.update_journal_search_index_for_all_tenants()
+
 
 # Application shutdown event handler
 async def close_event():
@@ -165,10 +179,20 @@ async def close_event():
     """
     logger.info("closing the application")
 
+    # Send the queued delivery statuses to the publishers of the logs
+    await delivery_status_notifier.close_async()
+
+    # Write the queued request logs before the database connection is closed
+    await request_log_writer.close_async()
+
     # Close the database connection
     logger.info("close database connection for all tenants...")
     await db_helper.close_client_async()
 
+    # Close the pooled HTTP clients of the other services
+    logger.info("Closing all HTTP client pools")
+    await close_all_clients()
+
     # add close tasks here
     logger.info("Application closed")
 
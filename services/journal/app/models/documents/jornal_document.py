@@ -30,3 +30,4 @@ class JournalDocument(AbstractDocument):
     generate_date_time: str  # Date and time when the journal was generated
     journal_text: str  # Formatted text for journal
     receipt_text: str  # Formatted text for receipt printing
+    search_tokens: Optional[list[str]] = None  # Normalized tokens of journal_text for the keyword search
@@ -1,17 +1,23 @@
 # Copyright 2025 masa@kugel  # # Licensed under the Apache License, Version 2.0 (the "License");  # you may not use this file except in compliance with the License.  # You may obtain a copy of the License at  # #     http://www.apache.org/licenses/LICENSE-2.0  # # Unless required by applicable law or agreed to in writing, software  # distributed under the License is distributed on an "AS IS" BASIS,  # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  # See the License for the specific language governing permissions and  # limitations under the License.
+import re
 from typing import Type
 from datetime import datetime
 from logging import getLogger
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
 
 from kugel_common.models.repositories.abstract_repository import AbstractRepository
-from kugel_common.exceptions import CannotCreateException, DocumentNotFoundException
+from kugel_common.exceptions import CannotCreateException, DocumentNotFoundException, RepositoryException
 from kugel_common.schemas.pagination import PaginatedResult
 from app.models.documents.jornal_document import JournalDocument
 from app.config.settings import settings
+from app.utils.journal_search import tokenize_journal_text, make_keywords_filter
 
 logger = getLogger(__name__)
 
+# Fields identifying a journal entry, as checked by create_journal_async
+_JOURNAL_KEY_FIELDS = ("tenant_id", "store_code", "terminal_no", "transaction_type", "generate_date_time")
+
 
 class JournalRepository(AbstractRepository[JournalDocument]):
     """
@@ -67,6 +73,7 @@ class JournalRepository(AbstractRepository[JournalDocument]):
 
             # Create a new journal document
             journal_doc.shard_key = self.__get_shard_key(journal_doc)
+            journal_doc.search_tokens = tokenize_journal_text(journal_doc.journal_text)
             logger.debug(f"JournalRepository.create_journal_async: journal_doc->{journal_doc}")
             if not await self.create_async(journal_doc):
                 raise Exception()
@@ -82,6 +89,50 @@ class JournalRepository(AbstractRepository[JournalDocument]):
             )
             raise CannotCreateException(message, logger, e) from e
 
+    async def create_journals_async(self, journal_docs: list[JournalDocument]) -> list[JournalDocument]:
+        """
+        Create new journal entries in the database with one ordered bulk insert.
+
+        The journal entries already stored are found with one query and skipped,
+        the same as in create_journal_async.
+
+        Args:
+            journal_docs: Journal documents to store
+
+        Returns:
+            The journal documents inserted
+
+        Raises:
+            CannotCreateException: If the journal entries cannot be created
+        """
+        if self.dbcollection is None:
+            await self.initialize()
+        try:
+            keys = [tuple(getattr(journal_doc, field) for field in _JOURNAL_KEY_FIELDS) for journal_doc in journal_docs]
+            existing = await self.dbcollection.find(
+                {"$or": [dict(zip(_JOURNAL_KEY_FIELDS, key)) for key in keys]},
+                {field: 1 for field in _JOURNAL_KEY_FIELDS},
+                session=self.session,
+            ).to_list(None)
+            stored_keys = {tuple(doc[field] for field in _JOURNAL_KEY_FIELDS) for doc in existing}
+
+            new_journal_docs = []
+            for key, journal_doc in zip(keys, journal_docs):
+                if key in stored_keys:
+                    logger.warning(f"Journal already exists. journal_doc: {journal_doc}")
+                    continue
+                stored_keys.add(key)
+                journal_doc.shard_key = self.__get_shard_key(journal_doc)
+                journal_doc.search_tokens = tokenize_journal_text(journal_doc.journal_text)
+                new_journal_docs.append(journal_doc)
+
+            logger.debug(f"JournalRepository.create_journals_async: count->{len(new_journal_docs)}")
+            await self.create_many_async(new_journal_docs)
+            return new_journal_docs
+        except Exception as e:
+            message = f"Failed to create {len(journal_docs)} journals: tenant_id->{self.tenant_id}"
+            raise CannotCreateException(message, self.collection_name, None, logger, e) from e
+
     async def get_journals_async(
         self,
         store_code: str,
@@ -97,6 +148,7 @@ class JournalRepository(AbstractRepository[JournalDocument]):
         limit: int = 100,
         page: int = 1,
         sort: list[tuple[str, int]] = None,
+        keywords_match_all: bool = False,
     ) -> list[JournalDocument]:
         """
         Retrieve journal entries based on multiple search criteria.
@@ -120,6 +172,7 @@ class JournalRepository(AbstractRepository[JournalDocument]):
             limit: Maximum number of results per page (default: 100)
             page: Page number (default: 1)
             sort: List of field name and direction tuples for sorting
+            keywords_match_all: True if all keywords have to match, False if any keyword (default: False)
 
         Returns:
             List of journal documents matching the search criteria
@@ -146,7 +199,7 @@ class JournalRepository(AbstractRepository[JournalDocument]):
         if receipt_no_from and receipt_no_to:
             query["receipt_no"] = {"$gte": receipt_no_from, "$lte": receipt_no_to}
         if keywords:
-            query["journal_text"] = {"$regex": "|".join(keywords)}
+            query.update(self.__make_keywords_query(keywords, keywords_match_all))
 
         try:
             logger.debug(f"JournalRepository.get_journals_async: query->{query}, limit->{limit}, sort->{sort}")
@@ -188,6 +241,7 @@ class JournalRepository(AbstractRepository[JournalDocument]):
         limit: int = 100,
         page: int = 1,
         sort: list[tuple[str, int]] = None,
+        keywords_match_all: bool = False,
     ) -> PaginatedResult[JournalDocument]:
         """
         Retrieve journal entries with pagination metadata.
@@ -210,6 +264,7 @@ class JournalRepository(AbstractRepository[JournalDocument]):
             limit: Maximum number of results per page (default: 100)
             page: Page number (default: 1)
             sort: List of field name and direction tuples for sorting
+            keywords_match_all: True if all keywords have to match, False if any keyword (default: False)
 
         Returns:
             PaginatedResult containing journal documents and metadata
@@ -236,7 +291,7 @@ class JournalRepository(AbstractRepository[JournalDocument]):
         if receipt_no_from and receipt_no_to:
             query["receipt_no"] = {"$gte": receipt_no_from, "$lte": receipt_no_to}
         if keywords:
-            query["journal_text"] = {"$regex": "|".join(keywords)}
+            query.update(self.__make_keywords_query(keywords, keywords_match_all))
 
         try:
             logger.debug(
@@ -253,6 +308,71 @@ class JournalRepository(AbstractRepository[JournalDocument]):
             )
             raise DocumentNotFoundException(message, logger, e) from e
 
+    async def backfill_search_tokens_async(self, batch_size: int = 1000) -> int:
+        """
+        Set the search tokens of journals stored before the search index was introduced.
+
+        Args:
+            batch_size: Number of journals updated with one bulk write (default: 1000)
+
+        Returns:
+            Number of updated journals
+
+        Raises:
+            RepositoryException: If the journals cannot be updated
+        """
+        if self.dbcollection is None:
+            await self.initialize()
+
+        updated = 0
+        try:
+            # one pass in _id order, so the collection is scanned only once
+            cursor = (
+                self.dbcollection.find({"search_tokens": None}, {"_id": 1, "journal_text": 1})
+                .sort("_id", 1)
+                .batch_size(batch_size)
+            )
+            requests = []
+            async for journal in cursor:
+                requests.append(
+                    UpdateOne(
+                        {"_id": journal["_id"]},
+                        {"$set": {"search_tokens": tokenize_journal_text(journal.get("journal_text"))}},
+                    )
+                )
+                if len(requests) >= batch_size:
+                    await self.dbcollection.bulk_write(requests, ordered=False)
+                    updated += len(requests)
+                    requests = []
+            if requests:
+                await self.dbcollection.bulk_write(requests, ordered=False)
+                updated += len(requests)
+        except Exception as e:
+            message = f"Failed to backfill journal search tokens: tenant_id->{self.tenant_id}, updated->{updated}"
+            raise RepositoryException(message, self.collection_name, logger, e) from e
+
+        logger.info(f"Journal search tokens backfilled: tenant_id->{self.tenant_id}, updated->{updated}")
+        return updated
+
+    def __make_keywords_query(self, keywords: list[str], match_all: bool) -> dict:
+        """
+        Create the keyword part of the journal query.
+
+        Args:
+            keywords: Keywords to search for in the journal text
+            match_all: True if all keywords have to match, False if any keyword
+
+        Returns:
+            Dictionary to merge into the journal query
+        """
+        if settings.USE_JOURNAL_SEARCH_INDEX:
+            return make_keywords_filter(keywords, match_all)
+
+        # full scan of the journal texts
+        if match_all:
+            return {"$and": [{"journal_text": {"$regex": re.escape(keyword)}} for keyword in keywords]}
+        return {"journal_text": {"$regex": "|".join(re.escape(keyword) for keyword in keywords)}}
+
     def __get_shard_key(self, journal_doc: JournalDocument) -> str:
         """
         Generate a shard key for database partitioning.
@@ -59,6 +59,32 @@ class JournalService:
             message = f"ジャーナルの作成に失敗しました: {journal}"
             raise JournalCreationException(message, logger, e) from e
 
+    async def receive_journals_async(self, journals: list[dict]) -> list[JournalDocument]:
+        """
+        Create new journal entries from dictionary data with one bulk insert.
+
+        Args:
+            journals: Dictionaries containing journal data
+
+        Returns:
+            Created JournalDocument instances
+
+        Raises:
+            JournalValidationException: If the journal data fails validation
+            JournalCreationException: If there is an error during journal creation
+        """
+        try:
+            journal_objs = [JournalDocument(**journal) for journal in journals]
+        except ValueError as e:
+            message = f"ジャーナルのバリデーションに失敗しました: {journals}"
+            raise JournalValidationException(message, logger, e) from e
+        try:
+            await self.journal_repository.create_journals_async(journal_objs)
+            return journal_objs
+        except Exception as e:
+            message = f"ジャーナルの作成に失敗しました: count->{len(journals)}"
+            raise JournalCreationException(message, logger, e) from e
+
     async def get_journals_async(
         self,
         store_code: str,
@@ -74,6 +100,7 @@ class JournalService:
         limit: int = 100,
         page: int = 1,
         sort: list[tuple[str, int]] = None,
+        keywords_match_all: bool = False,
     ) -> list[JournalDocument]:
         """
         Retrieve journal entries based on multiple search criteria.
@@ -96,6 +123,7 @@ class JournalService:
             limit: Maximum number of results per page (default: 100)
             page: Page number (default: 1)
             sort: List of field name and direction tuples for sorting
+            keywords_match_all: True if all keywords have to match, False if any keyword (default: False)
 
         Returns:
             List of journal documents matching the search criteria
@@ -119,6 +147,7 @@ class JournalService:
                 limit=limit,
                 page=page,
                 sort=sort,
+                keywords_match_all=keywords_match_all,
             )
             if not journals:
                 message = (
@@ -158,6 +187,7 @@ class JournalService:
         limit: int = 100,
         page: int = 1,
         sort: list[tuple[str, int]] = None,
+        keywords_match_all: bool = False,
     ):
         """
         Retrieve journal entries with pagination metadata.
@@ -180,6 +210,7 @@ class JournalService:
             limit: Maximum number of results per page (default: 100)
             page: Page number (default: 1)
             sort: List of field name and direction tuples for sorting
+            keywords_match_all: True if all keywords have to match, False if any keyword (default: False)
 
         Returns:
             PaginatedResult containing journal documents and metadata
@@ -202,6 +233,7 @@ class JournalService:
                 limit=limit,
                 page=page,
                 sort=sort,
+                keywords_match_all=keywords_match_all,
             )
         except Exception as e:
             message = (
@@ -65,30 +65,7 @@ class LogService:
             Exception: If there is an error during the transaction process
         """
 
-        # transaction type for cancellation transactions
-        tran_type = tran.transaction_type
-        if tran.transaction_type == TransactionType.NormalSales.value:
-            if tran.sales.is_cancelled:
-                tran_type = TransactionType.NormalSalesCancel.value
-
-        journal_doc = JournalDocument(
-            tenant_id=tran.tenant_id,
-            store_code=tran.store_code,
-            terminal_no=tran.terminal_no,
-            transaction_no=tran.transaction_no,
-            transaction_type=tran_type,  # Use the transaction type determined above
-            business_date=tran.business_date,
-            open_counter=tran.open_counter,
-            business_counter=tran.business_counter,
-            generate_date_time=tran.generate_date_time,
-            receipt_no=tran.receipt_no,
-            amount=tran.sales.total_amount_with_tax,
-            quantity=tran.sales.total_quantity,
-            staff_id=tran.staff.id,
-            user_id=tran.user.id,
-            journal_text=tran.journal_text,
-            receipt_text=tran.receipt_text,
-        )
+        journal_doc = self.__make_tranlog_journal(tran)
 
         async with await self.tran_repository.start_transaction() as session:
             try:
@@ -106,6 +83,36 @@ class LogService:
                 )
                 raise e
 
+    async def receive_tranlogs_async(self, trans: list[BaseTransaction]) -> list[BaseTransaction]:
+        """
+        Process and store a batch of transaction logs.
+
+        The transaction logs and their journal entries are stored with one ordered
+        bulk insert each, in a single atomic transaction for the whole batch.
+
+        Args:
+            trans: The transaction logs to process and store
+
+        Returns:
+            The transaction logs inserted, without those already stored
+
+        Raises:
+            Exception: If there is an error during the transaction process, no log of the batch is stored
+        """
+        journal_docs = [self.__make_tranlog_journal(tran).model_dump() for tran in trans]
+
+        async with await self.tran_repository.start_transaction() as session:
+            try:
+                self.journal_service.journal_repository.set_session(session)
+                return_trans = await self.tran_repository.create_tranlogs_async(trans)
+                await self.journal_service.receive_journals_async(journal_docs)
+                await self.tran_repository.commit_transaction()
+                return return_trans
+            except Exception as e:
+                await self.tran_repository.abort_transaction()
+                logger.error(f"Failed to create {len(trans)} transaction logs & journals: {e}")
+                raise e
+
     async def receive_cashlog_async(self, cashlog: CashInOutLog) -> CashInOutLog:
         """
         Process and store a cash in/out log.
@@ -211,3 +218,38 @@ class LogService:
                     message=message, error=e, service="journal", context=open_close_log.model_dump()
                 )
                 raise e
+
+    def __make_tranlog_journal(self, tran: BaseTransaction) -> JournalDocument:
+        """
+        Create the journal entry of a transaction log.
+
+        Args:
+            tran: The transaction log
+
+        Returns:
+            The journal document of the transaction
+        """
+        # transaction type for cancellation transactions
+        tran_type = tran.transaction_type
+        if tran.transaction_type == TransactionType.NormalSales.value:
+            if tran.sales.is_cancelled:
+                tran_type = TransactionType.NormalSalesCancel.value
+
+        return JournalDocument(
+            tenant_id=tran.tenant_id,
+            store_code=tran.store_code,
+            terminal_no=tran.terminal_no,
+            transaction_no=tran.transaction_no,
+            transaction_type=tran_type,  # Use the transaction type determined above
+            business_date=tran.business_date,
+            open_counter=tran.open_counter,
+            business_counter=tran.business_counter,
+            generate_date_time=tran.generate_date_time,
+            receipt_no=tran.receipt_no,
+            amount=tran.sales.total_amount_with_tax,
+            quantity=tran.sales.total_quantity,
+            staff_id=tran.staff.id,
+            user_id=tran.user.id,
+            journal_text=tran.journal_text,
+            receipt_text=tran.receipt_text,
+        )
@@ -0,0 +1,106 @@
+# Copyright 2025 masa@kugel  # # Licensed under the Apache License, Version 2.0 (the "License");  # you may not use this file except in compliance with the License.  # You may obtain a copy of the License at  # #     http://www.apache.org/licenses/LICENSE-2.0  # # Unless required by applicable law or agreed to in writing, software  # distributed under the License is distributed on an "AS IS" BASIS,  # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  # See the License for the specific language governing permissions and  # limitations under the License.
+"""
+Keyword search index for journal texts.
+
+The journal text is normalized (NFKC, case folded) and split into tokens which are stored
+in the search_tokens field of the journal and indexed with a multikey index:
+
+- Runs of letters and digits become one token per word, e.g. "Total", "1,000" -> "total", "1", "000".
+- Japanese has no word boundaries, so runs of kana and kanji become all their characters
+  and character bigrams, e.g. "牛乳" -> "牛", "乳", "牛乳".
+
+A keyword matches a journal if all tokens of the keyword are in its search tokens. Keywords
+with more than one token are additionally checked with an escaped regular expression, which
+then only runs on the journals found by the index.
+
+Unlike the regular expression search, a keyword only matches whole words (e.g. "mil" does not
+find "Milk") and letter case is ignored, so the token search is enabled with
+USE_JOURNAL_SEARCH_INDEX and the regular expression search stays the default.
+"""
+
+import re
+import unicodedata
+from typing import Any
+
+# Hiragana, katakana (incl. prolonged sound mark) and CJK ideographs, after NFKC normalization
+_CJK_CHARS = "぀-ヿ㐀-䶿一-鿿豈-﫿"
+_TOKEN_PATTERN = re.compile(f"(?P<cjk>[{_CJK_CHARS}]+)|(?P<word>[^\\W_{_CJK_CHARS}]+)")
+
+
+def tokenize_journal_text(text: str) -> list[str]:
+    """
+    Split a text into normalized search tokens.
+
+    Args:
+        text: Journal text or search keyword
+
+    Returns:
+        Sorted list of the distinct tokens
+    """
+    if not text:
+        return []
+    tokens = set()
+    for match in _TOKEN_PATTERN.finditer(unicodedata.normalize("NFKC", text).casefold()):
+        run = match.group("cjk")
+        if run is None:
+            tokens.add(match.group("word"))
+            continue
+        tokens.update(run)
+        tokens.update(run[i : i + 2] for i in range(len(run) - 1))
+    return sorted(tokens)
+
+
+def _keyword_tokens(keyword: str) -> list[str]:
+    """
+    Get the tokens a journal must contain to match a keyword.
+
+    Single characters of a Japanese keyword are implied by its bigrams and are left out.
+
+    Args:
+        keyword: Search keyword
+
+    Returns:
+        List of tokens
+    """
+    tokens = tokenize_journal_text(keyword)
+    bigrams_only = [token for token in tokens if not (len(token) == 1 and re.match(f"[{_CJK_CHARS}]", token))]
+    return bigrams_only if any(len(token) > 1 for token in bigrams_only) else tokens
+
+
+def make_keywords_filter(keywords: list[str], match_all: bool = False) -> dict[str, Any]:
+    """
+    Create the MongoDB filter for a keyword search using the search tokens.
+
+    Journals stored before the search index was introduced have no search tokens yet.
+    They are matched with the escaped regular expressions, using the index to find them.
+
+    Args:
+        keywords: Search keywords
+        match_all: True if all keywords have to match (AND), False if any keyword (OR)
+
+    Returns:
+        Dictionary to merge into the journal query
+    """
+    operator = "$and" if match_all else "$or"
+    indexed_conditions = []
+    legacy_conditions = []
+    for keyword in keywords:
+        regex_condition = {"journal_text": {"$regex": re.escape(keyword), "$options": "i"}}
+        legacy_conditions.append(regex_condition)
+
+        tokens = _keyword_tokens(keyword)
+        if not tokens:
+            # e.g. only symbols: no token to look up, so the keyword is checked by the regex only
+            indexed_conditions.append(regex_condition)
+            continue
+        condition = {"search_tokens": {"$all": tokens}}
+        if len(tokens) > 1:
+            condition = {"$and": [condition, regex_condition]}
+        indexed_conditions.append(condition)
+
+    return {
+        "$or": [
+            {operator: indexed_conditions},
+            {"$and": [{"search_tokens": None}, {operator: legacy_conditions}]},
+        ]
+    }
@@ -0,0 +1,154 @@
+# Copyright 2025 masa@kugel
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark of the journal keyword search
+
+Fills a journal collection of a benchmark tenant with synthetic receipts and compares the
+unanchored regular expression search (USE_JOURNAL_SEARCH_INDEX=False) with the search on
+the indexed search tokens (USE_JOURNAL_SEARCH_INDEX=True). For each query the duration and
+the number of documents examined by MongoDB (explain executionStats) are printed.
+
+Requires a running MongoDB (MONGODB_URI). The benchmark database is dropped before it is filled.
+
+Usage (from services/journal):
+    PYTHONPATH=../commons/src python -m performance_tests.benchmark_journal_search [journal_count]
+"""
+
+import asyncio
+import random
+import statistics
+import sys
+import time
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.config.settings import settings
+from app.database.database_setup import JOURNAL_SEARCH_INDEX
+from app.models.repositories.journal_repository import JournalRepository
+from app.utils.journal_search import tokenize_journal_text
+
+TENANT_ID = "B9999"
+STORE_CODE = "S0001"
+BATCH_SIZE = 10000
+ITERATIONS = 5
+
+ITEM_NAMES = [
+    "牛乳", "低脂肪牛乳", "食パン", "おにぎり 鮭", "緑茶 500ml", "コーヒー", "チョコレート", "Mineral Water",
+    "Orange Juice", "Sandwich", "Yogurt", "Green Tea", "Bento Box", "Banana", "Apple", "Ice Cream",
+]  # fmt: skip
+
+# keyword sets: (keywords, match all)
+QUERIES = [
+    (["Sandwich"], False),
+    (["牛乳"], False),
+    (["Banana", "Apple"], False),
+    (["Banana", "Apple"], True),
+    (["Mineral Water"], False),
+    (["R0000123"], False),
+]
+
+
+def make_journal(no: int) -> dict:
+    """
+    Create a synthetic journal document with a receipt text.
+
+    Args:
+        no: Sequence number of the journal
+
+    Returns:
+        Journal document as a dictionary
+    """
+    items = random.sample(ITEM_NAMES, random.randint(1, 5))
+    lines = [f"Receipt No. R{no:07d}", "2025-01-01 10:00"]
+    lines += [f"{item}  x{random.randint(1, 3)}  ¥{random.randint(100, 999)}" for item in items]
+    lines.append(f"合計 ¥{random.randint(100, 5000):,}")
+    text = "\n".join(lines)
+    return {
+        "tenant_id": TENANT_ID,
+        "store_code": STORE_CODE,
+        "terminal_no": no % 10 + 1,
+        "transaction_no": no,
+        "transaction_type": 101,
+        "business_date": "20250101",
+        "receipt_no": no,
+        "generate_date_time": f"2025-01-01T10:00:00.{no:07d}",
+        "journal_text": text,
+        "search_tokens": tokenize_journal_text(text),
+    }
+
+
+async def fill_collection_async(collection, journal_count: int) -> None:
+    """
+    Insert the synthetic journals and create the search index.
+
+    Args:
+        collection: The journal collection
+        journal_count: Number of journals to insert
+    """
+    start = time.perf_counter()
+    for offset in range(0, journal_count, BATCH_SIZE):
+        docs = [make_journal(no) for no in range(offset, min(offset + BATCH_SIZE, journal_count))]
+        await collection.insert_many(docs, ordered=False)
+    await collection.create_index(list(JOURNAL_SEARCH_INDEX["keys"].items()))
+    print(f"Inserted {journal_count} journals in {time.perf_counter() - start:.1f} s")
+
+
+async def measure_async(collection, query: dict) -> tuple[float, int, int]:
+    """
+    Measure a query.
+
+    Args:
+        collection: The journal collection
+        query: Query filter
+
+    Returns:
+        Median duration in milliseconds, number of documents returned and examined
+    """
+    durations = []
+    count = 0
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        count = len(await collection.find(query, {"_id": 1}).to_list(None))
+        durations.append((time.perf_counter() - start) * 1000)
+    explain = await collection.find(query).explain()
+    examined = explain["executionStats"]["totalDocsExamined"]
+    return statistics.median(durations), count, examined
+
+
+async def main(journal_count: int) -> None:
+    client = AsyncIOMotorClient(settings.MONGODB_URI)
+    db = client[f"{settings.DB_NAME_PREFIX}_{TENANT_ID}"]
+    await client.drop_database(db.name)
+    collection = db[settings.DB_COLLECTION_NAME_JOURNAL]
+    await fill_collection_async(collection, journal_count)
+
+    repository = JournalRepository(db=db, tenant_id=TENANT_ID)
+    make_keywords_query = repository._JournalRepository__make_keywords_query
+    print(f"{'keywords':<32} {'mode':<6} {'ms':>10} {'found':>8} {'examined':>10}")
+    for keywords, match_all in QUERIES:
+        label = (" AND " if match_all else " OR ").join(keywords)
+        for use_index in (False, True):
+            settings.USE_JOURNAL_SEARCH_INDEX = use_index
+            query = {"tenant_id": TENANT_ID, "store_code": STORE_CODE}
+            query.update(make_keywords_query(keywords, match_all))
+            duration, count, examined = await measure_async(collection, query)
+            mode = "index" if use_index else "regex"
+            print(f"{label:<32} {mode:<6} {duration:>10.1f} {count:>8} {examined:>10}")
+
+    await client.drop_database(db.name)
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000))
@@ -0,0 +1,122 @@
+# Copyright 2025 masa@kugel
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for the journal keyword search tokens and filters.
+"""
+import re
+
+from app.utils.journal_search import tokenize_journal_text, make_keywords_filter
+
+
+def _matches(doc: dict, filter: dict) -> bool:
+    """Evaluate the subset of the MongoDB query language used by make_keywords_filter."""
+    for field, condition in filter.items():
+        if field == "$and":
+            if not all(_matches(doc, sub) for sub in condition):
+                return False
+        elif field == "$or":
+            if not any(_matches(doc, sub) for sub in condition):
+                return False
+        elif condition is None:
+            if doc.get(field) is not None:
+                return False
+        elif "$all" in condition:
+            if not set(condition["$all"]) <= set(doc.get(field) or []):
+                return False
+        elif "$regex" in condition:
+            flags = re.IGNORECASE if "i" in condition.get("$options", "") else 0
+            if not re.search(condition["$regex"], doc.get(field, ""), flags):
+                return False
+        else:
+            raise AssertionError(f"unsupported condition: {condition}")
+    return True
+
+
+def _journal(text: str, indexed: bool = True) -> dict:
+    doc = {"journal_text": text}
+    if indexed:
+        doc["search_tokens"] = tokenize_journal_text(text)
+    return doc
+
+
+JOURNALS = {
+    "milk": _journal("Fresh Milk x2\nTotal 1,000"),
+    "bread": _journal("Bread x1\nTotal 250"),
+    "both": _journal("Milk x1\nBread x1\nTotal 1,250"),
+    "japanese": _journal("低脂肪牛乳 x1\n合計 ¥198"),
+    "legacy": _journal("Legacy milk receipt", indexed=False),
+}
+
+
+def _search(keywords: list[str], match_all: bool = False) -> set[str]:
+    filter = make_keywords_filter(keywords, match_all)
+    return {name for name, doc in JOURNALS.items() if _matches(doc, filter)}
+
+
+class TestTokenizeJournalText:
+    """Tests for tokenize_journal_text."""
+
+    def test_words_are_normalized(self):
+        assert tokenize_journal_text("Milk MILK ｍｉｌｋ １２３") == ["123", "milk"]
+
+    def test_japanese_runs_become_characters_and_bigrams(self):
+        assert tokenize_journal_text("牛乳パック") == sorted(["牛", "乳", "パ", "ッ", "ク", "牛乳", "乳パ", "パッ", "ック"])
+
+    def test_symbols_are_separators(self):
+        assert tokenize_journal_text("¥1,000-(税込)") == ["000", "1", "税", "税込", "込"]
+
+    def test_empty_text(self):
+        assert tokenize_journal_text("") == []
+        assert tokenize_journal_text(None) == []
+
+
+class TestMakeKeywordsFilter:
+    """Tests for make_keywords_filter."""
+
+    def test_any_keyword(self):
+        assert _search(["milk", "bread"]) == {"milk", "bread", "both", "legacy"}
+
+    def test_all_keywords(self):
+        assert _search(["milk", "bread"], match_all=True) == {"both"}
+
+    def test_search_is_case_insensitive(self):
+        assert _search(["MILK"]) == {"milk", "both", "legacy"}
+
+    def test_keyword_with_several_tokens_is_checked_as_phrase(self):
+        assert _search(["1,000"]) == {"milk"}
+        # both tokens are in the journal, but not as a phrase
+        assert _search(["x2 milk"]) == set()
+
+    def test_partial_word_is_not_matched(self):
+        # token search matches whole words, which is why the regex search stays the default;
+        # only the journal without search tokens is still found by the regex
+        assert _search(["mil"]) == {"legacy"}
+
+    def test_japanese_substring(self):
+        assert _search(["牛乳"]) == {"japanese"}
+        assert _search(["乳"]) == {"japanese"}
+        assert _search(["牛脂"]) == set()
+
+    def test_keyword_without_tokens_uses_regex(self):
+        assert _search(["¥"]) == {"japanese"}
+
+    def test_regex_characters_are_escaped(self):
+        assert _search(["x1.Total"]) == set()
+        assert _search([".*"]) == set()
+
+    def test_indexed_keyword_uses_search_tokens(self):
+        filter = make_keywords_filter(["milk"])
+        assert filter["$or"][0] == {"$or": [{"search_tokens": {"$all": ["milk"]}}]}
+        # journals without search tokens are found by the null key of the same index
+        assert filter["$or"][1]["$and"][0] == {"search_tokens": None}
@@ -19,8 +19,11 @@ duplicate handling, and paginated result construction for all
 four repositories: JournalRepository, TranlogRepository,
 CashInOutLogRepository, and OpenCloseLogRepository.
 """
+import re
+
 import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
+from pymongo import UpdateOne
 
 from kugel_common.schemas.pagination import PaginatedResult, Metadata
 
@@ -29,7 +32,9 @@ from app.models.documents.cash_in_out_log import CashInOutLog
 from app.models.documents.open_close_log import OpenCloseLog
 from kugel_common.models.documents.base_tranlog import BaseTransaction
 
+from app.config.settings import settings
 from app.models.repositories.journal_repository import JournalRepository
+from app.utils.journal_search import make_keywords_filter
 from app.models.repositories.tranlog_repository import TranlogRepository
 from app.models.repositories.cash_in_out_log_repository import CashInOutLogRepository
 from app.models.repositories.open_close_log_repository import OpenCloseLogRepository
@@ -44,6 +49,12 @@ def _make_mock_db():
     return MagicMock()
 
 
+@pytest.fixture
+def regex_keyword_search(monkeypatch):
+    """Search keywords with the regular expression instead of the search index."""
+    monkeypatch.setattr(settings, "USE_JOURNAL_SEARCH_INDEX", False)
+
+
 def _make_journal_doc(**overrides) -> JournalDocument:
     """Create a minimal JournalDocument with sensible defaults."""
     defaults = dict(
@@ -238,7 +249,7 @@ class TestJournalRepositoryGetJournals:
 
     # --- keyword search (single keyword) ---
     @pytest.mark.asyncio
-    async def test_keyword_search_single(self, repo):
+    async def test_keyword_search_single(self, repo, regex_keyword_search):
         with patch.object(repo, "get_list_async_with_sort_and_paging", new_callable=AsyncMock) as mock:
             mock.return_value = []
             await repo.get_journals_async(
@@ -251,7 +262,7 @@ class TestJournalRepositoryGetJournals:
 
     # --- keyword search (multiple keywords joined with |) ---
     @pytest.mark.asyncio
-    async def test_keyword_search_multiple(self, repo):
+    async def test_keyword_search_multiple(self, repo, regex_keyword_search):
         with patch.object(repo, "get_list_async_with_sort_and_paging", new_callable=AsyncMock) as mock:
             mock.return_value = []
             await repo.get_journals_async(
@@ -262,6 +273,49 @@ class TestJournalRepositoryGetJournals:
             query = mock.call_args[1]["filter"]
             assert query["journal_text"] == {"$regex": "milk|bread|eggs"}
 
+    # --- regex keywords are escaped ---
+    @pytest.mark.asyncio
+    async def test_keyword_search_regex_escaped(self, repo, regex_keyword_search):
+        with patch.object(repo, "get_list_async_with_sort_and_paging", new_callable=AsyncMock) as mock:
+            mock.return_value = []
+            await repo.get_journals_async(store_code="S001", keywords=["1.5", "a+b"], limit=10, page=1, sort=[])
+            query = mock.call_args[1]["filter"]
+            assert query["journal_text"] == {"$regex": "1\\.5|a\\+b"}
+
+    # --- regex keywords with AND semantics ---
+    @pytest.mark.asyncio
+    async def test_keyword_search_regex_match_all(self, repo, regex_keyword_search):
+        with patch.object(repo, "get_list_async_with_sort_and_paging", new_callable=AsyncMock) as mock:
+            mock.return_value = []
+            await repo.get_journals_async(
+                store_code="S001", keywords=["milk", "bread"], keywords_match_all=True, limit=10, page=1, sort=[]
+            )
+            query = mock.call_args[1]["filter"]
+            assert query["$and"] == [{"journal_text": {"$regex": "milk"}}, {"journal_text": {"$regex": "bread"}}]
+            assert "journal_text" not in query
+
+    # --- partial keywords match with the default search ---
+    @pytest.mark.asyncio
+    async def test_partial_keyword_matches_by_default(self, repo):
+        with patch.object(repo, "get_list_async_with_sort_and_paging", new_callable=AsyncMock) as mock:
+            mock.return_value = []
+            await repo.get_journals_async(store_code="S001", keywords=["Mil"], limit=10, page=1, sort=[])
+            query = mock.call_args[1]["filter"]
+            assert re.search(query["journal_text"]["$regex"], "Fresh Milk x2")
+
+    # --- keyword search with the search index ---
+    @pytest.mark.asyncio
+    async def test_keyword_search_uses_search_index(self, repo, monkeypatch):
+        monkeypatch.setattr(settings, "USE_JOURNAL_SEARCH_INDEX", True)
+        with patch.object(repo, "get_list_async_with_sort_and_paging", new_callable=AsyncMock) as mock:
+            mock.return_value = []
+            await repo.get_journals_async(
+                store_code="S001", keywords=["milk", "bread"], keywords_match_all=True, limit=10, page=1, sort=[]
+            )
+            query = mock.call_args[1]["filter"]
+            assert "journal_text" not in query
+            assert query["$or"] == make_keywords_filter(["milk", "bread"], match_all=True)["$or"]
+
     # --- empty keywords list should NOT add filter ---
     @pytest.mark.asyncio
     async def test_empty_keywords(self, repo):
@@ -277,7 +331,7 @@ class TestJournalRepositoryGetJournals:
 
     # --- combined filters ---
     @pytest.mark.asyncio
-    async def test_combined_filters(self, repo):
+    async def test_combined_filters(self, repo, regex_keyword_search):
         with patch.object(repo, "get_list_async_with_sort_and_paging", new_callable=AsyncMock) as mock:
             mock.return_value = []
             await repo.get_journals_async(
@@ -345,7 +399,7 @@ class TestJournalRepositoryGetJournalsPaginated:
             assert query["store_code"] == "S001"
 
     @pytest.mark.asyncio
-    async def test_paginated_filter_with_terminals_and_keywords(self, repo):
+    async def test_paginated_filter_with_terminals_and_keywords(self, repo, regex_keyword_search):
         paginated = PaginatedResult(
             metadata=Metadata(total=0, page=1, limit=10, sort="", filter={}),
             data=[],
@@ -388,6 +442,68 @@ class TestJournalRepositoryCreate:
             result = await repo.create_journal_async(doc)
             assert result.shard_key == "T001_S001_1_20240115"
 
+    @pytest.mark.asyncio
+    async def test_create_sets_search_tokens(self, repo):
+        doc = _make_journal_doc(journal_text="Milk 1,000 牛乳")
+        with (
+            patch.object(repo, "get_one_async", new_callable=AsyncMock, return_value=None),
+            patch.object(repo, "create_async", new_callable=AsyncMock, return_value=True),
+        ):
+            result = await repo.create_journal_async(doc)
+            assert result.search_tokens == ["000", "1", "milk", "乳", "牛", "牛乳"]
+
+    @pytest.mark.asyncio
+    async def test_backfill_search_tokens(self, repo):
+        cursor = MagicMock()
+        cursor.sort.return_value = cursor
+        cursor.batch_size.return_value = cursor
+        cursor.__aiter__.return_value = [
+            {"_id": 1, "journal_text": "Milk"},
+            {"_id": 2},
+            {"_id": 3, "journal_text": "Tea"},
+        ]
+        repo.dbcollection = MagicMock()
+        repo.dbcollection.find.return_value = cursor
+        repo.dbcollection.bulk_write = AsyncMock()
+
+        updated = await repo.backfill_search_tokens_async(batch_size=2)
+
+        assert updated == 3
+        # the collection is read once with a single cursor
+        repo.dbcollection.find.assert_called_once()
+        assert repo.dbcollection.find.call_args.args[0] == {"search_tokens": None}
+        cursor.sort.assert_called_once_with("_id", 1)
+        batches = [call.args[0] for call in repo.dbcollection.bulk_write.call_args_list]
+        assert batches == [
+            [
+                UpdateOne({"_id": 1}, {"$set": {"search_tokens": ["milk"]}}),
+                UpdateOne({"_id": 2}, {"$set": {"search_tokens": []}}),
+            ],
+            [UpdateOne({"_id": 3}, {"$set": {"search_tokens": ["tea"]}})],
+        ]
+
+    @pytest.mark.asyncio
+    async def test_search_index_is_updated_for_existing_tenants_only(self):
+        from app.database import database_setup
+
+        client = MagicMock()
+        prefix = settings.DB_NAME_PREFIX
+        client.list_database_names = AsyncMock(return_value=["admin", f"{prefix}_T001", f"{prefix}_T002"])
+        collections = {
+            f"{prefix}_T001": [settings.DB_COLLECTION_NAME_JOURNAL],
+            f"{prefix}_T002": [settings.DB_COLLECTION_NAME_TRAN],
+        }
+        client.__getitem__.side_effect = lambda name: MagicMock(
+            list_collection_names=AsyncMock(return_value=collections[name])
+        )
+
+        with patch.object(database_setup.db_helper, "get_client_async", AsyncMock(return_value=client)), patch.object(
+            database_setup, "update_journal_search_index", new_callable=AsyncMock
+        ) as update_index:
+            await database_setup.update_journal_search_index_for_all_tenants()
+
+        update_index.assert_awaited_once_with("T001")
+
     @pytest.mark.asyncio
     async def test_create_returns_existing_on_duplicate(self, repo):
         existing = _make_journal_doc()
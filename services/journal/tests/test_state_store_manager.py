@@ -114,3 +114,56 @@ async def test_close():
 
         await mgr.close()
         mock_client.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_state_from_memory_after_save():
+    """get_state should not call Dapr for a state saved by this manager."""
+    with patch("app.utils.state_store_manager.DaprClientHelper") as MockHelper:
+        mock_client = AsyncMock()
+        mock_client.save_state.return_value = True
+        MockHelper.return_value = mock_client
+
+        from app.utils.state_store_manager import StateStoreManager
+        mgr = StateStoreManager()
+
+        await mgr.save_state("id1", {"status": "processed"})
+        data, error = await mgr.get_state("id1")
+        assert data == {"status": "processed"}
+        assert error is None
+        mock_client.get_state.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_state_not_found_is_not_cached():
+    """get_state should ask Dapr again for a state that was not found."""
+    with patch("app.utils.state_store_manager.DaprClientHelper") as MockHelper:
+        mock_client = AsyncMock()
+        mock_client.get_state.side_effect = [None, {"status": "processed"}]
+        MockHelper.return_value = mock_client
+
+        from app.utils.state_store_manager import StateStoreManager
+        mgr = StateStoreManager()
+
+        assert await mgr.get_state("id1") == (None, None)
+        assert await mgr.get_state("id1") == ({"status": "processed"}, None)
+        assert mock_client.get_state.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_states_asks_dapr_only_for_states_not_in_memory():
+    """get_states should look up the states not in memory with one bulk request."""
+    with patch("app.utils.state_store_manager.DaprClientHelper") as MockHelper:
+        mock_client = AsyncMock()
+        mock_client.save_bulk_state.return_value = True
+        mock_client.get_bulk_state.return_value = {"id2": {"status": "processed"}, "id3": None}
+        MockHelper.return_value = mock_client
+
+        from app.utils.state_store_manager import StateStoreManager
+        mgr = StateStoreManager()
+
+        assert await mgr.save_states({"id1": {"status": "processed"}}) == (True, None)
+        states, error = await mgr.get_states(["id1", "id2", "id3"])
+        assert states == {"id1": {"status": "processed"}, "id2": {"status": "processed"}}
+        assert error is None
+        mock_client.get_bulk_state.assert_called_once_with(store_name="statestore", keys=["id2", "id3"])
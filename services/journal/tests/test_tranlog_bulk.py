@@ -0,0 +1,135 @@
+"""Unit tests for the bulk subscribe handler of the transaction logs (journal service)."""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from kugel_common.utils.bulk_subscribe import BulkEntry
+from kugel_common.models.documents.base_tranlog import BaseTransaction
+
+from app.api.v1 import tran as tran_module
+from app.api.v1.tran import handle_logs_bulk
+from app.services.log_service import LogService
+
+
+def make_tranlog_data(event_id: str, transaction_no: int, tenant_id: str = "T001") -> dict:
+    return {
+        "event_id": event_id,
+        "tenant_id": tenant_id,
+        "store_code": "S001",
+        "terminal_no": 1,
+        "transaction_no": transaction_no,
+        "transaction_type": 101,
+        "business_date": "20240101",
+        "generate_date_time": "2024-01-01T10:00:00",
+    }
+
+
+@pytest.fixture
+def dependencies():
+    """Replace the statestore, the log services and the notifications."""
+    state_store = MagicMock()
+    state_store.get_states = AsyncMock(return_value=({}, None))
+    state_store.save_states = AsyncMock(return_value=(True, None))
+    log_services = {}
+
+    async def get_log_service(tenant_id):
+        return log_services.setdefault(tenant_id, MagicMock(tenant_id=tenant_id))
+
+    notify = AsyncMock()
+    with patch.object(tran_module, "state_store_manager", state_store), patch.object(
+        tran_module, "get_log_service", get_log_service
+    ), patch.object(tran_module, "_notify_pubsub_status", notify):
+        yield state_store, notify
+
+
+@pytest.mark.asyncio
+async def test_new_logs_are_received_in_one_batch_per_tenant(dependencies):
+    state_store, notify = dependencies
+    state_store.get_states.return_value = ({"evt-2": {"event_id": "evt-2"}}, None)
+    receive_logs = AsyncMock()
+    receive_log = AsyncMock()
+    entries = [
+        BulkEntry("e1", make_tranlog_data("evt-1", 1)),
+        BulkEntry("e2", make_tranlog_data("evt-2", 2)),
+        BulkEntry("e3", make_tranlog_data("evt-3", 3, tenant_id="T002")),
+        BulkEntry("e4", make_tranlog_data("evt-1", 1)),
+        BulkEntry("e5", {"store_code": "S001"}),
+        BulkEntry("e6", None),
+    ]
+
+    statuses = await handle_logs_bulk(entries, "tranlog", BaseTransaction, receive_logs, receive_log)
+
+    assert statuses == {
+        "e1": "SUCCESS",
+        "e2": "SUCCESS",
+        "e3": "SUCCESS",
+        "e4": "SUCCESS",
+        "e5": "DROP",
+        "e6": "DROP",
+    }
+    assert [
+        (call.args[0].tenant_id, [tran.transaction_no for tran in call.args[1]])
+        for call in receive_logs.call_args_list
+    ] == [("T001", [1]), ("T002", [3])]
+    receive_log.assert_not_called()
+    state_store.get_states.assert_awaited_once_with(["evt-1", "evt-2", "evt-3"])
+    assert [call.args[0] for call in state_store.save_states.call_args_list] == [
+        {"evt-1": {"event_id": "evt-1"}},
+        {"evt-3": {"event_id": "evt-3"}},
+    ]
+    assert notify.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_received_one_by_one(dependencies):
+    state_store, notify = dependencies
+    receive_logs = AsyncMock(side_effect=Exception("transaction aborted"))
+
+    async def receive_log(log_service, tran):
+        if tran.transaction_no == 2:
+            raise Exception("invalid transaction")
+
+    entries = [BulkEntry(f"e{no}", make_tranlog_data(f"evt-{no}", no)) for no in (1, 2, 3)]
+
+    statuses = await handle_logs_bulk(entries, "tranlog", BaseTransaction, receive_logs, receive_log)
+
+    assert statuses == {"e1": "SUCCESS", "e2": "RETRY", "e3": "SUCCESS"}
+    state_store.save_states.assert_awaited_once_with(
+        {"evt-1": {"event_id": "evt-1"}, "evt-3": {"event_id": "evt-3"}}
+    )
+    assert [call.kwargs["status"] for call in notify.call_args_list] == ["failed", "received", "received"]
+
+
+@pytest.mark.asyncio
+async def test_receive_tranlogs_stores_batch_in_one_transaction():
+    tran_repo = AsyncMock()
+    tran_repo.create_tranlogs_async.side_effect = lambda trans: trans
+    journal_service = AsyncMock()
+    journal_service.journal_repository = MagicMock()
+    log_service = LogService(
+        tran_repository=tran_repo,
+        cash_in_out_log_repository=AsyncMock(),
+        open_close_log_repository=AsyncMock(),
+        journal_service=journal_service,
+    )
+    trans = [
+        BaseTransaction(
+            **make_tranlog_data(f"evt-{no}", no),
+            sales=BaseTransaction.SalesInfo(total_amount_with_tax=100.0, total_quantity=1, is_cancelled=False),
+            staff=BaseTransaction.Staff(id="staff1"),
+            user={"id": "user1"},
+            open_counter=1,
+            business_counter=1,
+            journal_text="journal",
+            receipt_text="receipt",
+        )
+        for no in (1, 2)
+    ]
+
+    result = await log_service.receive_tranlogs_async(trans)
+
+    assert result == trans
+    tran_repo.start_transaction.assert_awaited_once()
+    tran_repo.commit_transaction.assert_awaited_once()
+    journals = journal_service.receive_journals_async.call_args.args[0]
+    assert [journal["transaction_no"] for journal in journals] == [1, 2]
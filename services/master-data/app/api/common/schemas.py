@@ -12,7 +12,7 @@ validation and automatic documentation generation.
 """
 
 from typing import Optional, TypeVar
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 from kugel_common.utils.misc import to_lower_camel
 from app.enums.button_size import ButtonSize
@@ -167,6 +167,21 @@ class BaseItemDeleteResponse(BaseSchemaModel):
     is_logical: bool
 
 
+class BaseItemSearchRequest(BaseSchemaModel):
+    """
+    Base Item Search Request Schema
+
+    Defines fields for retrieving the items of a list of item codes, too long to be
+    sent as a query parameter. Includes the item codes, the response fields to return
+    (all if not given) and the pagination.
+    """
+
+    item_codes: list[str] = Field(min_length=1)  # empty would not filter, returning all items
+    fields: Optional[list[str]] = None
+    limit: int = 100
+    page: int = 1
+
+
 # Item Store
 class BaseItemStoreResponse(BaseSchemaModel):
     """
@@ -243,6 +258,17 @@ class BaseItemStoreDetailResponse(BaseSchemaModel):
     last_update_datetime: Optional[str] = None
 
 
+class BaseItemStoreDetailsRequest(BaseSchemaModel):
+    """
+    Base Store-specific Item Details Bulk Request Schema
+
+    Defines fields for retrieving detailed information of multiple items at once.
+    Includes the list of item codes to retrieve.
+    """
+
+    item_codes: list[str]
+
+
 # Payment
 class BasePaymentResponse(BaseSchemaModel):
     """
@@ -1,11 +1,14 @@
 # Copyright 2025 masa@kugel  # # Licensed under the Apache License, Version 2.0 (the "License");  # you may not use this file except in compliance with the License.  # You may obtain a copy of the License at  # #     http://www.apache.org/licenses/LICENSE-2.0  # # Unless required by applicable law or agreed to in writing, software  # distributed under the License is distributed on an "AS IS" BASIS,  # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  # See the License for the specific language governing permissions and  # limitations under the License.
 from fastapi import APIRouter, status, HTTPException, Depends, Query, Path
+from fastapi.responses import JSONResponse
 from logging import getLogger
+from typing import Any, Optional
 import inspect
 
 from kugel_common.status_codes import StatusCodes
 from kugel_common.security import get_tenant_id_with_security_by_query_optional, verify_tenant_id
 from kugel_common.schemas.api_response import ApiResponse
+from kugel_common.utils.misc import to_lower_camel
 from app.api.common.pagination import PaginationMetadata
 from kugel_common.exceptions import (
     RepositoryException,
@@ -19,6 +22,7 @@ from app.api.v1.schemas import (
     ItemUpdateRequest,
     ItemResponse,
     ItemDeleteResponse,
+    ItemSearchRequest,
 )
 from app.api.v1.schemas_transformer import SchemasTransformerV1
 from app.dependencies.get_master_services import get_item_master_service_async
@@ -30,6 +34,9 @@ router = APIRouter()
 # Get a logger instance for this module
 logger = getLogger(__name__)
 
+# Item response fields made from a document field of another name
+_ITEM_DATETIME_FIELDS = {"entry_datetime": "created_at", "last_update_datetime": "updated_at"}
+
 
 @router.post(
     "/tenants/{tenant_id}/items",
@@ -185,13 +192,17 @@ async def get_item_master_all_async(
     limit: int = Query(100),
     page: int = Query(1),
     sort: list[tuple[str, int]] = Depends(parse_sort),
+    item_codes: Optional[str] = Query(None, description="Comma separated item codes to retrieve"),
+    fields: Optional[str] = Query(None, description="Comma separated response fields, e.g. itemCode,description"),
     tenant_id_in_token: str = Depends(get_tenant_id_with_security_by_query_optional),
 ):
     """
     Retrieve all item master records for a tenant.
 
     This endpoint returns a paginated list of all active items for the specified tenant.
-    The results can be sorted and paginated as needed.
+    The results can be sorted and paginated as needed. The items can be filtered by
+    item codes, served by the item_code index, and limited to some response fields,
+    which are the only ones read from the database.
 
     Authentication is required via token or API key. The tenant ID in the path must match
     the one in the security credentials.
@@ -201,35 +212,194 @@ async def get_item_master_all_async(
         limit: Maximum number of items to return (default: 100)
         page: Page number for pagination (default: 1)
         sort: Sorting criteria (default: item_code ascending)
+        item_codes: Optional comma separated item codes to retrieve
+        fields: Optional comma separated response fields to return (all if not given)
         tenant_id_in_token: The tenant ID from security credentials
 
     Returns:
         ApiResponse[list[ItemResponse]]: Standard API response with a list of item data and pagination metadata
 
     Raises:
+        InvalidRequestDataException: If a requested field is not an item response field
         RepositoryException: If there's an error during database operations
     """
     logger.info(f"Get all items request received. tenant_id: {tenant_id}")
     verify_tenant_id(tenant_id, tenant_id_in_token, logger)
+    response = await _get_items_response_async(
+        tenant_id,
+        limit,
+        page,
+        sort,
+        item_codes=_split_list(item_codes),
+        fields=_split_list(fields),
+        operation=inspect.currentframe().f_code.co_name,
+    )
+    if fields:
+        # the projected items do not match the full item response model
+        return JSONResponse(content=response.model_dump(mode="json", by_alias=True))
+    return response
+
+
+@router.post(
+    "/tenants/{tenant_id}/items/search",
+    response_model=ApiResponse[list[dict[str, Any]]],
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_400_BAD_REQUEST: StatusCodes.get(status.HTTP_400_BAD_REQUEST),
+        status.HTTP_401_UNAUTHORIZED: StatusCodes.get(status.HTTP_401_UNAUTHORIZED),
+        status.HTTP_422_UNPROCESSABLE_ENTITY: StatusCodes.get(status.HTTP_422_UNPROCESSABLE_ENTITY),
+        status.HTTP_500_INTERNAL_SERVER_ERROR: StatusCodes.get(status.HTTP_500_INTERNAL_SERVER_ERROR),
+    },
+)
+async def search_item_master_async(
+    request: ItemSearchRequest,
+    tenant_id: str = Path(...),
+    sort: list[tuple[str, int]] = Depends(parse_sort),
+    tenant_id_in_token: str = Depends(get_tenant_id_with_security_by_query_optional),
+):
+    """
+    Retrieve the items of a list of item codes.
+
+    This is the POST variant of the item listing filtered by item codes, for lists of
+    codes too long for a query parameter. Only the requested response fields are read
+    from the database and returned. Item codes that are not found are omitted.
+
+    Authentication is required via token or API key. The tenant ID in the path must match
+    the one in the security credentials.
+
+    Args:
+        request: The item codes, response fields and pagination
+        tenant_id: The tenant identifier from the path
+        sort: Sorting criteria (default: item_code ascending)
+        tenant_id_in_token: The tenant ID from security credentials
+
+    Returns:
+        ApiResponse[list[dict]]: Standard API response with the item data and pagination metadata
+
+    Raises:
+        InvalidRequestDataException: If a requested field is not an item response field
+        RepositoryException: If there's an error during database operations
+    """
+    logger.info(f"Search items request received for {len(request.item_codes)} item codes, tenant_id: {tenant_id}")
+    verify_tenant_id(tenant_id, tenant_id_in_token, logger)
+    return await _get_items_response_async(
+        tenant_id,
+        request.limit,
+        request.page,
+        sort,
+        item_codes=request.item_codes,
+        fields=request.fields or list(ItemResponse.model_fields.keys()),
+        operation=inspect.currentframe().f_code.co_name,
+    )
+
+
+async def _get_items_response_async(
+    tenant_id: str,
+    limit: int,
+    page: int,
+    sort: list[tuple[str, int]],
+    item_codes: Optional[list[str]],
+    fields: Optional[list[str]],
+    operation: str,
+) -> ApiResponse:
+    """
+    Get a page of items, optionally filtered by item codes and limited to some response fields.
+
+    Args:
+        tenant_id: The tenant identifier
+        limit: Maximum number of items to return
+        page: Page number for pagination
+        sort: Sorting criteria
+        item_codes: Item codes to retrieve, all items if None
+        fields: Response fields to return (camelCase or snake_case), the full item response if None
+        operation: Name of the endpoint function
+
+    Returns:
+        ApiResponse: The items as dictionaries, keyed by the camelCase field names when fields are given
+    """
+    response_fields = _get_item_response_fields(fields) if fields else None
+    projection = None
+    if response_fields is not None:
+        projection = {_ITEM_DATETIME_FIELDS.get(field, field): 1 for field in response_fields}
+        projection["_id"] = 0
+
     master_service = await get_item_master_service_async(tenant_id)
     try:
-        item_docs, total_count = await master_service.get_item_all_paginated_async(limit, page, sort)
-        transformer = SchemasTransformerV1()
-        item_all = [transformer.transform_item(item_doc) for item_doc in item_docs]
+        item_docs, total_count = await master_service.get_item_all_paginated_async(
+            limit, page, sort, item_codes=item_codes, projection=projection
+        )
+        if response_fields is None:
+            transformer = SchemasTransformerV1()
+            items = [transformer.transform_item(item_doc).model_dump() for item_doc in item_docs]
+        else:
+            items = [_make_item_fields(item_doc, response_fields) for item_doc in item_docs]
     except Exception as e:
         raise e
 
     metadata = PaginationMetadata(page=page, limit=limit, total_count=total_count)
 
-    response = ApiResponse(
+    return ApiResponse(
         success=True,
         code=status.HTTP_200_OK,
         message=f"Items found. Total items: {total_count}",
-        data=[item.model_dump() for item in item_all],
+        data=items,
         metadata=metadata.model_dump(),
-        operation=f"{inspect.currentframe().f_code.co_name}",
+        operation=operation,
     )
-    return response
+
+
+def _get_item_response_fields(fields: list[str]) -> list[str]:
+    """
+    Convert the requested field names to the item response field names.
+
+    Args:
+        fields: Field names, camelCase (as returned by the API) or snake_case
+
+    Returns:
+        list[str]: The snake_case response field names
+
+    Raises:
+        InvalidRequestDataException: If a field is not an item response field
+    """
+    names = {}
+    for name in ItemResponse.model_fields.keys():
+        names[name] = name
+        names[to_lower_camel(name)] = name
+    unknown_fields = [field for field in fields if field not in names]
+    if unknown_fields:
+        available_fields = [to_lower_camel(name) for name in ItemResponse.model_fields.keys()]
+        message = f"Unknown item fields: {unknown_fields}. Available fields: {available_fields}"
+        raise InvalidRequestDataException(message, logger)
+    return list(dict.fromkeys(names[field] for field in fields))
+
+
+def _make_item_fields(item_doc, response_fields: list[str]) -> dict:
+    """
+    Make the requested response fields of an item, keyed by their camelCase names.
+
+    Args:
+        item_doc: The item document, possibly read with a projection
+        response_fields: The snake_case response field names
+
+    Returns:
+        dict: The field values
+    """
+    values = {}
+    for field in response_fields:
+        value = getattr(item_doc, _ITEM_DATETIME_FIELDS.get(field, field))
+        if field in _ITEM_DATETIME_FIELDS and value is not None:
+            value = value.strftime("%Y-%m-%d %H:%M:%S")
+        values[to_lower_camel(field)] = value
+    return values
+
+
+def _split_list(value: Optional[str]) -> Optional[list[str]]:
+    """
+    Split a comma separated query parameter, None if it is empty.
+    """
+    if not value:
+        return None
+    return [item.strip() for item in value.split(",") if item.strip()] or None
 
 
 @router.put(
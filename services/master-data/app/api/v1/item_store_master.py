@@ -20,6 +20,7 @@ from app.api.v1.schemas import (
     ItemStoreResponse,
     ItemStoreDeleteResponse,
     ItemStoreDetailResponse,
+    ItemStoreDetailsRequest,
 )
 from app.api.v1.schemas_transformer import SchemasTransformerV1
 from app.dependencies.get_master_services import get_item_store_master_service_async
@@ -435,3 +436,67 @@ async def get_item_store_master_detail_async(
         operation=f"{inspect.currentframe().f_code.co_name}",
     )
     return response
+
+
+@router.post(
+    "/tenants/{tenant_id}/stores/{store_code}/items/details",
+    response_model=ApiResponse[list[ItemStoreDetailResponse]],
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_400_BAD_REQUEST: StatusCodes.get(status.HTTP_400_BAD_REQUEST),
+        status.HTTP_401_UNAUTHORIZED: StatusCodes.get(status.HTTP_401_UNAUTHORIZED),
+        status.HTTP_422_UNPROCESSABLE_ENTITY: StatusCodes.get(status.HTTP_422_UNPROCESSABLE_ENTITY),
+        status.HTTP_500_INTERNAL_SERVER_ERROR: StatusCodes.get(status.HTTP_500_INTERNAL_SERVER_ERROR),
+    },
+)
+async def get_item_store_master_details_async(
+    request: ItemStoreDetailsRequest,
+    store_code: str = Path(...),
+    tenant_id: str = Path(...),
+    tenant_id_in_token: str = Depends(get_tenant_id_with_security_by_query_optional),
+):
+    """
+    Retrieve detailed item information for multiple item codes in one request.
+
+    This is the bulk variant of the item detail endpoint. Common and store-specific
+    item data for all requested codes are fetched together, so clients that add
+    many items at once (e.g. basket import or scale scanning) need a single call
+    instead of one call per item. Item codes that are not found are omitted from
+    the returned list.
+
+    Authentication is required via token or API key. The tenant ID in the path must match
+    the one in the security credentials.
+
+    Args:
+        request: The list of item codes to retrieve
+        store_code: The store code to get the items for
+        tenant_id: The tenant identifier from the path
+        tenant_id_in_token: The tenant ID from security credentials
+
+    Returns:
+        ApiResponse[list[ItemStoreDetailResponse]]: Standard API response with the combined item data
+
+    Raises:
+        RepositoryException: If there's an error during database operations
+    """
+    logger.info(
+        f"Get item details request received for {len(request.item_codes)} items, tenant_id: {tenant_id}, store_code: {store_code}"
+    )
+    verify_tenant_id(tenant_id, tenant_id_in_token, logger)
+    master_service = await get_item_store_master_service_async(tenant_id, store_code)
+    try:
+        item_store_details = await master_service.get_item_store_details_by_codes_async(request.item_codes)
+        transformer = SchemasTransformerV1()
+        return_items = [transformer.transform_item_store_detail(detail) for detail in item_store_details]
+    except Exception as e:
+        logger.error(f"Error getting item store details: {e}")
+        raise e
+
+    response = ApiResponse(
+        success=True,
+        code=status.HTTP_200_OK,
+        message=f"Items found. count: {len(return_items)}",
+        data=[item.model_dump() for item in return_items],
+        operation=f"{inspect.currentframe().f_code.co_name}",
+    )
+    return response
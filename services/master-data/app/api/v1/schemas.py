@@ -19,11 +19,13 @@ from app.api.common.schemas import (
     BaseItemCreateRequest,
     BaseItemUpdateRequest,
     BaseItemDeleteResponse,
+    BaseItemSearchRequest,
     BaseItemStoreResponse,
     BaseItemStoreCreateRequest,
     BaseItemStoreUpdateRequest,
     BaseItemStoreDeleteResponse,
     BaseItemStoreDetailResponse,
+    BaseItemStoreDetailsRequest,
     BasePaymentResponse,
     BasePaymentCreateRequest,
     BasePaymentUpdateRequest,
@@ -152,6 +154,17 @@ class ItemDeleteResponse(BaseItemDeleteResponse):
     pass
 
 
+class ItemSearchRequest(BaseItemSearchRequest):
+    """
+    Item Search Request Schema
+
+    Used to retrieve the items of many item codes in one request,
+    e.g. to name the items of a sales report.
+    """
+
+    pass
+
+
 # Store-specific item related schema definitions
 
 
@@ -211,6 +224,17 @@ class ItemStoreDetailResponse(BaseItemStoreDetailResponse):
     pass
 
 
+class ItemStoreDetailsRequest(BaseItemStoreDetailsRequest):
+    """
+    Store-specific Item Details Bulk Request Schema
+
+    Used to retrieve detailed item information for multiple item codes in one request,
+    e.g. when a POS terminal adds several items to a cart at once.
+    """
+
+    pass
+
+
 # Payment method related schema definitions
 
 
@@ -38,6 +38,19 @@ class Settings(
     USE_GRPC: bool = Field(default=False, description="Enable gRPC server")
     GRPC_PORT: int = Field(default=50051, description="gRPC server port")
 
+    # Item book detail cache settings
+    USE_ITEM_BOOK_DETAIL_CACHE: bool = Field(
+        default=True, description="Cache the item book details with item prices per item book and store"
+    )
+    ITEM_BOOK_DETAIL_CACHE_TTL_SECONDS: int = Field(
+        default=60,
+        description="Age in seconds after which a cached item book detail is reloaded, "
+        "bounds the staleness of changes made through other instances",
+    )
+    ITEM_BOOK_DETAIL_CACHE_MAX_ENTRIES: int = Field(
+        default=1000, description="Maximum number of cached item book details, the oldest is dropped first"
+    )
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_ignore_empty=True,  # Ignore empty values from .env file
@@ -29,9 +29,36 @@ from app.models.repositories.settings_master_repository import SettingsMasterRep
 from app.models.repositories.staff_master_repository import StaffMasterRepository
 from app.models.repositories.tax_master_repository import TaxMasterRepository
 from app.models.repositories.promotion_master_repository import PromotionMasterRepository
+from app.utils.pubsub_manager import PubsubManager
 
 logger = getLogger(__name__)
 
+# Publisher shared by all requests, created on first use
+_pubsub_manager: PubsubManager = None
+
+
+def get_pubsub_manager() -> PubsubManager:
+    """
+    Get the PubsubManager shared by the services publishing master data changes.
+
+    Returns:
+        PubsubManager: Shared publisher instance
+    """
+    global _pubsub_manager
+    if _pubsub_manager is None:
+        _pubsub_manager = PubsubManager()
+    return _pubsub_manager
+
+
+async def close_pubsub_manager_async() -> None:
+    """
+    Close the shared PubsubManager if it has been created.
+    """
+    global _pubsub_manager
+    if _pubsub_manager is not None:
+        await _pubsub_manager.close()
+        _pubsub_manager = None
+
 
 async def get_category_master_service_async(tenant_id: str) -> CategoryMasterService:
     """
@@ -152,7 +179,10 @@ async def get_settings_master_service_async(tenant_id: str) -> SettingsMasterSer
     """
     logger.debug(f"get_settings_master_service_async: tenant_id->{tenant_id}")
     db = await db_helper.get_db_async(f"{settings.DB_NAME_PREFIX}_{tenant_id}")
-    return SettingsMasterService(settings_master_repo=SettingsMasterRepository(db, tenant_id))
+    return SettingsMasterService(
+        settings_master_repo=SettingsMasterRepository(db, tenant_id),
+        pubsub_manager=get_pubsub_manager(),
+    )
 
 
 async def get_staff_master_service_async(tenant_id: str) -> StaffMasterService:
@@ -207,5 +237,6 @@ async def get_promotion_master_service_async(tenant_id: str) -> PromotionMasterS
     logger.debug(f"get_promotion_master_service_async: tenant_id->{tenant_id}")
     db = await db_helper.get_db_async(f"{settings.DB_NAME_PREFIX}_{tenant_id}")
     return PromotionMasterService(
-        promotion_master_repo=PromotionMasterRepository(db, tenant_id)
+        promotion_master_repo=PromotionMasterRepository(db, tenant_id),
+        pubsub_manager=get_pubsub_manager(),
     )
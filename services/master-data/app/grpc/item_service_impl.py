@@ -14,7 +14,7 @@
 """
 ItemService gRPC implementation
 
-Implements the GetItemDetail RPC method for retrieving item master data.
+Implements the GetItemDetail and GetItemDetails RPC methods for retrieving item master data.
 """
 
 import grpc
@@ -26,6 +26,25 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def _to_item_detail_response(item) -> item_service_pb2.ItemDetailResponse:
+    """Convert an item store detail document into an ItemDetailResponse message"""
+    # Use store_price if available, otherwise fall back to unit_price
+    price = item.store_price if item.store_price is not None else item.unit_price
+
+    return item_service_pb2.ItemDetailResponse(
+        item_code=item.item_code,
+        item_name=item.description or "",
+        price=int(price) if price else 0,
+        tax_rate=int(item.tax_code) if item.tax_code else 0,
+        category_code=item.category_code or "",
+        barcode=item.item_code,  # Using item_code as barcode for now
+        is_active=not item.is_deleted if hasattr(item, 'is_deleted') else True,
+        created_at=item.created_at.isoformat() if item.created_at else "",
+        updated_at=item.updated_at.isoformat() if item.updated_at else "",
+        tax_code=item.tax_code or "",  # Tax code as string
+    )
+
+
 class ItemServiceImpl(item_service_pb2_grpc.ItemServiceServicer):
     """gRPC service implementation for item master data"""
 
@@ -51,24 +70,9 @@ class ItemServiceImpl(item_service_pb2_grpc.ItemServiceServicer):
                 logger.warning(f"Item not found: {request.item_code}")
                 return item_service_pb2.ItemDetailResponse()
 
-            # Use store_price if available, otherwise fall back to unit_price
-            price = item.store_price if item.store_price is not None else item.unit_price
-
-            # Build response
-            response = item_service_pb2.ItemDetailResponse(
-                item_code=item.item_code,
-                item_name=item.description or "",
-                price=int(price) if price else 0,
-                tax_rate=int(item.tax_code) if item.tax_code else 0,
-                category_code=item.category_code or "",
-                barcode=item.item_code,  # Using item_code as barcode for now
-                is_active=not item.is_deleted if hasattr(item, 'is_deleted') else True,
-                created_at=item.created_at.isoformat() if item.created_at else "",
-                updated_at=item.updated_at.isoformat() if item.updated_at else "",
-                tax_code=item.tax_code or "",  # Tax code as string
-            )
+            response = _to_item_detail_response(item)
 
-            logger.info(f"gRPC GetItemDetail success: item_code={item.item_code}, price={price}")
+            logger.info(f"gRPC GetItemDetail success: item_code={item.item_code}, price={response.price}")
             return response
 
         except Exception as e:
@@ -76,3 +80,35 @@ class ItemServiceImpl(item_service_pb2_grpc.ItemServiceServicer):
             context.set_code(grpc.StatusCode.INTERNAL)
             context.set_details(str(e))
             return item_service_pb2.ItemDetailResponse()
+
+    async def GetItemDetails(self, request, context):
+        """Get item details for multiple item codes in one call"""
+        try:
+            logger.info(
+                f"gRPC GetItemDetails request: tenant_id={request.tenant_id}, "
+                f"store_code={request.store_code}, item_count={len(request.item_codes)}"
+            )
+
+            master_service = await get_item_store_master_service_async(
+                request.tenant_id, request.store_code
+            )
+
+            items = await master_service.get_item_store_details_by_codes_async(list(request.item_codes))
+            found_codes = {item.item_code for item in items}
+            not_found_codes = [code for code in dict.fromkeys(request.item_codes) if code not in found_codes]
+
+            response = item_service_pb2.ItemDetailsResponse(
+                items=[_to_item_detail_response(item) for item in items],
+                not_found_item_codes=not_found_codes,
+            )
+
+            logger.info(
+                f"gRPC GetItemDetails success: found={len(items)}, not_found={len(not_found_codes)}"
+            )
+            return response
+
+        except Exception as e:
+            logger.error(f"gRPC GetItemDetails error: {e}", exc_info=True)
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            return item_service_pb2.ItemDetailsResponse()
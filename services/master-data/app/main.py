@@ -42,6 +42,7 @@ from kugel_common.schemas.health import HealthCheckResponse, HealthStatus, Compo
 from kugel_common.utils.health_check import HealthChecker
 from kugel_common.exceptions import register_exception_handlers
 from kugel_common.middleware.log_requests import log_requests
+from kugel_common.utils.request_log_writer import request_log_writer
 
 # Import routers for different types of master data
 from app.api.v1.staff_master import router as v1_staff_master_router
@@ -56,6 +57,7 @@ from app.api.v1.tax_master import router as v1_tax_master_router
 from app.api.v1.promotion_master import router as v1_promotion_master_router
 from app.config.settings import settings
 from app.grpc.server import start_grpc_server, stop_grpc_server
+from app.dependencies.get_master_services import close_pubsub_manager_async
 
 # gRPC server instance (global variable)
 grpc_server = None
@@ -224,9 +226,15 @@ async def close_event():
     if grpc_server:
         await stop_grpc_server(grpc_server)
 
+    # Write the queued request logs before the database connection is closed
+    await request_log_writer.close_async()
+
     logger.info("Closing the database connection")
     await db_helper.close_client_async()
 
+    # Close the publisher of master data change events
+    await close_pubsub_manager_async()
+
     # add shutdown tasks here
     logger.info("Application closed")
 
@@ -3,6 +3,7 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from app.models.documents.item_book_master_document import ItemBookMasterDocument
 from kugel_common.models.repositories.abstract_repository import AbstractRepository
 from app.config.settings import settings
+from app.utils.item_book_detail_cache import item_book_detail_cache
 
 from logging import getLogger
 
@@ -94,6 +95,7 @@ class ItemBookMasterRepository(AbstractRepository[ItemBookMasterDocument]):
             The updated item book document
         """
         success = await self.update_one_async(self.__make_query_filter(item_book_id), update_data)
+        item_book_detail_cache.invalidate_item_book(self.tenant_id, item_book_id)
         if success:
             return await self.get_item_book_async(item_book_id)
         else:
@@ -113,6 +115,7 @@ class ItemBookMasterRepository(AbstractRepository[ItemBookMasterDocument]):
             The replaced item book document
         """
         success = await self.replace_one_async(self.__make_query_filter(item_book_id), new_document)
+        item_book_detail_cache.invalidate_item_book(self.tenant_id, item_book_id)
         if success:
             return new_document
         else:
@@ -128,7 +131,9 @@ class ItemBookMasterRepository(AbstractRepository[ItemBookMasterDocument]):
         Returns:
             None
         """
-        return await self.delete_async(self.__make_query_filter(item_book_id))
+        result = await self.delete_async(self.__make_query_filter(item_book_id))
+        item_book_detail_cache.invalidate_item_book(self.tenant_id, item_book_id)
+        return result
 
     async def get_item_book_count_by_filter_async(self, query_filter: dict) -> int:
         """
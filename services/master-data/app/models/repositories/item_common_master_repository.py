@@ -6,6 +6,7 @@ from kugel_common.utils.misc import get_app_time
 from app.config.settings import settings
 from kugel_common.models.repositories.abstract_repository import AbstractRepository
 from app.models.documents.item_common_master_document import ItemCommonMasterDocument
+from app.utils.item_book_detail_cache import item_book_detail_cache
 
 logger = getLogger(__name__)
 
@@ -65,6 +66,8 @@ class ItemCommonMasterRepository(AbstractRepository[ItemCommonMasterDocument]):
         item_doc.tenant_id = self.tenant_id
         item_doc.shard_key = self.__get_shard_key(item_doc)
         success = await self.create_async(item_doc)
+        # buttons of this item may be cached as "not found"
+        item_book_detail_cache.invalidate_item(self.tenant_id, item_doc.item_code)
         if success:
             return item_doc
         else:
@@ -119,8 +122,37 @@ class ItemCommonMasterRepository(AbstractRepository[ItemCommonMasterDocument]):
 
         return item_doc
 
+    async def get_items_by_codes_async(
+        self, item_codes: list[str], is_logical_deleted: bool = False
+    ) -> list[ItemCommonMasterDocument]:
+        """
+        Retrieve multiple items by their codes in a single query.
+
+        Uses an $in filter on item_code so that the whole list is served by one
+        round-trip on the item_code index. Codes without a matching item are omitted.
+
+        Args:
+            item_codes: List of item codes to retrieve
+            is_logical_deleted: If True, search logically deleted items instead of active ones
+
+        Returns:
+            List of matching item documents (order is not guaranteed)
+
+        Raises:
+            RepositoryException: If there is an error during retrieval
+        """
+        if not item_codes:
+            return []
+        filter = {"tenant_id": self.tenant_id, "item_code": {"$in": list(item_codes)}, "is_deleted": is_logical_deleted}
+        return await self.get_list_async(filter)
+
     async def get_item_by_filter_async(
-        self, query_filter: dict, limit: int, page: int, sort: list[tuple[str, int]]
+        self,
+        query_filter: dict,
+        limit: int,
+        page: int,
+        sort: list[tuple[str, int]],
+        projection: dict = None,
     ) -> list[ItemCommonMasterDocument]:
         """
         Retrieve items matching the specified filter with pagination and sorting.
@@ -132,6 +164,7 @@ class ItemCommonMasterRepository(AbstractRepository[ItemCommonMasterDocument]):
             limit: Maximum number of items to return per page
             page: Page number (1-based) to retrieve
             sort: List of tuples containing field name and sort direction
+            projection: Optional MongoDB projection limiting the returned fields
 
         Returns:
             List of item documents matching the query parameters
@@ -141,7 +174,7 @@ class ItemCommonMasterRepository(AbstractRepository[ItemCommonMasterDocument]):
         """
         query_filter["tenant_id"] = self.tenant_id
         logger.debug(f"query_filter->{query_filter} limit->{limit} page->{page} sort->{sort}")
-        return await self.get_list_async_with_sort_and_paging(query_filter, limit, page, sort)
+        return await self.get_list_async_with_sort_and_paging(query_filter, limit, page, sort, projection)
 
     async def update_item_async(self, item_code: str, update_data: dict) -> ItemCommonMasterDocument:
         """
@@ -159,6 +192,7 @@ class ItemCommonMasterRepository(AbstractRepository[ItemCommonMasterDocument]):
         """
         filter = {"tenant_id": self.tenant_id, "item_code": item_code}
         success = await self.update_one_async(filter, update_data)
+        item_book_detail_cache.invalidate_item(self.tenant_id, item_code)
         if success:
             return await self.get_item_by_code_async(item_code)
         else:
@@ -182,6 +216,7 @@ class ItemCommonMasterRepository(AbstractRepository[ItemCommonMasterDocument]):
         """
         filter = {"tenant_id": self.tenant_id, "item_code": item_code}
         success = await self.replace_one_async(filter, new_document)
+        item_book_detail_cache.invalidate_item(self.tenant_id, item_code)
         if success:
             return new_document
         else:
@@ -207,12 +242,15 @@ class ItemCommonMasterRepository(AbstractRepository[ItemCommonMasterDocument]):
 
         if is_logical:
             success = await self.update_one_async(filter, {"is_deleted": True})
+            item_book_detail_cache.invalidate_item(self.tenant_id, item_code)
             if success:
                 return await self.get_item_by_code_async(item_code, is_logical_deleted=True)
             else:
                 raise Exception(f"Failed to logically delete item with code {item_code}")
         else:
-            return await self.delete_async(filter)
+            result = await self.delete_async(filter)
+            item_book_detail_cache.invalidate_item(self.tenant_id, item_code)
+            return result
 
     async def get_item_count_by_filter_async(self, query_filter: dict) -> int:
         """
@@ -5,6 +5,7 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from kugel_common.models.repositories.abstract_repository import AbstractRepository
 from app.models.documents.item_store_master_document import ItemStoreMasterDocument
 from app.config.settings import settings
+from app.utils.item_book_detail_cache import item_book_detail_cache
 
 logger = getLogger(__name__)
 
@@ -47,6 +48,7 @@ class ItemStoreMasterRepository(AbstractRepository[ItemStoreMasterDocument]):
         item_store_doc.store_code = self.store_code
         item_store_doc.shard_key = self.__get_shard_key(item_store_doc)
         success = await self.create_async(item_store_doc)
+        item_book_detail_cache.invalidate_item(self.tenant_id, item_store_doc.item_code, self.store_code)
         if success:
             return item_store_doc
         else:
@@ -65,6 +67,21 @@ class ItemStoreMasterRepository(AbstractRepository[ItemStoreMasterDocument]):
         filter = {"tenant_id": self.tenant_id, "store_code": self.store_code, "item_code": item_code}
         return await self.get_one_async(filter)
 
+    async def get_item_stores_by_codes_async(self, item_codes: list[str]) -> list[ItemStoreMasterDocument]:
+        """
+        Retrieve multiple store-specific item records by their codes in a single query.
+
+        Args:
+            item_codes: List of item codes to retrieve
+
+        Returns:
+            List of matching store-specific item documents (codes without a record are omitted)
+        """
+        if not item_codes:
+            return []
+        filter = {"tenant_id": self.tenant_id, "store_code": self.store_code, "item_code": {"$in": list(item_codes)}}
+        return await self.get_list_async(filter)
+
     async def get_item_store_by_filter_async(
         self, query_filter: dict, limit: int, page: int, sort: list[tuple[str, int]]
     ) -> list[ItemStoreMasterDocument]:
@@ -100,6 +117,7 @@ class ItemStoreMasterRepository(AbstractRepository[ItemStoreMasterDocument]):
         """
         filter = {"tenant_id": self.tenant_id, "store_code": self.store_code, "item_code": item_code}
         success = await self.update_one_async(filter, update_data)
+        item_book_detail_cache.invalidate_item(self.tenant_id, item_code, self.store_code)
         if success:
             return await self.get_item_store_by_code(item_code)
         else:
@@ -120,6 +138,7 @@ class ItemStoreMasterRepository(AbstractRepository[ItemStoreMasterDocument]):
         """
         filter = {"tenant_id": self.tenant_id, "store_code": self.store_code, "item_code": item_code}
         success = await self.replace_one_async(filter, new_document)
+        item_book_detail_cache.invalidate_item(self.tenant_id, item_code, self.store_code)
         if success:
             return new_document
         else:
@@ -137,6 +156,7 @@ class ItemStoreMasterRepository(AbstractRepository[ItemStoreMasterDocument]):
         """
         filter = {"tenant_id": self.tenant_id, "store_code": self.store_code, "item_code": item_code}
         await self.delete_async(filter)
+        item_book_detail_cache.invalidate_item(self.tenant_id, item_code, self.store_code)
 
     async def get_item_count_by_filter_async(self, query_filter: dict) -> int:
         """
@@ -17,6 +17,8 @@ from app.models.documents.item_book_master_document import (
 from app.models.repositories.item_book_master_repository import ItemBookMasterRepository
 from app.models.repositories.item_common_master_repository import ItemCommonMasterRepository
 from app.models.repositories.item_store_master_repository import ItemStoreMasterRepository
+from app.config.settings import settings
+from app.utils.item_book_detail_cache import item_book_detail_cache
 
 logger = getLogger(__name__)
 
@@ -109,6 +111,8 @@ class ItemBookMasterService:
 
         This method enriches the standard item book data with additional details like
         unit prices and descriptions from the item common and store master data.
+        The items of all buttons are fetched with one query per master, and the result
+        is cached per item book and store until the item book or one of its items changes.
 
         Args:
             item_book_id: The unique identifier of the item book
@@ -119,33 +123,46 @@ class ItemBookMasterService:
         Raises:
             DocumentNotFoundException: If no item book with the given ID exists
         """
+        tenant_id = self.item_book_master_repo.tenant_id
+        store_code = self.item_store_master_repo.store_code if self.item_store_master_repo else None
+        if settings.USE_ITEM_BOOK_DETAIL_CACHE:
+            item_book = item_book_detail_cache.get(tenant_id, item_book_id, store_code)
+            if item_book is not None:
+                return item_book
+        generation = item_book_detail_cache.get_generation()
+
         item_book = await self.item_book_master_repo.get_item_book_async(item_book_id)
         if item_book is None:
             message = f"item book with item_book_id {item_book_id} not found"
             raise DocumentNotFoundException(message, logger)
 
-        # set unit_price to buttons
-        for category in item_book.categories:
-            for tab in category.tabs:
-                for button in tab.buttons:
-
-                    # get item common price & description
-                    item_common = await self.item_common_master_repo.get_item_by_code_async(
-                        button.item_code, is_logical_deleted=False, use_cache=False
-                    )
-                    if not item_common:
-                        logger.warning(f"Item with item_code {button.item_code} not found")
-                        button.description = "not found"
-                        continue
-                    else:
-                        button.description = item_common.description
-                        button.unit_price = item_common.unit_price
-
-                    # get item store price
-                    item_store = await self.item_store_master_repo.get_item_store_by_code(button.item_code)
-                    if item_store:
-                        button.unit_price = item_store.store_price  # override price
+        buttons = [button for category in item_book.categories for tab in category.tabs for button in tab.buttons]
+        item_codes = list(dict.fromkeys(button.item_code for button in buttons))
 
+        # get item common price & description, and the store price overriding it
+        item_commons = await self.item_common_master_repo.get_items_by_codes_async(item_codes, is_logical_deleted=False)
+        common_map = {item.item_code: item for item in item_commons}
+        store_map = {}
+        if self.item_store_master_repo is not None:
+            item_stores = await self.item_store_master_repo.get_item_stores_by_codes_async(list(common_map.keys()))
+            store_map = {item.item_code: item for item in item_stores}
+
+        # set unit_price to buttons
+        for button in buttons:
+            item_common = common_map.get(button.item_code)
+            if not item_common:
+                logger.warning(f"Item with item_code {button.item_code} not found")
+                button.description = "not found"
+                continue
+            button.description = item_common.description
+            button.unit_price = item_common.unit_price
+
+            item_store = store_map.get(button.item_code)
+            if item_store:
+                button.unit_price = item_store.store_price  # override price
+
+        if settings.USE_ITEM_BOOK_DETAIL_CACHE:
+            item_book_detail_cache.set(tenant_id, item_book_id, store_code, item_book, generation)
         return item_book
 
     async def get_item_book_all_async(self, limit: int, page: int, sort: list[tuple[str, int]]) -> list:
@@ -128,21 +128,36 @@ class ItemCommonMasterService:
         return items_all_in_tenant
 
     async def get_item_all_paginated_async(
-        self, limit: int, page: int, sort: list[tuple[str, int]]
+        self,
+        limit: int,
+        page: int,
+        sort: list[tuple[str, int]],
+        item_codes: list[str] = None,
+        projection: dict = None,
     ) -> tuple[list[ItemCommonMasterDocument], int]:
         """
         Retrieve all items with pagination metadata.
 
+        When item codes are given, only these items are retrieved with an $in filter
+        served by the item_code index.
+
         Args:
             limit: Maximum number of records to return
             page: Page number for pagination
             sort: List of tuples containing field name and sort direction
+            item_codes: Optional list of item codes to retrieve
+            projection: Optional MongoDB projection limiting the fields read from the database
 
         Returns:
             Tuple of (list of ItemCommonMasterDocument objects, total count)
         """
-        items_all_in_tenant = await self.item_common_master_repo.get_item_by_filter_async({}, limit, page, sort)
-        total_count = await self.item_common_master_repo.get_item_count_by_filter_async({})
+        query_filter = {}
+        if item_codes:
+            query_filter["item_code"] = {"$in": list(dict.fromkeys(item_codes))}
+        items_all_in_tenant = await self.item_common_master_repo.get_item_by_filter_async(
+            dict(query_filter), limit, page, sort, projection
+        )
+        total_count = await self.item_common_master_repo.get_item_count_by_filter_async(dict(query_filter))
         return items_all_in_tenant, total_count
 
     async def update_item_async(self, item_code: str, update_data: dict) -> ItemCommonMasterDocument:
@@ -12,6 +12,7 @@ from app.models.documents.item_store_master_document import ItemStoreMasterDocum
 from app.models.repositories.item_store_master_repository import ItemStoreMasterRepository
 from app.models.repositories.item_common_master_repository import ItemCommonMasterRepository
 from app.models.documents.item_store_detail_document import ItemStoreDetailDocument
+from app.models.documents.item_common_master_document import ItemCommonMasterDocument
 
 
 class ItemStoreMasterService:
@@ -152,30 +153,13 @@ class ItemStoreMasterService:
 
         logger.debug(f"get_item_store_detail_by_code_async request received for item_code: {item_code}")
 
-        item_detail_doc = ItemStoreDetailDocument()
-
         item_common = await self.item_common_master_repo.get_item_by_code_async(
             item_code=item_code, is_logical_deleted=False, use_cache=False
         )
         if item_common is None:
             message = f"item common with item_code {item_code} not found"
             raise DocumentNotFoundException(message, logger)
-        else:
-            logger.debug(f"item_common: {item_common}")
-            item_detail_doc.tenant_id = item_common.tenant_id
-            item_detail_doc.item_code = item_common.item_code
-            item_detail_doc.description = item_common.description
-            item_detail_doc.description_short = item_common.description_short
-            item_detail_doc.description_long = item_common.description_long
-            item_detail_doc.unit_price = item_common.unit_price
-            item_detail_doc.unit_cost = item_common.unit_cost
-            item_detail_doc.item_details = item_common.item_details
-            item_detail_doc.image_urls = item_common.image_urls
-            item_detail_doc.category_code = item_common.category_code
-            item_detail_doc.tax_code = item_common.tax_code
-            item_detail_doc.is_discount_restricted = item_common.is_discount_restricted
-            item_detail_doc.updated_at = item_common.updated_at
-            item_detail_doc.created_at = item_common.created_at
+        logger.debug(f"item_common: {item_common}")
 
         item_store = await self.item_store_master_repo.get_item_store_by_code(item_code=item_code)
         if item_store is None:
@@ -184,6 +168,70 @@ class ItemStoreMasterService:
             logger.info(message)
         else:
             logger.debug(f"item_store: {item_store}")
+
+        return self.__make_item_store_detail(item_common, item_store)
+
+    async def get_item_store_details_by_codes_async(self, item_codes: list[str]) -> list[ItemStoreDetailDocument]:
+        """
+        Retrieve detailed item records for multiple item codes.
+
+        Common and store-specific records are each fetched with a single query,
+        so the cost does not grow with the number of round-trips.
+        Item codes that do not exist in the common item master are omitted from the result.
+
+        Args:
+            item_codes: List of item codes to retrieve
+
+        Returns:
+            List of ItemStoreDetailDocument in the order of the requested item codes
+        """
+        logger.debug(f"get_item_store_details_by_codes_async request received for item_codes: {item_codes}")
+
+        unique_codes = list(dict.fromkeys(item_codes))
+        item_commons = await self.item_common_master_repo.get_items_by_codes_async(unique_codes)
+        item_stores = await self.item_store_master_repo.get_item_stores_by_codes_async(unique_codes)
+        common_map = {item.item_code: item for item in item_commons}
+        store_map = {item.item_code: item for item in item_stores}
+
+        details = []
+        for item_code in unique_codes:
+            item_common = common_map.get(item_code)
+            if item_common is None:
+                logger.info(f"item common with item_code {item_code} not found")
+                continue
+            details.append(self.__make_item_store_detail(item_common, store_map.get(item_code)))
+        return details
+
+    def __make_item_store_detail(
+        self, item_common: ItemCommonMasterDocument, item_store: ItemStoreMasterDocument | None
+    ) -> ItemStoreDetailDocument:
+        """
+        Merge a common item record and an optional store-specific record into a detail document.
+
+        Args:
+            item_common: Common item master record
+            item_store: Store-specific item record, or None if the store has no override
+
+        Returns:
+            ItemStoreDetailDocument with store-specific overrides applied
+        """
+        item_detail_doc = ItemStoreDetailDocument()
+        item_detail_doc.tenant_id = item_common.tenant_id
+        item_detail_doc.item_code = item_common.item_code
+        item_detail_doc.description = item_common.description
+        item_detail_doc.description_short = item_common.description_short
+        item_detail_doc.description_long = item_common.description_long
+        item_detail_doc.unit_price = item_common.unit_price
+        item_detail_doc.unit_cost = item_common.unit_cost
+        item_detail_doc.item_details = item_common.item_details
+        item_detail_doc.image_urls = item_common.image_urls
+        item_detail_doc.category_code = item_common.category_code
+        item_detail_doc.tax_code = item_common.tax_code
+        item_detail_doc.is_discount_restricted = item_common.is_discount_restricted
+        item_detail_doc.updated_at = item_common.updated_at
+        item_detail_doc.created_at = item_common.created_at
+
+        if item_store is not None:
             item_detail_doc.store_code = item_store.store_code
             item_detail_doc.store_price = item_store.store_price
             item_detail_doc.updated_at = item_store.updated_at
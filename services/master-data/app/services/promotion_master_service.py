@@ -12,9 +12,14 @@ from app.models.documents.promotion_master_document import PromotionMasterDocume
 from app.models.repositories.promotion_master_repository import (
     PromotionMasterRepository,
 )
+from app.utils.pubsub_manager import PubsubManager
 
 logger = getLogger(__name__)
 
+# Pub/Sub component and topic used to notify other services of master data changes
+MASTER_DATA_PUBSUB_NAME = "pubsub-master-data"
+MASTER_DATA_TOPIC_NAME = "topic-master-data"
+
 
 class PromotionMasterService:
     """
@@ -24,14 +29,20 @@ class PromotionMasterService:
     and deleting promotion records in the master data database.
     """
 
-    def __init__(self, promotion_master_repo: PromotionMasterRepository):
+    def __init__(
+        self,
+        promotion_master_repo: PromotionMasterRepository,
+        pubsub_manager: Optional[PubsubManager] = None,
+    ):
         """
         Initialize the PromotionMasterService with a repository.
 
         Args:
             promotion_master_repo: Repository for promotion master data operations
+            pubsub_manager: Optional publisher used to notify promotion changes
         """
         self.promotion_master_repo = promotion_master_repo
+        self.pubsub_manager = pubsub_manager
 
     async def create_promotion_async(
         self,
@@ -107,7 +118,9 @@ class PromotionMasterService:
         promotion_doc.is_active = is_active
         promotion_doc.detail = detail
 
-        return await self.promotion_master_repo.create_promotion_async(promotion_doc)
+        created = await self.promotion_master_repo.create_promotion_async(promotion_doc)
+        await self.__notify_promotion_changed_async(promotion_code, "create")
+        return created
 
     async def get_promotion_by_code_async(
         self, promotion_code: str
@@ -292,9 +305,11 @@ class PromotionMasterService:
                     message = "discount_rate must be between 0 and 100"
                     raise InvalidRequestDataException(message, logger)
 
-        return await self.promotion_master_repo.update_promotion_async(
+        updated = await self.promotion_master_repo.update_promotion_async(
             promotion_code, update_data
         )
+        await self.__notify_promotion_changed_async(promotion_code, "update")
+        return updated
 
     async def delete_promotion_async(self, promotion_code: str) -> None:
         """
@@ -315,3 +330,28 @@ class PromotionMasterService:
             raise DocumentNotFoundException(message, logger)
 
         await self.promotion_master_repo.delete_promotion_async(promotion_code)
+        await self.__notify_promotion_changed_async(promotion_code, "delete")
+
+    async def __notify_promotion_changed_async(self, promotion_code: str, operation: str) -> None:
+        """
+        Publish a promotion change so that services caching active promotions can invalidate them.
+
+        Publishing failures are logged only, subscribers also refresh their caches periodically.
+
+        Args:
+            promotion_code: Unique identifier of the changed promotion
+            operation: Kind of change ("create", "update" or "delete")
+        """
+        if self.pubsub_manager is None:
+            return
+        message = {
+            "tenant_id": self.promotion_master_repo.tenant_id,
+            "master_type": "promotion",
+            "promotion_code": promotion_code,
+            "operation": operation,
+        }
+        success, error_msg = await self.pubsub_manager.publish_message_async(
+            pubsub_name=MASTER_DATA_PUBSUB_NAME, topic_name=MASTER_DATA_TOPIC_NAME, message=message
+        )
+        if not success:
+            logger.warning(f"Failed to publish promotion change: {message}, error: {error_msg}")
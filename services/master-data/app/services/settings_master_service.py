@@ -1,5 +1,6 @@
 # Copyright 2025 masa@kugel  # # Licensed under the Apache License, Version 2.0 (the "License");  # you may not use this file except in compliance with the License.  # You may obtain a copy of the License at  # #     http://www.apache.org/licenses/LICENSE-2.0  # # Unless required by applicable law or agreed to in writing, software  # distributed under the License is distributed on an "AS IS" BASIS,  # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  # See the License for the specific language governing permissions and  # limitations under the License.
 from logging import getLogger
+from typing import Optional
 
 from kugel_common.exceptions import (
     DocumentAlreadyExistsException,
@@ -8,7 +9,9 @@ from kugel_common.exceptions import (
 )
 from app.models.documents.settings_master_document import SettingsMasterDocument, SettingsValue
 from app.models.repositories.settings_master_repository import SettingsMasterRepository
+from app.services.promotion_master_service import MASTER_DATA_PUBSUB_NAME, MASTER_DATA_TOPIC_NAME
 from app.utils.json_settings import ensure_json_format, process_setting_values
+from app.utils.pubsub_manager import PubsubManager
 
 logger = getLogger(__name__)
 
@@ -22,14 +25,20 @@ class SettingsMasterService:
     Settings can be configured at different levels (global, store, terminal).
     """
 
-    def __init__(self, settings_master_repo: SettingsMasterRepository):
+    def __init__(
+        self,
+        settings_master_repo: SettingsMasterRepository,
+        pubsub_manager: Optional[PubsubManager] = None,
+    ):
         """
         Initialize the SettingsMasterService with a repository.
 
         Args:
             settings_master_repo: Repository for settings master data operations
+            pubsub_manager: Optional publisher used to notify settings changes
         """
         self.settings_master_repo = settings_master_repo
+        self.pubsub_manager = pubsub_manager
 
     async def create_settings_async(self, name: str, default_value: str, values: list[dict]) -> SettingsMasterDocument:
         """
@@ -60,7 +69,9 @@ class SettingsMasterService:
         # Process values to ensure JSON formatting
         processed_values = process_setting_values(values)
         settings_doc.values = [SettingsValue(**value) for value in processed_values]
-        return await self.settings_master_repo.create_settings_async(settings_doc)
+        created_doc = await self.settings_master_repo.create_settings_async(settings_doc)
+        await self.__notify_settings_changed_async(name, "create")
+        return created_doc
 
     async def get_settings_by_name_async(self, name: str) -> SettingsMasterDocument:
         """
@@ -196,7 +207,9 @@ class SettingsMasterService:
         if "values" in update_data and isinstance(update_data["values"], list):
             update_data["values"] = process_setting_values(update_data["values"])
 
-        return await self.settings_master_repo.update_settings_async(name, update_data)
+        updated_doc = await self.settings_master_repo.update_settings_async(name, update_data)
+        await self.__notify_settings_changed_async(name, "update")
+        return updated_doc
 
     async def delete_settings_async(self, name: str) -> None:
         """
@@ -212,4 +225,30 @@ class SettingsMasterService:
         if settings is None:
             message = f"settings with name {name} not found"
             raise DocumentNotFoundException(message, logger)
-        return await self.settings_master_repo.delete_settings_async(name)
+        result = await self.settings_master_repo.delete_settings_async(name)
+        await self.__notify_settings_changed_async(name, "delete")
+        return result
+
+    async def __notify_settings_changed_async(self, name: str, operation: str) -> None:
+        """
+        Publish a settings change so that services caching resolved settings can invalidate them.
+
+        Publishing failures are logged only, subscribers also refresh their caches periodically.
+
+        Args:
+            name: Name of the changed setting
+            operation: Kind of change ("create", "update" or "delete")
+        """
+        if self.pubsub_manager is None:
+            return
+        message = {
+            "tenant_id": self.settings_master_repo.tenant_id,
+            "master_type": "settings",
+            "name": name,
+            "operation": operation,
+        }
+        success, error_msg = await self.pubsub_manager.publish_message_async(
+            pubsub_name=MASTER_DATA_PUBSUB_NAME, topic_name=MASTER_DATA_TOPIC_NAME, message=message
+        )
+        if not success:
+            logger.warning(f"Failed to publish settings change: {message}, error: {error_msg}")
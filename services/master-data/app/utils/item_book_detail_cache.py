@@ -0,0 +1,217 @@
+# Copyright 2025 masa@kugel  # # Licensed under the Apache License, Version 2.0 (the "License");  # you may not use this file except in compliance with the License.  # You may obtain a copy of the License at  # #     http://www.apache.org/licenses/LICENSE-2.0  # # Unless required by applicable law or agreed to in writing, software  # distributed under the License is distributed on an "AS IS" BASIS,  # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  # See the License for the specific language governing permissions and  # limitations under the License.
+"""
+Process-wide cache of item book details shared by all requests.
+
+An item book detail is the item book with the description and price of the item of every
+button, which terminals fetch at startup. Entries are kept per (tenant_id, item_book_id,
+store_code) and are dropped when the item book, or an item on one of its buttons, is changed
+through this instance. Changes made through other instances are picked up after the TTL.
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Tuple
+from logging import getLogger
+
+from app.config.settings import settings
+from app.models.documents.item_book_master_document import ItemBookMasterDocument
+
+logger = getLogger(__name__)
+
+
+@dataclass
+class ItemBookDetailCacheEntry:
+    """Cached item book detail together with the item codes of its buttons."""
+
+    item_book: ItemBookMasterDocument
+    item_codes: frozenset[str]
+    loaded_at: float = field(default_factory=time.time)
+
+
+class ItemBookDetailCache:
+    """Shared item book detail cache with TTL per (tenant, item book, store)."""
+
+    def __init__(self, ttl_seconds: int = 60, max_entries: int = 1000, max_invalidations: int = 1000):
+        """
+        Initialize the item book detail cache.
+
+        Args:
+            ttl_seconds: Age in seconds after which an entry is no longer used (default: 60)
+            max_entries: Maximum number of entries, the oldest is dropped first (default: 1000)
+            max_invalidations: Number of recent invalidations kept to check the details loaded
+                               meanwhile (default: 1000)
+        """
+        self._cache: dict[Tuple[str, str, str], ItemBookDetailCacheEntry] = {}
+        # Incremented on every invalidation. The recent invalidations are kept, so that only the details
+        # loaded before a change that drops them are discarded, not those of other item books or tenants.
+        self._generation = 0
+        self._invalidation_log: deque[Tuple[int, Callable]] = deque(maxlen=max_invalidations)
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def get(self, tenant_id: str, item_book_id: str, store_code: str) -> Optional[ItemBookMasterDocument]:
+        """
+        Get a copy of a cached item book detail.
+
+        Args:
+            tenant_id: The tenant identifier
+            item_book_id: The item book identifier
+            store_code: The store code the prices are for
+
+        Returns:
+            Copy of the cached ItemBookMasterDocument, None if not cached or expired
+        """
+        key = (tenant_id, item_book_id, store_code)
+        entry = self._cache.get(key)
+        if entry is not None and time.time() - entry.loaded_at >= self._ttl:
+            self._cache.pop(key, None)
+            entry = None
+        if entry is None:
+            self._misses += 1
+            logger.debug(f"Item book detail cache miss for {key}")
+            return None
+        self._hits += 1
+        # callers may modify the returned document
+        return entry.item_book.model_copy(deep=True)
+
+    def get_generation(self) -> int:
+        """
+        Get the current generation, to be passed to set() after loading.
+
+        Returns:
+            Invalidation counter of the cache
+        """
+        return self._generation
+
+    def set(
+        self, tenant_id: str, item_book_id: str, store_code: str, item_book: ItemBookMasterDocument, generation: int
+    ) -> bool:
+        """
+        Store a copy of an item book detail unless an invalidation made while loading drops it.
+
+        Args:
+            tenant_id: The tenant identifier
+            item_book_id: The item book identifier
+            store_code: The store code the prices are for
+            item_book: The item book detail to store
+            generation: Generation returned by get_generation() before the load started
+
+        Returns:
+            True if the entry was stored, False if it was discarded
+        """
+        key = (tenant_id, item_book_id, store_code)
+        item_codes = frozenset(
+            button.item_code for category in item_book.categories for tab in category.tabs for button in tab.buttons
+        )
+        entry = ItemBookDetailCacheEntry(item_book=item_book, item_codes=item_codes, loaded_at=time.time())
+        if self.__invalidated_since(generation, key, entry):
+            logger.debug(f"Discarding item book detail loaded before invalidation for {key}")
+            return False
+        entry.item_book = item_book.model_copy(deep=True)
+        self._cache.pop(key, None)
+        self._cache[key] = entry
+        while len(self._cache) > self._max_entries:
+            self._cache.pop(next(iter(self._cache)))
+        return True
+
+    def __invalidated_since(self, generation: int, key: Tuple[str, str, str], entry: ItemBookDetailCacheEntry) -> bool:
+        """
+        Check whether an invalidation made after a generation drops an entry.
+
+        Args:
+            generation: Generation returned by get_generation() before the load started
+            key: Key of the loaded entry
+            entry: The loaded entry
+
+        Returns:
+            True if the entry is dropped, or if the invalidations since the generation are no longer known
+        """
+        changes = [
+            predicate for change_generation, predicate in self._invalidation_log if change_generation > generation
+        ]
+        if len(changes) != self._generation - generation:
+            return True
+        return any(predicate(key, entry) for predicate in changes)
+
+    def invalidate_item_book(self, tenant_id: str, item_book_id: Optional[str] = None) -> None:
+        """
+        Drop the cached details of an item book for all stores.
+
+        Args:
+            tenant_id: The tenant identifier
+            item_book_id: If provided, drop only this item book. If None, all item books of the tenant.
+        """
+        self.__invalidate(
+            lambda key, entry: key[0] == tenant_id and (item_book_id is None or key[1] == item_book_id),
+            f"tenant_id={tenant_id}, item_book_id={item_book_id}",
+        )
+
+    def invalidate_item(self, tenant_id: str, item_code: str, store_code: Optional[str] = None) -> None:
+        """
+        Drop the cached details that contain a button for an item.
+
+        Args:
+            tenant_id: The tenant identifier
+            item_code: The code of the changed item
+            store_code: If provided, drop only details for this store (store specific price changed)
+        """
+        self.__invalidate(
+            lambda key, entry: key[0] == tenant_id
+            and (store_code is None or key[2] == store_code)
+            and item_code in entry.item_codes,
+            f"tenant_id={tenant_id}, item_code={item_code}, store_code={store_code}",
+        )
+
+    def __invalidate(self, predicate, description: str) -> None:
+        """
+        Drop the entries matching a predicate and start a new generation recording it.
+
+        Args:
+            predicate: Function of key and entry returning True for the entries to drop
+            description: Description of the change for the log
+        """
+        keys = [key for key, entry in self._cache.items() if predicate(key, entry)]
+        for key in keys:
+            self._cache.pop(key, None)
+        self._generation += 1
+        self._invalidation_log.append((self._generation, predicate))
+        self._invalidations += 1
+        logger.debug(f"Item book detail cache invalidated: {description}, dropped {len(keys)} entries")
+
+    def clear(self) -> None:
+        """
+        Clear all entries and reset statistics.
+        """
+        self._cache.clear()
+        # not logged, so every load started before is discarded
+        self._generation += 1
+        self._invalidation_log.clear()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def stats(self) -> dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss/invalidation counters, number of cached details and the TTL
+        """
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "invalidations": self._invalidations,
+            "cached_item_books": len(self._cache),
+            "ttl_seconds": self._ttl,
+        }
+
+
+# Create a singleton cache instance shared by all item book services and item repositories
+item_book_detail_cache = ItemBookDetailCache(
+    ttl_seconds=settings.ITEM_BOOK_DETAIL_CACHE_TTL_SECONDS,
+    max_entries=settings.ITEM_BOOK_DETAIL_CACHE_MAX_ENTRIES,
+)
@@ -124,6 +124,86 @@ async def test_list_items_success():
     assert body["metadata"] is not None
 
 
+@pytest.mark.asyncio
+async def test_list_items_filtered_by_codes_with_fields():
+    app = make_app()
+    mock_service = AsyncMock()
+    mock_service.get_item_all_paginated_async.return_value = ([_make_item_doc("ITEM001")], 1)
+
+    with patch(
+        "app.api.v1.item_common_master.get_item_master_service_async",
+        return_value=mock_service,
+    ):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            resp = await client.get(
+                f"/api/v1/tenants/{TENANT_ID}/items",
+                params={"item_codes": "ITEM001,ITEM002", "fields": "itemCode,description,entryDatetime", "limit": 2},
+            )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["data"] == [
+        {"itemCode": "ITEM001", "description": "Test Item", "entryDatetime": "2025-01-01 12:00:00"}
+    ]
+    assert body["metadata"]["total"] == 1
+    kwargs = mock_service.get_item_all_paginated_async.call_args.kwargs
+    assert kwargs["item_codes"] == ["ITEM001", "ITEM002"]
+    assert kwargs["projection"] == {"item_code": 1, "description": 1, "created_at": 1, "_id": 0}
+
+
+@pytest.mark.asyncio
+async def test_list_items_unknown_field_returns_422():
+    app = make_app()
+    mock_service = AsyncMock()
+
+    with patch(
+        "app.api.v1.item_common_master.get_item_master_service_async",
+        return_value=mock_service,
+    ):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            resp = await client.get(f"/api/v1/tenants/{TENANT_ID}/items", params={"fields": "itemCode,itemName"})
+    assert resp.status_code == 422
+    mock_service.get_item_all_paginated_async.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_search_items_by_codes():
+    app = make_app()
+    mock_service = AsyncMock()
+    mock_service.get_item_all_paginated_async.return_value = ([_make_item_doc("ITEM001")], 1)
+    item_codes = [f"ITEM{no:03d}" for no in range(500)]
+
+    with patch(
+        "app.api.v1.item_common_master.get_item_master_service_async",
+        return_value=mock_service,
+    ):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            resp = await client.post(
+                f"/api/v1/tenants/{TENANT_ID}/items/search",
+                json={"itemCodes": item_codes, "fields": ["itemCode", "categoryCode"], "limit": 500},
+            )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["data"] == [{"itemCode": "ITEM001", "categoryCode": "CAT001"}]
+    args = mock_service.get_item_all_paginated_async.call_args
+    assert args.args[0] == 500
+    assert args.kwargs["item_codes"] == item_codes
+
+
+@pytest.mark.asyncio
+async def test_search_items_without_codes_returns_422():
+    app = make_app()
+    mock_service = AsyncMock()
+
+    with patch(
+        "app.api.v1.item_common_master.get_item_master_service_async",
+        return_value=mock_service,
+    ):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            resp = await client.post(f"/api/v1/tenants/{TENANT_ID}/items/search", json={"itemCodes": []})
+    assert resp.status_code == 422
+    mock_service.get_item_all_paginated_async.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_get_item_success():
     app = make_app()
@@ -237,3 +237,26 @@ async def test_get_item_store_detail_not_found():
     assert resp.status_code == 404
     body = resp.json()
     assert body["success"] is False
+
+
+@pytest.mark.asyncio
+async def test_get_item_store_details_bulk_success():
+    app = make_app()
+    mock_service = AsyncMock()
+    mock_service.get_item_store_details_by_codes_async.return_value = [_make_item_store_detail_doc()]
+
+    with patch(
+        "app.api.v1.item_store_master.get_item_store_master_service_async",
+        return_value=mock_service,
+    ):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            resp = await client.post(
+                f"/api/v1/tenants/{TENANT_ID}/stores/{STORE_CODE}/items/details",
+                json={"itemCodes": ["ITEM001", "NOTFOUND"]},
+            )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["success"] is True
+    assert len(body["data"]) == 1
+    assert body["data"][0]["itemCode"] == "ITEM001"
+    mock_service.get_item_store_details_by_codes_async.assert_awaited_once_with(["ITEM001", "NOTFOUND"])
@@ -0,0 +1,130 @@
+"""
+Unit tests for ItemBookDetailCache.
+"""
+from unittest.mock import patch
+
+from app.models.documents.item_book_master_document import (
+    ItemBookMasterDocument,
+    ItemBookCategory,
+    ItemBookTab,
+    ItemBookButton,
+)
+from app.utils.item_book_detail_cache import ItemBookDetailCache
+
+
+def _make_detail(item_book_id="BK-001", item_codes=("ITEM-01",)):
+    buttons = [
+        ItemBookButton(pos_x=x, pos_y=0, size="Single", item_code=code, unit_price=100.0)
+        for x, code in enumerate(item_codes)
+    ]
+    tab = ItemBookTab(tab_number=1, title="Tab", color="#111", buttons=buttons)
+    category = ItemBookCategory(category_number=1, title="Category", color="#000", tabs=[tab])
+    return ItemBookMasterDocument(item_book_id=item_book_id, title="Book", categories=[category])
+
+
+def _store(cache, tenant_id="T001", item_book_id="BK-001", store_code="S001", item_codes=("ITEM-01",)):
+    return cache.set(
+        tenant_id, item_book_id, store_code, _make_detail(item_book_id, item_codes), cache.get_generation()
+    )
+
+
+def test_get_returns_copy():
+    cache = ItemBookDetailCache()
+    assert _store(cache)
+
+    detail = cache.get("T001", "BK-001", "S001")
+    detail.categories[0].tabs[0].buttons[0].unit_price = 0.0
+
+    assert cache.get("T001", "BK-001", "S001").categories[0].tabs[0].buttons[0].unit_price == 100.0
+    assert cache.get("T001", "BK-001", "S002") is None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_expired_entry_is_dropped():
+    cache = ItemBookDetailCache(ttl_seconds=60)
+    with patch("app.utils.item_book_detail_cache.time.time", return_value=1000.0):
+        _store(cache)
+    with patch("app.utils.item_book_detail_cache.time.time", return_value=1059.0):
+        assert cache.get("T001", "BK-001", "S001") is not None
+    with patch("app.utils.item_book_detail_cache.time.time", return_value=1060.0):
+        assert cache.get("T001", "BK-001", "S001") is None
+    assert cache.stats()["cached_item_books"] == 0
+
+
+def test_oldest_entry_is_dropped_when_full():
+    cache = ItemBookDetailCache(max_entries=2)
+    _store(cache, item_book_id="BK-001")
+    _store(cache, item_book_id="BK-002")
+    _store(cache, item_book_id="BK-003")
+
+    assert cache.get("T001", "BK-001", "S001") is None
+    assert cache.get("T001", "BK-002", "S001") is not None
+    assert cache.get("T001", "BK-003", "S001") is not None
+
+
+def test_load_started_before_invalidation_is_discarded():
+    cache = ItemBookDetailCache()
+    generation = cache.get_generation()
+    cache.invalidate_item("T001", "ITEM-01")
+
+    assert not cache.set("T001", "BK-001", "S001", _make_detail(), generation)
+    assert cache.get("T001", "BK-001", "S001") is None
+
+
+def test_load_survives_invalidation_of_other_entries():
+    cache = ItemBookDetailCache()
+    generation = cache.get_generation()
+    cache.invalidate_item("T002", "ITEM-01")
+    cache.invalidate_item_book("T001", "BK-002")
+    cache.invalidate_item("T001", "ITEM-99")
+    cache.invalidate_item("T001", "ITEM-01", store_code="S002")
+
+    assert cache.set("T001", "BK-001", "S001", _make_detail(), generation)
+    assert cache.get("T001", "BK-001", "S001") is not None
+
+
+def test_load_is_discarded_when_invalidations_are_no_longer_known():
+    cache = ItemBookDetailCache(max_invalidations=1)
+    generation = cache.get_generation()
+    cache.invalidate_item("T002", "ITEM-01")
+    cache.invalidate_item("T002", "ITEM-02")
+
+    assert not cache.set("T001", "BK-001", "S001", _make_detail(), generation)
+
+    generation = cache.get_generation()
+    cache.clear()
+    assert not cache.set("T001", "BK-001", "S001", _make_detail(), generation)
+
+
+def test_invalidate_item_book_drops_all_stores():
+    cache = ItemBookDetailCache()
+    _store(cache, store_code="S001")
+    _store(cache, store_code="S002")
+    _store(cache, item_book_id="BK-002")
+    _store(cache, tenant_id="T002")
+
+    cache.invalidate_item_book("T001", "BK-001")
+
+    assert cache.get("T001", "BK-001", "S001") is None
+    assert cache.get("T001", "BK-001", "S002") is None
+    assert cache.get("T001", "BK-002", "S001") is not None
+    assert cache.get("T002", "BK-001", "S001") is not None
+
+
+def test_invalidate_item_drops_books_containing_it():
+    cache = ItemBookDetailCache()
+    _store(cache, item_book_id="BK-001", item_codes=("ITEM-01", "ITEM-02"))
+    _store(cache, item_book_id="BK-002", item_codes=("ITEM-03",))
+    _store(cache, item_book_id="BK-001", store_code="S002", item_codes=("ITEM-01", "ITEM-02"))
+
+    # store price changed in S001 only
+    cache.invalidate_item("T001", "ITEM-02", store_code="S001")
+    assert cache.get("T001", "BK-001", "S001") is None
+    assert cache.get("T001", "BK-001", "S002") is not None
+    assert cache.get("T001", "BK-002", "S001") is not None
+
+    # common item changed for all stores
+    cache.invalidate_item("T001", "ITEM-01")
+    assert cache.get("T001", "BK-001", "S002") is None
+    assert cache.get("T001", "BK-002", "S001") is not None
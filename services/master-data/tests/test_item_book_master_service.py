@@ -9,7 +9,9 @@ from kugel_common.exceptions import (
     DocumentAlreadyExistsException,
     InvalidRequestDataException,
 )
+from app.config.settings import settings
 from app.services.item_book_master_service import ItemBookMasterService
+from app.utils.item_book_detail_cache import item_book_detail_cache
 from app.models.documents.item_book_master_document import (
     ItemBookMasterDocument,
     ItemBookCategory,
@@ -22,11 +24,21 @@ from app.models.documents.item_book_master_document import (
 # Helpers
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(autouse=True)
+def clear_item_book_detail_cache():
+    """Start every test with an empty item book detail cache."""
+    item_book_detail_cache.clear()
+    yield
+    item_book_detail_cache.clear()
+
+
 def _make_service():
     """Create a service with mocked repositories."""
     book_repo = AsyncMock()
+    book_repo.tenant_id = "T001"
     common_repo = AsyncMock()
     store_repo = AsyncMock()
+    store_repo.store_code = "S001"
     svc = ItemBookMasterService(
         item_book_master_repo=book_repo,
         item_common_master_repo=common_repo,
@@ -143,13 +155,15 @@ class TestGetItemBookDetail:
         book_repo.get_item_book_async.return_value = doc
 
         common_item = MagicMock()
+        common_item.item_code = "ITEM-01"
         common_item.description = "Test Item"
         common_item.unit_price = 100.0
-        common_repo.get_item_by_code_async.return_value = common_item
+        common_repo.get_items_by_codes_async.return_value = [common_item]
 
         store_item = MagicMock()
+        store_item.item_code = "ITEM-01"
         store_item.store_price = 120.0
-        store_repo.get_item_store_by_code.return_value = store_item
+        store_repo.get_item_stores_by_codes_async.return_value = [store_item]
 
         result = await svc.get_item_book_detail_by_id_async("BK-001")
         button = result.categories[0].tabs[0].buttons[0]
@@ -165,7 +179,8 @@ class TestGetItemBookDetail:
         cat = _make_category(tabs=[tab])
         doc = _make_item_book(categories=[cat])
         book_repo.get_item_book_async.return_value = doc
-        common_repo.get_item_by_code_async.return_value = None
+        common_repo.get_items_by_codes_async.return_value = []
+        store_repo.get_item_stores_by_codes_async.return_value = []
 
         result = await svc.get_item_book_detail_by_id_async("BK-001")
         button = result.categories[0].tabs[0].buttons[0]
@@ -182,10 +197,11 @@ class TestGetItemBookDetail:
         book_repo.get_item_book_async.return_value = doc
 
         common_item = MagicMock()
+        common_item.item_code = "ITEM-01"
         common_item.description = "Item"
         common_item.unit_price = 100.0
-        common_repo.get_item_by_code_async.return_value = common_item
-        store_repo.get_item_store_by_code.return_value = None
+        common_repo.get_items_by_codes_async.return_value = [common_item]
+        store_repo.get_item_stores_by_codes_async.return_value = []
 
         result = await svc.get_item_book_detail_by_id_async("BK-001")
         assert result.categories[0].tabs[0].buttons[0].unit_price == 100.0
@@ -198,6 +214,96 @@ class TestGetItemBookDetail:
         with pytest.raises(DocumentNotFoundException):
             await svc.get_item_book_detail_by_id_async("NONEXISTENT")
 
+    @pytest.mark.asyncio
+    async def test_detail_fetches_all_items_in_one_query(self):
+        svc, book_repo, common_repo, store_repo = _make_service()
+
+        buttons = [_make_button(pos_x=x, item_code=f"ITEM-{x % 3}") for x in range(6)]
+        doc = _make_item_book(
+            categories=[
+                _make_category(1, tabs=[_make_tab(1, buttons=buttons[:3]), _make_tab(2, buttons=buttons[3:5])]),
+                _make_category(2, tabs=[_make_tab(1, buttons=buttons[5:])]),
+            ]
+        )
+        book_repo.get_item_book_async.return_value = doc
+        common_items = []
+        for code in ("ITEM-0", "ITEM-1"):
+            item = MagicMock()
+            item.item_code = code
+            item.description = code
+            item.unit_price = 100.0
+            common_items.append(item)
+        common_repo.get_items_by_codes_async.return_value = common_items
+        store_repo.get_item_stores_by_codes_async.return_value = []
+
+        result = await svc.get_item_book_detail_by_id_async("BK-001")
+
+        common_repo.get_items_by_codes_async.assert_awaited_once_with(
+            ["ITEM-0", "ITEM-1", "ITEM-2"], is_logical_deleted=False
+        )
+        # store prices are looked up only for existing items
+        store_repo.get_item_stores_by_codes_async.assert_awaited_once_with(["ITEM-0", "ITEM-1"])
+        common_repo.get_item_by_code_async.assert_not_called()
+        store_repo.get_item_store_by_code.assert_not_called()
+        descriptions = [b.description for c in result.categories for t in c.tabs for b in t.buttons]
+        assert descriptions == ["ITEM-0", "ITEM-1", "not found", "ITEM-0", "ITEM-1", "not found"]
+
+    @pytest.mark.asyncio
+    async def test_detail_without_store(self):
+        book_repo = AsyncMock()
+        book_repo.tenant_id = "T001"
+        common_repo = AsyncMock()
+        svc = ItemBookMasterService(book_repo, common_repo, None)
+        book_repo.get_item_book_async.return_value = _make_item_book(
+            categories=[_make_category(tabs=[_make_tab(buttons=[_make_button()])])]
+        )
+        common_item = MagicMock()
+        common_item.item_code = "ITEM-01"
+        common_item.description = "Item"
+        common_item.unit_price = 100.0
+        common_repo.get_items_by_codes_async.return_value = [common_item]
+
+        result = await svc.get_item_book_detail_by_id_async("BK-001")
+        assert result.categories[0].tabs[0].buttons[0].unit_price == 100.0
+
+    @pytest.mark.asyncio
+    async def test_detail_is_cached(self):
+        svc, book_repo, common_repo, store_repo = _make_service()
+        book_repo.get_item_book_async.return_value = _make_item_book(
+            categories=[_make_category(tabs=[_make_tab(buttons=[_make_button()])])]
+        )
+        common_item = MagicMock()
+        common_item.item_code = "ITEM-01"
+        common_item.description = "Item"
+        common_item.unit_price = 100.0
+        common_repo.get_items_by_codes_async.return_value = [common_item]
+        store_repo.get_item_stores_by_codes_async.return_value = []
+
+        first = await svc.get_item_book_detail_by_id_async("BK-001")
+        first.categories[0].tabs[0].buttons[0].unit_price = 0.0  # must not change the cached detail
+        second = await svc.get_item_book_detail_by_id_async("BK-001")
+
+        assert book_repo.get_item_book_async.await_count == 1
+        assert common_repo.get_items_by_codes_async.await_count == 1
+        assert second.categories[0].tabs[0].buttons[0].unit_price == 100.0
+
+        # another store has its own prices
+        store_repo.store_code = "S002"
+        await svc.get_item_book_detail_by_id_async("BK-001")
+        assert book_repo.get_item_book_async.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_detail_cache_disabled(self, monkeypatch):
+        monkeypatch.setattr(settings, "USE_ITEM_BOOK_DETAIL_CACHE", False)
+        svc, book_repo, common_repo, store_repo = _make_service()
+        book_repo.get_item_book_async.return_value = _make_item_book()
+        common_repo.get_items_by_codes_async.return_value = []
+        store_repo.get_item_stores_by_codes_async.return_value = []
+
+        await svc.get_item_book_detail_by_id_async("BK-001")
+        await svc.get_item_book_detail_by_id_async("BK-001")
+        assert book_repo.get_item_book_async.await_count == 2
+
 
 # ---------------------------------------------------------------------------
 # get_item_book_all_async / get_item_book_all_paginated_async
@@ -392,6 +392,24 @@ class TestSettingsMasterService:
         result = await service.create_settings_async("KEY-01", "value", [])
         assert result == doc
 
+    @pytest.mark.asyncio
+    async def test_changes_are_published(self, repo):
+        pubsub = MagicMock()
+        pubsub.publish_message_async = AsyncMock(return_value=(True, None))
+        repo.tenant_id = "T001"
+        service = SettingsMasterService(settings_master_repo=repo, pubsub_manager=pubsub)
+
+        repo.get_settings_by_name_async.return_value = None
+        await service.create_settings_async("KEY-01", "value", [])
+        repo.get_settings_by_name_async.return_value = SettingsMasterDocument()
+        await service.update_settings_async("KEY-01", {"default_value": "new"})
+        await service.delete_settings_async("KEY-01")
+
+        messages = [call.kwargs["message"] for call in pubsub.publish_message_async.call_args_list]
+        assert [m["operation"] for m in messages] == ["create", "update", "delete"]
+        assert all(m["tenant_id"] == "T001" and m["master_type"] == "settings" for m in messages)
+        assert pubsub.publish_message_async.call_args.kwargs["topic_name"] == "topic-master-data"
+
     @pytest.mark.asyncio
     async def test_create_duplicate_raises(self, service, repo):
         repo.get_settings_by_name_async.return_value = MagicMock(tenant_id="T001")
@@ -526,6 +544,20 @@ class TestItemCommonMasterService:
         assert result == mock_list
         assert count == 5
 
+    @pytest.mark.asyncio
+    async def test_get_items_paginated_by_codes(self, service, repo):
+        repo.get_item_by_filter_async.return_value = []
+        repo.get_item_count_by_filter_async.return_value = 0
+        projection = {"item_code": 1, "_id": 0}
+
+        await service.get_item_all_paginated_async(
+            limit=10, page=1, sort=[], item_codes=["ITEM001", "ITEM002", "ITEM001"], projection=projection
+        )
+
+        expected_filter = {"item_code": {"$in": ["ITEM001", "ITEM002"]}}
+        repo.get_item_by_filter_async.assert_called_once_with(expected_filter, 10, 1, [], projection)
+        repo.get_item_count_by_filter_async.assert_called_once_with(expected_filter)
+
     @pytest.mark.asyncio
     async def test_update_success(self, service, repo):
         doc = ItemCommonMasterDocument()
@@ -1058,6 +1090,35 @@ class TestItemStoreMasterServiceAdditional:
         with pytest.raises(DocumentNotFoundException):
             await service.get_item_store_detail_by_code_async("NONEXISTENT")
 
+    @pytest.mark.asyncio
+    async def test_get_item_store_details_by_codes(self, service, store_repo, common_repo):
+        """Batch detail lookup uses one query per collection and keeps the requested order."""
+
+        def _common(code):
+            doc = ItemCommonMasterDocument()
+            doc.tenant_id = "T1"
+            doc.item_code = code
+            doc.description = f"Item {code}"
+            doc.unit_price = 100.0
+            return doc
+
+        store_doc = ItemStoreMasterDocument()
+        store_doc.item_code = "ITEM-02"
+        store_doc.store_code = "S1"
+        store_doc.store_price = 90.0
+
+        common_repo.get_items_by_codes_async.return_value = [_common("ITEM-02"), _common("ITEM-01")]
+        store_repo.get_item_stores_by_codes_async.return_value = [store_doc]
+
+        result = await service.get_item_store_details_by_codes_async(["ITEM-01", "ITEM-02", "MISSING", "ITEM-01"])
+
+        common_repo.get_items_by_codes_async.assert_awaited_once_with(["ITEM-01", "ITEM-02", "MISSING"])
+        store_repo.get_item_stores_by_codes_async.assert_awaited_once_with(["ITEM-01", "ITEM-02", "MISSING"])
+        assert [detail.item_code for detail in result] == ["ITEM-01", "ITEM-02"]
+        assert result[0].store_price is None
+        assert result[1].store_price == 90.0
+        assert result[1].store_code == "S1"
+
     @pytest.mark.asyncio
     async def test_update_item_code_mismatch_raises(self, service, store_repo, common_repo):
         """Lines 211-213: item_code in update_data differs from path."""
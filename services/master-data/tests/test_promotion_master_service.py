@@ -422,3 +422,80 @@ class TestPromotionMasterServiceDelete:
 
         with pytest.raises(DocumentNotFoundException):
             await service.delete_promotion_async("NONEXISTENT")
+
+
+class TestPromotionMasterServiceChangeNotification:
+    """Tests for publishing promotion change events."""
+
+    @pytest.fixture
+    def mock_repo(self):
+        repo = AsyncMock(spec=PromotionMasterRepository)
+        repo.tenant_id = "T001"
+        return repo
+
+    @pytest.fixture
+    def mock_pubsub(self):
+        pubsub = MagicMock()
+        pubsub.publish_message_async = AsyncMock(return_value=(True, None))
+        return pubsub
+
+    @pytest.fixture
+    def service(self, mock_repo, mock_pubsub):
+        return PromotionMasterService(promotion_master_repo=mock_repo, pubsub_manager=mock_pubsub)
+
+    @pytest.mark.asyncio
+    async def test_create_publishes_change(self, service, mock_repo, mock_pubsub):
+        """Creating a promotion publishes a change event for the tenant."""
+        mock_repo.get_promotion_by_code_async.return_value = None
+        mock_repo.create_promotion_async.return_value = make_promotion_doc()
+
+        await service.create_promotion_async(
+            promotion_code="PROMO-01",
+            promotion_type="category_discount",
+            name="Test Promo",
+            start_datetime=START,
+            end_datetime=END,
+            detail=make_category_detail(),
+        )
+
+        mock_pubsub.publish_message_async.assert_awaited_once()
+        kwargs = mock_pubsub.publish_message_async.call_args.kwargs
+        assert kwargs["pubsub_name"] == "pubsub-master-data"
+        assert kwargs["topic_name"] == "topic-master-data"
+        assert kwargs["message"]["tenant_id"] == "T001"
+        assert kwargs["message"]["promotion_code"] == "PROMO-01"
+        assert kwargs["message"]["operation"] == "create"
+
+    @pytest.mark.asyncio
+    async def test_update_and_delete_publish_change(self, service, mock_repo, mock_pubsub):
+        """Updating and deleting a promotion publish change events."""
+        mock_repo.get_promotion_by_code_async.return_value = make_promotion_doc()
+        mock_repo.update_promotion_async.return_value = make_promotion_doc(name="Updated")
+
+        await service.update_promotion_async("PROMO-01", {"name": "Updated"})
+        await service.delete_promotion_async("PROMO-01")
+
+        operations = [call.kwargs["message"]["operation"] for call in mock_pubsub.publish_message_async.call_args_list]
+        assert operations == ["update", "delete"]
+
+    @pytest.mark.asyncio
+    async def test_publish_failure_does_not_fail_update(self, service, mock_repo, mock_pubsub):
+        """A failed publish is logged only and the update result is returned."""
+        mock_pubsub.publish_message_async.return_value = (False, "dapr unavailable")
+        mock_repo.get_promotion_by_code_async.return_value = make_promotion_doc()
+        expected = make_promotion_doc(name="Updated")
+        mock_repo.update_promotion_async.return_value = expected
+
+        result = await service.update_promotion_async("PROMO-01", {"name": "Updated"})
+
+        assert result == expected
+
+    @pytest.mark.asyncio
+    async def test_failed_validation_does_not_publish(self, service, mock_repo, mock_pubsub):
+        """No event is published when the change is rejected."""
+        mock_repo.get_promotion_by_code_async.return_value = None
+
+        with pytest.raises(DocumentNotFoundException):
+            await service.delete_promotion_async("PROMO-XX")
+
+        mock_pubsub.publish_message_async.assert_not_awaited()
@@ -11,8 +11,17 @@ from kugel_common.schemas.api_response import ApiResponse
 from kugel_common.security import get_tenant_id_with_security_by_query_optional, verify_tenant_id
 from kugel_common.status_codes import StatusCodes
 from kugel_common.models.documents.base_tranlog import BaseTransaction
-from kugel_common.utils.http_client_helper import get_service_client
+from kugel_common.utils.http_client_helper import get_pooled_client
 from kugel_common.utils.service_auth import create_service_token
+from kugel_common.utils.delivery_status_notifier import delivery_status_notifier
+from kugel_common.utils.bulk_subscribe import (
+    BULK_STATUS_DROP,
+    BULK_STATUS_RETRY,
+    BULK_STATUS_SUCCESS,
+    BulkEntry,
+    get_bulk_entries,
+    make_bulk_response,
+)
 
 from app.api.v1.schemas_transformer import SchemasTransformerV1
 from app.api.v1.schemas import TranResponse
@@ -24,6 +33,7 @@ from app.models.documents.cash_in_out_log import CashInOutLog
 from app.models.repositories.cash_in_out_log_repository import CashInOutLogRepository
 from app.models.documents.open_close_log import OpenCloseLog
 from app.models.repositories.open_close_log_repository import OpenCloseLogRepository
+from app.models.repositories.sales_aggregate_repository import SalesAggregateRepository
 from app.config.settings import settings
 from app.exceptions import ExternalServiceException
 from app.utils.state_store_manager import state_store_manager
@@ -87,6 +97,7 @@ async def get_log_service(tenant_id: str = Path(...)) -> LogService:
         tran_repository=TranlogRepository(db=db, tenant_id=tenant_id),
         cash_in_out_log_repository=CashInOutLogRepository(db=db, tenant_id=tenant_id),
         open_close_log_repository=OpenCloseLogRepository(db=db, tenant_id=tenant_id),
+        sales_aggregate_repository=SalesAggregateRepository(db=db, tenant_id=tenant_id),
     )
 
 
@@ -122,6 +133,7 @@ async def get_log_service_from_request(request: Request) -> LogService:
         tran_repository=TranlogRepository(db=db, tenant_id=tenant_id),
         cash_in_out_log_repository=CashInOutLogRepository(db=db, tenant_id=tenant_id),
         open_close_log_repository=OpenCloseLogRepository(db=db, tenant_id=tenant_id),
+        sales_aggregate_repository=SalesAggregateRepository(db=db, tenant_id=tenant_id),
     )
 
 
@@ -203,6 +215,116 @@ async def handle_log(request: Request, log_type: str, log_model: BaseModel, rece
         }, status.HTTP_500_INTERNAL_SERVER_ERROR
 
 
+async def handle_logs_bulk(
+    entries: list[BulkEntry], log_type: str, log_model: type[BaseModel], receive_logs_method, receive_method
+) -> dict[str, str]:
+    """
+    Handle a batch of logs delivered by Dapr bulk subscribe.
+
+    The processed messages are looked up in the statestore with one request, and the new logs
+    of each tenant are stored with one call of receive_logs_method. If the batch cannot be stored,
+    its logs are stored one by one, so that only the failing logs are delivered again.
+
+    Args:
+        entries: The entries of the bulk delivery
+        log_type: The type of log (e.g., "tranlog")
+        log_model: The Pydantic model for the log data
+        receive_logs_method: LogService method storing a list of logs in one transaction
+        receive_method: LogService method storing one log
+    Returns:
+        dict[str, str]: The status of each entry by entry ID
+    """
+    statuses: dict[str, str] = {}
+    entry_ids: dict[str, list[str]] = {}  # entry IDs of each event ID, a message may be delivered twice
+    messages: dict[str, tuple[dict, BaseModel]] = {}
+    for entry in entries:
+        data = entry.data or {}
+        if data.get("test") == "health-check":
+            statuses[entry.entry_id] = BULK_STATUS_SUCCESS
+            continue
+        event_id = data.get("event_id")
+        if not event_id or not data.get("tenant_id"):
+            logger.error(f"event_id and tenant_id are required in the message data. entry_id: {entry.entry_id}")
+            statuses[entry.entry_id] = BULK_STATUS_DROP
+            continue
+        if event_id in entry_ids:
+            entry_ids[event_id].append(entry.entry_id)
+            continue
+        try:
+            messages[event_id] = (data, log_model(**data))
+        except Exception as e:
+            err_message = f"Failed to receive {log_type}. message: {data}, Error: {e}"
+            logger.error(err_message)
+            statuses[entry.entry_id] = BULK_STATUS_RETRY
+            await _notify_pubsub_status_safe(log_type, data, "failed", err_message)
+            continue
+        entry_ids[event_id] = [entry.entry_id]
+
+    def set_status(event_id: str, entry_status: str) -> None:
+        for entry_id in entry_ids[event_id]:
+            statuses[entry_id] = entry_status
+
+    # Check which messages have already been processed
+    processed, error = await state_store_manager.get_states(list(messages))
+    if error:
+        logger.error(f"Error checking for duplicates: {error}. Proceeding with {len(messages)} messages")
+    event_ids_by_tenant: dict[str, list[str]] = {}
+    for event_id, (data, _) in messages.items():
+        if event_id in processed:
+            logger.warning(f"Message already processed. event_id: {event_id}")
+            set_status(event_id, BULK_STATUS_SUCCESS)
+            continue
+        event_ids_by_tenant.setdefault(data["tenant_id"], []).append(event_id)
+
+    for tenant_id, event_ids in event_ids_by_tenant.items():
+        log_service = await get_log_service(tenant_id)
+        try:
+            await receive_logs_method(log_service, [messages[event_id][1] for event_id in event_ids])
+            received_event_ids = event_ids
+        except Exception as e:
+            logger.warning(f"Failed to receive {len(event_ids)} {log_type} in one batch, receiving one by one: {e}")
+            received_event_ids = []
+            for event_id in event_ids:
+                data, log_data = messages[event_id]
+                try:
+                    await receive_method(log_service, log_data)
+                    received_event_ids.append(event_id)
+                except Exception as e:
+                    err_message = f"Failed to receive {log_type}. event_id: {event_id}, Error: {e}"
+                    logger.error(err_message)
+                    set_status(event_id, BULK_STATUS_RETRY)
+                    await _notify_pubsub_status_safe(log_type, data, "failed", err_message)
+
+        for event_id in received_event_ids:
+            set_status(event_id, BULK_STATUS_SUCCESS)
+            await _notify_pubsub_status_safe(log_type, messages[event_id][0], "received")
+        if received_event_ids:
+            # Save the states to prevent duplicate processing
+            success, error = await state_store_manager.save_states(
+                {event_id: {"event_id": event_id} for event_id in received_event_ids}
+            )
+            if not success:
+                logger.error(f"Failed to save states. error: {error}")
+        logger.info(f"{log_type} received in bulk. tenant_id: {tenant_id}, received: {len(received_event_ids)}")
+
+    return statuses
+
+
+async def _notify_pubsub_status_safe(log_type: str, data_dict: dict, status: str, message: str = "") -> None:
+    """
+    Notify the Pub/Sub service about the status of a log received in bulk, logging any error.
+    The log stays undelivered in the delivery status of the publisher, which republishes it.
+    """
+    try:
+        await _notify_pubsub_status(log_type=log_type, data_dict=data_dict, status=status, message=message)
+    except Exception as e:
+        logger.error(f"Failed to notify the status of event_id: {data_dict.get('event_id')}, Error: {e}")
+
+
+# Services publishing the logs, which are notified about their delivery status
+_LOG_PUBLISHER_SERVICES = {"tranlog": "cart", "cashlog": "terminal", "opencloselog": "terminal"}
+
+
 async def _notify_pubsub_status(log_type: str, data_dict: dict, status: str, message: str = "") -> None:
     """
     Notify the Pub/Sub service about the status of a transaction log.
@@ -216,7 +338,17 @@ async def _notify_pubsub_status(log_type: str, data_dict: dict, status: str, mes
     # Implementation for notifying the Pub/Sub service
     # This is a placeholder and should be replaced with actual notification logic
     try:
-        if log_type == "tranlog":
+        if settings.USE_DELIVERY_STATUS_BATCH and log_type in _LOG_PUBLISHER_SERVICES:
+            # sent to the publisher in one bulk request with the statuses of other messages
+            delivery_status_notifier.notify(
+                target_service=_LOG_PUBLISHER_SERVICES[log_type],
+                tenant_id=data_dict["tenant_id"],
+                service_name="report",
+                event_id=data_dict["event_id"],
+                status=status,
+                message=message,
+            )
+        elif log_type == "tranlog":
             await _notify_pubsub_status_tranlog_async(data_dict, status, message)
         elif log_type == "cashlog":
             await _notify_pubsub_status_terminallog_async(data_dict, status, message)
@@ -268,10 +400,10 @@ async def _notify_pubsub_status_tranlog_async(tran_dict: dict, status: str, mess
 
     payload = {"event_id": event_id, "service": service_name, "status": status, "message": message}
 
-    async with get_service_client(service_name="cart") as client:
-        params = {"terminal_id": terminal_id}
-        endpoint = f"/tenants/{tenant_id}/stores/{store_code}/terminals/{terminal_no_str}/transactions/{transaction_no_str}/delivery-status"
-        await client.post(endpoint=endpoint, headers=headers, params=params, json=payload)
+    client = await get_pooled_client(service_name="cart")
+    params = {"terminal_id": terminal_id}
+    endpoint = f"/tenants/{tenant_id}/stores/{store_code}/terminals/{terminal_no_str}/transactions/{transaction_no_str}/delivery-status"
+    await client.post(endpoint=endpoint, headers=headers, params=params, json=payload)
 
     logger.info(f"tranlog Pub/Sub service notified successfully. event_id: {event_id}, json: {payload}")
     return None
@@ -310,10 +442,10 @@ async def _notify_pubsub_status_terminallog_async(terminal_dict: dict, status: s
 
     payload = {"event_id": event_id, "service": service_name, "status": status, "message": message}
 
-    async with get_service_client(service_name="terminal") as client:
-        params = {"terminal_id": terminal_id}
-        endpoint = f"/terminals/{terminal_id}/delivery-status"
-        await client.post(endpoint=endpoint, headers=headers, params=params, json=payload)
+    client = await get_pooled_client(service_name="terminal")
+    params = {"terminal_id": terminal_id}
+    endpoint = f"/terminals/{terminal_id}/delivery-status"
+    await client.post(endpoint=endpoint, headers=headers, params=params, json=payload)
 
     logger.info(f"terminallog Pub/Sub service notified successfully. event_id: {event_id}, json: {payload}")
     return None
@@ -345,6 +477,28 @@ async def handle_tranlog(request: Request, log_service: LogService = Depends(get
     return await handle_log(request, "tranlog", BaseTransaction, log_service.receive_tranlog_async)
 
 
+@router.post("/tranlog/bulk")
+async def handle_tranlog_bulk(request: Request):
+    """
+    Handle batches of transaction logs received via Dapr bulk subscribe.
+
+    This endpoint is called by Dapr with up to BULK_SUBSCRIBE_MAX_MESSAGES messages of
+    the 'topic-tranlog' topic when bulk subscribe is enabled. The transaction logs of
+    each tenant are stored with one transaction per batch.
+
+    Args:
+        request: The FastAPI request containing the bulk pub/sub message
+
+    Returns:
+        dict: The status of each entry of the batch
+    """
+    entries = get_bulk_entries(await request.json())
+    statuses = await handle_logs_bulk(
+        entries, "tranlog", BaseTransaction, LogService.receive_tranlogs_async, LogService.receive_tranlog_async
+    )
+    return make_bulk_response(statuses)
+
+
 @router.post("/cashlog")
 async def handle_cashlog(request: Request, log_service: LogService = Depends(get_log_service_from_request)):
     """
@@ -27,6 +27,25 @@ class Settings(
     MONGODB_URI: str = Field(default="mongodb://localhost:27017/?replicaSet=rs0")
     DB_NAME_PREFIX: str = Field(default="db_report")
 
+    # Sales aggregate settings
+    UPDATE_SALES_AGGREGATES: bool = Field(
+        default=True,
+        description="Update the materialized sales aggregates when a transaction log is received",
+    )
+    USE_SALES_AGGREGATES: bool = Field(
+        default=False,
+        description="Generate sales reports from the sales aggregates instead of aggregating the transaction logs. "
+        "Enable after the aggregates of existing transaction logs have been rebuilt "
+        "(python -m app.tools.rebuild_sales_aggregates)",
+    )
+
+    # Plugin settings
+    USE_PLUGIN_REGISTRY: bool = Field(
+        default=True,
+        description="Keep the report plugin configuration and classes in the process-wide plugin registry "
+        "instead of reading plugins.json for every report",
+    )
+
     DEBUG: str = "false"
     DEBUG_PORT: int = 5678
 
@@ -7,3 +7,4 @@ class DBCollectionSettings(BaseSettings):
     DB_COLLECTION_NAME_CASH_IN_OUT_LOG: str = "log_cash_in_out"
     DB_COLLECTION_NAME_OPEN_CLOSE_LOG: str = "log_open_close"
     DB_COLLECTION_NAME_DAILY_INFO: str = "info_daily"
+    DB_COLLECTION_NAME_SALES_AGGREGATE: str = "sales_aggregates"
@@ -88,12 +88,70 @@ async def create_request_log_collection(tenant_id: str):
     )
 
 
+# index of the sales aggregates, the idempotent upsert of SalesAggregateRepository relies on it being unique
+SALES_AGGREGATE_INDEX = {
+    "keys": {
+        "tenant_id": 1,
+        "store_code": 1,
+        "terminal_no": 1,
+        "business_date": 1,
+        "open_counter": 1,
+        "transaction_type": 1,
+    },
+    "unique": True,
+}
+
+
+# create sales aggregate collection
+async def create_sales_aggregate_collection(tenant_id: str):
+    name = settings.DB_COLLECTION_NAME_SALES_AGGREGATE
+    index_key_list = [SALES_AGGREGATE_INDEX]
+    await create_some_collection(
+        tenant_id=tenant_id, collection_name=name, index_keys_list=index_key_list, index_name=name + "_index"
+    )
+
+
+# add the sales aggregate index to an existing tenant, creating the collection if needed
+async def update_sales_aggregate_indexes(tenant_id: str):
+    name = settings.DB_COLLECTION_NAME_SALES_AGGREGATE
+    db = await db_helper.get_db_async(f"{settings.DB_NAME_PREFIX}_{tenant_id}")
+    await db_helper.create_collection_async(collection_name=name, db=db)
+    keys = SALES_AGGREGATE_INDEX["keys"]
+    # same name as create_collection_with_indexes_async gives it, so this is a no-op if it exists
+    index_name = name + "_index_" + "_".join(keys.keys())
+    command = db_helper.create_indexes_command(
+        collection_name=name, index_keys=keys, index_name=index_name, unique=SALES_AGGREGATE_INDEX["unique"]
+    )
+    await db_helper.execute_command_async(command=command, db=db)
+
+
+# add the sales aggregate index to all existing tenants
+async def update_sales_aggregate_indexes_for_all_tenants():
+    client = await db_helper.get_client_async()
+    prefix = f"{settings.DB_NAME_PREFIX}_"
+    for db_name in await client.list_database_names():
+        tenant_id = db_name[len(prefix) :] if db_name.startswith(prefix) else None
+        if not tenant_id:
+            continue
+        collection_names = await client[db_name].list_collection_names()
+        if settings.DB_COLLECTION_NAME_TRAN not in collection_names:
+            continue
+        try:
+            await update_sales_aggregate_indexes(tenant_id)
+        except Exception as e:
+            # the other tenants are migrated anyway, the failed one is retried on the next startup.
+            # duplicate aggregates stored without the index are removed by rebuilding them
+            # (python -m app.tools.rebuild_sales_aggregates)
+            logger.error(f"Failed to update the sales aggregate indexes for tenant_id:{tenant_id}: {e}")
+
+
 # create all collections
 async def create_collections(tenant_id: str):
     await create_tran_collection(tenant_id)
     await create_cash_in_out_log_collection(tenant_id)
     await create_open_close_log_collection(tenant_id)
     await create_request_log_collection(tenant_id)
+    await create_sales_aggregate_collection(tenant_id)
 
     # add more collections here
 
@@ -40,7 +40,8 @@ async def get_requesting_staff_id(
         # If using API key authentication with terminal
         if terminal_id and api_key:
             logger.debug(f"Getting staff info from terminal: {terminal_id}")
-            terminal_info = await get_terminal_info(terminal_id, api_key)
+            # the staff signs in and out during the day, so the cached terminal info may be stale
+            terminal_info = await get_terminal_info(terminal_id, api_key, use_cache=False)
 
             # Extract staff ID from terminal info if available
             if terminal_info and terminal_info.staff:
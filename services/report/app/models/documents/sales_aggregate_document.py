@@ -0,0 +1,58 @@
+# Copyright 2025 masa@kugel  # # Licensed under the Apache License, Version 2.0 (the "License");  # you may not use this file except in compliance with the License.  # You may obtain a copy of the License at  # #     http://www.apache.org/licenses/LICENSE-2.0  # # Unless required by applicable law or agreed to in writing, software  # distributed under the License is distributed on an "AS IS" BASIS,  # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  # See the License for the specific language governing permissions and  # limitations under the License.
+from typing import Optional
+
+from kugel_common.models.documents.abstract_document import AbstractDocument
+from kugel_common.models.documents.base_document_model import BaseDocumentModel
+
+
+class SalesAggregateDocument(AbstractDocument):
+    """
+    Document class representing the materialized sales totals of one transaction type.
+
+    One document exists per tenant, store, terminal, business date, open counter and
+    transaction type. The totals are incremented when a transaction log is received,
+    so sales reports can be generated without aggregating the transaction logs.
+    The transaction numbers already applied are kept to make the update idempotent.
+    """
+
+    class TaxAggregate(BaseDocumentModel):
+        """
+        Nested class representing the totals of one tax code.
+        """
+
+        tax_name: Optional[str] = None  # Name of the tax
+        tax_amount: Optional[float] = 0.0  # Total tax amount
+        target_amount: Optional[float] = 0.0  # Total amount subject to the tax
+        target_quantity: Optional[int] = 0  # Total quantity subject to the tax
+
+    class PaymentAggregate(BaseDocumentModel):
+        """
+        Nested class representing the totals of one payment code.
+        """
+
+        description: Optional[str] = None  # Description of the payment method
+        amount: Optional[float] = 0.0  # Total payment amount
+        count: Optional[int] = 0  # Number of payments
+
+    tenant_id: Optional[str] = None  # Identifier for the tenant
+    store_code: Optional[str] = None  # Identifier for the store
+    terminal_no: Optional[int] = None  # Terminal number
+    business_date: Optional[str] = None  # Business date (YYYYMMDD)
+    open_counter: Optional[int] = None  # Counter for terminal open/close cycles
+    transaction_type: Optional[int] = None  # Transaction type
+    total_amount: Optional[float] = 0.0
+    total_amount_with_tax: Optional[float] = 0.0
+    total_tax_amount: Optional[float] = 0.0  # Sum of the tax amounts of all taxes
+    total_quantity: Optional[int] = 0
+    total_change_amount: Optional[float] = 0.0
+    total_discount_amount: Optional[float] = 0.0
+    total_line_items_discount_amount: Optional[float] = 0.0
+    total_line_items_discount_count: Optional[int] = 0
+    total_line_items_discount_quantity: Optional[int] = 0
+    total_sub_total_discount_amount: Optional[float] = 0.0
+    total_sub_total_discount_count: Optional[int] = 0
+    total_sub_total_discount_quantity: Optional[int] = 0
+    total_transaction_count: Optional[int] = 0
+    taxes: Optional[dict[str, TaxAggregate]] = {}  # Totals keyed by tax code
+    payments: Optional[dict[str, PaymentAggregate]] = {}  # Totals keyed by payment code
+    transaction_nos: Optional[list[int]] = []  # Transaction numbers already applied
@@ -2,7 +2,7 @@
 from typing import Optional, Dict
 import logging
 
-from kugel_common.utils.http_client_helper import get_service_client, HttpClientError
+from kugel_common.utils.http_client_helper import get_pooled_client, HttpClientError
 from kugel_common.utils.service_auth import create_service_token
 from kugel_common.exceptions import ServiceException
 from app.exceptions import CategoryMasterDataNotFoundException
@@ -43,42 +43,42 @@ class CategoryMasterWebRepository:
             logger.info(f"Getting categories from master-data service for tenant {self.tenant_id}")
             logger.info(f"Master data base URL: {self.master_data_base_url}")
             
-            async with get_service_client("master-data") as client:
-                service_token = create_service_token(self.tenant_id, "report")
-                headers = {
-                    "Authorization": f"Bearer {service_token}",
-                    "X-Tenant-ID": self.tenant_id
-                }
-                logger.debug(f"Request headers: {headers}")
-                
-                url = f"{self.master_data_base_url}/tenants/{self.tenant_id}/categories"
-                logger.info(f"Requesting categories from URL: {url}")
-                # HttpClientHelper.get() returns the JSON data directly, not a response object
-                data = await client.get(url, headers=headers)
+            client = await get_pooled_client("master-data")
+            service_token = create_service_token(self.tenant_id, "report")
+            headers = {
+                "Authorization": f"Bearer {service_token}",
+                "X-Tenant-ID": self.tenant_id
+            }
+            logger.debug(f"Request headers: {headers}")
+            
+            url = f"{self.master_data_base_url}/tenants/{self.tenant_id}/categories"
+            logger.info(f"Requesting categories from URL: {url}")
+            # HttpClientHelper.get() returns the JSON data directly, not a response object
+            data = await client.get(url, headers=headers)
+            
+            logger.info(f"Received response from master-data service: success={data.get('success')}, data count={len(data.get('data', []))}")
+            logger.debug(f"Full response data: {data}")
+            
+            # Check if the response was successful
+            if data.get("success") and data.get("data"):
+                # Extract category code to description mapping
+                category_map = {}
+                for category in data["data"]:
+                    logger.debug(f"Processing category: {category}")
+                    category_code = category.get("categoryCode")
+                    description = category.get("description")
+                    logger.debug(f"Category mapping: {category_code} -> {description}")
+                    category_map[category_code] = description if description else category_code
                 
-                logger.info(f"Received response from master-data service: success={data.get('success')}, data count={len(data.get('data', []))}")
-                logger.debug(f"Full response data: {data}")
+                logger.info(f"Final category mapping: {category_map}")
+                return category_map
+            else:
+                logger.error(f"Failed to get categories: {data}")
+                raise CategoryMasterDataNotFoundException(
+                    f"Failed to retrieve category master data: {data.get('message', 'Unknown error')}",
+                    logger
+                )
                 
-                # Check if the response was successful
-                if data.get("success") and data.get("data"):
-                    # Extract category code to description mapping
-                    category_map = {}
-                    for category in data["data"]:
-                        logger.debug(f"Processing category: {category}")
-                        category_code = category.get("categoryCode")
-                        description = category.get("description")
-                        logger.debug(f"Category mapping: {category_code} -> {description}")
-                        category_map[category_code] = description if description else category_code
-                    
-                    logger.info(f"Final category mapping: {category_map}")
-                    return category_map
-                else:
-                    logger.error(f"Failed to get categories: {data}")
-                    raise CategoryMasterDataNotFoundException(
-                        f"Failed to retrieve category master data: {data.get('message', 'Unknown error')}",
-                        logger
-                    )
-                    
         except HttpClientError as e:
             logger.error(f"HTTP client error while getting categories: {e}")
             raise CategoryMasterDataNotFoundException(
@@ -2,13 +2,19 @@
 from typing import Optional, Dict, List
 import logging
 
-from kugel_common.utils.http_client_helper import get_service_client, HttpClientError
+from kugel_common.utils.http_client_helper import get_pooled_client, HttpClientError
 from kugel_common.utils.service_auth import create_service_token
 from kugel_common.exceptions import ServiceException
 from app.exceptions.report_exceptions import ItemMasterDataNotFoundException
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of items requested from master-data at once
+ITEM_CODES_PER_REQUEST = 1000
+
+# Item fields used by the reports, the only ones returned by master-data
+ITEM_FIELDS = ["itemCode", "description", "categoryCode"]
+
 
 class ItemMasterWebRepository:
     """
@@ -33,6 +39,10 @@ class ItemMasterWebRepository:
         """
         Retrieve items for the tenant as a mapping of item code to item details.
 
+        The item codes are sent in the body of the master-data item search, at most
+        ITEM_CODES_PER_REQUEST per request, and only the fields used by the reports
+        are read and returned by master-data.
+
         Args:
             item_codes: Optional list of specific item codes to retrieve.
                        If None, retrieves all items.
@@ -46,40 +56,45 @@ class ItemMasterWebRepository:
             ItemMasterDataNotFoundException: If item data cannot be retrieved
         """
         try:
-            async with get_service_client("master-data") as client:
-                service_token = create_service_token(self.tenant_id, "report")
-                headers = {
-                    "Authorization": f"Bearer {service_token}",
-                    "X-Tenant-ID": self.tenant_id
+            client = await get_pooled_client("master-data")
+            service_token = create_service_token(self.tenant_id, "report")
+            headers = {
+                "Authorization": f"Bearer {service_token}",
+                "X-Tenant-ID": self.tenant_id
+            }
+
+            url = f"{self.master_data_base_url}/tenants/{self.tenant_id}/items"
+            items = []
+            if item_codes:
+                unique_codes = list(dict.fromkeys(item_codes))
+                for start in range(0, len(unique_codes), ITEM_CODES_PER_REQUEST):
+                    chunk = unique_codes[start : start + ITEM_CODES_PER_REQUEST]
+                    payload = {"itemCodes": chunk, "fields": ITEM_FIELDS, "limit": len(chunk), "page": 1}
+                    # HttpClientHelper.post() returns the JSON data directly, not a response object
+                    data = await client.post(f"{url}/search", headers=headers, json=payload)
+                    items.extend(self.__get_data(data))
+            else:
+                page = 1
+                while True:
+                    params = {"fields": ",".join(ITEM_FIELDS), "limit": ITEM_CODES_PER_REQUEST, "page": page}
+                    data = await client.get(url, headers=headers, params=params)
+                    items.extend(self.__get_data(data))
+                    total = (data.get("metadata") or {}).get("total") or 0
+                    if page * ITEM_CODES_PER_REQUEST >= total:
+                        break
+                    page += 1
+
+            # Extract item code to item details mapping
+            item_map = {}
+            for item in items:
+                item_map[item["itemCode"]] = {
+                    "name": item.get("description") or item["itemCode"],
+                    "category_code": item.get("categoryCode") or ""
                 }
-                
-                url = f"{self.master_data_base_url}/tenants/{self.tenant_id}/items"
-                
-                # Add item codes as query parameters if specified
-                params = {}
-                if item_codes:
-                    params["item_codes"] = ",".join(item_codes)
-                
-                # HttpClientHelper.get() returns the JSON data directly, not a response object
-                data = await client.get(url, headers=headers, params=params)
-                
-                # Check if the response was successful
-                if data.get("success") and data.get("data"):
-                    # Extract item code to item details mapping
-                    item_map = {}
-                    for item in data["data"]:
-                        item_map[item["itemCode"]] = {
-                            "name": item.get("itemName", item["itemCode"]),
-                            "category_code": item.get("categoryCode", "")
-                        }
-                    return item_map
-                else:
-                    logger.error(f"Failed to get items: {data}")
-                    raise ItemMasterDataNotFoundException(
-                        f"Failed to retrieve item master data: {data.get('message', 'Unknown error')}",
-                        logger
-                    )
-                    
+            return item_map
+
+        except ItemMasterDataNotFoundException:
+            raise
         except HttpClientError as e:
             logger.error(f"HTTP client error while getting items: {e}")
             raise ItemMasterDataNotFoundException(
@@ -93,4 +108,25 @@ class ItemMasterWebRepository:
                 f"Unexpected error retrieving item data: {str(e)}",
                 logger,
                 e
-            ) from e
\ No newline at end of file
+            ) from e
+
+    def __get_data(self, data: dict) -> list[dict]:
+        """
+        Get the items of a master-data response.
+
+        Args:
+            data: The JSON response of master-data
+
+        Returns:
+            list[dict]: The items, empty if none of the requested items exists
+
+        Raises:
+            ItemMasterDataNotFoundException: If the request was not successful
+        """
+        if not data.get("success"):
+            logger.error(f"Failed to get items: {data}")
+            raise ItemMasterDataNotFoundException(
+                f"Failed to retrieve item master data: {data.get('message', 'Unknown error')}",
+                logger
+            )
+        return data.get("data") or []
@@ -0,0 +1,326 @@
+# Copyright 2025 masa@kugel  # # Licensed under the Apache License, Version 2.0 (the "License");  # you may not use this file except in compliance with the License.  # You may obtain a copy of the License at  # #     http://www.apache.org/licenses/LICENSE-2.0  # # Unless required by applicable law or agreed to in writing, software  # distributed under the License is distributed on an "AS IS" BASIS,  # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  # See the License for the specific language governing permissions and  # limitations under the License.
+from typing import Any
+from logging import getLogger
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+
+from kugel_common.models.repositories.abstract_repository import AbstractRepository
+from kugel_common.models.documents.base_tranlog import BaseTransaction
+from kugel_common.exceptions import CannotCreateException, RepositoryException
+from kugel_common.utils.misc import get_app_time
+
+from app.config.settings import settings
+from app.models.documents.sales_aggregate_document import SalesAggregateDocument
+
+logger = getLogger(__name__)
+
+# Numeric totals of the aggregate document, in the order of the sales report pipeline result
+SALES_TOTAL_FIELDS = [
+    "total_amount",
+    "total_amount_with_tax",
+    "total_tax_amount",
+    "total_quantity",
+    "total_change_amount",
+    "total_discount_amount",
+    "total_line_items_discount_amount",
+    "total_line_items_discount_count",
+    "total_line_items_discount_quantity",
+    "total_sub_total_discount_amount",
+    "total_sub_total_discount_count",
+    "total_sub_total_discount_quantity",
+    "total_transaction_count",
+]
+
+
+class SalesAggregateRepository(AbstractRepository[SalesAggregateDocument]):
+    """
+    Repository for the materialized sales aggregates.
+
+    This class applies received transaction logs to the aggregate document of their
+    terminal, business date, open counter and transaction type, and reads the aggregates
+    back in the same shape as the result of the sales report aggregation pipeline.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase, tenant_id: str):
+        """
+        Initialize the sales aggregate repository.
+
+        Args:
+            db: AsyncIOMotorDatabase instance for database operations
+            tenant_id: Identifier for the tenant
+        """
+        super().__init__(settings.DB_COLLECTION_NAME_SALES_AGGREGATE, SalesAggregateDocument, db)
+        self.tenant_id = tenant_id
+
+    async def apply_tranlog_async(self, tranlog: BaseTransaction) -> bool:
+        """
+        Add a transaction log to its sales aggregate with one atomic upsert.
+
+        The update only matches an aggregate that does not contain the transaction number yet,
+        so a redelivered transaction log is not counted twice. Cancelled transactions are not
+        aggregated, the same as in the sales report pipeline.
+
+        Args:
+            tranlog: Transaction log document to add
+
+        Returns:
+            True if the aggregate was updated, False if the transaction was skipped or already applied
+
+        Raises:
+            CannotCreateException: If the aggregate cannot be updated
+        """
+        if tranlog.sales is None or tranlog.sales.is_cancelled:
+            return False
+
+        if self.dbcollection is None:
+            await self.initialize()
+
+        key = self.__make_key(tranlog)
+        filter = dict(key, transaction_nos={"$ne": tranlog.transaction_no})
+        update = self.make_tranlog_update(tranlog)
+        update["$set"]["shard_key"] = self.__get_shard_key(tranlog)
+        update["$set"]["updated_at"] = get_app_time()
+        update["$setOnInsert"] = {"created_at": get_app_time()}
+        update["$push"] = {"transaction_nos": tranlog.transaction_no}
+
+        # The second attempt only happens if a concurrent upsert created the aggregate first
+        for _ in range(2):
+            try:
+                await self.dbcollection.update_one(filter, update, upsert=True)
+                return True
+            except DuplicateKeyError:
+                # the filter did not match an existing aggregate: either it already contains
+                # the transaction, or it was inserted by a concurrent upsert
+                if await self.dbcollection.find_one(dict(key, transaction_nos=tranlog.transaction_no), {"_id": 1}):
+                    logger.warning(
+                        f"Transaction already aggregated. key->{key}, transaction_no->{tranlog.transaction_no}"
+                    )
+                    return False
+            except Exception as e:
+                message = f"Failed to update sales aggregate: key->{key}, transaction_no->{tranlog.transaction_no}"
+                raise CannotCreateException(message, self.collection_name, key, logger, e) from e
+
+        message = f"Failed to update sales aggregate after retry: key->{key}, transaction_no->{tranlog.transaction_no}"
+        raise CannotCreateException(message, self.collection_name, key, logger)
+
+    @staticmethod
+    def make_tranlog_update(tranlog: BaseTransaction) -> dict[str, Any]:
+        """
+        Create the update adding one transaction to its aggregate.
+
+        The values are calculated the same way as the per-transaction values of the sales
+        report pipeline: taxes and payments are de-duplicated per transaction, and the tax
+        amount is the sum of the tax amounts in the taxes array.
+
+        Args:
+            tranlog: Transaction log document
+
+        Returns:
+            Dictionary with the $inc and $set operators of the update
+        """
+        line_items = tranlog.line_items or []
+        subtotal_discounts = tranlog.subtotal_discounts or []
+        taxes = list(
+            dict.fromkeys(
+                (tax.tax_no, tax.tax_code, tax.tax_type, tax.tax_name, tax.tax_amount, tax.target_amount, tax.target_quantity)
+                for tax in tranlog.taxes or []
+            )
+        )
+        payments = list(
+            dict.fromkeys(
+                (payment.payment_no, payment.payment_code, payment.amount, payment.description)
+                for payment in tranlog.payments or []
+            )
+        )
+
+        inc = {
+            "total_amount": tranlog.sales.total_amount or 0,
+            "total_amount_with_tax": tranlog.sales.total_amount_with_tax or 0,
+            "total_tax_amount": sum(tax[4] or 0 for tax in taxes),
+            "total_quantity": tranlog.sales.total_quantity or 0,
+            "total_change_amount": tranlog.sales.change_amount or 0,
+            "total_discount_amount": tranlog.sales.total_discount_amount or 0,
+            "total_line_items_discount_amount": sum(
+                discount.discount_amount or 0 for line_item in line_items for discount in line_item.discounts or []
+            ),
+            "total_line_items_discount_count": sum(len(line_item.discounts or []) for line_item in line_items),
+            "total_line_items_discount_quantity": sum(
+                line_item.quantity or 0 for line_item in line_items if line_item.discounts
+            ),
+            "total_sub_total_discount_amount": sum(discount.discount_amount or 0 for discount in subtotal_discounts),
+            "total_sub_total_discount_count": len(subtotal_discounts),
+            "total_sub_total_discount_quantity": sum(
+                line_item.quantity or 0 for line_item in line_items if line_item.discounts_allocated
+            ),
+            "total_transaction_count": 1,
+        }
+        set_values = {}
+
+        for _, tax_code, _, tax_name, tax_amount, target_amount, target_quantity in taxes:
+            if tax_code is None:
+                continue
+            prefix = f"taxes.{tax_code}"
+            inc[f"{prefix}.tax_amount"] = inc.get(f"{prefix}.tax_amount", 0) + (tax_amount or 0)
+            inc[f"{prefix}.target_amount"] = inc.get(f"{prefix}.target_amount", 0) + (target_amount or 0)
+            inc[f"{prefix}.target_quantity"] = inc.get(f"{prefix}.target_quantity", 0) + (target_quantity or 0)
+            set_values[f"{prefix}.tax_name"] = tax_name
+
+        for _, payment_code, amount, description in payments:
+            if payment_code is None:
+                continue
+            prefix = f"payments.{payment_code}"
+            inc[f"{prefix}.amount"] = inc.get(f"{prefix}.amount", 0) + (amount or 0)
+            inc[f"{prefix}.count"] = inc.get(f"{prefix}.count", 0) + 1
+            set_values[f"{prefix}.description"] = description
+
+        return {"$inc": inc, "$set": set_values}
+
+    async def get_sales_results_async(
+        self,
+        store_code: str,
+        business_date: str,
+        terminal_no: int = None,
+        open_counter: int = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Sum the matching aggregates per transaction type.
+
+        Args:
+            store_code: Identifier for the store
+            business_date: Business date to filter by
+            terminal_no: Optional terminal number to filter by
+            open_counter: Optional counter for terminal open/close cycles
+
+        Returns:
+            List of results in the shape of the sales report pipeline result, one per transaction type
+
+        Raises:
+            RepositoryException: If the aggregates cannot be read
+        """
+        if self.dbcollection is None:
+            await self.initialize()
+
+        filter = {"tenant_id": self.tenant_id, "store_code": store_code, "business_date": business_date}
+        if terminal_no is not None:
+            filter["terminal_no"] = terminal_no
+        if open_counter is not None:
+            filter["open_counter"] = open_counter
+
+        try:
+            aggregates = await self.dbcollection.find(filter, {"_id": 0, "transaction_nos": 0}).to_list(None)
+        except Exception as e:
+            message = f"Failed to get sales aggregates: filter->{filter}"
+            raise RepositoryException(message, self.collection_name, logger, e) from e
+
+        results: dict[int, dict[str, Any]] = {}
+        for aggregate in aggregates:
+            transaction_type = aggregate["transaction_type"]
+            result = results.get(transaction_type)
+            if result is None:
+                result_id = {
+                    "tenant_id": self.tenant_id,
+                    "store_code": store_code,
+                    "business_date": business_date,
+                    "transaction_type": transaction_type,
+                }
+                if terminal_no is not None:
+                    result_id["terminal_no"] = terminal_no
+                result = {"_id": result_id, **{field: 0 for field in SALES_TOTAL_FIELDS}, "taxes": {}, "payments": {}}
+                results[transaction_type] = result
+
+            for field in SALES_TOTAL_FIELDS:
+                result[field] += aggregate.get(field, 0)
+            for tax_code, tax in (aggregate.get("taxes") or {}).items():
+                total = result["taxes"].setdefault(
+                    tax_code,
+                    {"tax_code": tax_code, "tax_name": tax.get("tax_name"), "tax_amount": 0, "target_amount": 0, "target_quantity": 0},
+                )
+                total["tax_amount"] += tax.get("tax_amount", 0)
+                total["target_amount"] += tax.get("target_amount", 0)
+                total["target_quantity"] += tax.get("target_quantity", 0)
+            for payment_code, payment in (aggregate.get("payments") or {}).items():
+                total = result["payments"].setdefault(
+                    payment_code,
+                    {"payment_code": payment_code, "description": payment.get("description"), "amount": 0, "count": 0},
+                )
+                total["amount"] += payment.get("amount", 0)
+                total["count"] += payment.get("count", 0)
+
+        for result in results.values():
+            result["taxes"] = list(result["taxes"].values())
+            result["payments"] = list(result["payments"].values())
+        return list(results.values())
+
+    async def delete_aggregates_async(
+        self, store_code: str, business_date: str, terminal_no: int, open_counter: int
+    ) -> int:
+        """
+        Delete the aggregates of a terminal, e.g. before rebuilding them.
+
+        Args:
+            store_code: Identifier for the store
+            business_date: Business date
+            terminal_no: Terminal number
+            open_counter: Counter for terminal open/close cycles
+
+        Returns:
+            Number of deleted aggregates
+
+        Raises:
+            RepositoryException: If the aggregates cannot be deleted
+        """
+        if self.dbcollection is None:
+            await self.initialize()
+
+        filter = {
+            "tenant_id": self.tenant_id,
+            "store_code": store_code,
+            "terminal_no": terminal_no,
+            "business_date": business_date,
+            "open_counter": open_counter,
+        }
+        try:
+            response = await self.dbcollection.delete_many(filter, session=self.session)
+            return response.deleted_count
+        except Exception as e:
+            message = f"Failed to delete sales aggregates: filter->{filter}"
+            raise RepositoryException(message, self.collection_name, logger, e) from e
+
+    def __make_key(self, tranlog: BaseTransaction) -> dict[str, Any]:
+        """
+        Create the unique key of the aggregate a transaction log belongs to.
+
+        Args:
+            tranlog: Transaction log document
+
+        Returns:
+            Dictionary of the key fields
+        """
+        return {
+            "tenant_id": tranlog.tenant_id,
+            "store_code": tranlog.store_code,
+            "terminal_no": tranlog.terminal_no,
+            "business_date": tranlog.business_date,
+            "open_counter": tranlog.open_counter,
+            "transaction_type": tranlog.transaction_type,
+        }
+
+    def __get_shard_key(self, tranlog: BaseTransaction) -> str:
+        """
+        Generate a shard key for database partitioning.
+
+        Creates a composite shard key from tenant ID, store code,
+        terminal number, and business date.
+
+        Args:
+            tranlog: Transaction log document
+
+        Returns:
+            String representation of the shard key
+        """
+        keys = []
+        keys.append(tranlog.tenant_id)
+        keys.append(tranlog.store_code)
+        keys.append(str(tranlog.terminal_no))
+        keys.append(tranlog.business_date)
+        return self.make_shard_key(keys)
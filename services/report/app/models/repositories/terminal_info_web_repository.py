@@ -2,7 +2,7 @@
 from fastapi import Depends
 
 from kugel_common.exceptions import RepositoryException, NotFoundException
-from kugel_common.utils.http_client_helper import get_service_client
+from kugel_common.utils.http_client_helper import get_pooled_client
 from kugel_common.models.documents.terminal_info_document import TerminalInfoDocument
 from app.config.settings import settings
 
@@ -54,38 +54,38 @@ class TerminalInfoWebRepository:
             NotFoundException: If terminals for the store cannot be found
             RepositoryException: If a communication error occurs
         """
-        async with get_service_client("terminal") as client:
-            headers = {}
-            params = {"store_code": self.store_code, "limit": 0, "page": 1, "sort": "terminal_no:1"}
-            if self.api_key is not None and self.terminal_id is not None:
-                headers["X-API-KEY"] = self.api_key
-                params["terminal_id"] = self.terminal_id
-            elif self.token is not None:
-                headers["Authorization"] = f"Bearer {self.token}"
-
-            endpoint = "/terminals"
-            logger.debug(f"endpoint: {endpoint}, params: {params}, headers: {headers}")
-
-            try:
-                response_data = await client.get(endpoint, params=params, headers=headers)
-            except Exception as e:
-                if hasattr(e, "status_code") and e.status_code == 404:
-                    message = f"Terminal not found for store code {self.store_code}"
-                    raise NotFoundException(
-                        message=message,
-                        collection_name="terminal web",
-                        find_key=self.store_code,
-                        logger=logger,
-                        original_exception=e,
-                    )
-                else:
-                    message = f"Request error for store code {self.store_code}"
-                    raise RepositoryException(
-                        message=message, collection_name="terminal web", logger=logger, original_exception=e
-                    )
-
-            logger.debug(f"response: {response_data}")
-            return [TerminalInfoDocument(**terminal) for terminal in response_data.get("data")]
+        client = await get_pooled_client("terminal")
+        headers = {}
+        params = {"store_code": self.store_code, "limit": 0, "page": 1, "sort": "terminal_no:1"}
+        if self.api_key is not None and self.terminal_id is not None:
+            headers["X-API-KEY"] = self.api_key
+            params["terminal_id"] = self.terminal_id
+        elif self.token is not None:
+            headers["Authorization"] = f"Bearer {self.token}"
+
+        endpoint = "/terminals"
+        logger.debug(f"endpoint: {endpoint}, params: {params}, headers: {headers}")
+
+        try:
+            response_data = await client.get(endpoint, params=params, headers=headers)
+        except Exception as e:
+            if hasattr(e, "status_code") and e.status_code == 404:
+                message = f"Terminal not found for store code {self.store_code}"
+                raise NotFoundException(
+                    message=message,
+                    collection_name="terminal web",
+                    find_key=self.store_code,
+                    logger=logger,
+                    original_exception=e,
+                )
+            else:
+                message = f"Request error for store code {self.store_code}"
+                raise RepositoryException(
+                    message=message, collection_name="terminal web", logger=logger, original_exception=e
+                )
+
+        logger.debug(f"response: {response_data}")
+        return [TerminalInfoDocument(**terminal) for terminal in response_data.get("data")]
 
     async def get_terminal_info_async(self, terminal_no: str) -> TerminalInfoDocument:
         """
@@ -104,36 +104,36 @@ class TerminalInfoWebRepository:
             NotFoundException: If the terminal cannot be found
             RepositoryException: If a communication error occurs
         """
-        async with get_service_client("terminal") as client:
-            headers = {}
-            params = {"store_code": self.store_code}
-
-            if self.api_key is not None:
-                headers["X-API-KEY"] = self.api_key
-            elif self.token is not None:
-                headers["Authorization"] = f"Bearer {self.token}"
-
-            terminal_id = f"{self.tenant_id}-{self.store_code}-{terminal_no}"
-            endpoint = f"/terminals/{terminal_id}"
-
-            try:
-                response_data = await client.get(endpoint, params=params, headers=headers)
-            except Exception as e:
-                if hasattr(e, "status_code") and e.status_code == 404:
-                    message = f"Terminal not found for id {terminal_id}"
-                    raise NotFoundException(
-                        message=message,
-                        collection_name="terminal web",
-                        find_key=terminal_id,
-                        logger=logger,
-                        original_exception=e,
-                    )
-                else:
-                    message = f"Request error for id {terminal_id}"
-                    raise RepositoryException(
-                        message=message, collection_name="terminal web", logger=logger, original_exception=e
-                    )
-
-            logger.debug(f"response: {response_data}")
-
-            return TerminalInfoDocument(**response_data.get("data"))
+        client = await get_pooled_client("terminal")
+        headers = {}
+        params = {"store_code": self.store_code}
+
+        if self.api_key is not None:
+            headers["X-API-KEY"] = self.api_key
+        elif self.token is not None:
+            headers["Authorization"] = f"Bearer {self.token}"
+
+        terminal_id = f"{self.tenant_id}-{self.store_code}-{terminal_no}"
+        endpoint = f"/terminals/{terminal_id}"
+
+        try:
+            response_data = await client.get(endpoint, params=params, headers=headers)
+        except Exception as e:
+            if hasattr(e, "status_code") and e.status_code == 404:
+                message = f"Terminal not found for id {terminal_id}"
+                raise NotFoundException(
+                    message=message,
+                    collection_name="terminal web",
+                    find_key=terminal_id,
+                    logger=logger,
+                    original_exception=e,
+                )
+            else:
+                message = f"Request error for id {terminal_id}"
+                raise RepositoryException(
+                    message=message, collection_name="terminal web", logger=logger, original_exception=e
+                )
+
+        logger.debug(f"response: {response_data}")
+
+        return TerminalInfoDocument(**response_data.get("data"))
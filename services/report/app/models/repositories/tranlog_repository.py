@@ -12,6 +12,9 @@ from app.config.settings import settings
 
 logger = getLogger(__name__)
 
+# Fields identifying a transaction log
+_TRANLOG_KEY_FIELDS = ("tenant_id", "store_code", "terminal_no", "transaction_no")
+
 
 class TranlogRepository(AbstractRepository[BaseTransaction]):
     """
@@ -79,6 +82,50 @@ class TranlogRepository(AbstractRepository[BaseTransaction]):
             )
             raise CannotCreateException(message, logger, e) from e
 
+    async def create_tranlogs_async(self, tranlogs: list[BaseTransaction]) -> list[BaseTransaction]:
+        """
+        Create new transaction logs in the database with one ordered bulk insert.
+
+        The transaction logs already stored are found with one query and skipped,
+        the same as in create_tranlog_async.
+
+        Args:
+            tranlogs: Transaction log documents to store
+
+        Returns:
+            The transaction log documents inserted
+
+        Raises:
+            CannotCreateException: If the transaction logs cannot be created
+        """
+        if self.dbcollection is None:
+            await self.initialize()
+        try:
+            keys = [self.__get_key(tranlog) for tranlog in tranlogs]
+            existing = await self.dbcollection.find(
+                {"$or": [dict(zip(_TRANLOG_KEY_FIELDS, key)) for key in keys]},
+                {field: 1 for field in _TRANLOG_KEY_FIELDS},
+                session=self.session,
+            ).to_list(None)
+            stored_keys = {tuple(doc[field] for field in _TRANLOG_KEY_FIELDS) for doc in existing}
+
+            new_tranlogs = []
+            for key, tranlog in zip(keys, tranlogs):
+                if key in stored_keys:
+                    logger.warning(f"Transaction already exists. transaction: {tranlog}")
+                    continue
+                stored_keys.add(key)
+                tranlog.shard_key = self.__get_shard_key(tranlog)
+                new_tranlogs.append(tranlog)
+
+            logger.debug(f"TranlogRepository.create_tranlogs_async: count->{len(new_tranlogs)}")
+            await self.create_many_async(new_tranlogs)
+            return new_tranlogs
+
+        except Exception as e:
+            message = f"Failed to create {len(tranlogs)} tranlogs: tenant_id->{self.tenant_id}"
+            raise CannotCreateException(message, self.collection_name, None, logger, e) from e
+
     # get tranlog list by query parameters
     async def get_tranlog_list_by_query_async(
         self,
@@ -130,6 +177,18 @@ class TranlogRepository(AbstractRepository[BaseTransaction]):
         )
         return await self.get_paginated_list_async(filter=query, limit=limit, page=page, sort=sort)
 
+    def __get_key(self, tranlog: BaseTransaction) -> tuple:
+        """
+        Get the values of the fields identifying a transaction log.
+
+        Args:
+            tranlog: Transaction log document
+
+        Returns:
+            Tuple of the values in the order of _TRANLOG_KEY_FIELDS
+        """
+        return tuple(getattr(tranlog, field) for field in _TRANLOG_KEY_FIELDS)
+
     def __get_shard_key(self, tranlog: BaseTransaction) -> str:
         """
         Generate a shard key for database partitioning.
@@ -10,6 +10,7 @@ from app.models.documents.open_close_log import OpenCloseLog
 from app.models.repositories.tranlog_repository import TranlogRepository
 from app.models.repositories.cash_in_out_log_repository import CashInOutLogRepository
 from app.models.repositories.open_close_log_repository import OpenCloseLogRepository
+from app.models.repositories.sales_aggregate_repository import SalesAggregateRepository
 from app.config.settings import settings
 
 logger = getLogger(__name__)
@@ -29,6 +30,7 @@ class LogService:
         tran_repository: TranlogRepository,
         cash_in_out_log_repository: CashInOutLogRepository,
         open_close_log_repository: OpenCloseLogRepository,
+        sales_aggregate_repository: SalesAggregateRepository = None,
     ) -> None:
         """
         Initialize the LogService with repositories for different log types.
@@ -37,15 +39,20 @@ class LogService:
             tran_repository: Repository for transaction logs
             cash_in_out_log_repository: Repository for cash in/out operation logs
             open_close_log_repository: Repository for terminal open/close logs
+            sales_aggregate_repository: Optional repository for the materialized sales aggregates
         """
         self.tran_repository = tran_repository
         self.cash_in_out_log_repository = cash_in_out_log_repository
         self.open_close_log_repository = open_close_log_repository
+        self.sales_aggregate_repository = sales_aggregate_repository
 
     async def receive_tranlog_async(self, tran: BaseTransaction) -> BaseTransaction:
         """
         Receive and store a transaction log.
 
+        The sales aggregate of the transaction is updated after the log is stored. The update is
+        idempotent, so a redelivered log only completes an update that failed before.
+
         Args:
             tran: Transaction log document to store
 
@@ -54,6 +61,8 @@ class LogService:
         """
         try:
             tran = await self.tran_repository.create_tranlog_async(tran)
+            if self.sales_aggregate_repository is not None and settings.UPDATE_SALES_AGGREGATES:
+                await self.sales_aggregate_repository.apply_tranlog_async(tran)
             return tran
         except Exception as e:
             message = f"Failed to create transaction log: {e}"
@@ -62,6 +71,37 @@ class LogService:
             await send_fatal_error_notification(message=message, error=e, service="report", context=tran.model_dump())
             raise e
 
+    async def receive_tranlogs_async(self, trans: list[BaseTransaction]) -> list[BaseTransaction]:
+        """
+        Receive and store a batch of transaction logs.
+
+        The transaction logs are stored with one ordered bulk insert in a single atomic
+        transaction for the whole batch. The sales aggregates are updated afterwards for
+        all logs of the batch, as in receive_tranlog_async.
+
+        Args:
+            trans: Transaction log documents to store
+
+        Returns:
+            The transaction log documents inserted, without those already stored
+
+        Raises:
+            Exception: If the batch cannot be stored or an aggregate cannot be updated
+        """
+        async with await self.tran_repository.start_transaction():
+            try:
+                return_trans = await self.tran_repository.create_tranlogs_async(trans)
+                await self.tran_repository.commit_transaction()
+            except Exception as e:
+                await self.tran_repository.abort_transaction()
+                logger.error(f"Failed to create {len(trans)} transaction logs: {e}")
+                raise e
+
+        if self.sales_aggregate_repository is not None and settings.UPDATE_SALES_AGGREGATES:
+            for tran in trans:
+                await self.sales_aggregate_repository.apply_tranlog_async(tran)
+        return return_trans
+
     async def receive_cashlog_async(self, cashlog: CashInOutLog) -> CashInOutLog:
         """
         Receive and store a cash in/out operation log.
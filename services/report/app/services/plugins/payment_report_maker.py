@@ -5,7 +5,7 @@ import os
 from datetime import datetime
 import pytz
 
-from kugel_common.utils.http_client_helper import get_service_client
+from kugel_common.utils.http_client_helper import get_pooled_client
 from kugel_common.utils.service_auth import create_service_token
 from app.models.repositories.tranlog_repository import TranlogRepository
 from app.models.repositories.cash_in_out_log_repository import CashInOutLogRepository
@@ -202,37 +202,37 @@ class PaymentReportMaker(IReportPlugin):
             # Call master-data API to get all payment methods
             # Note: In production, master-data is accessed via service mesh without auth
             # In local testing, we skip auth and use default payment mapping
-            async with get_service_client("master-data") as client:
-                # Create service token for authentication
-                service_token = create_service_token(tenant_id, "report")
-                headers = {
-                    "Authorization": f"Bearer {service_token}",
-                    "X-Tenant-ID": tenant_id,
-                    "X-Store-Code": store_code
+            client = await get_pooled_client("master-data")
+            # Create service token for authentication
+            service_token = create_service_token(tenant_id, "report")
+            headers = {
+                "Authorization": f"Bearer {service_token}",
+                "X-Tenant-ID": tenant_id,
+                "X-Store-Code": store_code
+            }
+                
+            # HttpClientHelper.get() returns the JSON data directly, not a response object
+            data = await client.get(
+                f"{base_url}/tenants/{tenant_id}/payments",
+                params={"limit": 100, "page": 1},
+                headers=headers
+            )
+            
+            if data.get("success") and data.get("data"):
+                for payment in data["data"]:
+                    payment_code = payment.get("paymentCode")  # Changed from payment_code to paymentCode
+                    description = payment.get("description", f"Payment {payment_code}")
+                    if payment_code:
+                        payment_map[payment_code] = description
+            else:
+                # If no data or API error, use default mapping for testing
+                logger.warning(f"Failed to fetch payment master data: {data.get('message', 'No data available')}")
+                payment_map = {
+                    "01": "Cash",
+                    "11": "Cashless", 
+                    "12": "Others",
                 }
-                    
-                # HttpClientHelper.get() returns the JSON data directly, not a response object
-                data = await client.get(
-                    f"{base_url}/tenants/{tenant_id}/payments",
-                    params={"limit": 100, "page": 1},
-                    headers=headers
-                )
                 
-                if data.get("success") and data.get("data"):
-                    for payment in data["data"]:
-                        payment_code = payment.get("paymentCode")  # Changed from payment_code to paymentCode
-                        description = payment.get("description", f"Payment {payment_code}")
-                        if payment_code:
-                            payment_map[payment_code] = description
-                else:
-                    # If no data or API error, use default mapping for testing
-                    logger.warning(f"Failed to fetch payment master data: {data.get('message', 'No data available')}")
-                    payment_map = {
-                        "01": "Cash",
-                        "11": "Cashless", 
-                        "12": "Others",
-                    }
-                    
         except Exception as e:
             logger.error(f"Error fetching payment master data: {e}")
             # Return default mapping if API call fails
@@ -8,12 +8,14 @@ from kugel_common.utils.misc import get_app_time_str
 from app.models.repositories.tranlog_repository import TranlogRepository
 from app.models.repositories.cash_in_out_log_repository import CashInOutLogRepository
 from app.models.repositories.open_close_log_repository import OpenCloseLogRepository
+from app.models.repositories.sales_aggregate_repository import SalesAggregateRepository
 from app.models.documents.sales_report_document import SalesReportDocument
 from app.models.documents.cash_in_out_log import CashInOutLog
 from app.models.documents.open_close_log import OpenCloseLog
 from app.enums.transaction_type import TransactionType
 from app.services.report_plugin_interface import IReportPlugin
 from app.services.plugins.sales_report_receipt_data import SalesReportReceiptData
+from app.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +32,7 @@ class SalesReportMaker(IReportPlugin):
         tran_repository: TranlogRepository,
         cash_in_out_log_repository: CashInOutLogRepository,
         open_close_log_repository: OpenCloseLogRepository,
+        sales_aggregate_repository: SalesAggregateRepository = None,
     ):
         """
         Constructor
@@ -38,10 +41,12 @@ class SalesReportMaker(IReportPlugin):
             tran_repository: Transaction log repository
             cash_in_out_log_repository: Cash in/out log repository
             open_close_log_repository: Open/close log repository
+            sales_aggregate_repository: Sales aggregate repository (optional)
         """
         self.tran_repository = tran_repository
         self.cash_in_out_log_repository = cash_in_out_log_repository
         self.open_close_log_repository = open_close_log_repository
+        self.sales_aggregate_repository = sales_aggregate_repository
 
     async def generate_report(
         self,
@@ -75,8 +80,8 @@ class SalesReportMaker(IReportPlugin):
             Sales report document
         """
 
-        # Create pipeline for retrieving sales report data
-        pipeline = self._create_pipeline_for_sales_report(
+        # Retrieve sales report data per transaction type
+        tran_results = await self.get_sales_results_async(
             store_code=store_code,
             terminal_no=terminal_no,
             business_date=business_date,
@@ -85,11 +90,6 @@ class SalesReportMaker(IReportPlugin):
             page=page,
             sort=sort,
         )
-        logger.info(f"Sales report pipeline: {pipeline}")
-
-        # Retrieve data from transaction log collection using the pipeline
-        tran_results = await self.tran_repository.execute_pipeline(pipeline)
-        logger.info(f"Sales report results: {tran_results}")
 
         # Aggregate sales report data
         summarized_tran_result = self._summarize_sales_report(tran_results)
@@ -185,6 +185,67 @@ class SalesReportMaker(IReportPlugin):
         logger.info(f"Sales report document: {return_doc}")
         return return_doc
 
+    async def get_sales_results_async(
+        self,
+        store_code: str,
+        terminal_no: int,
+        business_date: str,
+        open_counter: int,
+        limit: int = 100,
+        page: int = 1,
+        sort: list[tuple[str, int]] = None,
+        use_aggregates: bool = None,
+    ) -> list[dict]:
+        """
+        Retrieve the sales totals per transaction type
+
+        The totals are read from the sales aggregates if USE_SALES_AGGREGATES is enabled,
+        otherwise they are aggregated from the transaction logs by the pipeline.
+        Both sources return the same result shape.
+
+        Args:
+            store_code: Store code
+            terminal_no: Terminal number
+            business_date: Business date
+            open_counter: Open counter
+            limit: Data retrieval limit (pipeline only)
+            page: Page number (pipeline only)
+            sort: Sort conditions (pipeline only)
+            use_aggregates: Force the source, None to follow the settings
+
+        Returns:
+            Sales report retrieval results
+        """
+        if use_aggregates is None:
+            use_aggregates = settings.USE_SALES_AGGREGATES and self.sales_aggregate_repository is not None
+
+        if use_aggregates:
+            tran_results = await self.sales_aggregate_repository.get_sales_results_async(
+                store_code=store_code,
+                business_date=business_date,
+                terminal_no=terminal_no,
+                open_counter=open_counter,
+            )
+            logger.info(f"Sales report results from aggregates: {tran_results}")
+            return tran_results
+
+        # Create pipeline for retrieving sales report data
+        pipeline = self._create_pipeline_for_sales_report(
+            store_code=store_code,
+            terminal_no=terminal_no,
+            business_date=business_date,
+            open_counter=open_counter,
+            limit=limit,
+            page=page,
+            sort=sort,
+        )
+        logger.info(f"Sales report pipeline: {pipeline}")
+
+        # Retrieve data from transaction log collection using the pipeline
+        tran_results = await self.tran_repository.execute_pipeline(pipeline)
+        logger.info(f"Sales report results: {tran_results}")
+        return tran_results
+
     def _summarize_cash_in_out_logs(self, results: list[CashInOutLog]) -> dict[str, Any]:
         """
         Aggregate cash in/out logs
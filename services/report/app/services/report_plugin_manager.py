@@ -2,6 +2,10 @@
 import json, importlib
 from logging import getLogger
 
+from kugel_common.utils.plugin_registry import plugin_registry
+
+from app.config.settings import settings
+
 logger = getLogger(__name__)
 
 
@@ -13,16 +17,24 @@ class ReportPluginManager:
     and dynamically instantiating the appropriate plugin classes or functions based on
     the requested report type. It uses Python's importlib to dynamically load modules
     and create plugin instances at runtime.
+
+    With USE_PLUGIN_REGISTRY, the configuration file and the plugin classes are kept in
+    the process-wide plugin registry, so a report request does not read the file nor
+    import the modules again.
     """
 
     def __init__(self):
         """
         Initialize the ReportPluginManager.
 
-        Sets up the configuration path and loads the plugin configuration data.
+        Sets up the configuration path and loads the plugin configuration data,
+        or gets it from the plugin registry.
         """
         self.config_path = "app/services/plugins/plugins.json"
-        self.config = self.__load_config(self.config_path)
+        if settings.USE_PLUGIN_REGISTRY:
+            self.config = plugin_registry.get_config(self.config_path)
+        else:
+            self.config = self.__load_config(self.config_path)
 
     def __load_config(self, path):
         """
@@ -55,12 +67,8 @@ class ReportPluginManager:
         logger.debug(f"plugin manager kwargs params: {kwargs}")
         plugins = {}
         for report_type, plugin in self.config[plugin_name].items():
-            module_name = plugin["module"]
-            module = importlib.import_module(module_name)
-
             if "class" in plugin:
-                class_name = plugin["class"]
-                plugin_class = getattr(module, class_name)
+                plugin_class = self.__resolve(plugin["module"], plugin["class"])
                 # Get constructor arguments
                 args = [kwargs.get(arg.strip("<>"), arg) for arg in plugin.get("args", [])]
                 logger.debug(f"plugin manager args: {args}")
@@ -70,7 +78,22 @@ class ReportPluginManager:
                 plugin_instance = plugin_class(*args, **plugin_kwargs)
                 plugins[report_type] = plugin_instance
             elif "function" in plugin:
-                function_name = plugin["function"]
-                function = getattr(module, function_name)
+                function = self.__resolve(plugin["module"], plugin["function"])
                 plugins[report_type] = function
         return plugins
+
+    def __resolve(self, module_name: str, attr_name: str):
+        """
+        Get a plugin class or function, from the plugin registry if enabled.
+
+        Args:
+            module_name: Name of the plugin module
+            attr_name: Name of the class or function in the module
+
+        Returns:
+            The plugin class or function
+        """
+        if settings.USE_PLUGIN_REGISTRY:
+            return plugin_registry.resolve(self.config_path, module_name, attr_name)
+        module = importlib.import_module(module_name)
+        return getattr(module, attr_name)
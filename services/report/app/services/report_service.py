@@ -8,7 +8,7 @@ logger = getLogger(__name__)
 from kugel_common.schemas.pagination import PaginatedResult
 from kugel_common.exceptions import ServiceException, CannotCreateException
 from kugel_common.utils.misc import get_app_time_str
-from kugel_common.utils.http_client_helper import get_service_client, HttpClientError
+from kugel_common.utils.http_client_helper import get_pooled_client, HttpClientError
 from kugel_common.utils.service_auth import create_service_token
 from kugel_common.enums import TransactionType
 
@@ -17,8 +17,11 @@ from app.models.repositories.tranlog_repository import TranlogRepository
 from app.models.repositories.cash_in_out_log_repository import CashInOutLogRepository
 from app.models.repositories.open_close_log_repository import OpenCloseLogRepository
 from app.models.repositories.daily_info_document_repository import DailyInfoDocumentRepository
+from app.models.repositories.sales_aggregate_repository import SalesAggregateRepository
 from app.models.documents.daily_info_document import DailyInfoDocument
 from app.services.report_plugin_manager import ReportPluginManager
+from app.services.sales_aggregate_service import SalesAggregateService
+from app.config.settings import settings
 from app.exceptions import (
     ReportNotFoundException,
     ReportValidationException,
@@ -55,6 +58,7 @@ class ReportService:
         open_close_log_repository: OpenCloseLogRepository,
         daily_info_repository: DailyInfoDocumentRepository,
         terminal_info_repository: TerminalInfoWebRepository,
+        sales_aggregate_repository: SalesAggregateRepository = None,
     ):
         """
         Initialize the ReportService with required repositories.
@@ -65,12 +69,17 @@ class ReportService:
             open_close_log_repository: Repository for terminal open/close logs
             daily_info_repository: Repository for daily information documents
             terminal_info_repository: Repository for terminal information
+            sales_aggregate_repository: Optional repository for the materialized sales aggregates
         """
         self.tran_repository = tran_repository
         self.cash_in_out_log_repository = cash_in_out_log_repository
         self.open_close_log_repository = open_close_log_repository
         self.daily_info_repository = daily_info_repository
         self.terminal_repository = terminal_info_repository
+        self.sales_aggregate_repository = sales_aggregate_repository
+        self.sales_aggregate_service = (
+            SalesAggregateService(tran_repository, sales_aggregate_repository) if sales_aggregate_repository else None
+        )
         self.tenant_id = self.tran_repository.tenant_id
         self.plugin_manager = ReportPluginManager()
         self.report_makers = self.plugin_manager.load_plugins(
@@ -78,6 +87,7 @@ class ReportService:
             tran_repository=self.tran_repository,
             cash_in_out_log_repository=self.cash_in_out_log_repository,
             open_close_log_repository=self.open_close_log_repository,
+            sales_aggregate_repository=self.sales_aggregate_repository,
         )
 
     async def get_report_for_store_async(
@@ -607,9 +617,40 @@ class ReportService:
             f"all transaction logs are received for the business date and open counter. store_code->{store_code}, terminal_no->{terminal_no}, business_date->{business_date}, open_counter->{open_counter}"
         )
 
+        # all logs are received, so the sales aggregates of the terminal are final now
+        await self._reconcile_sales_aggregates_async(
+            store_code=store_code, terminal_no=terminal_no, business_date=business_date, open_counter=open_counter
+        )
+
         # create daily info document
         await self._create_daily_info(daily_info, True, "All logs are received successfully")
 
+    async def _reconcile_sales_aggregates_async(
+        self, store_code: str, terminal_no: int, business_date: str, open_counter: int
+    ) -> None:
+        """
+        Reconcile the sales aggregates of a verified terminal with its transaction logs.
+
+        Differing aggregates are rebuilt. Errors are only logged, because the pipeline result
+        stays available and a failed reconciliation must not block the terminal verification.
+
+        Args:
+            store_code: Identifier for the store
+            terminal_no: Terminal number
+            business_date: Business date of the verified logs
+            open_counter: Counter for terminal open/close cycles
+        """
+        if self.sales_aggregate_service is None or not settings.UPDATE_SALES_AGGREGATES:
+            return
+        try:
+            await self.sales_aggregate_service.reconcile_async(
+                store_code=store_code, terminal_no=terminal_no, business_date=business_date, open_counter=open_counter
+            )
+        except Exception as e:
+            logger.error(
+                f"Failed to reconcile sales aggregates. tenant_id->{self.tenant_id}, store_code->{store_code}, terminal_no->{terminal_no}, business_date->{business_date}, open_counter->{open_counter}, error->{e}"
+            )
+
     async def _send_report_to_journal(
         self,
         store_code: str,
@@ -716,11 +757,11 @@ class ReportService:
             # Add Authorization header with Bearer token
             headers = {"Authorization": f"Bearer {service_token}"}
 
-            async with get_service_client("journal") as client:
-                response = await client.post(endpoint, json=journal_data, headers=headers)
-                logger.info(
-                    f"Report sent to journal successfully: {report_type} ({report_scope}) for {store_code}/{terminal_no or 'store'} (requested by terminal {journal_terminal_no})"
-                )
+            client = await get_pooled_client("journal")
+            await client.post(endpoint, json=journal_data, headers=headers)
+            logger.info(
+                f"Report sent to journal successfully: {report_type} ({report_scope}) for {store_code}/{terminal_no or 'store'} (requested by terminal {journal_terminal_no})"
+            )
 
         except HttpClientError as e:
             # Log the error but don't fail the report generation
@@ -0,0 +1,197 @@
+# Copyright 2025 masa@kugel  # # Licensed under the Apache License, Version 2.0 (the "License");  # you may not use this file except in compliance with the License.  # You may obtain a copy of the License at  # #     http://www.apache.org/licenses/LICENSE-2.0  # # Unless required by applicable law or agreed to in writing, software  # distributed under the License is distributed on an "AS IS" BASIS,  # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  # See the License for the specific language governing permissions and  # limitations under the License.
+import math
+from typing import Any, Optional
+from logging import getLogger
+
+from app.models.repositories.tranlog_repository import TranlogRepository
+from app.models.repositories.sales_aggregate_repository import SalesAggregateRepository, SALES_TOTAL_FIELDS
+from app.services.plugins.sales_report_maker import SalesReportMaker
+
+logger = getLogger(__name__)
+
+
+class SalesAggregateService:
+    """
+    Service for reconciling the materialized sales aggregates with the transaction logs.
+
+    The aggregates are updated incrementally when transaction logs are received. This service
+    compares them with the result of the sales report pipeline, which aggregates the
+    transaction logs themselves, and rebuilds the aggregates of a terminal if they differ.
+    """
+
+    def __init__(
+        self,
+        tran_repository: TranlogRepository,
+        sales_aggregate_repository: SalesAggregateRepository,
+    ) -> None:
+        """
+        Initialize the SalesAggregateService.
+
+        Args:
+            tran_repository: Repository for transaction logs
+            sales_aggregate_repository: Repository for the sales aggregates
+        """
+        self.tran_repository = tran_repository
+        self.sales_aggregate_repository = sales_aggregate_repository
+        self.sales_report_maker = SalesReportMaker(
+            tran_repository=tran_repository,
+            cash_in_out_log_repository=None,
+            open_close_log_repository=None,
+            sales_aggregate_repository=sales_aggregate_repository,
+        )
+
+    async def reconcile_async(
+        self, store_code: str, terminal_no: int, business_date: str, open_counter: int, rebuild: bool = True
+    ) -> list[str]:
+        """
+        Compare the aggregates of a terminal with the pipeline result.
+
+        Args:
+            store_code: Identifier for the store
+            terminal_no: Terminal number
+            business_date: Business date to reconcile
+            open_counter: Counter for terminal open/close cycles
+            rebuild: Whether to rebuild the aggregates if they differ (default: True)
+
+        Returns:
+            List of the differences found, empty if the aggregates are correct
+        """
+        params = dict(
+            store_code=store_code, terminal_no=terminal_no, business_date=business_date, open_counter=open_counter
+        )
+        expected = await self.sales_report_maker.get_sales_results_async(**params, use_aggregates=False)
+        actual = await self.sales_report_maker.get_sales_results_async(**params, use_aggregates=True)
+
+        differences = self.compare_sales_results(expected, actual)
+        if not differences:
+            logger.info(f"Sales aggregates are consistent. params->{params}")
+            return differences
+
+        logger.warning(f"Sales aggregates differ from the transaction logs. params->{params}, differences->{differences}")
+        if rebuild:
+            await self.rebuild_async(**params)
+        return differences
+
+    async def rebuild_async(self, store_code: str, terminal_no: int, business_date: str, open_counter: int) -> int:
+        """
+        Rebuild the aggregates of a terminal from its transaction logs.
+
+        Args:
+            store_code: Identifier for the store
+            terminal_no: Terminal number
+            business_date: Business date to rebuild
+            open_counter: Counter for terminal open/close cycles
+
+        Returns:
+            Number of transaction logs applied
+        """
+        await self.sales_aggregate_repository.delete_aggregates_async(
+            store_code=store_code, business_date=business_date, terminal_no=terminal_no, open_counter=open_counter
+        )
+        filter = {
+            "tenant_id": self.tran_repository.tenant_id,
+            "store_code": store_code,
+            "terminal_no": terminal_no,
+            "business_date": business_date,
+            "open_counter": open_counter,
+            "sales.is_cancelled": False,
+        }
+        tranlogs = await self.tran_repository.get_list_async(filter)
+        applied = 0
+        for tranlog in tranlogs:
+            if await self.sales_aggregate_repository.apply_tranlog_async(tranlog):
+                applied += 1
+        logger.info(f"Sales aggregates rebuilt from {applied} transaction logs. filter->{filter}")
+        return applied
+
+    async def rebuild_range_async(
+        self, business_date_from: str, business_date_to: str, store_code: Optional[str] = None
+    ) -> int:
+        """
+        Rebuild the aggregates of all terminals with transaction logs in a range of business dates.
+
+        Used to build the aggregates of the transaction logs received before they were introduced,
+        before enabling USE_SALES_AGGREGATES.
+
+        Args:
+            business_date_from: First business date to rebuild (YYYYMMDD)
+            business_date_to: Last business date to rebuild (YYYYMMDD)
+            store_code: Identifier for the store, all stores if None
+
+        Returns:
+            Number of transaction logs applied
+        """
+        match = {
+            "tenant_id": self.tran_repository.tenant_id,
+            "business_date": {"$gte": business_date_from, "$lte": business_date_to},
+        }
+        if store_code:
+            match["store_code"] = store_code
+        # cancelled transactions are included, so that aggregates of terminals with only those are cleared too
+        pipeline = [
+            {"$match": match},
+            {
+                "$group": {
+                    "_id": {
+                        "store_code": "$store_code",
+                        "terminal_no": "$terminal_no",
+                        "business_date": "$business_date",
+                        "open_counter": "$open_counter",
+                    }
+                }
+            },
+            {"$sort": {"_id.business_date": 1, "_id.store_code": 1, "_id.terminal_no": 1, "_id.open_counter": 1}},
+        ]
+        terminals = await self.tran_repository.execute_pipeline(pipeline)
+        applied = 0
+        for terminal in terminals:
+            applied += await self.rebuild_async(**terminal["_id"])
+        logger.info(f"Sales aggregates of {len(terminals)} terminals rebuilt. match->{match}, applied->{applied}")
+        return applied
+
+    @staticmethod
+    def compare_sales_results(expected: list[dict[str, Any]], actual: list[dict[str, Any]]) -> list[str]:
+        """
+        Compare two sales report results field by field.
+
+        Amounts are compared with a small tolerance because the sums are calculated in a different order.
+
+        Args:
+            expected: Result of the sales report pipeline
+            actual: Result read from the sales aggregates
+
+        Returns:
+            List of the differences found
+        """
+
+        def normalize(results: list[dict[str, Any]]) -> dict[int, dict[str, Any]]:
+            normalized = {}
+            for result in results:
+                values = {field: result.get(field, 0) for field in SALES_TOTAL_FIELDS}
+                for tax in result.get("taxes", []):
+                    if tax.get("tax_code") is None:
+                        continue
+                    for field in ("tax_amount", "target_amount", "target_quantity"):
+                        values[f"taxes.{tax['tax_code']}.{field}"] = tax.get(field, 0)
+                for payment in result.get("payments", []):
+                    if payment.get("payment_code") is None:
+                        continue
+                    for field in ("amount", "count"):
+                        values[f"payments.{payment['payment_code']}.{field}"] = payment.get(field, 0)
+                normalized[result["_id"]["transaction_type"]] = values
+            return normalized
+
+        expected_values = normalize(expected)
+        actual_values = normalize(actual)
+        differences = []
+        for transaction_type in sorted(expected_values.keys() | actual_values.keys()):
+            expected_type = expected_values.get(transaction_type, {})
+            actual_type = actual_values.get(transaction_type, {})
+            for field in sorted(expected_type.keys() | actual_type.keys()):
+                expected_value = expected_type.get(field) or 0
+                actual_value = actual_type.get(field) or 0
+                if not math.isclose(expected_value, actual_value, rel_tol=1e-9, abs_tol=1e-6):
+                    differences.append(
+                        f"transaction_type->{transaction_type} {field}: expected->{expected_value}, actual->{actual_value}"
+                    )
+        return differences
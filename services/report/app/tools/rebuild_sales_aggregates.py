@@ -0,0 +1,76 @@
+# Copyright 2025 masa@kugel  # # Licensed under the Apache License, Version 2.0 (the "License");  # you may not use this file except in compliance with the License.  # You may obtain a copy of the License at  # #     http://www.apache.org/licenses/LICENSE-2.0  # # Unless required by applicable law or agreed to in writing, software  # distributed under the License is distributed on an "AS IS" BASIS,  # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  # See the License for the specific language governing permissions and  # limitations under the License.
+"""
+Rebuild the sales aggregates of the transaction logs in a range of business dates.
+
+Run this before enabling USE_SALES_AGGREGATES, so that the aggregates include the transaction
+logs received before they were introduced, or to remove duplicate aggregates.
+
+Usage: pipenv run python -m app.tools.rebuild_sales_aggregates --tenant-id T001 --from 20250101 --to 20250131
+"""
+import argparse
+import asyncio
+from logging import getLogger, basicConfig, INFO
+
+from kugel_common.database import database as db_helper
+from app.config.settings import settings
+from app.database import database_setup
+from app.models.repositories.tranlog_repository import TranlogRepository
+from app.models.repositories.sales_aggregate_repository import SalesAggregateRepository
+from app.services.sales_aggregate_service import SalesAggregateService
+
+logger = getLogger(__name__)
+
+
+async def rebuild_sales_aggregates_async(
+    tenant_id: str, business_date_from: str, business_date_to: str, store_code: str = None
+) -> int:
+    """
+    Rebuild the sales aggregates of a tenant.
+
+    Args:
+        tenant_id: Identifier for the tenant
+        business_date_from: First business date to rebuild (YYYYMMDD)
+        business_date_to: Last business date to rebuild (YYYYMMDD)
+        store_code: Identifier for the store, all stores if None
+
+    Returns:
+        Number of transaction logs applied
+    """
+    db_helper.MONGODB_URI = settings.MONGODB_URI
+    try:
+        # the unique index makes the rebuilt aggregates idempotent against tranlogs received meanwhile
+        await database_setup.update_sales_aggregate_indexes(tenant_id)
+    except Exception as e:
+        # duplicates stored without the index are removed by the rebuild, the index is added on the next run
+        logger.warning(f"Sales aggregate index not created for tenant_id:{tenant_id}, rebuilding anyway: {e}")
+
+    db = await db_helper.get_db_async(f"{settings.DB_NAME_PREFIX}_{tenant_id}")
+    service = SalesAggregateService(
+        tran_repository=TranlogRepository(db=db, tenant_id=tenant_id),
+        sales_aggregate_repository=SalesAggregateRepository(db=db, tenant_id=tenant_id),
+    )
+    try:
+        return await service.rebuild_range_async(business_date_from, business_date_to, store_code=store_code)
+    finally:
+        await db_helper.close_client_async()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the sales aggregates from the transaction logs.")
+    parser.add_argument("--tenant-id", required=True, help="tenant to rebuild")
+    parser.add_argument("--from", dest="business_date_from", required=True, help="first business date (YYYYMMDD)")
+    parser.add_argument("--to", dest="business_date_to", required=True, help="last business date (YYYYMMDD)")
+    parser.add_argument("--store-code", default=None, help="store to rebuild, all stores if omitted")
+    args = parser.parse_args()
+
+    basicConfig(level=INFO)
+    applied = asyncio.run(
+        rebuild_sales_aggregates_async(
+            args.tenant_id, args.business_date_from, args.business_date_to, store_code=args.store_code
+        )
+    )
+    logger.info(f"Rebuilt the sales aggregates from {applied} transaction logs")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ from logging import getLogger
 from typing import Tuple, Optional
 
 from kugel_common.utils.dapr_client_helper import DaprClientHelper
+from kugel_common.utils.event_id_cache import EventIdCache
 from app.config.settings import settings
 
 # Get a logger instance for this module
@@ -13,6 +14,10 @@ class StateStoreManager:
     """
     Manager for handling statestore operations with Dapr.
     Uses DaprClientHelper for unified Dapr communication with built-in circuit breaker.
+
+    The states saved and found are also kept in an in-memory cache of event IDs, so that
+    redelivered messages are recognized without a call to the state store. A state that is
+    not in memory is always looked up in the state store.
     """
 
     def __init__(self):
@@ -26,6 +31,10 @@ class StateStoreManager:
         )
         # Default state store name
         self._store_name = "statestore"
+        # Recently processed event IDs, checked before the state store
+        self._event_id_cache = EventIdCache(
+            ttl_seconds=settings.EVENT_ID_CACHE_TTL_SECONDS, max_entries=settings.EVENT_ID_CACHE_MAX_ENTRIES
+        )
 
     async def save_state(self, state_id: str, state_data: dict) -> Tuple[bool, Optional[str]]:
         """
@@ -39,6 +48,8 @@ class StateStoreManager:
         Returns:
             Tuple[bool, Optional[str]]: (True if successful, None) or (False, error message)
         """
+        # the message has been processed, even if the state store cannot be reached
+        self._remember(state_id, state_data)
         try:
             success = await self._dapr_client.save_state(store_name=self._store_name, key=state_id, value=state_data)
 
@@ -65,6 +76,11 @@ class StateStoreManager:
         Returns:
             Tuple[Optional[dict], Optional[str]]: (state data if found, None) or (None, error message)
         """
+        state_data = self._recall(state_id)
+        if state_data is not None:
+            logger.info(f"State found in memory. state_id: {state_id}")
+            return state_data, None
+
         try:
             state_data = await self._dapr_client.get_state(store_name=self._store_name, key=state_id)
 
@@ -73,6 +89,7 @@ class StateStoreManager:
                 return None, None
             else:
                 logger.info(f"State retrieved successfully. state_id: {state_id}, state_data: {state_data}")
+                self._remember(state_id, state_data)
                 return state_data, None
 
         except Exception as e:
@@ -80,6 +97,90 @@ class StateStoreManager:
             logger.error(error_message)
             return None, error_message
 
+    async def save_states(self, states: dict[str, dict]) -> Tuple[bool, Optional[str]]:
+        """
+        Save the states of several messages to the Dapr statestore with one request.
+        Used when a batch of messages has been processed.
+
+        Args:
+            states: Dictionary mapping the state IDs (typically the message IDs) to the data to store
+
+        Returns:
+            Tuple[bool, Optional[str]]: (True if successful, None) or (False, error message)
+        """
+        for state_id, state_data in states.items():
+            self._remember(state_id, state_data)
+        try:
+            success = await self._dapr_client.save_bulk_state(store_name=self._store_name, states=states)
+            if success:
+                logger.info(f"States saved successfully. count: {len(states)}")
+                return True, None
+            return False, f"Failed to save states. state_ids: {list(states.keys())}"
+        except Exception as e:
+            error_message = f"Exception occurred while saving states: {e}"
+            logger.error(error_message)
+            return False, error_message
+
+    async def get_states(self, state_ids: list[str]) -> Tuple[dict[str, dict], Optional[str]]:
+        """
+        Get the states of several messages, with one request to the Dapr statestore for those not in memory.
+        Used to check a batch of messages for duplicates.
+
+        Args:
+            state_ids: The state IDs (typically the message IDs)
+
+        Returns:
+            Tuple[dict[str, dict], Optional[str]]: (states found by state ID, None) or (states found in memory, error message)
+        """
+        found = {}
+        missing = []
+        for state_id in state_ids:
+            state_data = self._recall(state_id)
+            if state_data is not None:
+                found[state_id] = state_data
+            else:
+                missing.append(state_id)
+        if not missing:
+            return found, None
+
+        try:
+            states = await self._dapr_client.get_bulk_state(store_name=self._store_name, keys=missing)
+        except Exception as e:
+            error_message = f"Exception occurred while retrieving states: {e}"
+            logger.error(error_message)
+            return found, error_message
+        for state_id, state_data in states.items():
+            if state_data:
+                self._remember(state_id, state_data)
+                found[state_id] = state_data
+        logger.info(f"States retrieved. requested: {len(state_ids)}, found: {len(found)}")
+        return found, None
+
+    def _recall(self, state_id: str) -> Optional[dict]:
+        """
+        Get a state from the in-memory cache.
+
+        Args:
+            state_id: The unique ID for the state
+
+        Returns:
+            Optional[dict]: The state data if cached, None otherwise
+        """
+        if not settings.USE_EVENT_ID_CACHE:
+            return None
+        return self._event_id_cache.get(state_id)
+
+    def _remember(self, state_id: str, state_data: dict) -> None:
+        """
+        Keep a state in the in-memory cache.
+
+        Args:
+            state_id: The unique ID for the state
+            state_data: The state data
+        """
+        if settings.USE_EVENT_ID_CACHE and state_data:
+            self._event_id_cache.set(state_id, state_data)
+
     async def close(self):
         """
         Close the Dapr client connection.
@@ -43,9 +43,9 @@ class TestJournalIntegration:
         mock_report_data.sales_net.quantity = 10
 
         # Mock the HTTP client
-        with patch("app.services.report_service.get_service_client") as mock_get_client:
+        with patch("app.services.report_service.get_pooled_client", new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
-            mock_get_client.return_value.__aenter__.return_value = mock_client
+            mock_get_client.return_value = mock_client
             mock_client.post = AsyncMock(return_value={"success": True})
 
             # Call the method
@@ -121,9 +121,9 @@ class TestJournalIntegration:
         mock_report_data.model_dump = MagicMock(return_value={"test": "data"})
 
         # Mock the HTTP client
-        with patch("app.services.report_service.get_service_client") as mock_get_client:
+        with patch("app.services.report_service.get_pooled_client", new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
-            mock_get_client.return_value.__aenter__.return_value = mock_client
+            mock_get_client.return_value = mock_client
             mock_client.post = AsyncMock(return_value={"success": True})
 
             # Call the method
@@ -196,9 +196,9 @@ class TestJournalIntegration:
         mock_report_data.sales_net.quantity = 10
 
         # Mock the HTTP client to raise an error
-        with patch("app.services.report_service.get_service_client") as mock_get_client:
+        with patch("app.services.report_service.get_pooled_client", new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
-            mock_get_client.return_value.__aenter__.return_value = mock_client
+            mock_get_client.return_value = mock_client
             mock_client.post = AsyncMock(side_effect=HttpClientError("Connection failed", status_code=500))
 
             # Call should not raise exception
@@ -247,9 +247,9 @@ class TestJournalIntegration:
         mock_report_data.sales_net.quantity = 20
 
         # Mock the HTTP client
-        with patch("app.services.report_service.get_service_client") as mock_get_client:
+        with patch("app.services.report_service.get_pooled_client", new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
-            mock_get_client.return_value.__aenter__.return_value = mock_client
+            mock_get_client.return_value = mock_client
             mock_client.post = AsyncMock(return_value={"success": True})
 
             # Call the method without requesting_terminal_no
@@ -296,7 +296,7 @@ class TestJournalIntegration:
         mock_report_data = MagicMock()
 
         # Mock the HTTP client
-        with patch("app.services.report_service.get_service_client") as mock_get_client:
+        with patch("app.services.report_service.get_pooled_client", new_callable=AsyncMock) as mock_get_client:
             # Call with unknown report scope
             await service._send_report_to_journal(
                 store_code="STORE001",
@@ -346,7 +346,7 @@ class TestJournalIntegration:
         service.report_makers = {"sales": mock_report_maker}
 
         # Mock the HTTP client
-        with patch("app.services.report_service.get_service_client") as mock_get_client:
+        with patch("app.services.report_service.get_pooled_client", new_callable=AsyncMock) as mock_get_client:
             # Call the method with JWT request (is_api_key_request=False)
             await service.get_report_for_terminal_async(
                 store_code="STORE001",
@@ -398,9 +398,9 @@ class TestJournalIntegration:
         service.report_makers = {"sales": mock_report_maker}
 
         # Mock the HTTP client
-        with patch("app.services.report_service.get_service_client") as mock_get_client:
+        with patch("app.services.report_service.get_pooled_client", new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
-            mock_get_client.return_value.__aenter__.return_value = mock_client
+            mock_get_client.return_value = mock_client
             mock_client.post = AsyncMock(return_value={"success": True})
 
             # Call the method with API key request (is_api_key_request=True)
@@ -67,6 +67,47 @@ class TestLogServiceReceiveTranlog:
                 await svc.receive_tranlog_async(tran)
 
 
+    @pytest.mark.asyncio
+    async def test_receive_tranlog_updates_sales_aggregate(self):
+        svc, tran_repo, _, _ = make_service()
+        aggregate_repo = AsyncMock()
+        svc.sales_aggregate_repository = aggregate_repo
+        tran = make_tran()
+        tran_repo.create_tranlog_async.return_value = tran
+
+        with patch("app.services.log_service.settings") as mock_settings:
+            mock_settings.UPDATE_SALES_AGGREGATES = True
+            await svc.receive_tranlog_async(tran)
+
+        aggregate_repo.apply_tranlog_async.assert_awaited_once_with(tran)
+
+    @pytest.mark.asyncio
+    async def test_receive_tranlog_skips_sales_aggregate_when_disabled(self):
+        svc, tran_repo, _, _ = make_service()
+        aggregate_repo = AsyncMock()
+        svc.sales_aggregate_repository = aggregate_repo
+        tran_repo.create_tranlog_async.return_value = make_tran()
+
+        with patch("app.services.log_service.settings") as mock_settings:
+            mock_settings.UPDATE_SALES_AGGREGATES = False
+            await svc.receive_tranlog_async(make_tran())
+
+        aggregate_repo.apply_tranlog_async.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_receive_tranlog_sales_aggregate_error_raises(self):
+        """Aggregate errors are re-raised so that the message is redelivered."""
+        svc, tran_repo, _, _ = make_service()
+        aggregate_repo = AsyncMock()
+        aggregate_repo.apply_tranlog_async.side_effect = Exception("aggregate error")
+        svc.sales_aggregate_repository = aggregate_repo
+        tran_repo.create_tranlog_async.return_value = make_tran()
+
+        with patch("app.services.log_service.send_fatal_error_notification", new_callable=AsyncMock):
+            with pytest.raises(Exception, match="aggregate error"):
+                await svc.receive_tranlog_async(make_tran())
+
+
 # ---------------------------------------------------------------------------
 # LogService.receive_cashlog_async
 # ---------------------------------------------------------------------------
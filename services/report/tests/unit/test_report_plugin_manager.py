@@ -3,6 +3,16 @@ import json
 import pytest
 from unittest.mock import patch, mock_open, MagicMock
 
+from kugel_common.utils.plugin_registry import plugin_registry
+
+
+@pytest.fixture(autouse=True)
+def clear_plugin_registry():
+    """Each test reads its own configuration and modules instead of the cached ones."""
+    plugin_registry.clear()
+    yield
+    plugin_registry.clear()
+
 
 SAMPLE_CONFIG = {
     "report": {
@@ -541,3 +541,31 @@ class TestCommitTerminalReport:
         await svc._commit_terminal_report_async("T001", "S001", 1, "20240101", 1)
 
         repos["daily"].create_daily_info_document.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_verified_terminal_reconciles_sales_aggregates(self):
+        """検証成功時に売上集計を照合する。照合エラーは検証を妨げない。"""
+        svc, repos = make_service()
+        svc.sales_aggregate_service = AsyncMock()
+        svc.sales_aggregate_service.reconcile_async.side_effect = Exception("reconcile error")
+        repos["daily"].get_daily_info_documents.return_value = make_paginated_result(total=0)
+
+        close_log = MagicMock()
+        close_log.cash_in_out_count = 0
+        close_log.cash_in_out_last_datetime = None
+        close_log.cart_transaction_count = 0
+        close_log.cart_transaction_last_no = 0
+        repos["open_close"].get_open_close_logs.side_effect = [
+            make_paginated_result(data=[MagicMock()], total=1),
+            make_paginated_result(data=[close_log], total=1),
+        ]
+        repos["cash"].get_cash_in_out_logs.return_value = make_paginated_result(total=0)
+        repos["tran"].get_tranlog_list_by_query_async.return_value = make_paginated_result(total=0)
+        repos["daily"].create_daily_info_document.return_value = None
+
+        await svc._commit_terminal_report_async("T001", "S001", 1, "20240101", 1)
+
+        svc.sales_aggregate_service.reconcile_async.assert_awaited_once_with(
+            store_code="S001", terminal_no=1, business_date="20240101", open_counter=1
+        )
+        repos["daily"].create_daily_info_document.assert_called_once()
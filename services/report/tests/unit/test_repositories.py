@@ -770,3 +770,56 @@ class TestDailyInfoDocumentRepository:
         )
         key = repo._DailyInfoDocumentRepository__get_shard_key(doc)
         assert key == "TX_SX_6_20250615"
+
+
+class TestItemMasterWebRepository:
+    @pytest.mark.asyncio
+    async def test_get_items_searches_codes_in_chunks_with_fields(self):
+        from app.models.repositories import item_master_web_repository as module
+
+        client = MagicMock()
+        client.post = AsyncMock(
+            side_effect=[
+                {"success": True, "data": [{"itemCode": "ITEM0001", "description": "Apple", "categoryCode": "C01"}]},
+                {"success": True, "data": []},
+            ]
+        )
+        item_codes = [f"ITEM{no:04d}" for no in range(module.ITEM_CODES_PER_REQUEST + 1)]
+        repo = module.ItemMasterWebRepository("T001", "http://master-data/api/v1")
+
+        with patch.object(module, "get_pooled_client", AsyncMock(return_value=client)), patch.object(
+            module, "create_service_token", return_value="token"
+        ):
+            items = await repo.get_items(item_codes + ["ITEM0001"])
+
+        assert items == {"ITEM0001": {"name": "Apple", "category_code": "C01"}}
+        assert client.post.await_count == 2
+        first_call = client.post.await_args_list[0]
+        assert first_call.args[0] == "http://master-data/api/v1/tenants/T001/items/search"
+        assert first_call.kwargs["json"]["fields"] == ["itemCode", "description", "categoryCode"]
+        assert len(first_call.kwargs["json"]["itemCodes"]) == module.ITEM_CODES_PER_REQUEST
+        assert client.post.await_args_list[1].kwargs["json"]["itemCodes"] == [item_codes[-1]]
+
+    @pytest.mark.asyncio
+    async def test_get_items_without_codes_reads_all_pages(self):
+        from app.models.repositories import item_master_web_repository as module
+
+        limit = module.ITEM_CODES_PER_REQUEST
+
+        def page_response(page, total):
+            # metadata as serialized by ApiResponse, which has no hasNext
+            metadata = {"total": total, "page": page, "limit": limit, "sort": None, "filter": None}
+            item = {"itemCode": f"ITEM{page}", "description": f"Item {page}", "categoryCode": "C01"}
+            return {"success": True, "data": [item], "metadata": metadata}
+
+        client = MagicMock()
+        client.get = AsyncMock(side_effect=[page_response(1, limit + 1), page_response(2, limit + 1)])
+        repo = module.ItemMasterWebRepository("T001", "http://master-data/api/v1")
+
+        with patch.object(module, "get_pooled_client", AsyncMock(return_value=client)), patch.object(
+            module, "create_service_token", return_value="token"
+        ):
+            items = await repo.get_items()
+
+        assert set(items) == {"ITEM1", "ITEM2"}
+        assert [call.kwargs["params"]["page"] for call in client.get.await_args_list] == [1, 2]
@@ -0,0 +1,451 @@
+# Copyright 2025 masa@kugel
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Unit tests for the materialized sales aggregates (repository, service and report maker).
+"""
+import copy
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from pymongo.errors import DuplicateKeyError
+
+from kugel_common.models.documents.base_tranlog import BaseTransaction
+
+from app.config.settings import settings
+from app.models.repositories.sales_aggregate_repository import SalesAggregateRepository
+from app.services.sales_aggregate_service import SalesAggregateService
+from app.services.plugins.sales_report_maker import SalesReportMaker
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+KEY_FIELDS = ["tenant_id", "store_code", "terminal_no", "business_date", "open_counter", "transaction_type"]
+
+
+class FakeCollection:
+    """In-memory collection supporting the operators used by SalesAggregateRepository."""
+
+    def __init__(self):
+        self.docs = []
+
+    @staticmethod
+    def _matches(doc, filter):
+        for field, condition in filter.items():
+            value = doc.get(field)
+            if isinstance(condition, dict) and "$ne" in condition:
+                if condition["$ne"] in (value or []):
+                    return False
+            elif field == "transaction_nos":
+                if condition not in (value or []):
+                    return False
+            elif value != condition:
+                return False
+        return True
+
+    @staticmethod
+    def _set_path(doc, path, value, inc=False):
+        *parents, last = path.split(".")
+        for part in parents:
+            doc = doc.setdefault(part, {})
+        doc[last] = doc.get(last, 0) + value if inc else value
+
+    async def update_one(self, filter, update, upsert=False):
+        doc = next((doc for doc in self.docs if self._matches(doc, filter)), None)
+        if doc is None:
+            if not upsert:
+                return MagicMock(modified_count=0)
+            key = {field: filter[field] for field in KEY_FIELDS}
+            if any(all(existing.get(f) == v for f, v in key.items()) for existing in self.docs):
+                raise DuplicateKeyError("E11000 duplicate key error")
+            doc = copy.deepcopy(key)
+            self.docs.append(doc)
+            for path, value in update.get("$setOnInsert", {}).items():
+                self._set_path(doc, path, value)
+        for path, value in update.get("$inc", {}).items():
+            self._set_path(doc, path, value, inc=True)
+        for path, value in update.get("$set", {}).items():
+            self._set_path(doc, path, value)
+        for path, value in update.get("$push", {}).items():
+            doc.setdefault(path, []).append(value)
+        return MagicMock(modified_count=1)
+
+    async def find_one(self, filter, projection=None):
+        return next((doc for doc in self.docs if self._matches(doc, filter)), None)
+
+    def find(self, filter, projection=None):
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=[copy.deepcopy(doc) for doc in self.docs if self._matches(doc, filter)])
+        return cursor
+
+
+def _make_repo():
+    repo = SalesAggregateRepository(MagicMock(), "T001")
+    repo.dbcollection = FakeCollection()
+    return repo
+
+
+def _make_tranlog(transaction_no=1, **overrides) -> BaseTransaction:
+    defaults = dict(
+        tenant_id="T001",
+        store_code="S001",
+        terminal_no=1,
+        transaction_no=transaction_no,
+        transaction_type=101,
+        business_date="20250101",
+        open_counter=1,
+        generate_date_time="2025-01-01T10:00:00Z",
+        sales=BaseTransaction.SalesInfo(
+            total_amount=1000.0,
+            total_amount_with_tax=1100.0,
+            tax_amount=100.0,
+            total_quantity=3,
+            change_amount=0.0,
+            total_discount_amount=50.0,
+            is_cancelled=False,
+        ),
+        line_items=[
+            BaseTransaction.LineItem(
+                line_no=1,
+                quantity=2,
+                discounts=[
+                    BaseTransaction.DiscountInfo(discount_amount=20.0),
+                    BaseTransaction.DiscountInfo(discount_amount=10.0),
+                ],
+            ),
+            BaseTransaction.LineItem(
+                line_no=2, quantity=1, discounts_allocated=[BaseTransaction.DiscountInfo(discount_amount=20.0)]
+            ),
+        ],
+        subtotal_discounts=[BaseTransaction.DiscountInfo(discount_amount=20.0)],
+        taxes=[
+            BaseTransaction.Tax(tax_no=1, tax_code="01", tax_name="Tax 10%", tax_amount=100.0, target_amount=1000.0, target_quantity=3)
+        ],
+        payments=[
+            BaseTransaction.Payment(payment_no=1, payment_code="01", amount=600.0, description="Cash"),
+            BaseTransaction.Payment(payment_no=2, payment_code="11", amount=500.0, description="Card"),
+        ],
+    )
+    defaults.update(overrides)
+    return BaseTransaction(**defaults)
+
+
+# ===========================================================================
+# SalesAggregateRepository
+# ===========================================================================
+
+class TestSalesAggregateRepository:
+    """Tests for SalesAggregateRepository."""
+
+    def test_collection_name(self):
+        repo = SalesAggregateRepository(MagicMock(), "T001")
+        assert repo.collection_name == "sales_aggregates"
+
+    def test_tranlog_update_matches_pipeline_values(self):
+        update = SalesAggregateRepository.make_tranlog_update(_make_tranlog())
+
+        inc = update["$inc"]
+        assert inc["total_amount"] == 1000.0
+        assert inc["total_amount_with_tax"] == 1100.0
+        assert inc["total_tax_amount"] == 100.0
+        assert inc["total_discount_amount"] == 50.0
+        assert inc["total_line_items_discount_amount"] == 30.0
+        assert inc["total_line_items_discount_count"] == 2
+        assert inc["total_line_items_discount_quantity"] == 2
+        assert inc["total_sub_total_discount_amount"] == 20.0
+        assert inc["total_sub_total_discount_count"] == 1
+        assert inc["total_sub_total_discount_quantity"] == 1
+        assert inc["total_transaction_count"] == 1
+        assert inc["taxes.01.tax_amount"] == 100.0
+        assert inc["payments.01.amount"] == 600.0
+        assert inc["payments.11.count"] == 1
+        assert update["$set"] == {
+            "taxes.01.tax_name": "Tax 10%",
+            "payments.01.description": "Cash",
+            "payments.11.description": "Card",
+        }
+
+    def test_tranlog_update_deduplicates_taxes_and_skips_missing_codes(self):
+        tax = BaseTransaction.Tax(tax_no=1, tax_code="01", tax_name="Tax 10%", tax_amount=100.0)
+        tranlog = _make_tranlog(taxes=[tax, tax, BaseTransaction.Tax(tax_no=2, tax_code=None, tax_amount=5.0)])
+
+        inc = SalesAggregateRepository.make_tranlog_update(tranlog)["$inc"]
+
+        # identical taxes are counted once, the tax without a code only adds to the total
+        assert inc["taxes.01.tax_amount"] == 100.0
+        assert inc["total_tax_amount"] == 105.0
+        assert not any(path.startswith("taxes.None") for path in inc)
+
+    @pytest.mark.asyncio
+    async def test_apply_skips_cancelled_transaction(self):
+        repo = _make_repo()
+        tranlog = _make_tranlog()
+        tranlog.sales.is_cancelled = True
+
+        assert await repo.apply_tranlog_async(tranlog) is False
+        assert repo.dbcollection.docs == []
+
+    @pytest.mark.asyncio
+    async def test_apply_is_idempotent(self):
+        repo = _make_repo()
+
+        assert await repo.apply_tranlog_async(_make_tranlog(1)) is True
+        assert await repo.apply_tranlog_async(_make_tranlog(2)) is True
+        # redelivered transaction log
+        assert await repo.apply_tranlog_async(_make_tranlog(1)) is False
+
+        assert len(repo.dbcollection.docs) == 1
+        doc = repo.dbcollection.docs[0]
+        assert doc["transaction_nos"] == [1, 2]
+        assert doc["total_transaction_count"] == 2
+        assert doc["total_amount"] == 2000.0
+        assert doc["shard_key"] == "T001_S001_1_20250101"
+
+    @pytest.mark.asyncio
+    async def test_apply_retries_after_concurrent_insert(self):
+        repo = _make_repo()
+        collection = MagicMock()
+        collection.update_one = AsyncMock(side_effect=[DuplicateKeyError("E11000"), MagicMock()])
+        collection.find_one = AsyncMock(return_value=None)
+        repo.dbcollection = collection
+
+        assert await repo.apply_tranlog_async(_make_tranlog()) is True
+        assert collection.update_one.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_sales_results_sums_terminals(self):
+        repo = _make_repo()
+        await repo.apply_tranlog_async(_make_tranlog(1))
+        await repo.apply_tranlog_async(_make_tranlog(1, terminal_no=2))
+        await repo.apply_tranlog_async(_make_tranlog(2, transaction_type=102))
+
+        results = await repo.get_sales_results_async(store_code="S001", business_date="20250101")
+
+        by_type = {result["_id"]["transaction_type"]: result for result in results}
+        assert set(by_type) == {101, 102}
+        normal = by_type[101]
+        assert "terminal_no" not in normal["_id"]
+        assert normal["total_transaction_count"] == 2
+        assert normal["total_amount_with_tax"] == 2200.0
+        assert normal["taxes"] == [
+            {"tax_code": "01", "tax_name": "Tax 10%", "tax_amount": 200.0, "target_amount": 2000.0, "target_quantity": 6}
+        ]
+        assert {p["payment_code"]: p["count"] for p in normal["payments"]} == {"01": 2, "11": 2}
+
+    @pytest.mark.asyncio
+    async def test_get_sales_results_for_terminal(self):
+        repo = _make_repo()
+        await repo.apply_tranlog_async(_make_tranlog(1))
+        await repo.apply_tranlog_async(_make_tranlog(1, terminal_no=2))
+
+        results = await repo.get_sales_results_async(store_code="S001", business_date="20250101", terminal_no=2)
+
+        assert len(results) == 1
+        assert results[0]["_id"]["terminal_no"] == 2
+        assert results[0]["total_transaction_count"] == 1
+
+
+# ===========================================================================
+# SalesAggregateService
+# ===========================================================================
+
+class TestSalesAggregateService:
+    """Tests for SalesAggregateService."""
+
+    def _make_service(self):
+        tran_repo = AsyncMock()
+        tran_repo.tenant_id = "T001"
+        aggregate_repo = _make_repo()
+        return SalesAggregateService(tran_repo, aggregate_repo), tran_repo, aggregate_repo
+
+    def test_compare_equal_results(self):
+        result = {
+            "_id": {"transaction_type": 101},
+            "total_amount": 0.1 + 0.2,
+            "taxes": [{"tax_code": "01", "tax_amount": 10.0}],
+            "payments": [{"payment_code": "01", "amount": 100.0, "count": 1}],
+        }
+        other = copy.deepcopy(result)
+        other["total_amount"] = 0.3
+
+        assert SalesAggregateService.compare_sales_results([result], [other]) == []
+
+    def test_compare_reports_differences(self):
+        expected = [
+            {"_id": {"transaction_type": 101}, "total_amount": 100.0, "taxes": [], "payments": []},
+            {"_id": {"transaction_type": 102}, "total_amount": 50.0, "taxes": [], "payments": []},
+        ]
+        actual = [{"_id": {"transaction_type": 101}, "total_amount": 90.0, "taxes": [], "payments": []}]
+
+        differences = SalesAggregateService.compare_sales_results(expected, actual)
+
+        assert differences == [
+            "transaction_type->101 total_amount: expected->100.0, actual->90.0",
+            "transaction_type->102 total_amount: expected->50.0, actual->0",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_reconcile_without_differences_does_not_rebuild(self):
+        svc, _, aggregate_repo = self._make_service()
+        await aggregate_repo.apply_tranlog_async(_make_tranlog(1))
+        pipeline_results = await aggregate_repo.get_sales_results_async("S001", "20250101", terminal_no=1)
+
+        with (
+            patch.object(svc.sales_report_maker, "_create_pipeline_for_sales_report", return_value=[]),
+            patch.object(svc, "rebuild_async", new_callable=AsyncMock) as mock_rebuild,
+        ):
+            svc.tran_repository.execute_pipeline.return_value = pipeline_results
+            differences = await svc.reconcile_async("S001", 1, "20250101", 1)
+
+        assert differences == []
+        mock_rebuild.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_reconcile_rebuilds_differing_aggregates(self):
+        svc, tran_repo, aggregate_repo = self._make_service()
+        # the aggregate missed transaction 2, e.g. after a failed update
+        await aggregate_repo.apply_tranlog_async(_make_tranlog(1))
+        tran_repo.get_list_async.return_value = [_make_tranlog(1), _make_tranlog(2)]
+        expected_repo = _make_repo()
+        for tranlog in tran_repo.get_list_async.return_value:
+            await expected_repo.apply_tranlog_async(tranlog)
+        tran_repo.execute_pipeline.return_value = await expected_repo.get_sales_results_async(
+            "S001", "20250101", terminal_no=1
+        )
+        aggregate_repo.delete_aggregates_async = AsyncMock(side_effect=lambda **kwargs: aggregate_repo.dbcollection.docs.clear())
+
+        differences = await svc.reconcile_async("S001", 1, "20250101", 1)
+
+        assert "transaction_type->101 total_transaction_count: expected->2, actual->1" in differences
+        aggregate_repo.delete_aggregates_async.assert_awaited_once_with(
+            store_code="S001", business_date="20250101", terminal_no=1, open_counter=1
+        )
+        tran_filter = tran_repo.get_list_async.call_args.args[0]
+        assert tran_filter["sales.is_cancelled"] is False
+        assert aggregate_repo.dbcollection.docs[0]["transaction_nos"] == [1, 2]
+        assert await svc.reconcile_async("S001", 1, "20250101", 1, rebuild=False) == []
+
+    @pytest.mark.asyncio
+    async def test_rebuild_range_rebuilds_each_terminal(self):
+        svc, tran_repo, _ = self._make_service()
+        terminals = [
+            {"store_code": "S001", "terminal_no": 1, "business_date": "20250101", "open_counter": 1},
+            {"store_code": "S001", "terminal_no": 2, "business_date": "20250102", "open_counter": 1},
+        ]
+        tran_repo.execute_pipeline.return_value = [{"_id": terminal} for terminal in terminals]
+
+        with patch.object(svc, "rebuild_async", new_callable=AsyncMock, side_effect=[3, 2]) as mock_rebuild:
+            applied = await svc.rebuild_range_async("20250101", "20250131", store_code="S001")
+
+        assert applied == 5
+        assert [call.kwargs for call in mock_rebuild.await_args_list] == terminals
+        match = tran_repo.execute_pipeline.call_args.args[0][0]["$match"]
+        assert match == {
+            "tenant_id": "T001",
+            "business_date": {"$gte": "20250101", "$lte": "20250131"},
+            "store_code": "S001",
+        }
+
+
+# ===========================================================================
+# Database setup
+# ===========================================================================
+
+class TestSalesAggregateIndexes:
+    """Tests for adding the sales aggregate index to existing tenants."""
+
+    @pytest.mark.asyncio
+    async def test_indexes_are_updated_for_existing_tenants_only(self):
+        from app.database import database_setup
+
+        client = MagicMock()
+        prefix = settings.DB_NAME_PREFIX
+        client.list_database_names = AsyncMock(return_value=["admin", f"{prefix}_T001", f"{prefix}_T002"])
+        collections = {
+            f"{prefix}_T001": [settings.DB_COLLECTION_NAME_TRAN],
+            f"{prefix}_T002": [],
+        }
+        client.__getitem__.side_effect = lambda name: MagicMock(
+            list_collection_names=AsyncMock(return_value=collections[name])
+        )
+
+        with patch.object(database_setup.db_helper, "get_client_async", AsyncMock(return_value=client)), patch.object(
+            database_setup, "update_sales_aggregate_indexes", new_callable=AsyncMock
+        ) as update_indexes:
+            await database_setup.update_sales_aggregate_indexes_for_all_tenants()
+
+        update_indexes.assert_awaited_once_with("T001")
+
+    @pytest.mark.asyncio
+    async def test_unique_index_is_created(self):
+        from app.database import database_setup
+
+        db = MagicMock()
+        with (
+            patch.object(database_setup.db_helper, "get_db_async", AsyncMock(return_value=db)),
+            patch.object(database_setup.db_helper, "create_collection_async", new_callable=AsyncMock),
+            patch.object(database_setup.db_helper, "execute_command_async", new_callable=AsyncMock) as execute,
+        ):
+            await database_setup.update_sales_aggregate_indexes("T001")
+
+        command = execute.call_args.kwargs["command"]
+        index = command["indexes"][0]
+        assert index["key"] == database_setup.SALES_AGGREGATE_INDEX["keys"]
+        assert index["unique"] is True
+        assert index["name"] == settings.DB_COLLECTION_NAME_SALES_AGGREGATE + "_index_" + "_".join(index["key"])
+
+
+# ===========================================================================
+# SalesReportMaker
+# ===========================================================================
+
+class TestSalesReportMakerSource:
+    """Tests for the source selection of SalesReportMaker.get_sales_results_async."""
+
+    @pytest.mark.asyncio
+    async def test_reads_aggregates_when_enabled(self, monkeypatch):
+        monkeypatch.setattr(settings, "USE_SALES_AGGREGATES", True)
+        tran_repo = AsyncMock()
+        aggregate_repo = AsyncMock()
+        aggregate_repo.get_sales_results_async.return_value = ["aggregated"]
+        maker = SalesReportMaker(tran_repo, AsyncMock(), AsyncMock(), aggregate_repo)
+
+        results = await maker.get_sales_results_async("S001", 1, "20250101", 1)
+
+        assert results == ["aggregated"]
+        tran_repo.execute_pipeline.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_runs_pipeline_when_disabled(self, monkeypatch):
+        monkeypatch.setattr(settings, "USE_SALES_AGGREGATES", False)
+        tran_repo = AsyncMock()
+        tran_repo.tenant_id = "T001"
+        tran_repo.execute_pipeline.return_value = ["pipeline"]
+        aggregate_repo = AsyncMock()
+        maker = SalesReportMaker(tran_repo, AsyncMock(), AsyncMock(), aggregate_repo)
+
+        results = await maker.get_sales_results_async("S001", 1, "20250101", 1)
+
+        assert results == ["pipeline"]
+        aggregate_repo.get_sales_results_async.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_runs_pipeline_without_aggregate_repository(self, monkeypatch):
+        monkeypatch.setattr(settings, "USE_SALES_AGGREGATES", True)
+        tran_repo = AsyncMock()
+        tran_repo.tenant_id = "T001"
+        tran_repo.execute_pipeline.return_value = ["pipeline"]
+        maker = SalesReportMaker(tran_repo, AsyncMock(), AsyncMock())
+
+        assert await maker.get_sales_results_async("S001", 1, "20250101", 1) == ["pipeline"]
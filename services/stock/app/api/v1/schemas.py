@@ -85,7 +85,9 @@ class StockSnapshotResponse(BaseSchemaModel):
     store_code: str = Field(..., description="Store code")
     total_items: int = Field(..., description="Total number of items")
     total_quantity: float = Field(..., description="Total stock quantity")
-    stocks: List[StockSnapshotItemResponse] = Field(..., description="Stock details by item")
+    stocks: List[StockSnapshotItemResponse] = Field(
+        ..., description="Stock details by item, a page of them when getting a snapshot by ID and empty in lists"
+    )
     created_by: str = Field(..., description="User or system that created the snapshot")
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: Optional[datetime] = Field(None, description="Last update timestamp")
@@ -13,8 +13,9 @@ from kugel_common.schemas.pagination import PaginatedResult
 from kugel_common.schemas.base_schemas import Metadata
 from kugel_common.security import get_tenant_id_with_security_by_query_optional, verify_tenant_id
 from kugel_common.status_codes import StatusCodes
-from kugel_common.utils.http_client_helper import get_service_client
+from kugel_common.utils.http_client_helper import get_pooled_client
 from kugel_common.utils.service_auth import create_service_token
+from kugel_common.utils.delivery_status_notifier import delivery_status_notifier
 from app.api.v1.schemas import (
     StockUpdateRequest,
     SetMinimumQuantityRequest,
@@ -183,7 +184,10 @@ async def create_snapshot(
     response_model=ApiResponse[PaginatedResult[StockSnapshotResponse]],
     status_code=status.HTTP_200_OK,
     summary="Get stock snapshots by date range",
-    description="Get list of stock snapshots filtered by generate_date_time range",
+    description=(
+        "Get list of stock snapshots filtered by generate_date_time range. "
+        "The snapshots are returned with their totals, get the stock details by snapshot ID"
+    ),
     responses={
         status.HTTP_400_BAD_REQUEST: {"description": "Bad Request"},
         status.HTTP_401_UNAUTHORIZED: {"description": "Unauthorized"},
@@ -251,7 +255,7 @@ async def get_snapshots_by_date_range(
     response_model=ApiResponse[StockSnapshotResponse],
     status_code=status.HTTP_200_OK,
     summary="Get stock snapshot by ID",
-    description="Get a specific stock snapshot by its ID",
+    description="Get a specific stock snapshot by its ID with a page of its stock details",
     responses={
         status.HTTP_400_BAD_REQUEST: {"description": "Bad Request"},
         status.HTTP_401_UNAUTHORIZED: {"description": "Unauthorized"},
@@ -267,6 +271,8 @@ async def get_snapshot_by_id(
     store_code: str = Path(...),
     snapshot_id: str = Path(...),
     terminal_id: str = Query(None, description="Terminal ID for api_key, None for token"),
+    page: int = Query(1, ge=1, description="Page number of the stock details"),
+    limit: int = Query(1000, ge=1, le=10000, description="Maximum number of stock details to return"),
     snapshot_service: SnapshotService = Depends(get_snapshot_service),
 ):
     """Get a specific snapshot"""
@@ -274,7 +280,10 @@ async def get_snapshot_by_id(
     # Verify tenant ID matches security context
     verify_tenant_id(tenant_id, tenant_id_with_security, logger)
 
-    snapshot = await snapshot_service.get_snapshot_by_id_async(snapshot_id)
+    # Calculate skip from page
+    skip = (page - 1) * limit
+
+    snapshot = await snapshot_service.get_snapshot_by_id_async(snapshot_id, skip, limit)
 
     if snapshot is None:
         raise SnapshotNotFoundError(message=f"Snapshot {snapshot_id} not found", logger=logger)
@@ -605,11 +614,11 @@ async def _notify_pubsub_status_tranlog_async(tran_dict: dict, status: str, mess
     payload = {"event_id": event_id, "service": service_name, "status": status, "message": message}
 
     try:
-        async with get_service_client(service_name="cart") as client:
-            terminal_id = f"{tenant_id}-{store_code}-{terminal_no_str}"
-            params = {"terminal_id": terminal_id}
-            endpoint = f"/tenants/{tenant_id}/stores/{store_code}/terminals/{terminal_no_str}/transactions/{transaction_no_str}/delivery-status"
-            await client.post(endpoint=endpoint, headers=headers, params=params, json=payload)
+        client = await get_pooled_client(service_name="cart")
+        terminal_id = f"{tenant_id}-{store_code}-{terminal_no_str}"
+        params = {"terminal_id": terminal_id}
+        endpoint = f"/tenants/{tenant_id}/stores/{store_code}/terminals/{terminal_no_str}/transactions/{transaction_no_str}/delivery-status"
+        await client.post(endpoint=endpoint, headers=headers, params=params, json=payload)
 
         logger.info(f"tranlog Pub/Sub service notified successfully. event_id: {event_id}, json: {payload}")
     except Exception as e:
@@ -629,7 +638,20 @@ async def _notify_pubsub_status(log_type: str, log_dict: dict, status: str, mess
         status: The status of the log processing
         message: Optional message to include in the notification
     """
+    from app.config.settings import settings
+
     if log_type == "tranlog":
+        if settings.USE_DELIVERY_STATUS_BATCH:
+            # sent to cart in one bulk request with the statuses of other messages
+            delivery_status_notifier.notify(
+                target_service="cart",
+                tenant_id=log_dict.get("tenant_id"),
+                service_name="stock",
+                event_id=log_dict.get("event_id"),
+                status=status,
+                message=message,
+            )
+            return
         await _notify_pubsub_status_tranlog_async(log_dict, status, message)
     # Add other log types here if needed in the future
 
@@ -927,9 +949,6 @@ async def websocket_endpoint(websocket: WebSocket, tenant_id: str, store_code: s
     try:
         # Import dependencies
         from app.dependencies.get_alert_service import get_alert_service
-        from app.services.stock_service import StockService
-        from kugel_common.database import database as db_helper
-        from app.config.settings import settings
         from kugel_common.security import verify_token
     except Exception as e:
         logger.error(f"Import error in WebSocket: {e}", exc_info=True)
@@ -995,42 +1014,8 @@ async def websocket_endpoint(websocket: WebSocket, tenant_id: str, store_code: s
         )
 
         # Get and send current alerts
-        db = await db_helper.get_db_async(f"{settings.DB_NAME_PREFIX}_{tenant_id}")
-        stock_service = StockService(db, alert_service)
-
-        # Get items below reorder point
-        reorder_alerts, _ = await stock_service.get_reorder_alerts_async(tenant_id, store_code)
-        for stock in reorder_alerts:
-            await alert_service.send_alert(
-                {
-                    "type": "stock_alert",
-                    "alert_type": "reorder_point",
-                    "tenant_id": stock.tenant_id,
-                    "store_code": stock.store_code,
-                    "item_code": stock.item_code,
-                    "current_quantity": stock.current_quantity,
-                    "reorder_point": stock.reorder_point,
-                    "reorder_quantity": stock.reorder_quantity,
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                }
-            )
-
-        # Get items below minimum stock
-        low_stocks, _ = await stock_service.get_low_stocks_async(tenant_id, store_code)
-        for stock in low_stocks:
-            await alert_service.send_alert(
-                {
-                    "type": "stock_alert",
-                    "alert_type": "minimum_stock",
-                    "tenant_id": stock.tenant_id,
-                    "store_code": stock.store_code,
-                    "item_code": stock.item_code,
-                    "current_quantity": stock.current_quantity,
-                    "minimum_quantity": stock.minimum_quantity,
-                    "reorder_quantity": stock.reorder_quantity,
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                }
-            )
+        for alert in await alert_service.get_current_alerts(tenant_id, store_code):
+            await alert_service.send_alert(alert)
 
         # Keep connection alive and handle messages
         while True:
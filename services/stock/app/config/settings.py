@@ -45,12 +45,26 @@ class Settings(
     # System-wide snapshot constraints
     MAX_SNAPSHOT_RETENTION_DAYS: int = Field(default=365, description="Maximum allowed snapshot retention days")
     MIN_SNAPSHOT_RETENTION_DAYS: int = Field(default=1, description="Minimum allowed snapshot retention days")
+    SNAPSHOT_CHUNK_SIZE: int = Field(
+        default=1000, description="Number of items read per batch and stored per chunk document of a snapshot"
+    )
 
     # Alert settings
     ALERT_COOLDOWN_SECONDS: int = Field(
         default=60, description="Cooldown period in seconds between duplicate alerts for the same item"
     )
 
+    # Transaction processing settings
+    USE_BULK_STOCK_UPDATE: bool = Field(
+        default=True, description="Apply the stock changes of a transaction with one bulk write instead of per item"
+    )
+
+    # Alert query settings
+    USE_STOCK_ALERT_FLAGS: bool = Field(
+        default=True,
+        description="Find low stock and reorder alerts with the precomputed alert flags instead of comparing fields",
+    )
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_ignore_empty=True,  # Ignore empty values from .env file
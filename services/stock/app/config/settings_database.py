@@ -6,3 +6,4 @@ class DBCollectionSettings(BaseSettings):
     DB_COLLECTION_NAME_STOCK: str = "stocks"
     DB_COLLECTION_NAME_STOCK_UPDATE: str = "stock_updates"
     DB_COLLECTION_NAME_STOCK_SNAPSHOT: str = "stock_snapshots"
+    DB_COLLECTION_NAME_STOCK_SNAPSHOT_CHUNK: str = "stock_snapshot_chunks"
@@ -4,10 +4,25 @@ from logging import getLogger
 
 from kugel_common.database import database as db_helper
 from app.config.settings import settings
+from app.models.repositories.stock_repository import StockRepository
 
 # setup logger
 logger = getLogger(__name__)
 
+# partial indexes of the low stock and reorder alert queries, holding only the flagged stocks
+STOCK_ALERT_INDEXES = [
+    {
+        "keys": {"tenant_id": 1, "store_code": 1, "is_below_minimum": 1},
+        "unique": False,
+        "partial_filter_expression": {"is_below_minimum": True},
+    },
+    {
+        "keys": {"tenant_id": 1, "store_code": 1, "is_below_reorder": 1},
+        "unique": False,
+        "partial_filter_expression": {"is_below_reorder": True},
+    },
+]
+
 
 # create some collection
 async def create_some_collection(
@@ -31,12 +46,52 @@ async def create_stock_collection(tenant_id: str):
         {"keys": {"tenant_id": 1, "store_code": 1, "item_code": 1}, "unique": True},
         {"keys": {"item_code": 1}},
         {"keys": {"last_updated": -1}},
+        *STOCK_ALERT_INDEXES,
     ]
     await create_some_collection(
         tenant_id=tenant_id, collection_name=name, index_keys_list=index_keys_list, index_name=name + "_index"
     )
 
 
+# add the alert indexes to an existing stock collection
+async def update_stock_alert_indexes(tenant_id: str):
+    name = settings.DB_COLLECTION_NAME_STOCK
+    db = await db_helper.get_db_async(f"{settings.DB_NAME_PREFIX}_{tenant_id}")
+    for index_info in STOCK_ALERT_INDEXES:
+        keys = index_info["keys"]
+        # same name as create_collection_with_indexes_async gives it, so this is a no-op if it exists
+        index_name = name + "_index_" + "_".join(keys.keys())
+        command = db_helper.create_indexes_command(
+            collection_name=name,
+            index_keys=keys,
+            index_name=index_name,
+            unique=index_info["unique"],
+            partial_filter_expression=index_info["partial_filter_expression"],
+        )
+        await db_helper.execute_command_async(command=command, db=db)
+
+    # set the alert flags of stocks stored before the flags were introduced
+    await StockRepository(db).backfill_alert_flags_async()
+
+
+# add the alert indexes and flags to the stock collections of all existing tenants
+async def update_stock_alert_indexes_for_all_tenants():
+    client = await db_helper.get_client_async()
+    prefix = f"{settings.DB_NAME_PREFIX}_"
+    for db_name in await client.list_database_names():
+        tenant_id = db_name[len(prefix) :] if db_name.startswith(prefix) else None
+        if not tenant_id:
+            continue
+        collection_names = await client[db_name].list_collection_names()
+        if settings.DB_COLLECTION_NAME_STOCK not in collection_names:
+            continue
+        try:
+            await update_stock_alert_indexes(tenant_id)
+        except Exception as e:
+            # the other tenants are migrated anyway, the failed one is retried on the next startup
+            logger.error(f"Failed to update the stock alert indexes for tenant_id:{tenant_id}: {e}")
+
+
 # create stock_updates collection
 async def create_stock_update_collection(tenant_id: str):
     name = settings.DB_COLLECTION_NAME_STOCK_UPDATE
@@ -60,6 +115,15 @@ async def create_stock_snapshot_collection(tenant_id: str):
     )
 
 
+# create stock_snapshot_chunks collection
+async def create_stock_snapshot_chunk_collection(tenant_id: str):
+    name = settings.DB_COLLECTION_NAME_STOCK_SNAPSHOT_CHUNK
+    index_key_list = [{"keys": {"snapshot_id": 1, "chunk_no": 1}, "unique": True}]
+    await create_some_collection(
+        tenant_id=tenant_id, collection_name=name, index_keys_list=index_key_list, index_name=name + "_index"
+    )
+
+
 # create request log collection
 async def create_request_log_collection(tenant_id: str):
     name = settings.DB_COLLECTION_NAME_REQUEST_LOG
@@ -76,6 +140,7 @@ async def create_collections(tenant_id: str):
     await create_stock_collection(tenant_id)
     await create_stock_update_collection(tenant_id)
     await create_stock_snapshot_collection(tenant_id)
+    await create_stock_snapshot_chunk_collection(tenant_id)
     await create_request_log_collection(tenant_id)
 
     # add more collections here
@@ -85,4 +150,5 @@ async def create_collections(tenant_id: str):
 async def execute(tenant_id: str):
     logger.info(f"Setting up database for tenant_id:{tenant_id} execution started...")
     await create_collections(tenant_id)
+    await update_stock_alert_indexes(tenant_id)
     # add more setup tasks here
@@ -17,11 +17,14 @@ logger.info("Application started - stock service")
 
 # Import the required application modules after the logger is configured  # This ensures all imported modules use the configured logger
 from kugel_common.database import database as db_helper
+from kugel_common.utils.http_client_helper import close_all_clients
 from kugel_common.schemas.api_response import ApiResponse
 from kugel_common.schemas.health import HealthCheckResponse, HealthStatus, ComponentHealth
 from kugel_common.utils.health_check import HealthChecker
 from kugel_common.exceptions import register_exception_handlers
 from kugel_common.middleware.log_requests import log_requests
+from kugel_common.utils.request_log_writer import request_log_writer
+from kugel_common.utils.delivery_status_notifier import delivery_status_notifier
 from app.api.v1.stock import router as v1_stock_router
 from app.api.v1.tenant import router as v1_tenant_router
 from app.config.settings import settings
@@ -32,6 +35,7 @@ from app.dependencies.get_alert_service import set_alert_service
 from app.dependencies.get_stock_service import get_db_from_tenant
 from app.websocket.connection_manager import ConnectionManager
 from app.services.alert_service import AlertService
+from app.database import database_setup
 
 # Create a FastAPI instance with API documentation URLs enabled
 app = FastAPI(docs_url="/docs", redoc_url="/redoc")
@@ -169,6 +173,11 @@ async def startup_event():
         logger.error(f"Error connecting to the database: {e}")
         raise e
 
+    # Stocks of tenants created before the alert flags were introduced have no flags nor indexes yet
+    if settings.USE_STOCK_ALERT_FLAGS:
+        logger.info("Updating the stock alert indexes of existing tenants...")
+        await database_setup.update_stock_alert_indexes_for_all_tenants()
+
     # Initialize and start the snapshot scheduler
     logger.info("Initializing snapshot scheduler...")
     scheduler = MultiTenantSnapshotScheduler()
@@ -216,10 +225,20 @@ async def close_event():
     logger.info("closing state store manager...")
     await state_store_manager.close()
 
+    # Send the queued delivery statuses to the publishers of the logs
+    await delivery_status_notifier.close_async()
+
+    # Write the queued request logs before the database connection is closed
+    await request_log_writer.close_async()
+
     # Close the database connection
     logger.info("close database connection for all tenants...")
     await db_helper.close_client_async()
 
+    # Close the pooled HTTP clients of the other services
+    logger.info("Closing all HTTP client pools")
+    await close_all_clients()
+
     # add close tasks here
     logger.info("Application closed")
 
@@ -1,6 +1,12 @@
 # Copyright 2025 masa@kugel  # # Licensed under the Apache License, Version 2.0 (the "License");  # you may not use this file except in compliance with the License.  # You may obtain a copy of the License at  # #     http://www.apache.org/licenses/LICENSE-2.0  # # Unless required by applicable law or agreed to in writing, software  # distributed under the License is distributed on an "AS IS" BASIS,  # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  # See the License for the specific language governing permissions and  # limitations under the License.
 from .stock_document import StockDocument
 from .stock_update_document import StockUpdateDocument
-from .stock_snapshot_document import StockSnapshotDocument, StockSnapshotItem
+from .stock_snapshot_document import StockSnapshotDocument, StockSnapshotItem, StockSnapshotChunkDocument
 
-__all__ = ["StockDocument", "StockUpdateDocument", "StockSnapshotDocument", "StockSnapshotItem"]
+__all__ = [
+    "StockDocument",
+    "StockUpdateDocument",
+    "StockSnapshotDocument",
+    "StockSnapshotItem",
+    "StockSnapshotChunkDocument",
+]
@@ -20,3 +20,16 @@ class StockDocument(AbstractDocument):
     reorder_point: float = Field(0.0, description="Reorder point - quantity that triggers reorder")
     reorder_quantity: float = Field(0.0, description="Quantity to order when reorder point is reached")
     last_transaction_id: Optional[str] = Field(None, description="Last transaction reference")
+    is_below_minimum: bool = Field(False, description="Current quantity is below the minimum quantity")
+    is_below_reorder: bool = Field(False, description="Current quantity is at or below the reorder point")
+
+    def update_alert_flags(self) -> "StockDocument":
+        """
+        Compute the alert flags from the quantities, as the repository updates do.
+
+        Returns:
+            StockDocument: This document
+        """
+        self.is_below_minimum = self.current_quantity < self.minimum_quantity
+        self.is_below_reorder = self.reorder_point > 0 and self.current_quantity <= self.reorder_point
+        return self
@@ -4,6 +4,7 @@ from datetime import datetime
 from pydantic import Field
 from kugel_common.models.documents.abstract_document import AbstractDocument
 from kugel_common.models.documents.base_document_model import BaseDocumentModel
+from app.enums.snapshot_status import SnapshotStatus
 
 
 class StockSnapshotItem(BaseDocumentModel):
@@ -20,6 +21,12 @@ class StockSnapshotDocument(AbstractDocument):
     total_items: int = Field(..., description="Total number of items")
     total_quantity: float = Field(..., description="Total stock quantity")
     stocks: List[StockSnapshotItem] = Field(default_factory=list, description="Stock details by item")
+    chunk_count: int = Field(
+        0, description="Number of chunk documents holding the stock details, 0 if they are stored in this document"
+    )
+    status: SnapshotStatus = Field(
+        SnapshotStatus.COMPLETED, description="in_progress until all stock details of the snapshot are stored"
+    )
     created_by: str = Field(..., description="User or system that created the snapshot")
     generate_date_time: Optional[str] = Field(None, description="Snapshot generation datetime in ISO format")
 
@@ -29,3 +36,22 @@ class StockSnapshotDocument(AbstractDocument):
             {"keys": [("tenant_id", 1), ("store_code", 1), ("created_at", -1)]},
             {"keys": [("tenant_id", 1), ("store_code", 1), ("generate_date_time", -1)]},
         ]
+
+
+class StockSnapshotChunkDocument(AbstractDocument):
+    """
+    Chunk of the stock details of a snapshot.
+
+    The items of a snapshot are written in chunks while the stocks are read, so a
+    snapshot is neither limited in size nor held in memory as a whole.
+    """
+
+    snapshot_id: str = Field(..., description="ID of the snapshot document")
+    tenant_id: str = Field(..., description="Tenant ID")
+    store_code: str = Field(..., description="Store code")
+    chunk_no: int = Field(..., description="Order of the chunk in the snapshot, from 0")
+    stocks: List[StockSnapshotItem] = Field(default_factory=list, description="Stock details by item")
+
+    class Settings:
+        name = "stock_snapshot_chunks"
+        indexes = [{"keys": [("snapshot_id", 1), ("chunk_no", 1)], "unique": True}]
@@ -2,5 +2,6 @@
 from .stock_repository import StockRepository
 from .stock_update_repository import StockUpdateRepository
 from .stock_snapshot_repository import StockSnapshotRepository
+from .stock_snapshot_chunk_repository import StockSnapshotChunkRepository
 
-__all__ = ["StockRepository", "StockUpdateRepository", "StockSnapshotRepository"]
+__all__ = ["StockRepository", "StockUpdateRepository", "StockSnapshotRepository", "StockSnapshotChunkRepository"]
@@ -1,11 +1,25 @@
 # Copyright 2025 masa@kugel  # # Licensed under the Apache License, Version 2.0 (the "License");  # you may not use this file except in compliance with the License.  # You may obtain a copy of the License at  # #     http://www.apache.org/licenses/LICENSE-2.0  # # Unless required by applicable law or agreed to in writing, software  # distributed under the License is distributed on an "AS IS" BASIS,  # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  # See the License for the specific language governing permissions and  # limitations under the License.
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List, Dict
+from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
 from kugel_common.models.repositories.abstract_repository import AbstractRepository
 from kugel_common.utils.misc import get_app_time
 from app.models.documents.stock_document import StockDocument
 from app.config.settings import settings
 
+# Alert flags of a stock, computed from its quantities by update pipelines so that the
+# alert queries can use partial indexes instead of comparing fields with $expr
+ALERT_FLAGS_EXPRESSION = {
+    "is_below_minimum": {"$lt": ["$current_quantity", "$minimum_quantity"]},
+    "is_below_reorder": {
+        "$and": [
+            {"$gt": ["$reorder_point", 0]},  # Only set if reorder point is set
+            {"$lte": ["$current_quantity", "$reorder_point"]},
+        ]
+    },
+}
+
 
 class StockRepository(AbstractRepository[StockDocument]):
     def __init__(self, database: AsyncIOMotorDatabase):
@@ -32,18 +46,42 @@ class StockRepository(AbstractRepository[StockDocument]):
         documents = await cursor.to_list(length=limit if limit > 0 else None)
         return [StockDocument(**doc) for doc in documents]
 
+    async def find_by_store_in_batches_async(
+        self, tenant_id: str, store_code: str, batch_size: int = 1000
+    ) -> AsyncIterator[List[StockDocument]]:
+        """Iterate over all stocks of a store in item code order, one batch at a time"""
+        if self.dbcollection is None:
+            await self.initialize()
+
+        cursor = (
+            self.dbcollection.find({"tenant_id": tenant_id, "store_code": store_code})
+            .sort("item_code", 1)
+            .batch_size(batch_size)
+        )
+        batch = []
+        async for doc in cursor:
+            batch.append(StockDocument(**doc))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
     async def find_low_stock_async(self, tenant_id: str, store_code: str) -> List[StockDocument]:
         """Find items with stock below minimum quantity"""
         if self.dbcollection is None:
             await self.initialize()
 
-        cursor = self.dbcollection.find(
-            {
+        if settings.USE_STOCK_ALERT_FLAGS:
+            # served by the partial index on the precomputed flag
+            query = {"tenant_id": tenant_id, "store_code": store_code, "is_below_minimum": True}
+        else:
+            query = {
                 "tenant_id": tenant_id,
                 "store_code": store_code,
                 "$expr": {"$lt": ["$current_quantity", "$minimum_quantity"]},
             }
-        )
+        cursor = self.dbcollection.find(query)
         documents = await cursor.to_list(length=None)
         return [StockDocument(**doc) for doc in documents]
 
@@ -52,10 +90,19 @@ class StockRepository(AbstractRepository[StockDocument]):
     ) -> bool:
         """Update stock quantity"""
         update_data = {"current_quantity": new_quantity, "last_transaction_id": transaction_id}
-        return await self.update_one_async(
+        return await self._update_with_alert_flags_async(
             {"tenant_id": tenant_id, "store_code": store_code, "item_code": item_code}, update_data
         )
 
+    async def update_minimum_quantity_async(
+        self, tenant_id: str, store_code: str, item_code: str, minimum_quantity: float
+    ) -> bool:
+        """Update minimum quantity for an item"""
+        return await self._update_with_alert_flags_async(
+            {"tenant_id": tenant_id, "store_code": store_code, "item_code": item_code},
+            {"minimum_quantity": minimum_quantity},
+        )
+
     async def update_quantity_atomic_async(
         self,
         tenant_id: str,
@@ -68,24 +115,12 @@ class StockRepository(AbstractRepository[StockDocument]):
         if self.dbcollection is None:
             await self.initialize()
 
-        now = get_app_time()
-
         # Use findAndModify with upsert for atomic update
         result = await self.dbcollection.find_one_and_update(
             filter={"tenant_id": tenant_id, "store_code": store_code, "item_code": item_code},
-            update={
-                "$inc": {"current_quantity": quantity_change},
-                "$set": {"last_transaction_id": transaction_id, "updated_at": now},
-                "$setOnInsert": {
-                    "tenant_id": tenant_id,
-                    "store_code": store_code,
-                    "item_code": item_code,
-                    "minimum_quantity": 0.0,
-                    "reorder_point": 0.0,
-                    "reorder_quantity": 0.0,
-                    "created_at": now,
-                },
-            },
+            update=self._make_quantity_update(
+                tenant_id, store_code, item_code, quantity_change, transaction_id, get_app_time()
+            ),
             upsert=True,  # Create document if it doesn't exist
             return_document=True,  # Return the document after update
         )
@@ -94,6 +129,100 @@ class StockRepository(AbstractRepository[StockDocument]):
             return StockDocument(**result)
         return None
 
+    async def update_quantities_bulk_async(
+        self,
+        tenant_id: str,
+        store_code: str,
+        quantity_changes: Dict[str, float],
+        transaction_id: Optional[str] = None,
+    ) -> List[StockDocument]:
+        """
+        Update the quantities of several items with one bulk write and return the updated stocks.
+
+        Run it in a transaction (start_transaction or set_session) to apply all changes or none and
+        to read back the quantities written by this update, which concurrent writes cannot change
+        until the transaction is committed.
+        """
+        if not quantity_changes:
+            return []
+        if self.dbcollection is None:
+            await self.initialize()
+
+        now = get_app_time()
+        operations = [
+            UpdateOne(
+                {"tenant_id": tenant_id, "store_code": store_code, "item_code": item_code},
+                self._make_quantity_update(tenant_id, store_code, item_code, quantity_change, transaction_id, now),
+                upsert=True,
+            )
+            for item_code, quantity_change in quantity_changes.items()
+        ]
+        await self.dbcollection.bulk_write(operations, ordered=False, session=self.session)
+
+        # Read back with one query in the same session
+        cursor = self.dbcollection.find(
+            {"tenant_id": tenant_id, "store_code": store_code, "item_code": {"$in": list(quantity_changes.keys())}},
+            session=self.session,
+        )
+        documents = await cursor.to_list(length=None)
+        return [StockDocument(**doc) for doc in documents]
+
+    @staticmethod
+    def _make_quantity_update(
+        tenant_id: str,
+        store_code: str,
+        item_code: str,
+        quantity_change: float,
+        transaction_id: Optional[str],
+        now: datetime,
+    ) -> list:
+        """
+        Build the upsert update that increments the quantity of an item.
+
+        The update is a pipeline so that the alert flags are computed from the new quantity
+        in the same write. An upserted document starts with the fields of the filter
+        (tenant_id, store_code, item_code), the other fields get their defaults.
+        """
+        return [
+            {
+                "$set": {
+                    "current_quantity": {"$add": [{"$ifNull": ["$current_quantity", 0.0]}, quantity_change]},
+                    "minimum_quantity": {"$ifNull": ["$minimum_quantity", 0.0]},
+                    "reorder_point": {"$ifNull": ["$reorder_point", 0.0]},
+                    "reorder_quantity": {"$ifNull": ["$reorder_quantity", 0.0]},
+                    "last_transaction_id": {"$literal": transaction_id},
+                    "created_at": {"$ifNull": ["$created_at", now]},
+                    "updated_at": now,
+                }
+            },
+            {"$set": ALERT_FLAGS_EXPRESSION},
+        ]
+
+    async def _update_with_alert_flags_async(self, filter: dict, new_values: dict) -> bool:
+        """Set fields of a stock and recompute its alert flags in the same write"""
+        if self.dbcollection is None:
+            await self.initialize()
+
+        new_values["updated_at"] = get_app_time()
+        values = {key: {"$literal": value} for key, value in new_values.items()}
+        response = await self.dbcollection.update_one(filter, [{"$set": values}, {"$set": ALERT_FLAGS_EXPRESSION}])
+        return response.modified_count == 1
+
+    async def backfill_alert_flags_async(self) -> int:
+        """
+        Set the alert flags of stocks stored before the flags were introduced.
+
+        Returns:
+            Number of updated stocks
+        """
+        if self.dbcollection is None:
+            await self.initialize()
+
+        response = await self.dbcollection.update_many(
+            {"$or": [{"is_below_minimum": None}, {"is_below_reorder": None}]}, [{"$set": ALERT_FLAGS_EXPRESSION}]
+        )
+        return response.modified_count
+
     async def count_by_store_async(self, tenant_id: str, store_code: str) -> int:
         """Count all stocks for a store"""
         if self.dbcollection is None:
@@ -106,8 +235,11 @@ class StockRepository(AbstractRepository[StockDocument]):
         if self.dbcollection is None:
             await self.initialize()
 
-        cursor = self.dbcollection.find(
-            {
+        if settings.USE_STOCK_ALERT_FLAGS:
+            # served by the partial index on the precomputed flag
+            query = {"tenant_id": tenant_id, "store_code": store_code, "is_below_reorder": True}
+        else:
+            query = {
                 "tenant_id": tenant_id,
                 "store_code": store_code,
                 "$expr": {
@@ -117,7 +249,7 @@ class StockRepository(AbstractRepository[StockDocument]):
                     ]
                 },
             }
-        )
+        cursor = self.dbcollection.find(query)
         documents = await cursor.to_list(length=None)
         return [StockDocument(**doc) for doc in documents]
 
@@ -126,6 +258,6 @@ class StockRepository(AbstractRepository[StockDocument]):
     ) -> bool:
         """Update reorder point and quantity for an item"""
         update_data = {"reorder_point": reorder_point, "reorder_quantity": reorder_quantity}
-        return await self.update_one_async(
+        return await self._update_with_alert_flags_async(
             {"tenant_id": tenant_id, "store_code": store_code, "item_code": item_code}, update_data
         )
@@ -0,0 +1,36 @@
+# Copyright 2025 masa@kugel  # # Licensed under the Apache License, Version 2.0 (the "License");  # you may not use this file except in compliance with the License.  # You may obtain a copy of the License at  # #     http://www.apache.org/licenses/LICENSE-2.0  # # Unless required by applicable law or agreed to in writing, software  # distributed under the License is distributed on an "AS IS" BASIS,  # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  # See the License for the specific language governing permissions and  # limitations under the License.
+from typing import List
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from kugel_common.models.repositories.abstract_repository import AbstractRepository
+from app.models.documents.stock_snapshot_document import StockSnapshotChunkDocument, StockSnapshotItem
+from app.config.settings import settings
+
+
+class StockSnapshotChunkRepository(AbstractRepository[StockSnapshotChunkDocument]):
+    def __init__(self, database: AsyncIOMotorDatabase):
+        super().__init__(settings.DB_COLLECTION_NAME_STOCK_SNAPSHOT_CHUNK, StockSnapshotChunkDocument, database)
+
+    async def find_stocks_page_async(self, snapshot_id: str, skip: int, limit: int) -> List[StockSnapshotItem]:
+        """Find a page of the stock details of a snapshot, in chunk order"""
+        if self.dbcollection is None:
+            await self.initialize()
+
+        # only the requested page of items is returned, not the chunks holding them
+        pipeline = [
+            {"$match": {"snapshot_id": snapshot_id}},
+            {"$sort": {"chunk_no": 1}},
+            {"$unwind": "$stocks"},
+            {"$skip": skip},
+            {"$limit": limit},
+            {"$replaceRoot": {"newRoot": "$stocks"}},
+        ]
+        items = await self.dbcollection.aggregate(pipeline).to_list(length=limit)
+        return [StockSnapshotItem(**item) for item in items]
+
+    async def delete_by_snapshot_ids_async(self, snapshot_ids: List[str]) -> int:
+        """Delete the chunks of snapshots"""
+        if self.dbcollection is None:
+            await self.initialize()
+
+        result = await self.dbcollection.delete_many({"snapshot_id": {"$in": snapshot_ids}})
+        return result.deleted_count
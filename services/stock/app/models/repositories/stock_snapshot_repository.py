@@ -1,25 +1,117 @@
 # Copyright 2025 masa@kugel  # # Licensed under the Apache License, Version 2.0 (the "License");  # you may not use this file except in compliance with the License.  # You may obtain a copy of the License at  # #     http://www.apache.org/licenses/LICENSE-2.0  # # Unless required by applicable law or agreed to in writing, software  # distributed under the License is distributed on an "AS IS" BASIS,  # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  # See the License for the specific language governing permissions and  # limitations under the License.
 from typing import List, Optional, Tuple
 from datetime import datetime, timedelta, timezone
+from bson import ObjectId
+from bson.errors import InvalidId
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from kugel_common.models.repositories.abstract_repository import AbstractRepository
-from app.models.documents.stock_snapshot_document import StockSnapshotDocument
+from kugel_common.utils.misc import get_app_time
+from app.models.documents.stock_snapshot_document import (
+    StockSnapshotDocument,
+    StockSnapshotChunkDocument,
+    StockSnapshotItem,
+)
+from app.models.repositories.stock_snapshot_chunk_repository import StockSnapshotChunkRepository
 from app.config.settings import settings
+from app.enums.snapshot_status import SnapshotStatus
+
+# snapshots whose stock details are still being stored are not returned
+COMPLETED_SNAPSHOT_FILTER = {"status": {"$ne": SnapshotStatus.IN_PROGRESS.value}}
+
+# listings return the totals only, the stock details are paged by snapshot ID
+SNAPSHOT_SUMMARY_PROJECTION = {"stocks": 0}
 
 
 class StockSnapshotRepository(AbstractRepository[StockSnapshotDocument]):
     def __init__(self, database: AsyncIOMotorDatabase):
         super().__init__(settings.DB_COLLECTION_NAME_STOCK_SNAPSHOT, StockSnapshotDocument, database)
+        self._chunk_repository = StockSnapshotChunkRepository(database)
+
+    async def create_snapshot_async(self, snapshot: StockSnapshotDocument) -> str:
+        """Insert a snapshot and return its ID from the insert result"""
+        if self.dbcollection is None:
+            await self.initialize()
+
+        snapshot.created_at = get_app_time()
+        response = await self.dbcollection.insert_one(snapshot.model_dump())
+        return str(response.inserted_id)
+
+    async def add_stocks_async(
+        self, snapshot_id: str, snapshot: StockSnapshotDocument, chunk_no: int, stocks: List[StockSnapshotItem]
+    ) -> bool:
+        """Store a chunk of the stock details of a snapshot"""
+        chunk = StockSnapshotChunkDocument(
+            snapshot_id=snapshot_id,
+            tenant_id=snapshot.tenant_id,
+            store_code=snapshot.store_code,
+            chunk_no=chunk_no,
+            stocks=stocks,
+        )
+        return await self._chunk_repository.create_async(chunk)
+
+    async def complete_snapshot_async(
+        self, snapshot_id: str, total_items: int, total_quantity: float, chunk_count: int
+    ) -> bool:
+        """Set the totals and the number of chunks of a snapshot once all its stocks are stored, and complete it"""
+        if self.dbcollection is None:
+            await self.initialize()
+
+        result = await self.dbcollection.update_one(
+            {"_id": ObjectId(snapshot_id)},
+            {
+                "$set": {
+                    "total_items": total_items,
+                    "total_quantity": total_quantity,
+                    "chunk_count": chunk_count,
+                    "status": SnapshotStatus.COMPLETED.value,
+                    "updated_at": get_app_time(),
+                }
+            },
+        )
+        return result.matched_count == 1
+
+    async def delete_snapshot_async(self, snapshot_id: str) -> None:
+        """Delete a snapshot and its chunks"""
+        if self.dbcollection is None:
+            await self.initialize()
+
+        await self._chunk_repository.delete_by_snapshot_ids_async([snapshot_id])
+        await self.dbcollection.delete_one({"_id": ObjectId(snapshot_id)})
+
+    async def get_by_id_async(
+        self, snapshot_id: str, skip: int = 0, limit: int = 1000
+    ) -> Optional[StockSnapshotDocument]:
+        """Get a snapshot by ID with a page of its stock details"""
+        if self.dbcollection is None:
+            await self.initialize()
+
+        try:
+            object_id = ObjectId(snapshot_id)
+        except (InvalidId, TypeError):
+            return None
+
+        # snapshots stored before chunking hold their stock details in the document
+        document = await self.dbcollection.find_one(
+            {"_id": object_id, **COMPLETED_SNAPSHOT_FILTER}, {"stocks": {"$slice": [skip, limit]}}
+        )
+        if document is None:
+            return None
+        if document.get("chunk_count"):
+            document["stocks"] = await self._chunk_repository.find_stocks_page_async(snapshot_id, skip, limit)
+        return StockSnapshotDocument(**document)
 
     async def find_by_store_async(
         self, tenant_id: str, store_code: str, skip: int = 0, limit: int = 20
     ) -> List[StockSnapshotDocument]:
-        """Find snapshots by store"""
+        """Find snapshots by store, without their stock details"""
         if self.dbcollection is None:
             await self.initialize()
 
         cursor = (
-            self.dbcollection.find({"tenant_id": tenant_id, "store_code": store_code})
+            self.dbcollection.find(
+                {"tenant_id": tenant_id, "store_code": store_code, **COMPLETED_SNAPSHOT_FILTER},
+                SNAPSHOT_SUMMARY_PROJECTION,
+            )
             .sort("created_at", -1)
             .skip(skip)
             .limit(limit)
@@ -31,27 +123,40 @@ class StockSnapshotRepository(AbstractRepository[StockSnapshotDocument]):
     async def find_by_date_range_async(
         self, tenant_id: str, store_code: str, start_date: datetime, end_date: datetime
     ) -> List[StockSnapshotDocument]:
-        """Find snapshots within date range using created_at for backward compatibility"""
+        """Find snapshots within date range using created_at for backward compatibility, without their stock details"""
         cursor = self.dbcollection.find(
-            {"tenant_id": tenant_id, "store_code": store_code, "created_at": {"$gte": start_date, "$lte": end_date}}
+            {
+                "tenant_id": tenant_id,
+                "store_code": store_code,
+                "created_at": {"$gte": start_date, "$lte": end_date},
+                **COMPLETED_SNAPSHOT_FILTER,
+            },
+            SNAPSHOT_SUMMARY_PROJECTION,
         ).sort("created_at", -1)
         documents = await cursor.to_list(length=None)
         return [StockSnapshotDocument(**doc) for doc in documents]
 
     async def get_latest_snapshot_async(self, tenant_id: str, store_code: str) -> Optional[StockSnapshotDocument]:
-        """Get the latest snapshot for a store"""
-        # Use the parent class method with sorting
-        snapshots = await self.get_list_async_with_sort_and_paging(
-            filter={"tenant_id": tenant_id, "store_code": store_code}, limit=1, page=1, sort=[("created_at", -1)]
-        )
+        """Get the latest snapshot for a store, without its stock details"""
+        snapshots = await self.find_by_store_async(tenant_id, store_code, skip=0, limit=1)
         return snapshots[0] if snapshots else None
 
     async def delete_old_snapshots_async(self, tenant_id: str, store_code: str, retention_days: int = 90) -> int:
         """Delete snapshots older than retention days"""
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=retention_days)
-        result = await self.dbcollection.delete_many(
-            {"tenant_id": tenant_id, "store_code": store_code, "created_at": {"$lt": cutoff_date}}
-        )
+        query = {"tenant_id": tenant_id, "store_code": store_code, "created_at": {"$lt": cutoff_date}}
+
+        # Delete the chunks of the old snapshots first, so no snapshot is left without its stocks.
+        # Snapshots left in progress by a stopped process may have chunks but no chunk count yet.
+        chunked_query = {
+            **query,
+            "$or": [{"chunk_count": {"$gt": 0}}, {"status": SnapshotStatus.IN_PROGRESS.value}],
+        }
+        chunked = await self.dbcollection.find(chunked_query, {"_id": 1}).to_list(length=None)
+        if chunked:
+            await self._chunk_repository.delete_by_snapshot_ids_async([str(doc["_id"]) for doc in chunked])
+
+        result = await self.dbcollection.delete_many(query)
         return result.deleted_count
 
     async def count_by_store_async(self, tenant_id: str, store_code: str) -> int:
@@ -59,7 +164,9 @@ class StockSnapshotRepository(AbstractRepository[StockSnapshotDocument]):
         if self.dbcollection is None:
             await self.initialize()
 
-        return await self.dbcollection.count_documents({"tenant_id": tenant_id, "store_code": store_code})
+        return await self.dbcollection.count_documents(
+            {"tenant_id": tenant_id, "store_code": store_code, **COMPLETED_SNAPSHOT_FILTER}
+        )
 
     async def find_by_generate_date_time_async(
         self,
@@ -70,12 +177,17 @@ class StockSnapshotRepository(AbstractRepository[StockSnapshotDocument]):
         skip: int = 0,
         limit: int = 100,
     ) -> Tuple[List[StockSnapshotDocument], int]:
-        """Find snapshots by generate_date_time range with pagination"""
+        """Find snapshots by generate_date_time range with pagination, without their stock details"""
         if self.dbcollection is None:
             await self.initialize()
 
         # Build query - only consider records with generate_date_time
-        query = {"tenant_id": tenant_id, "store_code": store_code, "generate_date_time": {"$ne": None}}
+        query = {
+            "tenant_id": tenant_id,
+            "store_code": store_code,
+            "generate_date_time": {"$ne": None},
+            **COMPLETED_SNAPSHOT_FILTER,
+        }
 
         # Add date range filters if provided
         if start_date:
@@ -87,34 +199,42 @@ class StockSnapshotRepository(AbstractRepository[StockSnapshotDocument]):
         total_count = await self.dbcollection.count_documents(query)
 
         # Get paginated results sorted by generate_date_time
-        cursor = self.dbcollection.find(query).sort("generate_date_time", -1).skip(skip).limit(limit)
+        cursor = (
+            self.dbcollection.find(query, SNAPSHOT_SUMMARY_PROJECTION)
+            .sort("generate_date_time", -1)
+            .skip(skip)
+            .limit(limit)
+        )
         documents = await cursor.to_list(length=limit if limit > 0 else None)
         snapshots = [StockSnapshotDocument(**doc) for doc in documents]
 
         return snapshots, total_count
 
     async def ensure_ttl_index(self, retention_days: int):
-        """Ensure TTL index exists on created_at field"""
+        """Ensure TTL index exists on created_at field of the snapshots and their chunks"""
         if self.dbcollection is None:
             await self.initialize()
-
-        # Get existing indexes
-        indexes = await self.dbcollection.list_indexes().to_list(None)
-
-        # Check if TTL index already exists
-        ttl_index_exists = False
-        for index in indexes:
-            if index.get("name") == "created_at_ttl":
-                # Check if TTL value is different
-                if index.get("expireAfterSeconds") != retention_days * 86400:
-                    # Drop old index and recreate with new TTL
-                    await self.dbcollection.drop_index("created_at_ttl")
-                else:
-                    ttl_index_exists = True
-                break
-
-        # Create TTL index if it doesn't exist
-        if not ttl_index_exists:
-            await self.dbcollection.create_index(
-                "created_at", name="created_at_ttl", expireAfterSeconds=retention_days * 86400
-            )
+        if self._chunk_repository.dbcollection is None:
+            await self._chunk_repository.initialize()
+
+        for collection in (self.dbcollection, self._chunk_repository.dbcollection):
+            # Get existing indexes
+            indexes = await collection.list_indexes().to_list(None)
+
+            # Check if TTL index already exists
+            ttl_index_exists = False
+            for index in indexes:
+                if index.get("name") == "created_at_ttl":
+                    # Check if TTL value is different
+                    if index.get("expireAfterSeconds") != retention_days * 86400:
+                        # Drop old index and recreate with new TTL
+                        await collection.drop_index("created_at_ttl")
+                    else:
+                        ttl_index_exists = True
+                    break
+
+            # Create TTL index if it doesn't exist
+            if not ttl_index_exists:
+                await collection.create_index(
+                    "created_at", name="created_at_ttl", expireAfterSeconds=retention_days * 86400
+                )
@@ -1,17 +1,41 @@
 # Copyright 2025 masa@kugel  # # Licensed under the Apache License, Version 2.0 (the "License");  # you may not use this file except in compliance with the License.  # You may obtain a copy of the License at  # #     http://www.apache.org/licenses/LICENSE-2.0  # # Unless required by applicable law or agreed to in writing, software  # distributed under the License is distributed on an "AS IS" BASIS,  # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  # See the License for the specific language governing permissions and  # limitations under the License.
 from typing import List, Optional
 from datetime import datetime
+from logging import getLogger
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from kugel_common.models.repositories.abstract_repository import AbstractRepository
+from kugel_common.exceptions import RepositoryException
+from kugel_common.utils.misc import get_app_time
 from app.models.documents.stock_update_document import StockUpdateDocument
 from app.config.settings import settings
 from app.enums.update_type import UpdateType
 
+logger = getLogger(__name__)
+
 
 class StockUpdateRepository(AbstractRepository[StockUpdateDocument]):
     def __init__(self, database: AsyncIOMotorDatabase):
         super().__init__(settings.DB_COLLECTION_NAME_STOCK_UPDATE, StockUpdateDocument, database)
 
+    async def create_many_async(self, documents: List[StockUpdateDocument]) -> bool:
+        """Insert several stock update records with one insert_many"""
+        if not documents:
+            return True
+        if self.dbcollection is None:
+            await self.initialize()
+
+        now = get_app_time()
+        for document in documents:
+            document.created_at = now
+        try:
+            result = await self.dbcollection.insert_many(
+                [document.model_dump() for document in documents], ordered=False, session=self.session
+            )
+        except Exception as e:
+            message = f"Failed to save {len(documents)} stock update records to database"
+            raise RepositoryException(message, self.collection_name, logger, e) from e
+        return len(result.inserted_ids) == len(documents)
+
     async def find_by_item_async(
         self, tenant_id: str, store_code: str, item_code: str, skip: int = 0, limit: int = 100
     ) -> List[StockUpdateDocument]:
@@ -1,11 +1,14 @@
 # Copyright 2025 masa@kugel  # # Licensed under the Apache License, Version 2.0 (the "License");  # you may not use this file except in compliance with the License.  # You may obtain a copy of the License at  # #     http://www.apache.org/licenses/LICENSE-2.0  # # Unless required by applicable law or agreed to in writing, software  # distributed under the License is distributed on an "AS IS" BASIS,  # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  # See the License for the specific language governing permissions and  # limitations under the License.
-from typing import Dict, Any
+from typing import Dict, Any, List
 from datetime import datetime, timezone, timedelta
 from logging import getLogger
 import asyncio
 import json
 
+from kugel_common.database import database as db_helper
+from app.config.settings import settings
 from app.models.documents.stock_document import StockDocument
+from app.models.repositories.stock_repository import StockRepository
 from app.websocket.connection_manager import ConnectionManager
 
 logger = getLogger(__name__)
@@ -17,8 +20,6 @@ class AlertService:
     def __init__(self, connection_manager: ConnectionManager):
         self.connection_manager = connection_manager
         # Get cooldown from settings, default to 60 seconds
-        from app.config.settings import settings
-
         self.alert_cooldown = settings.ALERT_COOLDOWN_SECONDS
         self.recent_alerts: Dict[str, datetime] = {}  # Track recent alerts to prevent spam
         self._cleanup_task = None
@@ -68,47 +69,66 @@ class AlertService:
 
     async def check_and_send_alerts(self, stock: StockDocument) -> None:
         """Check stock levels and send alerts if necessary"""
+        for alert in self._collect_alerts(stock):
+            await self.send_alert(alert)
+
+    async def check_and_send_alerts_batch(self, stocks: List[StockDocument]) -> None:
+        """Check stock levels of several items at once and send alerts if necessary"""
+        alerts_to_send = []
+        for stock in stocks:
+            alerts_to_send.extend(self._collect_alerts(stock))
+
+        # Send alerts via WebSocket
+        for alert in alerts_to_send:
+            await self.send_alert(alert)
+
+    def _collect_alerts(self, stock: StockDocument) -> List[Dict[str, Any]]:
+        """Build the alerts to send for the stock level of an item"""
         alerts_to_send = []
 
         # Check reorder point
         if stock.reorder_point > 0 and stock.current_quantity <= stock.reorder_point:
             alert_key = f"reorder_{stock.tenant_id}_{stock.store_code}_{stock.item_code}"
             if self._should_send_alert(alert_key):
-                alerts_to_send.append(
-                    {
-                        "type": "stock_alert",
-                        "alert_type": "reorder_point",
-                        "tenant_id": stock.tenant_id,
-                        "store_code": stock.store_code,
-                        "item_code": stock.item_code,
-                        "current_quantity": stock.current_quantity,
-                        "reorder_point": stock.reorder_point,
-                        "reorder_quantity": stock.reorder_quantity,
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                    }
-                )
+                alerts_to_send.append(self._make_reorder_alert(stock))
 
         # Check minimum stock
         if stock.minimum_quantity > 0 and stock.current_quantity < stock.minimum_quantity:
             alert_key = f"minimum_{stock.tenant_id}_{stock.store_code}_{stock.item_code}"
             if self._should_send_alert(alert_key):
-                alerts_to_send.append(
-                    {
-                        "type": "stock_alert",
-                        "alert_type": "minimum_stock",
-                        "tenant_id": stock.tenant_id,
-                        "store_code": stock.store_code,
-                        "item_code": stock.item_code,
-                        "current_quantity": stock.current_quantity,
-                        "minimum_quantity": stock.minimum_quantity,
-                        "reorder_quantity": stock.reorder_quantity,
-                        "timestamp": datetime.now(timezone.utc).isoformat(),
-                    }
-                )
-
-        # Send alerts via WebSocket
-        for alert in alerts_to_send:
-            await self.send_alert(alert)
+                alerts_to_send.append(self._make_minimum_alert(stock))
+
+        return alerts_to_send
+
+    @staticmethod
+    def _make_reorder_alert(stock: StockDocument) -> Dict[str, Any]:
+        """Build the alert of an item at or below its reorder point"""
+        return {
+            "type": "stock_alert",
+            "alert_type": "reorder_point",
+            "tenant_id": stock.tenant_id,
+            "store_code": stock.store_code,
+            "item_code": stock.item_code,
+            "current_quantity": stock.current_quantity,
+            "reorder_point": stock.reorder_point,
+            "reorder_quantity": stock.reorder_quantity,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+
+    @staticmethod
+    def _make_minimum_alert(stock: StockDocument) -> Dict[str, Any]:
+        """Build the alert of an item below its minimum quantity"""
+        return {
+            "type": "stock_alert",
+            "alert_type": "minimum_stock",
+            "tenant_id": stock.tenant_id,
+            "store_code": stock.store_code,
+            "item_code": stock.item_code,
+            "current_quantity": stock.current_quantity,
+            "minimum_quantity": stock.minimum_quantity,
+            "reorder_quantity": stock.reorder_quantity,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
 
     async def send_alert(self, alert_data: Dict[str, Any]) -> None:
         """Send an alert to connected clients"""
@@ -124,8 +144,13 @@ class AlertService:
 
         logger.info(f"Sent {alert_data['alert_type']} alert for item {alert_data['item_code']}")
 
-    async def get_current_alerts(self, tenant_id: str, store_code: str) -> list:
-        """Get all current alerts for a store (for new connections)"""
-        # This method would typically query the database for current alert conditions
-        # For now, return empty list as this will be implemented with the stock service
-        return []
+    async def get_current_alerts(self, tenant_id: str, store_code: str) -> List[Dict[str, Any]]:
+        """Get all current alerts for a store (for new connections) from the alert flags of the stocks"""
+        db = await db_helper.get_db_async(f"{settings.DB_NAME_PREFIX}_{tenant_id}")
+        repository = StockRepository(db)
+
+        reorder_stocks = await repository.find_reorder_alerts_async(tenant_id, store_code)
+        low_stocks = await repository.find_low_stock_async(tenant_id, store_code)
+        return [self._make_reorder_alert(stock) for stock in reorder_stocks] + [
+            self._make_minimum_alert(stock) for stock in low_stocks
+        ]
@@ -169,7 +169,10 @@ class MultiTenantSnapshotScheduler:
             for store_code in stores:
                 try:
                     await snapshot_service.create_snapshot_async(
-                        tenant_id=tenant_id, store_code=store_code, created_by="scheduled_system"
+                        tenant_id=tenant_id,
+                        store_code=store_code,
+                        created_by="scheduled_system",
+                        include_stocks=False,
                     )
                     success_count += 1
                 except Exception as e:
@@ -8,6 +8,7 @@ from kugel_common.utils.misc import get_app_time_str
 from app.models.documents import StockSnapshotDocument, StockSnapshotItem
 from app.models.repositories import StockRepository, StockSnapshotRepository
 from app.config.settings import settings
+from app.enums.snapshot_status import SnapshotStatus
 
 logger = getLogger(__name__)
 
@@ -19,60 +20,78 @@ class SnapshotService:
         self._snapshot_repository = StockSnapshotRepository(database)
 
     async def create_snapshot_async(
-        self, tenant_id: str, store_code: str, created_by: str = "system"
+        self, tenant_id: str, store_code: str, created_by: str = "system", include_stocks: bool = True
     ) -> StockSnapshotDocument:
-        """Create a snapshot of current stock levels"""
-
-        # Get all stocks for the store
-        stocks = await self._stock_repository.find_by_store_async(
-            tenant_id, store_code, skip=0, limit=10000  # Get all stocks
-        )
-
-        # Prepare snapshot items
-        snapshot_items = []
-        total_quantity = 0.0
-
-        for stock in stocks:
-            snapshot_item = StockSnapshotItem(
-                item_code=stock.item_code,
-                quantity=stock.current_quantity,
-                minimum_quantity=stock.minimum_quantity,
-                reorder_point=stock.reorder_point,
-                reorder_quantity=stock.reorder_quantity,
-            )
-            snapshot_items.append(snapshot_item)
-            total_quantity += stock.current_quantity
-
-        # Create snapshot document
+        """
+        Create a snapshot of current stock levels.
+
+        The stocks are read in batches and each batch is stored as a chunk of the snapshot,
+        so the size of a snapshot is not limited. The snapshot is inserted in progress, which
+        the queries skip, and completed with its totals once all chunks are stored.
+
+        Args:
+            tenant_id: Tenant ID
+            store_code: Store code
+            created_by: User or system that created the snapshot
+            include_stocks: Return the stock details with the snapshot, False to return only the totals
+
+        Returns:
+            StockSnapshotDocument: The created snapshot
+        """
         snapshot = StockSnapshotDocument(
             tenant_id=tenant_id,
             store_code=store_code,
-            total_items=len(snapshot_items),
-            total_quantity=total_quantity,
-            stocks=snapshot_items,
+            total_items=0,
+            total_quantity=0.0,
+            status=SnapshotStatus.IN_PROGRESS,
             created_by=created_by,
             generate_date_time=get_app_time_str(),
         )
-
-        # Save snapshot
-        success = await self._snapshot_repository.create_async(snapshot)
-
-        if not success:
+        snapshot_id = await self._snapshot_repository.create_snapshot_async(snapshot)
+        if not snapshot_id:
             logger.error(f"Failed to create snapshot for store {store_code}")
             raise Exception("Failed to create snapshot")
 
-        logger.info(f"Snapshot created for store {store_code} with {len(snapshot_items)} items")
+        total_items = 0
+        total_quantity = 0.0
+        chunk_count = 0
+        try:
+            async for stocks in self._stock_repository.find_by_store_in_batches_async(
+                tenant_id, store_code, batch_size=settings.SNAPSHOT_CHUNK_SIZE
+            ):
+                snapshot_items = [
+                    StockSnapshotItem(
+                        item_code=stock.item_code,
+                        quantity=stock.current_quantity,
+                        minimum_quantity=stock.minimum_quantity,
+                        reorder_point=stock.reorder_point,
+                        reorder_quantity=stock.reorder_quantity,
+                    )
+                    for stock in stocks
+                ]
+                await self._snapshot_repository.add_stocks_async(snapshot_id, snapshot, chunk_count, snapshot_items)
+                chunk_count += 1
+                total_items += len(snapshot_items)
+                total_quantity += sum(item.quantity for item in snapshot_items)
+                if include_stocks:
+                    snapshot.stocks.extend(snapshot_items)
+
+            await self._snapshot_repository.complete_snapshot_async(
+                snapshot_id, total_items, total_quantity, chunk_count
+            )
+        except Exception:
+            # Do not leave an incomplete snapshot behind
+            logger.error(f"Failed to store the stocks of snapshot {snapshot_id} for store {store_code}")
+            await self._snapshot_repository.delete_snapshot_async(snapshot_id)
+            raise
 
-        # Retrieve the created snapshot to get the ID
-        # Since we just created it, get the most recent one
-        created_snapshot = await self._snapshot_repository.get_latest_snapshot_async(tenant_id, store_code)
+        logger.info(f"Snapshot {snapshot_id} created for store {store_code} with {total_items} items")
 
-        if created_snapshot:
-            return created_snapshot
-        else:
-            # If retrieval fails, return the original snapshot without ID
-            logger.warning(f"Could not retrieve created snapshot for store {store_code}")
-            return snapshot
+        snapshot.total_items = total_items
+        snapshot.total_quantity = total_quantity
+        snapshot.chunk_count = chunk_count
+        snapshot.status = SnapshotStatus.COMPLETED
+        return snapshot
 
     async def get_snapshots_async(
         self, tenant_id: str, store_code: str, skip: int = 0, limit: int = 20
@@ -82,9 +101,11 @@ class SnapshotService:
         total_count = await self._snapshot_repository.count_by_store_async(tenant_id, store_code)
         return snapshots, total_count
 
-    async def get_snapshot_by_id_async(self, snapshot_id: str) -> Optional[StockSnapshotDocument]:
-        """Get a specific snapshot by ID"""
-        return await self._snapshot_repository.get_by_id_async(snapshot_id)
+    async def get_snapshot_by_id_async(
+        self, snapshot_id: str, skip: int = 0, limit: int = 1000
+    ) -> Optional[StockSnapshotDocument]:
+        """Get a specific snapshot by ID with a page of its stock details"""
+        return await self._snapshot_repository.get_by_id_async(snapshot_id, skip, limit)
 
     async def get_snapshots_by_date_range_async(
         self, tenant_id: str, store_code: str, start_date: datetime, end_date: datetime
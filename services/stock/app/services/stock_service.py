@@ -100,6 +100,107 @@ class StockService:
 
         return update_record
 
+    async def update_stocks_bulk_async(
+        self,
+        tenant_id: str,
+        store_code: str,
+        quantity_changes: Dict[str, float],
+        update_type: UpdateType,
+        reference_id: Optional[str] = None,
+        operator_id: Optional[str] = None,
+        note: Optional[str] = None,
+    ) -> List[StockUpdateDocument]:
+        """
+        Update stock quantities of several items with one bulk write and record the updates with one insert.
+
+        Both writes run in one transaction, so a failed update changes no stock and applying its
+        redelivery does not count any change twice. The quantities read back in the transaction are
+        those written by this update, so the before and after quantities of the records are exact.
+        Transactions of concurrent transactions on the same items that fail with a write conflict
+        are retried.
+        """
+
+        async def apply_updates_async(session) -> Tuple[List[StockDocument], List[StockUpdateDocument]]:
+            self._stock_repository.set_session(session)
+            self._stock_update_repository.set_session(session)
+            try:
+                updated_stocks = await self._stock_repository.update_quantities_bulk_async(
+                    tenant_id, store_code, quantity_changes, reference_id
+                )
+                update_records = self._make_update_records(
+                    tenant_id, store_code, quantity_changes, updated_stocks, update_type, reference_id, operator_id, note
+                )
+                await self._stock_update_repository.create_many_async(update_records)
+                return updated_stocks, update_records
+            finally:
+                self._stock_repository.set_session(None)
+                self._stock_update_repository.set_session(None)
+
+        async with await self._database.client.start_session() as session:
+            # with_transaction commits the changes, aborts them on errors and runs them again while the
+            # error has the TransientTransactionError label (e.g. a WriteConflict) or the commit result is unknown
+            updated_stocks, update_records = await session.with_transaction(apply_updates_async)
+
+        logger.info(
+            f"Stock updated - Items: {len(update_records)}, Reference: {reference_id}, Type: {update_type.value}"
+        )
+
+        # Check for alerts once for the whole batch if alert service is available
+        if self._alert_service:
+            await self._alert_service.check_and_send_alerts_batch(updated_stocks)
+
+        return update_records
+
+    @staticmethod
+    def _make_update_records(
+        tenant_id: str,
+        store_code: str,
+        quantity_changes: Dict[str, float],
+        updated_stocks: List[StockDocument],
+        update_type: UpdateType,
+        reference_id: Optional[str],
+        operator_id: Optional[str],
+        note: Optional[str],
+    ) -> List[StockUpdateDocument]:
+        """Build the update records of a bulk update from the updated stocks"""
+        stocks_by_item_code = {stock.item_code: stock for stock in updated_stocks}
+
+        timestamp = datetime.now(timezone.utc)
+        update_records = []
+        for item_code, quantity_change in quantity_changes.items():
+            updated_stock = stocks_by_item_code.get(item_code)
+            if updated_stock is None:
+                raise StockNotFoundError(message=f"Failed to update stock for item {item_code}")
+
+            # Calculate before quantity from the after quantity and change
+            after_quantity = updated_stock.current_quantity
+            before_quantity = after_quantity - quantity_change
+
+            # Allow negative stock (backorders are permitted)
+            if after_quantity < 0:
+                logger.warning(
+                    f"Stock going negative for item {item_code}. "
+                    f"Available: {before_quantity}, After: {after_quantity}, "
+                    f"Change: {quantity_change}"
+                )
+
+            update_records.append(
+                StockUpdateDocument(
+                    tenant_id=tenant_id,
+                    store_code=store_code,
+                    item_code=item_code,
+                    update_type=update_type,
+                    quantity_change=quantity_change,
+                    before_quantity=before_quantity,
+                    after_quantity=after_quantity,
+                    reference_id=reference_id,
+                    timestamp=timestamp,
+                    operator_id=operator_id,
+                    note=note,
+                )
+            )
+        return update_records
+
     async def get_stock_history_async(
         self, tenant_id: str, store_code: str, item_code: str, skip: int = 0, limit: int = 100
     ) -> Tuple[List[StockUpdateDocument], int]:
@@ -157,6 +258,9 @@ class StockService:
                 )
                 return
 
+            # Quantity changes per item for the bulk update, in the order of the line items
+            quantity_changes: Dict[str, float] = {}
+
             # Process each item in the transaction
             for item in line_items:
                 item_code = item.get("item_code")
@@ -171,6 +275,11 @@ class StockService:
                     continue
 
                 if quantity > 0:
+                    if settings.USE_BULK_STOCK_UPDATE:
+                        # negative for sales, positive for returns
+                        quantity_changes[item_code] = quantity_changes.get(item_code, 0) + quantity * sign
+                        continue
+
                     # Sales reduce stock (negative change)
                     await self.update_stock_async(
                         tenant_id=tenant_id,
@@ -181,6 +290,15 @@ class StockService:
                         reference_id=transaction_no_str,
                     )
 
+            if quantity_changes:
+                await self.update_stocks_bulk_async(
+                    tenant_id=tenant_id,
+                    store_code=store_code,
+                    quantity_changes=quantity_changes,
+                    update_type=update_type,
+                    reference_id=transaction_no_str,
+                )
+
             logger.info(
                 f"Transaction processed successfully. tenant_id: {tenant_id}, store_code: {store_code}, terminal_no: {terminal_no}, transaction_no: {transaction_no}"
             )
@@ -205,14 +323,13 @@ class StockService:
                 minimum_quantity=minimum_quantity,
                 reorder_point=0.0,
                 reorder_quantity=0.0,
-            )
+            ).update_alert_flags()
             await self._stock_repository.create_async(stock)
             return True
         else:
             # Update existing stock
-            return await self._stock_repository.update_one_async(
-                {"tenant_id": tenant_id, "store_code": store_code, "item_code": item_code},
-                {"minimum_quantity": minimum_quantity},
+            return await self._stock_repository.update_minimum_quantity_async(
+                tenant_id, store_code, item_code, minimum_quantity
             )
 
     async def set_reorder_parameters_async(
@@ -231,7 +348,7 @@ class StockService:
                 minimum_quantity=0.0,
                 reorder_point=reorder_point,
                 reorder_quantity=reorder_quantity,
-            )
+            ).update_alert_flags()
             await self._stock_repository.create_async(stock)
 
             # Check if new stock triggers alerts
@@ -162,6 +162,37 @@ class TestCheckAndSendAlerts:
         conn.send_to_store.assert_not_called()
 
 
+# ---------------------------------------------------------------------------
+# check_and_send_alerts_batch
+# ---------------------------------------------------------------------------
+
+class TestCheckAndSendAlertsBatch:
+    @pytest.mark.asyncio
+    async def test_alerts_sent_for_each_item_below_threshold(self):
+        svc, conn = make_service()
+        stocks = [
+            make_stock(item_code="ITEM-01", current_quantity=15.0, reorder_point=20.0, minimum_quantity=0.0),
+            make_stock(item_code="ITEM-02", current_quantity=100.0),
+            make_stock(item_code="ITEM-03", current_quantity=3.0, minimum_quantity=5.0, reorder_point=0.0),
+        ]
+
+        await svc.check_and_send_alerts_batch(stocks)
+
+        payloads = [json.loads(call[0][2]) for call in conn.send_to_store.call_args_list]
+        assert [(p["item_code"], p["alert_type"]) for p in payloads] == [
+            ("ITEM-01", "reorder_point"),
+            ("ITEM-03", "minimum_stock"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_sends_nothing(self):
+        svc, conn = make_service()
+
+        await svc.check_and_send_alerts_batch([])
+
+        conn.send_to_store.assert_not_called()
+
+
 # ---------------------------------------------------------------------------
 # send_alert
 # ---------------------------------------------------------------------------
@@ -222,9 +253,35 @@ class TestAlertServiceLifecycle:
         await svc.stop()  # _cleanup_task is None — no-op
 
     @pytest.mark.asyncio
-    async def test_get_current_alerts_returns_empty_list(self):
+    async def test_get_current_alerts_from_flagged_stocks(self):
+        svc, _ = make_service()
+        repo = MagicMock()
+        repo.find_reorder_alerts_async = AsyncMock(return_value=[make_stock(item_code="ITEM-01")])
+        repo.find_low_stock_async = AsyncMock(
+            return_value=[make_stock(item_code="ITEM-02", current_quantity=1.0)]
+        )
+        with patch("app.services.alert_service.db_helper.get_db_async", new_callable=AsyncMock), patch(
+            "app.services.alert_service.StockRepository", return_value=repo
+        ):
+            result = await svc.get_current_alerts("T001", "S001")
+
+        repo.find_reorder_alerts_async.assert_awaited_once_with("T001", "S001")
+        repo.find_low_stock_async.assert_awaited_once_with("T001", "S001")
+        assert [(alert["alert_type"], alert["item_code"]) for alert in result] == [
+            ("reorder_point", "ITEM-01"),
+            ("minimum_stock", "ITEM-02"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_get_current_alerts_returns_empty_list_without_alerts(self):
         svc, _ = make_service()
-        result = await svc.get_current_alerts("T001", "S001")
+        repo = MagicMock()
+        repo.find_reorder_alerts_async = AsyncMock(return_value=[])
+        repo.find_low_stock_async = AsyncMock(return_value=[])
+        with patch("app.services.alert_service.db_helper.get_db_async", new_callable=AsyncMock), patch(
+            "app.services.alert_service.StockRepository", return_value=repo
+        ):
+            result = await svc.get_current_alerts("T001", "S001")
         assert result == []
 
     @pytest.mark.asyncio
@@ -193,6 +193,16 @@ async def test_get_snapshot_by_id_success(client, mock_snapshot_service):
     body = resp.json()
     assert body["success"] is True
     assert body["data"]["totalItems"] == 2
+    mock_snapshot_service.get_snapshot_by_id_async.assert_awaited_once_with("snap_001", 0, 1000)
+
+
+@pytest.mark.asyncio
+async def test_get_snapshot_by_id_stock_page(client, mock_snapshot_service):
+    mock_snapshot_service.get_snapshot_by_id_async.return_value = _snapshot_doc()
+
+    resp = await client.get(f"/api/v1/tenants/{TENANT}/stores/{STORE}/stock/snapshot/snap_001?page=3&limit=100")
+    assert resp.status_code == 200
+    mock_snapshot_service.get_snapshot_by_id_async.assert_awaited_once_with("snap_001", 200, 100)
 
 
 @pytest.mark.asyncio
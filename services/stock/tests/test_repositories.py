@@ -20,8 +20,11 @@ and date-based operations using mocked MongoDB collections.
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch, PropertyMock
 from datetime import datetime, timedelta, timezone
+from bson import ObjectId
+from pymongo import UpdateOne
 
-from app.models.repositories.stock_repository import StockRepository
+from app.config.settings import settings
+from app.models.repositories.stock_repository import StockRepository, ALERT_FLAGS_EXPRESSION
 from app.models.repositories.stock_snapshot_repository import StockSnapshotRepository
 from app.models.repositories.stock_update_repository import StockUpdateRepository
 from app.models.documents.stock_document import StockDocument
@@ -51,6 +54,19 @@ def _make_mock_cursor(return_docs=None):
     return cursor
 
 
+def _make_async_cursor(return_docs):
+    """Create a mock cursor that supports chaining and async iteration."""
+    cursor = _make_mock_cursor(return_docs)
+    cursor.batch_size.return_value = cursor
+
+    async def iterate():
+        for doc in return_docs:
+            yield doc
+
+    cursor.__aiter__ = lambda self: iterate()
+    return cursor
+
+
 def _make_mock_collection():
     """Create a mock MongoDB collection with common async methods."""
     coll = MagicMock()
@@ -96,6 +112,11 @@ def _snapshot_doc_dict(**overrides):
     return base
 
 
+def _snapshot_item_dict(item_code):
+    """Return a dict that can construct a StockSnapshotItem."""
+    return {"item_code": item_code, "quantity": 1.0, "minimum_quantity": 0.0}
+
+
 def _update_doc_dict(**overrides):
     """Return a minimal dict that can construct a StockUpdateDocument."""
     base = {
@@ -181,10 +202,30 @@ class TestStockRepository:
         cursor.skip.assert_called_once_with(0)
         cursor.limit.assert_called_once_with(100)
 
+    # -- find_by_store_in_batches_async --------------------------------------
+
+    @pytest.mark.asyncio
+    async def test_find_by_store_in_batches_async_yields_batches(self):
+        repo = self._make_repo()
+        docs = [_stock_doc_dict(item_code=f"ITEM{no:03d}") for no in range(5)]
+        cursor = _make_async_cursor(docs)
+        repo.dbcollection.find.return_value = cursor
+
+        batches = [batch async for batch in repo.find_by_store_in_batches_async(TENANT, STORE, batch_size=2)]
+
+        repo.dbcollection.find.assert_called_once_with({"tenant_id": TENANT, "store_code": STORE})
+        cursor.sort.assert_called_once_with("item_code", 1)
+        cursor.batch_size.assert_called_once_with(2)
+        assert [[stock.item_code for stock in batch] for batch in batches] == [
+            ["ITEM000", "ITEM001"],
+            ["ITEM002", "ITEM003"],
+            ["ITEM004"],
+        ]
+
     # -- find_low_stock_async ------------------------------------------------
 
     @pytest.mark.asyncio
-    async def test_find_low_stock_async_expr_query(self):
+    async def test_find_low_stock_async_flag_query(self):
         repo = self._make_repo()
         doc = _stock_doc_dict(current_quantity=5.0, minimum_quantity=10.0)
         cursor = _make_mock_cursor([doc])
@@ -192,6 +233,21 @@ class TestStockRepository:
 
         result = await repo.find_low_stock_async(TENANT, STORE)
 
+        repo.dbcollection.find.assert_called_once_with(
+            {"tenant_id": TENANT, "store_code": STORE, "is_below_minimum": True}
+        )
+        assert len(result) == 1
+
+    @pytest.mark.asyncio
+    async def test_find_low_stock_async_expr_query(self):
+        repo = self._make_repo()
+        doc = _stock_doc_dict(current_quantity=5.0, minimum_quantity=10.0)
+        cursor = _make_mock_cursor([doc])
+        repo.dbcollection.find.return_value = cursor
+
+        with patch.object(settings, "USE_STOCK_ALERT_FLAGS", False):
+            result = await repo.find_low_stock_async(TENANT, STORE)
+
         call_args = repo.dbcollection.find.call_args[0][0]
         assert call_args["tenant_id"] == TENANT
         assert call_args["store_code"] == STORE
@@ -211,13 +267,26 @@ class TestStockRepository:
     # -- find_reorder_alerts_async -------------------------------------------
 
     @pytest.mark.asyncio
-    async def test_find_reorder_alerts_async_expr_query(self):
+    async def test_find_reorder_alerts_async_flag_query(self):
         repo = self._make_repo()
         cursor = _make_mock_cursor([])
         repo.dbcollection.find.return_value = cursor
 
         await repo.find_reorder_alerts_async(TENANT, STORE)
 
+        repo.dbcollection.find.assert_called_once_with(
+            {"tenant_id": TENANT, "store_code": STORE, "is_below_reorder": True}
+        )
+
+    @pytest.mark.asyncio
+    async def test_find_reorder_alerts_async_expr_query(self):
+        repo = self._make_repo()
+        cursor = _make_mock_cursor([])
+        repo.dbcollection.find.return_value = cursor
+
+        with patch.object(settings, "USE_STOCK_ALERT_FLAGS", False):
+            await repo.find_reorder_alerts_async(TENANT, STORE)
+
         call_args = repo.dbcollection.find.call_args[0][0]
         assert call_args["tenant_id"] == TENANT
         assert call_args["store_code"] == STORE
@@ -250,15 +319,16 @@ class TestStockRepository:
             "item_code": ITEM,
         }
 
+        # pipeline update: the new quantity first, then the alert flags computed from it
         update = call_kwargs.kwargs["update"]
-        assert update["$inc"] == {"current_quantity": 5.0}
-        assert update["$set"]["last_transaction_id"] == "TXN001"
-        assert update["$set"]["updated_at"] == fixed_time
-        assert update["$setOnInsert"]["tenant_id"] == TENANT
-        assert update["$setOnInsert"]["store_code"] == STORE
-        assert update["$setOnInsert"]["item_code"] == ITEM
-        assert update["$setOnInsert"]["minimum_quantity"] == 0.0
-        assert update["$setOnInsert"]["created_at"] == fixed_time
+        assert len(update) == 2
+        values = update[0]["$set"]
+        assert values["current_quantity"] == {"$add": [{"$ifNull": ["$current_quantity", 0.0]}, 5.0]}
+        assert values["minimum_quantity"] == {"$ifNull": ["$minimum_quantity", 0.0]}
+        assert values["last_transaction_id"] == {"$literal": "TXN001"}
+        assert values["created_at"] == {"$ifNull": ["$created_at", fixed_time]}
+        assert values["updated_at"] == fixed_time
+        assert update[1] == {"$set": ALERT_FLAGS_EXPRESSION}
 
         assert call_kwargs.kwargs["upsert"] is True
         assert call_kwargs.kwargs["return_document"] is True
@@ -343,7 +413,7 @@ class TestStockRepository:
     # -- update_quantity_async (thin wrapper) ---------------------------------
 
     @pytest.mark.asyncio
-    async def test_update_quantity_async_delegates_to_update_one(self):
+    async def test_update_quantity_async_recomputes_alert_flags(self):
         repo = self._make_repo()
         mock_response = MagicMock()
         mock_response.modified_count = 1
@@ -356,8 +426,9 @@ class TestStockRepository:
         filter_arg = call_args[0][0]
         update_arg = call_args[0][1]
         assert filter_arg == {"tenant_id": TENANT, "store_code": STORE, "item_code": ITEM}
-        assert update_arg["$set"]["current_quantity"] == 99.0
-        assert update_arg["$set"]["last_transaction_id"] == "TXN002"
+        assert update_arg[0]["$set"]["current_quantity"] == {"$literal": 99.0}
+        assert update_arg[0]["$set"]["last_transaction_id"] == {"$literal": "TXN002"}
+        assert update_arg[1] == {"$set": ALERT_FLAGS_EXPRESSION}
         assert result is True
 
     # -- update_reorder_parameters_async -------------------------------------
@@ -376,10 +447,120 @@ class TestStockRepository:
         filter_arg = call_args[0][0]
         update_arg = call_args[0][1]
         assert filter_arg == {"tenant_id": TENANT, "store_code": STORE, "item_code": ITEM}
-        assert update_arg["$set"]["reorder_point"] == 25.0
-        assert update_arg["$set"]["reorder_quantity"] == 200.0
+        assert update_arg[0]["$set"]["reorder_point"] == {"$literal": 25.0}
+        assert update_arg[0]["$set"]["reorder_quantity"] == {"$literal": 200.0}
+        assert update_arg[1] == {"$set": ALERT_FLAGS_EXPRESSION}
         assert result is True
 
+    @pytest.mark.asyncio
+    async def test_update_minimum_quantity_async(self):
+        repo = self._make_repo()
+        mock_response = MagicMock()
+        mock_response.modified_count = 0
+        repo.dbcollection.update_one = AsyncMock(return_value=mock_response)
+
+        result = await repo.update_minimum_quantity_async(TENANT, STORE, ITEM, 12.0)
+
+        update_arg = repo.dbcollection.update_one.call_args[0][1]
+        assert update_arg[0]["$set"]["minimum_quantity"] == {"$literal": 12.0}
+        assert update_arg[1] == {"$set": ALERT_FLAGS_EXPRESSION}
+        assert result is False
+
+    # -- backfill_alert_flags_async ------------------------------------------
+
+    @pytest.mark.asyncio
+    async def test_backfill_alert_flags_async_updates_unflagged_stocks(self):
+        repo = self._make_repo()
+        repo.dbcollection.update_many = AsyncMock(return_value=MagicMock(modified_count=3))
+
+        result = await repo.backfill_alert_flags_async()
+
+        repo.dbcollection.update_many.assert_awaited_once_with(
+            {"$or": [{"is_below_minimum": None}, {"is_below_reorder": None}]}, [{"$set": ALERT_FLAGS_EXPRESSION}]
+        )
+        assert result == 3
+
+    @pytest.mark.asyncio
+    async def test_alert_indexes_are_updated_for_existing_tenants_only(self):
+        from app.database import database_setup
+
+        client = MagicMock()
+        prefix = settings.DB_NAME_PREFIX
+        client.list_database_names = AsyncMock(return_value=["admin", f"{prefix}_T001", f"{prefix}_T002"])
+        collections = {
+            f"{prefix}_T001": [settings.DB_COLLECTION_NAME_STOCK],
+            f"{prefix}_T002": [settings.DB_COLLECTION_NAME_STOCK_UPDATE],
+        }
+        client.__getitem__.side_effect = lambda name: MagicMock(
+            list_collection_names=AsyncMock(return_value=collections[name])
+        )
+
+        with patch.object(database_setup.db_helper, "get_client_async", AsyncMock(return_value=client)), patch.object(
+            database_setup, "update_stock_alert_indexes", new_callable=AsyncMock
+        ) as update_indexes:
+            await database_setup.update_stock_alert_indexes_for_all_tenants()
+
+        update_indexes.assert_awaited_once_with("T001")
+
+    # -- update_quantities_bulk_async ----------------------------------------
+
+    @pytest.mark.asyncio
+    async def test_update_quantities_bulk_async_one_bulk_write_of_upserts(self):
+        repo = self._make_repo()
+        repo.session = MagicMock()  # the transaction of the caller
+        repo.dbcollection.bulk_write = AsyncMock()
+        cursor = _make_mock_cursor(
+            [_stock_doc_dict(item_code="ITEM001", current_quantity=47.0), _stock_doc_dict(item_code="ITEM002")]
+        )
+        repo.dbcollection.find.return_value = cursor
+
+        fixed_time = datetime(2025, 6, 1, 12, 0, 0, tzinfo=timezone.utc)
+        with patch("app.models.repositories.stock_repository.get_app_time", return_value=fixed_time):
+            result = await repo.update_quantities_bulk_async(
+                TENANT, STORE, {"ITEM001": -3.0, "ITEM002": -1.0}, transaction_id="TXN001"
+            )
+
+        repo.dbcollection.bulk_write.assert_awaited_once()
+        operations = repo.dbcollection.bulk_write.call_args[0][0]
+        assert repo.dbcollection.bulk_write.call_args.kwargs["ordered"] is False
+        assert len(operations) == 2
+        assert operations[0] == UpdateOne(
+            {"tenant_id": TENANT, "store_code": STORE, "item_code": "ITEM001"},
+            [
+                {
+                    "$set": {
+                        "current_quantity": {"$add": [{"$ifNull": ["$current_quantity", 0.0]}, -3.0]},
+                        "minimum_quantity": {"$ifNull": ["$minimum_quantity", 0.0]},
+                        "reorder_point": {"$ifNull": ["$reorder_point", 0.0]},
+                        "reorder_quantity": {"$ifNull": ["$reorder_quantity", 0.0]},
+                        "last_transaction_id": {"$literal": "TXN001"},
+                        "created_at": {"$ifNull": ["$created_at", fixed_time]},
+                        "updated_at": fixed_time,
+                    }
+                },
+                {"$set": ALERT_FLAGS_EXPRESSION},
+            ],
+            upsert=True,
+        )
+
+        repo.dbcollection.find.assert_called_once_with(
+            {"tenant_id": TENANT, "store_code": STORE, "item_code": {"$in": ["ITEM001", "ITEM002"]}},
+            session=repo.session,
+        )
+        assert repo.dbcollection.bulk_write.call_args.kwargs["session"] is repo.session
+        assert [stock.item_code for stock in result] == ["ITEM001", "ITEM002"]
+        assert result[0].current_quantity == 47.0
+
+    @pytest.mark.asyncio
+    async def test_update_quantities_bulk_async_without_changes_does_nothing(self):
+        repo = self._make_repo()
+        repo.dbcollection.bulk_write = AsyncMock()
+
+        result = await repo.update_quantities_bulk_async(TENANT, STORE, {})
+
+        assert result == []
+        repo.dbcollection.bulk_write.assert_not_called()
+
 
 # ============================================================================
 # StockSnapshotRepository Tests
@@ -423,8 +604,9 @@ class TestStockSnapshotRepository:
 
         result = await repo.find_by_store_async(TENANT, STORE, skip=5, limit=10)
 
-        call_args = repo.dbcollection.find.call_args[0][0]
-        assert call_args == {"tenant_id": TENANT, "store_code": STORE}
+        query, projection = repo.dbcollection.find.call_args[0]
+        assert query == {"tenant_id": TENANT, "store_code": STORE, "status": {"$ne": "in_progress"}}
+        assert projection == {"stocks": 0}
         cursor.sort.assert_called_once_with("created_at", -1)
         cursor.skip.assert_called_once_with(5)
         cursor.limit.assert_called_once_with(10)
@@ -584,41 +766,141 @@ class TestStockSnapshotRepository:
         result = await repo.count_by_store_async(TENANT, STORE)
 
         repo.dbcollection.count_documents.assert_called_once_with(
-            {"tenant_id": TENANT, "store_code": STORE}
+            {"tenant_id": TENANT, "store_code": STORE, "status": {"$ne": "in_progress"}}
         )
         assert result == 15
 
     # -- get_latest_snapshot_async -------------------------------------------
 
     @pytest.mark.asyncio
-    async def test_get_latest_snapshot_async_delegates_with_sort(self):
+    async def test_get_latest_snapshot_async_sorted_by_created_at(self):
         repo = self._make_repo()
+        cursor = _make_mock_cursor([_snapshot_doc_dict()])
+        repo.dbcollection.find.return_value = cursor
 
-        # Mock the parent class method that get_latest_snapshot_async delegates to
-        doc = StockSnapshotDocument(**_snapshot_doc_dict())
-        with patch.object(repo, "get_list_async_with_sort_and_paging", new_callable=AsyncMock) as mock_method:
-            mock_method.return_value = [doc]
-            result = await repo.get_latest_snapshot_async(TENANT, STORE)
-
-        mock_method.assert_called_once_with(
-            filter={"tenant_id": TENANT, "store_code": STORE},
-            limit=1,
-            page=1,
-            sort=[("created_at", -1)],
+        result = await repo.get_latest_snapshot_async(TENANT, STORE)
+
+        repo.dbcollection.find.assert_called_once_with(
+            {"tenant_id": TENANT, "store_code": STORE, "status": {"$ne": "in_progress"}}, {"stocks": 0}
         )
-        assert result is not None
+        cursor.sort.assert_called_once_with("created_at", -1)
+        cursor.limit.assert_called_once_with(1)
         assert isinstance(result, StockSnapshotDocument)
 
     @pytest.mark.asyncio
     async def test_get_latest_snapshot_async_returns_none_when_empty(self):
         repo = self._make_repo()
+        repo.dbcollection.find.return_value = _make_mock_cursor([])
 
-        with patch.object(repo, "get_list_async_with_sort_and_paging", new_callable=AsyncMock) as mock_method:
-            mock_method.return_value = []
-            result = await repo.get_latest_snapshot_async(TENANT, STORE)
+        result = await repo.get_latest_snapshot_async(TENANT, STORE)
 
         assert result is None
 
+    # -- chunked snapshots ---------------------------------------------------
+
+    @pytest.mark.asyncio
+    async def test_create_snapshot_async_returns_inserted_id(self):
+        repo = self._make_repo()
+        object_id = ObjectId()
+        repo.dbcollection.insert_one = AsyncMock(return_value=MagicMock(inserted_id=object_id))
+
+        result = await repo.create_snapshot_async(StockSnapshotDocument(**_snapshot_doc_dict()))
+
+        assert result == str(object_id)
+
+    @pytest.mark.asyncio
+    async def test_get_by_id_async_reads_page_of_chunked_stocks(self):
+        repo = self._make_repo()
+        object_id = ObjectId()
+        repo.dbcollection.find_one = AsyncMock(
+            return_value={**_snapshot_doc_dict(total_items=3), "_id": object_id, "chunk_count": 2}
+        )
+        chunk_coll = _make_mock_collection()
+        chunk_coll.aggregate = MagicMock(return_value=_make_mock_cursor([_snapshot_item_dict(code) for code in "BC"]))
+        repo._chunk_repository.dbcollection = chunk_coll
+
+        result = await repo.get_by_id_async(str(object_id), skip=1, limit=2)
+
+        repo.dbcollection.find_one.assert_called_once_with(
+            {"_id": object_id, "status": {"$ne": "in_progress"}}, {"stocks": {"$slice": [1, 2]}}
+        )
+        pipeline = chunk_coll.aggregate.call_args[0][0]
+        assert pipeline[0] == {"$match": {"snapshot_id": str(object_id)}}
+        assert pipeline[1] == {"$sort": {"chunk_no": 1}}
+        assert {"$skip": 1} in pipeline and {"$limit": 2} in pipeline
+        assert [item.item_code for item in result.stocks] == ["B", "C"]
+        assert result.total_items == 3
+
+    @pytest.mark.asyncio
+    async def test_get_by_id_async_slices_embedded_stocks(self):
+        repo = self._make_repo()
+        object_id = ObjectId()
+        repo.dbcollection.find_one = AsyncMock(
+            return_value={**_snapshot_doc_dict(stocks=[_snapshot_item_dict("A")]), "_id": object_id}
+        )
+        repo._chunk_repository.dbcollection = _make_mock_collection()
+
+        result = await repo.get_by_id_async(str(object_id))
+
+        assert repo.dbcollection.find_one.call_args[0][1] == {"stocks": {"$slice": [0, 1000]}}
+        repo._chunk_repository.dbcollection.aggregate.assert_not_called()
+        assert [item.item_code for item in result.stocks] == ["A"]
+
+    @pytest.mark.asyncio
+    async def test_complete_snapshot_async_sets_totals_and_status(self):
+        repo = self._make_repo()
+        object_id = ObjectId()
+        repo.dbcollection.update_one = AsyncMock(return_value=MagicMock(matched_count=1))
+
+        result = await repo.complete_snapshot_async(str(object_id), 3, 175.0, 2)
+
+        query, update = repo.dbcollection.update_one.call_args[0]
+        assert query == {"_id": object_id}
+        assert update["$set"]["status"] == "completed"
+        assert update["$set"]["chunk_count"] == 2
+        assert result is True
+
+    @pytest.mark.asyncio
+    async def test_get_by_id_async_invalid_id_returns_none(self):
+        repo = self._make_repo()
+
+        assert await repo.get_by_id_async("not-an-object-id") is None
+        repo.dbcollection.find_one.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_find_by_store_async_does_not_read_chunks(self):
+        repo = self._make_repo()
+        repo.dbcollection.find.return_value = _make_mock_cursor(
+            [{**_snapshot_doc_dict(total_items=3), "_id": ObjectId(), "chunk_count": 2}]
+        )
+        repo._chunk_repository.dbcollection = _make_mock_collection()
+
+        result = await repo.find_by_store_async(TENANT, STORE)
+
+        repo._chunk_repository.dbcollection.find.assert_not_called()
+        repo._chunk_repository.dbcollection.aggregate.assert_not_called()
+        assert result[0].total_items == 3
+        assert result[0].stocks == []
+
+    @pytest.mark.asyncio
+    async def test_delete_old_snapshots_async_deletes_chunks(self):
+        repo = self._make_repo()
+        object_id = ObjectId()
+        repo.dbcollection.find.return_value = _make_mock_cursor([{"_id": object_id}])
+        repo.dbcollection.delete_many = AsyncMock(return_value=MagicMock(deleted_count=1))
+        chunk_coll = _make_mock_collection()
+        chunk_coll.delete_many = AsyncMock(return_value=MagicMock(deleted_count=4))
+        repo._chunk_repository.dbcollection = chunk_coll
+
+        result = await repo.delete_old_snapshots_async(TENANT, STORE, 30)
+
+        assert repo.dbcollection.find.call_args[0][0]["$or"] == [
+            {"chunk_count": {"$gt": 0}},
+            {"status": "in_progress"},
+        ]
+        chunk_coll.delete_many.assert_called_once_with({"snapshot_id": {"$in": [str(object_id)]}})
+        assert result == 1
+
 
 # ============================================================================
 # StockUpdateRepository Tests
@@ -651,6 +933,34 @@ class TestStockUpdateRepository:
         assert result is True
         repo.dbcollection.insert_one.assert_called_once()
 
+    # -- create_many_async ---------------------------------------------------
+
+    @pytest.mark.asyncio
+    async def test_create_many_async_single_insert_many(self):
+        repo = self._make_repo()
+        mock_response = MagicMock()
+        mock_response.inserted_ids = ["upd1", "upd2"]
+        repo.dbcollection.insert_many = AsyncMock(return_value=mock_response)
+        docs = [StockUpdateDocument(**_update_doc_dict(item_code=code)) for code in ("ITEM001", "ITEM002")]
+
+        fixed_time = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        with patch("app.models.repositories.stock_update_repository.get_app_time", return_value=fixed_time):
+            result = await repo.create_many_async(docs)
+
+        assert result is True
+        repo.dbcollection.insert_many.assert_awaited_once()
+        inserted = repo.dbcollection.insert_many.call_args[0][0]
+        assert [doc["item_code"] for doc in inserted] == ["ITEM001", "ITEM002"]
+        assert all(doc["created_at"] == fixed_time for doc in inserted)
+
+    @pytest.mark.asyncio
+    async def test_create_many_async_empty_list(self):
+        repo = self._make_repo()
+        repo.dbcollection.insert_many = AsyncMock()
+
+        assert await repo.create_many_async([]) is True
+        repo.dbcollection.insert_many.assert_not_called()
+
     # -- find_by_item_async --------------------------------------------------
 
     @pytest.mark.asyncio
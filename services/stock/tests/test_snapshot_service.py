@@ -16,6 +16,7 @@ from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from app.models.documents.stock_document import StockDocument
+from app.enums.snapshot_status import SnapshotStatus
 from app.models.documents.stock_snapshot_document import StockSnapshotDocument
 from app.services.snapshot_service import SnapshotService
 
@@ -62,71 +63,121 @@ def make_service():
 # create_snapshot_async
 # ---------------------------------------------------------------------------
 
+def stock_batches(*batches):
+    """find_by_store_in_batches_async の代わりにバッチを順に返す非同期ジェネレータ。"""
+
+    async def iterate(tenant_id, store_code, batch_size=1000):
+        for batch in batches:
+            yield batch
+
+    return MagicMock(side_effect=iterate)
+
+
 class TestCreateSnapshot:
     @pytest.mark.asyncio
     async def test_create_snapshot_success(self):
-        """在庫データからスナップショットを作成し、返却する。"""
+        """在庫をバッチごとにチャンクとして保存し、合計を計算して返却する。"""
         svc, stock_repo, snapshot_repo = make_service()
-        stocks = [make_stock("ITEM-01", 100.0), make_stock("ITEM-02", 50.0)]
-        stock_repo.find_by_store_async.return_value = stocks
-        snapshot_repo.create_async.return_value = True
-        created = make_snapshot(total_items=2, total_quantity=150.0)
-        snapshot_repo.get_latest_snapshot_async.return_value = created
+        stock_repo.find_by_store_in_batches_async = stock_batches(
+            [make_stock("ITEM-01", 100.0), make_stock("ITEM-02", 50.0)], [make_stock("ITEM-03", 25.0)]
+        )
+        inserted_statuses = []
+
+        def insert_snapshot(snapshot):
+            inserted_statuses.append(snapshot.status)
+            return "SNAP-001"
+
+        snapshot_repo.create_snapshot_async.side_effect = insert_snapshot
 
         result = await svc.create_snapshot_async("T001", "S001")
 
-        assert result.total_items == 2
-        assert result.total_quantity == 150.0
-        snapshot_repo.create_async.assert_called_once()
+        assert result.total_items == 3
+        assert result.total_quantity == 175.0
+        assert result.chunk_count == 2
+        assert [item.item_code for item in result.stocks] == ["ITEM-01", "ITEM-02", "ITEM-03"]
+        snapshot_repo.create_snapshot_async.assert_called_once()
+        # 親ドキュメントは作成中として挿入され、完了後に返却される
+        assert inserted_statuses == [SnapshotStatus.IN_PROGRESS]
+        assert result.status == SnapshotStatus.COMPLETED
+        # チャンクは挿入結果の ID に紐付けられる
+        chunk_calls = snapshot_repo.add_stocks_async.call_args_list
+        assert [(c.args[0], c.args[2], len(c.args[3])) for c in chunk_calls] == [("SNAP-001", 0, 2), ("SNAP-001", 1, 1)]
+        snapshot_repo.complete_snapshot_async.assert_called_once_with("SNAP-001", 3, 175.0, 2)
+        snapshot_repo.get_latest_snapshot_async.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_create_snapshot_reads_stocks_in_chunks_of_configured_size(self):
+        svc, stock_repo, snapshot_repo = make_service()
+        stock_repo.find_by_store_in_batches_async = stock_batches()
+        snapshot_repo.create_snapshot_async.return_value = "SNAP-001"
+
+        with patch("app.services.snapshot_service.settings.SNAPSHOT_CHUNK_SIZE", 250):
+            await svc.create_snapshot_async("T001", "S001")
+
+        stock_repo.find_by_store_in_batches_async.assert_called_once_with("T001", "S001", batch_size=250)
+
+    @pytest.mark.asyncio
+    async def test_create_snapshot_without_stocks(self):
+        """include_stocks=False では合計のみを返す。"""
+        svc, stock_repo, snapshot_repo = make_service()
+        stock_repo.find_by_store_in_batches_async = stock_batches([make_stock("ITEM-01", 100.0)])
+        snapshot_repo.create_snapshot_async.return_value = "SNAP-001"
+
+        result = await svc.create_snapshot_async("T001", "S001", include_stocks=False)
+
+        assert result.total_items == 1
+        assert result.stocks == []
+        snapshot_repo.add_stocks_async.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_create_snapshot_raises_on_save_failure(self):
-        """create_async が False を返したら例外を発生させる。"""
+        """スナップショットの挿入に失敗したら例外を発生させる。"""
         svc, stock_repo, snapshot_repo = make_service()
-        stock_repo.find_by_store_async.return_value = [make_stock()]
-        snapshot_repo.create_async.return_value = False
+        stock_repo.find_by_store_in_batches_async = stock_batches([make_stock()])
+        snapshot_repo.create_snapshot_async.return_value = None
 
         with pytest.raises(Exception, match="Failed to create snapshot"):
             await svc.create_snapshot_async("T001", "S001")
 
+        snapshot_repo.add_stocks_async.assert_not_called()
+
     @pytest.mark.asyncio
-    async def test_create_snapshot_returns_original_when_retrieval_fails(self):
-        """get_latest_snapshot_async が None を返した場合は元のスナップショットを返す。"""
+    async def test_create_snapshot_deletes_incomplete_snapshot(self):
+        """チャンクの保存に失敗したら作成途中のスナップショットを削除する。"""
         svc, stock_repo, snapshot_repo = make_service()
-        stock_repo.find_by_store_async.return_value = [make_stock()]
-        snapshot_repo.create_async.return_value = True
-        snapshot_repo.get_latest_snapshot_async.return_value = None
+        stock_repo.find_by_store_in_batches_async = stock_batches([make_stock()])
+        snapshot_repo.create_snapshot_async.return_value = "SNAP-001"
+        snapshot_repo.add_stocks_async.side_effect = Exception("write failed")
 
-        result = await svc.create_snapshot_async("T001", "S001")
+        with pytest.raises(Exception, match="write failed"):
+            await svc.create_snapshot_async("T001", "S001")
 
-        # None ではなく StockSnapshotDocument インスタンスが返る
-        assert result is not None
+        snapshot_repo.delete_snapshot_async.assert_called_once_with("SNAP-001")
+        snapshot_repo.complete_snapshot_async.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_create_snapshot_empty_store(self):
         """在庫ゼロの店舗でスナップショットを作成できる。"""
         svc, stock_repo, snapshot_repo = make_service()
-        stock_repo.find_by_store_async.return_value = []
-        snapshot_repo.create_async.return_value = True
-        created = make_snapshot(total_items=0, total_quantity=0.0)
-        snapshot_repo.get_latest_snapshot_async.return_value = created
+        stock_repo.find_by_store_in_batches_async = stock_batches()
+        snapshot_repo.create_snapshot_async.return_value = "SNAP-001"
 
         result = await svc.create_snapshot_async("T001", "S001")
 
         assert result.total_items == 0
+        snapshot_repo.complete_snapshot_async.assert_called_once_with("SNAP-001", 0, 0.0, 0)
 
     @pytest.mark.asyncio
     async def test_create_snapshot_custom_created_by(self):
         """created_by パラメータがリポジトリに渡されることを確認。"""
         svc, stock_repo, snapshot_repo = make_service()
-        stock_repo.find_by_store_async.return_value = [make_stock()]
-        snapshot_repo.create_async.return_value = True
-        snapshot_repo.get_latest_snapshot_async.return_value = make_snapshot()
+        stock_repo.find_by_store_in_batches_async = stock_batches([make_stock()])
+        snapshot_repo.create_snapshot_async.return_value = "SNAP-001"
 
         await svc.create_snapshot_async("T001", "S001", created_by="admin")
 
-        # create_async に渡された引数の created_by を確認
-        call_arg = snapshot_repo.create_async.call_args[0][0]
+        # create_snapshot_async に渡された引数の created_by を確認
+        call_arg = snapshot_repo.create_snapshot_async.call_args[0][0]
         assert call_arg.created_by == "admin"
 
 
@@ -170,9 +221,10 @@ class TestGetSnapshotById:
         snap = make_snapshot()
         snapshot_repo.get_by_id_async.return_value = snap
 
-        result = await svc.get_snapshot_by_id_async("SNAP-001")
+        result = await svc.get_snapshot_by_id_async("SNAP-001", skip=1000, limit=500)
 
         assert result == snap
+        snapshot_repo.get_by_id_async.assert_awaited_once_with("SNAP-001", 1000, 500)
 
     @pytest.mark.asyncio
     async def test_get_snapshot_by_id_not_found(self):
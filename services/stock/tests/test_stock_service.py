@@ -19,6 +19,7 @@ from app.services.stock_service import StockService
 from app.models.documents import StockDocument, StockUpdateDocument
 from app.enums.update_type import UpdateType
 from app.exceptions.stock_exceptions import StockNotFoundError
+from app.config.settings import settings
 
 
 def make_stock(
@@ -56,13 +57,29 @@ def make_update_record(**kwargs):
     return StockUpdateDocument(**defaults)
 
 
+def make_session():
+    """Create a session whose with_transaction runs the callback once, like a transaction without conflicts."""
+    session = MagicMock()
+    session.__aenter__.return_value = session
+
+    async def with_transaction(callback):
+        return await callback(session)
+
+    session.with_transaction = AsyncMock(side_effect=with_transaction)
+    return session
+
+
 def make_service():
     """Create a StockService with all repositories mocked."""
     mock_db = MagicMock()
+    mock_db.client.start_session = AsyncMock(return_value=make_session())
     with patch("app.services.stock_service.StockRepository") as MockStockRepo, \
          patch("app.services.stock_service.StockUpdateRepository") as MockUpdateRepo:
         stock_repo = AsyncMock()
         update_repo = AsyncMock()
+        # set_session is synchronous
+        stock_repo.set_session = MagicMock()
+        update_repo.set_session = MagicMock()
         MockStockRepo.return_value = stock_repo
         MockUpdateRepo.return_value = update_repo
         service = StockService(database=mock_db)
@@ -250,18 +267,21 @@ class TestSetMinimumQuantity:
 
         assert result is True
         stock_repo.create_async.assert_called_once()
+        created = stock_repo.create_async.call_args[0][0]
+        assert created.is_below_minimum is True
+        assert created.is_below_reorder is False
 
     @pytest.mark.asyncio
     async def test_set_minimum_quantity_updates_existing(self):
         """When stock exists, updates minimum_quantity."""
         svc, stock_repo, _ = make_service()
         stock_repo.find_by_item_async.return_value = make_stock()
-        stock_repo.update_one_async.return_value = True
+        stock_repo.update_minimum_quantity_async.return_value = True
 
         result = await svc.set_minimum_quantity_async("T001", "S001", "ITEM-01", 20.0)
 
         assert result is True
-        stock_repo.update_one_async.assert_called_once()
+        stock_repo.update_minimum_quantity_async.assert_called_once_with("T001", "S001", "ITEM-01", 20.0)
 
 
 # ---------------------------------------------------------------------------
@@ -322,6 +342,12 @@ class TestSetReorderParameters:
 # ---------------------------------------------------------------------------
 
 class TestProcessTransaction:
+    """Per-item stock update path (USE_BULK_STOCK_UPDATE disabled)."""
+
+    @pytest.fixture(autouse=True)
+    def disable_bulk_update(self, monkeypatch):
+        monkeypatch.setattr(settings, "USE_BULK_STOCK_UPDATE", False)
+
     def _make_tran_data(self, transaction_type=101, is_cancelled=False, line_items=None):
         return {
             "tenant_id": "T001",
@@ -438,6 +464,165 @@ class TestProcessTransaction:
             await svc.process_transaction_async(self._make_tran_data(transaction_type=101))
 
 
+# ---------------------------------------------------------------------------
+# process_transaction_async - bulk update
+# ---------------------------------------------------------------------------
+
+class TestProcessTransactionBulk:
+    """Bulk stock update path (USE_BULK_STOCK_UPDATE enabled)."""
+
+    @pytest.fixture(autouse=True)
+    def enable_bulk_update(self, monkeypatch):
+        monkeypatch.setattr(settings, "USE_BULK_STOCK_UPDATE", True)
+
+    def _make_tran_data(self, transaction_type=101, line_items=None):
+        return {
+            "tenant_id": "T001",
+            "store_code": "S001",
+            "terminal_no": 1,
+            "transaction_no": 100,
+            "transaction_type": transaction_type,
+            "sales": {"is_cancelled": False},
+            "line_items": line_items,
+        }
+
+    @pytest.mark.asyncio
+    async def test_quantities_aggregated_per_item_in_one_call(self):
+        svc, _, _ = make_service()
+        svc.update_stock_async = AsyncMock()
+        svc.update_stocks_bulk_async = AsyncMock()
+        items = [
+            {"item_code": "ITEM-01", "quantity": 2, "is_cancelled": False},
+            {"item_code": "ITEM-02", "quantity": 1, "is_cancelled": False},
+            {"item_code": "ITEM-01", "quantity": 3, "is_cancelled": False},
+            {"item_code": "ITEM-03", "quantity": 4, "is_cancelled": True},
+            {"item_code": "ITEM-04", "quantity": 0, "is_cancelled": False},
+        ]
+
+        await svc.process_transaction_async(self._make_tran_data(line_items=items))
+
+        svc.update_stock_async.assert_not_called()
+        svc.update_stocks_bulk_async.assert_awaited_once()
+        call_kwargs = svc.update_stocks_bulk_async.call_args[1]
+        assert call_kwargs["quantity_changes"] == {"ITEM-01": -5, "ITEM-02": -1}
+        assert call_kwargs["update_type"] == UpdateType.SALE
+        assert call_kwargs["reference_id"] == "100"
+
+    @pytest.mark.asyncio
+    async def test_return_sales_restores_stock(self):
+        svc, _, _ = make_service()
+        svc.update_stocks_bulk_async = AsyncMock()
+        items = [{"item_code": "ITEM-01", "quantity": 2, "is_cancelled": False}]
+
+        await svc.process_transaction_async(self._make_tran_data(transaction_type=102, line_items=items))
+
+        assert svc.update_stocks_bulk_async.call_args[1]["quantity_changes"] == {"ITEM-01": 2}
+
+    @pytest.mark.asyncio
+    async def test_all_items_cancelled_skips_update(self):
+        svc, _, _ = make_service()
+        svc.update_stocks_bulk_async = AsyncMock()
+        items = [{"item_code": "ITEM-01", "quantity": 2, "is_cancelled": True}]
+
+        await svc.process_transaction_async(self._make_tran_data(line_items=items))
+
+        svc.update_stocks_bulk_async.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# update_stocks_bulk_async
+# ---------------------------------------------------------------------------
+
+class TestUpdateStocksBulk:
+    @pytest.mark.asyncio
+    async def test_history_inserted_once_with_before_and_after(self):
+        svc, stock_repo, update_repo = make_service()
+        stock_repo.update_quantities_bulk_async.return_value = [
+            make_stock(item_code="ITEM-02", current_quantity=9.0),
+            make_stock(item_code="ITEM-01", current_quantity=95.0),
+        ]
+
+        result = await svc.update_stocks_bulk_async(
+            "T001", "S001", {"ITEM-01": -5.0, "ITEM-02": -1.0}, UpdateType.SALE, reference_id="100"
+        )
+
+        stock_repo.update_quantities_bulk_async.assert_awaited_once_with(
+            "T001", "S001", {"ITEM-01": -5.0, "ITEM-02": -1.0}, "100"
+        )
+        update_repo.create_many_async.assert_awaited_once_with(result)
+        update_repo.create_async.assert_not_called()
+        assert [record.item_code for record in result] == ["ITEM-01", "ITEM-02"]
+        assert (result[0].before_quantity, result[0].after_quantity) == (100.0, 95.0)
+        assert (result[1].before_quantity, result[1].after_quantity) == (10.0, 9.0)
+        assert result[0].timestamp == result[1].timestamp
+        # the bulk write and the history insert run in one transaction
+        session = svc._database.client.start_session.return_value
+        session.with_transaction.assert_awaited_once()
+        assert stock_repo.set_session.call_args_list[0].args == (session,)
+        assert update_repo.set_session.call_args_list[0].args == (session,)
+        stock_repo.set_session.assert_called_with(None)
+        update_repo.set_session.assert_called_with(None)
+
+    @pytest.mark.asyncio
+    async def test_failed_history_insert_fails_the_transaction(self):
+        svc, stock_repo, update_repo = make_service()
+        stock_repo.update_quantities_bulk_async.return_value = [make_stock(item_code="ITEM-01")]
+        update_repo.create_many_async.side_effect = Exception("insert failed")
+
+        with pytest.raises(Exception, match="insert failed"):
+            await svc.update_stocks_bulk_async("T001", "S001", {"ITEM-01": -1.0}, UpdateType.SALE)
+
+        stock_repo.set_session.assert_called_with(None)
+        update_repo.set_session.assert_called_with(None)
+
+    @pytest.mark.asyncio
+    async def test_transaction_runs_again_after_write_conflict(self):
+        svc, stock_repo, update_repo = make_service()
+        stock_repo.update_quantities_bulk_async.side_effect = [
+            Exception("write conflict"),
+            [make_stock(item_code="ITEM-01", current_quantity=99.0)],
+        ]
+        session = svc._database.client.start_session.return_value
+
+        async def with_transaction(callback):
+            # with_transaction runs the callback again on a TransientTransactionError
+            try:
+                return await callback(session)
+            except Exception:
+                return await callback(session)
+
+        session.with_transaction.side_effect = with_transaction
+
+        result = await svc.update_stocks_bulk_async("T001", "S001", {"ITEM-01": -1.0}, UpdateType.SALE)
+
+        assert stock_repo.update_quantities_bulk_async.await_count == 2
+        update_repo.create_many_async.assert_awaited_once_with(result)
+        assert (result[0].before_quantity, result[0].after_quantity) == (100.0, 99.0)
+
+    @pytest.mark.asyncio
+    async def test_missing_stock_raises(self):
+        svc, stock_repo, update_repo = make_service()
+        stock_repo.update_quantities_bulk_async.return_value = [make_stock(item_code="ITEM-01")]
+
+        with pytest.raises(StockNotFoundError):
+            await svc.update_stocks_bulk_async("T001", "S001", {"ITEM-01": -1.0, "ITEM-02": -1.0}, UpdateType.SALE)
+
+        update_repo.create_many_async.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_alerts_checked_once_for_batch(self):
+        svc, stock_repo, _ = make_service()
+        mock_alert = AsyncMock()
+        svc._alert_service = mock_alert
+        updated_stocks = [make_stock(item_code="ITEM-01"), make_stock(item_code="ITEM-02")]
+        stock_repo.update_quantities_bulk_async.return_value = updated_stocks
+
+        await svc.update_stocks_bulk_async("T001", "S001", {"ITEM-01": -1.0, "ITEM-02": -1.0}, UpdateType.SALE)
+
+        mock_alert.check_and_send_alerts_batch.assert_awaited_once_with(updated_stocks)
+        mock_alert.check_and_send_alerts.assert_not_called()
+
+
 # ---------------------------------------------------------------------------
 # set_reorder_parameters_async - new stock with alert_service (line 239)
 # ---------------------------------------------------------------------------
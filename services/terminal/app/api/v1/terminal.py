@@ -17,7 +17,9 @@ from app.dependencies.get_terminal_service import (
     get_tenant_id_with_security_wrapper,
     get_tenant_id_with_security_by_query_optional_wrapper,
     get_tenant_id_for_pubsub_notification,
+    get_terminallog_delivery_status_repository_for_pubsub_notification,
 )
+from app.models.repositories.terminallog_delivery_status_repository import TerminallogDeliveryStatusRepository
 
 router = APIRouter()
 logger = getLogger(__name__)
@@ -720,3 +722,60 @@ async def update_delivery_status(
         operation=f"{inspect.currentframe().f_code.co_name}",
     )
     return response
+
+
+@router.post(
+    "/tenants/{tenant_id}/delivery-status/bulk",
+    status_code=status.HTTP_200_OK,
+    response_model=ApiResponse[BulkDeliveryStatusUpdateResponse],
+    responses={
+        status.HTTP_400_BAD_REQUEST: StatusCodes.get(status.HTTP_400_BAD_REQUEST),
+        status.HTTP_401_UNAUTHORIZED: StatusCodes.get(status.HTTP_401_UNAUTHORIZED),
+        status.HTTP_403_FORBIDDEN: StatusCodes.get(status.HTTP_403_FORBIDDEN),
+        status.HTTP_422_UNPROCESSABLE_ENTITY: StatusCodes.get(status.HTTP_422_UNPROCESSABLE_ENTITY),
+        status.HTTP_500_INTERNAL_SERVER_ERROR: StatusCodes.get(status.HTTP_500_INTERNAL_SERVER_ERROR),
+    },
+)
+async def update_delivery_status_bulk(
+    tenant_id: str,
+    bulk_request: BulkDeliveryStatusUpdateRequest,
+    delivery_status_repo: TerminallogDeliveryStatusRepository = Depends(
+        get_terminallog_delivery_status_repository_for_pubsub_notification
+    ),
+):
+    """
+    Update the delivery statuses of many terminal logs at once
+
+    Used by the receiving services to acknowledge the cash in/out and open/close logs
+    in batches instead of one request per log. All statuses are applied with one bulk write.
+
+    Args:
+        tenant_id: Tenant ID the logs belong to
+        bulk_request: Delivery statuses with event ID, service, status, and optional message
+        delivery_status_repo: Delivery status repository
+
+    Returns:
+        ApiResponse containing the number of statuses requested and of delivery statuses found
+    """
+    logger.debug(f"Updating delivery statuses for tenant {tenant_id}, count: {len(bulk_request.statuses)}")
+    statuses = [
+        {
+            "event_id": delivery_status.event_id,
+            "service_name": delivery_status.service,
+            "status": delivery_status.status,
+            "message": delivery_status.message,
+        }
+        for delivery_status in bulk_request.statuses
+    ]
+    matched = await delivery_status_repo.bulk_update_service_status_async(tenant_id=tenant_id, statuses=statuses)
+    if matched < len(statuses):
+        logger.warning(f"Delivery status not found for {len(statuses) - matched} of {len(statuses)} events")
+
+    response = ApiResponse(
+        success=True,
+        code=status.HTTP_200_OK,
+        message=f"Delivery Statuses Updated. tenant_id: {tenant_id}, requested: {len(statuses)}, matched: {matched}",
+        data=BulkDeliveryStatusUpdateResponse(requested=len(statuses), matched=matched),
+        operation=f"{inspect.currentframe().f_code.co_name}",
+    )
+    return response
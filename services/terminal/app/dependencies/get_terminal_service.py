@@ -7,7 +7,7 @@ This module provides dependency injection helpers for creating and configuring
 terminal service instances with all necessary repositories and services.
 """
 
-from fastapi import Depends, Path, Query
+from fastapi import Depends, HTTPException, Path, Query, status
 from logging import getLogger
 from typing import Optional
 
@@ -167,3 +167,26 @@ async def get_tenant_id_for_pubsub_notification(
     # Extract tenant_id from terminal_id (format: tenant_id-store_code-terminal_no)
     tenant_id = terminal_id.split("-")[0]
     return tenant_id
+
+
+async def get_terminallog_delivery_status_repository_for_pubsub_notification(
+    tenant_id: str = Path(...), auth_info: dict = Depends(verify_pubsub_notification_auth)
+) -> TerminallogDeliveryStatusRepository:
+    """
+    Dependency for the bulk delivery status notification endpoint.
+    Validates authentication using either service JWT token or PUBSUB_NOTIFY_API_KEY.
+
+    Args:
+        tenant_id: Tenant ID from path parameter
+        auth_info: Authentication information from JWT or API key
+
+    Returns:
+        Delivery status repository on the common database, not bound to a terminal
+
+    Raises:
+        HTTPException: If the service token belongs to another tenant
+    """
+    if auth_info.get("tenant_id") and auth_info.get("tenant_id") != tenant_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Tenant ID does not match the token")
+    db_common = await db_helper.get_db_async(f"{settings.DB_NAME_PREFIX}_commons")
+    return TerminallogDeliveryStatusRepository(db=db_common, terminal_info=None)
@@ -15,7 +15,9 @@ logger.info("Application started")
 
 # Import the required application modules after the logger is configured  # to ensure proper logging for all imported modules
 from kugel_common.database import database as db_helper
+from kugel_common.utils.http_client_helper import close_all_clients
 from kugel_common.middleware.log_requests import log_requests
+from kugel_common.utils.request_log_writer import request_log_writer
 from kugel_common.schemas.api_response import ApiResponse
 from kugel_common.schemas.health import HealthCheckResponse, HealthStatus, ComponentHealth
 from kugel_common.utils.health_check import HealthChecker
@@ -179,9 +181,16 @@ async def close_event():
     await shutdown_republish_undelivered_terminallog_job()
     logger.info("Shutdown republish job for undelivered terminal log messages")
 
+    # Write the queued request logs before the database connection is closed
+    await request_log_writer.close_async()
+
     logger.info("Closing the database connection")
     await db_helper.close_client_async()
 
+    # Close the pooled HTTP clients of the other services
+    logger.info("Closing all HTTP client pools")
+    await close_all_clients()
+
     # Add additional cleanup tasks here if needed
     logger.info("Application closed")
 
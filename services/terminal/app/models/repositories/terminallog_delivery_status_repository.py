@@ -9,8 +9,10 @@ from logging import getLogger
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from typing import Optional, List
 from datetime import datetime, timedelta, timezone
+from pymongo import UpdateOne
 
 from kugel_common.utils.misc import get_app_time
+from kugel_common.exceptions import RepositoryException
 from kugel_common.models.repositories.abstract_repository import AbstractRepository
 from kugel_common.models.documents.terminal_info_document import TerminalInfoDocument
 from app.models.documents.terminallog_delivery_status_document import TerminallogDeliveryStatus
@@ -19,6 +21,28 @@ from app.config.settings import settings
 logger = getLogger(__name__)
 
 
+def _all_services_in_status(status: str) -> dict:
+    """
+    Aggregation expression: True if all services of the document are in the given status.
+    """
+    return {
+        "$allElementsTrue": [{"$map": {"input": "$services", "as": "service", "in": {"$eq": ["$$service.status", status]}}}]
+    }
+
+
+# Overall status derived from the service statuses, as in TerminalService.update_delivery_status_async
+_OVERALL_STATUS_EXPRESSION = {
+    "$switch": {
+        "branches": [
+            {"case": _all_services_in_status("received"), "then": "delivered"},
+            {"case": {"$in": ["received", "$services.status"]}, "then": "partially_delivered"},
+            {"case": _all_services_in_status("failed"), "then": "failed"},
+        ],
+        "default": "$status",
+    }
+}
+
+
 class TerminallogDeliveryStatusRepository(AbstractRepository[TerminallogDeliveryStatus]):
     """
     Terminal Log Delivery Status Repository
@@ -211,6 +235,66 @@ class TerminallogDeliveryStatusRepository(AbstractRepository[TerminallogDelivery
             logger.error(f"Failed to update service status: {e}")
             return False
 
+    async def bulk_update_service_status_async(self, tenant_id: str, statuses: List[dict]) -> int:
+        """
+        Update the service statuses of many events with one bulk write
+
+        Each update sets the receipt status of the service and derives the overall status
+        from the updated service statuses in the same operation. The updates are
+        applied in the given order.
+
+        Args:
+            tenant_id: Tenant ID the events belong to
+            statuses: List of dictionaries with event_id, service_name, status and optional message
+
+        Returns:
+            int: Number of delivery status documents found
+
+        Raises:
+            RepositoryException: If the bulk write fails
+        """
+        if not statuses:
+            return 0
+
+        now = get_app_time()
+        operations = []
+        for status in statuses:
+            service_update = {"status": {"$literal": status["status"]}, "received_at": now}
+            if status.get("message") is not None:
+                service_update["message"] = {"$literal": status["message"]}
+            pipeline = [
+                {
+                    "$set": {
+                        "services": {
+                            "$map": {
+                                "input": {"$ifNull": ["$services", []]},
+                                "as": "service",
+                                "in": {
+                                    "$cond": [
+                                        {"$eq": ["$$service.service_name", {"$literal": status["service_name"]}]},
+                                        {"$mergeObjects": ["$$service", service_update]},
+                                        "$$service",
+                                    ]
+                                },
+                            }
+                        },
+                        "last_updated_at": now,
+                    }
+                },
+                {"$set": {"status": _OVERALL_STATUS_EXPRESSION}},
+            ]
+            operations.append(UpdateOne({"event_id": status["event_id"], "tenant_id": tenant_id}, pipeline))
+
+        if self.dbcollection is None:
+            await self.initialize()
+
+        try:
+            result = await self.dbcollection.bulk_write(operations, ordered=True, session=self.session)
+        except Exception as e:
+            message = f"Failed to update {len(operations)} delivery statuses: {e}"
+            raise RepositoryException(message, self.collection_name, logger, e) from e
+        return result.matched_count
+
     async def update_delivery_status(self, event_id: str, status: str) -> bool:
         """
         Update overall delivery status
@@ -7,7 +7,7 @@ via HTTP API calls. It is used to access transaction data that is stored in a di
 """
 
 from kugel_common.exceptions import NotFoundException, RepositoryException
-from kugel_common.utils.http_client_helper import get_service_client
+from kugel_common.utils.http_client_helper import get_pooled_client
 from kugel_common.schemas.pagination import PaginatedResult, Metadata
 from kugel_common.models.documents.terminal_info_document import TerminalInfoDocument
 from kugel_common.models.documents.base_tranlog import BaseTransaction
@@ -77,57 +77,57 @@ class TranlogWebRepository:
         store_code = self.terminal_info.store_code
         terminal_no = self.terminal_info.terminal_no
 
-        async with get_service_client("cart") as client:
-            jwt_token = getattr(self.terminal_info, "jwt_token", None)
-            if jwt_token:
-                headers = {"Authorization": f"Bearer {jwt_token}"}
+        client = await get_pooled_client("cart")
+        jwt_token = getattr(self.terminal_info, "jwt_token", None)
+        if jwt_token:
+            headers = {"Authorization": f"Bearer {jwt_token}"}
+        else:
+            headers = {"X-API-KEY": self.terminal_info.api_key}
+        params = {
+            "terminal_id": self.terminal_info.terminal_id,
+            "business_date": business_date,
+            "open_counter": open_counter,
+            "include_cancelled": include_cancelled,
+            "limit": limit,
+            "page": page,
+        }
+        if transaction_type:
+            params["transaction_type"] = transaction_type
+        if sort:
+            sort_str = ",".join([f"{key}:{value}" for key, value in sort])
+            params["sort"] = sort_str
+        endpoint = f"/tenants/{self.tenant_id}/stores/{store_code}/terminals/{terminal_no}/transactions"
+
+        logger.debug(f"TranlogWebRepository.get_tran_log_list_async: endpoint->{endpoint}, params->{params}")
+
+        try:
+            response_data = await client.get(endpoint, params=params, headers=headers)
+        except Exception as e:
+            if hasattr(e, "status_code") and e.status_code == 404:
+                message = f"tranlog not found for terminal_id {self.terminal_info.terminal_id}"
+                raise NotFoundException(
+                    message=message,
+                    collection_name="Tranlog Web",
+                    find_key=self.terminal_info.terminal_id,
+                    logger=logger,
+                    original_exception=e,
+                )
             else:
-                headers = {"X-API-KEY": self.terminal_info.api_key}
-            params = {
-                "terminal_id": self.terminal_info.terminal_id,
-                "business_date": business_date,
-                "open_counter": open_counter,
-                "include_cancelled": include_cancelled,
-                "limit": limit,
-                "page": page,
-            }
-            if transaction_type:
-                params["transaction_type"] = transaction_type
-            if sort:
-                sort_str = ",".join([f"{key}:{value}" for key, value in sort])
-                params["sort"] = sort_str
-            endpoint = f"/tenants/{self.tenant_id}/stores/{store_code}/terminals/{terminal_no}/transactions"
-
-            logger.debug(f"TranlogWebRepository.get_tran_log_list_async: endpoint->{endpoint}, params->{params}")
-
-            try:
-                response_data = await client.get(endpoint, params=params, headers=headers)
-            except Exception as e:
-                if hasattr(e, "status_code") and e.status_code == 404:
-                    message = f"tranlog not found for terminal_id {self.terminal_info.terminal_id}"
-                    raise NotFoundException(
-                        message=message,
-                        collection_name="Tranlog Web",
-                        find_key=self.terminal_info.terminal_id,
-                        logger=logger,
-                        original_exception=e,
-                    )
-                else:
-                    message = f"Request error for terminal_id {self.terminal_info.terminal_id}"
-                    raise RepositoryException(
-                        message=message, collection_name="Tranlog Web", logger=logger, original_exception=e
-                    )
-
-            logger.debug(f"response: {response_data}")
-            paginated_result = PaginatedResult(
-                data=[BaseTransaction(**tranlog) for tranlog in response_data.get("data")],
-                metadata=Metadata(
-                    limit=limit,
-                    page=page,
-                    total=response_data.get("metadata").get("total"),
-                    sort=sort_str if "sort_str" in locals() else None,
-                    filter={"terminal_id": self.terminal_info.terminal_id},
-                ),
-            )
-            logger.debug(f"paginated_result: {paginated_result}")
-            return paginated_result
+                message = f"Request error for terminal_id {self.terminal_info.terminal_id}"
+                raise RepositoryException(
+                    message=message, collection_name="Tranlog Web", logger=logger, original_exception=e
+                )
+
+        logger.debug(f"response: {response_data}")
+        paginated_result = PaginatedResult(
+            data=[BaseTransaction(**tranlog) for tranlog in response_data.get("data")],
+            metadata=Metadata(
+                limit=limit,
+                page=page,
+                total=response_data.get("metadata").get("total"),
+                sort=sort_str if "sort_str" in locals() else None,
+                filter={"terminal_id": self.terminal_info.terminal_id},
+            ),
+        )
+        logger.debug(f"paginated_result: {paginated_result}")
+        return paginated_result
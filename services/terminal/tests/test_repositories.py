@@ -934,6 +934,64 @@ class TestTerminallogDeliveryStatusRepository:
             mock_init.assert_awaited_once()
             assert result is True
 
+    # -- bulk_update_service_status_async -------------------------------------
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_service_status_one_bulk_write(self):
+        repo = self._make_repo(terminal_info=None)
+        mock_collection = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.matched_count = 2
+        mock_collection.bulk_write = AsyncMock(return_value=mock_result)
+        repo.dbcollection = mock_collection
+
+        matched = await repo.bulk_update_service_status_async(
+            "T1",
+            [
+                {"event_id": "evt-001", "service_name": "report", "status": "received", "message": None},
+                {"event_id": "evt-002", "service_name": "journal", "status": "failed", "message": "error"},
+            ],
+        )
+
+        assert matched == 2
+        mock_collection.bulk_write.assert_awaited_once()
+        operations = mock_collection.bulk_write.call_args[0][0]
+        assert mock_collection.bulk_write.call_args[1]["ordered"] is True
+        assert [operation._filter for operation in operations] == [
+            {"event_id": "evt-001", "tenant_id": "T1"},
+            {"event_id": "evt-002", "tenant_id": "T1"},
+        ]
+        service_updates = [
+            operation._doc[0]["$set"]["services"]["$map"]["in"]["$cond"][1]["$mergeObjects"][1]
+            for operation in operations
+        ]
+        assert service_updates[0]["status"] == {"$literal": "received"}
+        assert "message" not in service_updates[0]
+        assert service_updates[1]["message"] == {"$literal": "error"}
+        assert "received_at" in service_updates[1]
+        assert "status" in operations[0]._doc[1]["$set"]
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_service_status_empty(self):
+        repo = self._make_repo()
+        repo.dbcollection = AsyncMock()
+
+        assert await repo.bulk_update_service_status_async("T1", []) == 0
+        repo.dbcollection.bulk_write.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_service_status_error(self):
+        from kugel_common.exceptions import RepositoryException
+
+        repo = self._make_repo()
+        repo.dbcollection = AsyncMock()
+        repo.dbcollection.bulk_write = AsyncMock(side_effect=Exception("db error"))
+
+        with pytest.raises(RepositoryException):
+            await repo.bulk_update_service_status_async(
+                "T1", [{"event_id": "evt-001", "service_name": "report", "status": "received"}]
+            )
+
     # -- update_delivery_status -----------------------------------------------
 
     @pytest.mark.asyncio